@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Benchmarks - Teljesítmény mérések a fő hot path-okra
+====================================================
+- fetch: MultiCityEngine.analyze_multi_city a helyi stand-in API ellen
+- analytics: trend statisztika 5 / 55 éves soron
+- geo: GeoUtils clustering és kiválasztás 40k városon
+- city_manager: település / város keresés
+- rendering: heatmap, wind rose, adattáblázat
+
+Futtatás a projekt gyökeréből:
+    python -m benchmarks                    # mérés + mentés + összevetés az előző futással
+    python -m benchmarks -k geo --slow      # szűrés, lassú paraméterekkel
+    python -m benchmarks --compare benchmarks/results/<futás>.json --fail-on-regression
+"""
+
+from .datasets import isolate_app_data
+
+# Minden benchmark folyamat (a --worker folyamatok is) saját ideiglenes adatkönyvtárral fut
+isolate_app_data()
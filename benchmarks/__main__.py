@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark futtató - python -m benchmarks
+Global Weather Analyzer projekt
+"""
+
+import argparse
+import json
+import logging
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+from .harness import (
+    DEFAULT_REGRESSION_THRESHOLD, PROJECT_ROOT, discover, run_case, run_benchmarks, save_results,
+    load_results, latest_results_file, compare, format_seconds
+)
+
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _print_result(result) -> None:
+    if result.status == "ok":
+        print(f"  ✅ {result.key:<60} medián {format_seconds(result.median):>12}  "
+              f"(min {format_seconds(result.min)}, ±{format_seconds(result.stdev)}, n={result.repeat})")
+    elif result.status == "skipped":
+        print(f"  ⏭️ {result.key:<60} kihagyva: {result.reason}")
+    else:
+        print(f"  ❌ {result.key:<60} hiba: {result.reason}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Global Weather Analyzer benchmark suite")
+    parser.add_argument("-k", "--filter", action="append", default=[],
+                        help="Csak a nevükben ezt tartalmazó benchmarkok (többször megadható)")
+    parser.add_argument("--slow", action="store_true", help="Lassú paraméterek futtatása is (pl. 40k clustering)")
+    parser.add_argument("--repeat", type=int, default=None, help="Ismétlésszám felülírása")
+    parser.add_argument("--no-save", action="store_true", help="Eredmények mentésének kihagyása")
+    parser.add_argument("--compare", type=Path, default=None,
+                        help="Összevetés ezzel a futással (alapértelmezés: a legutóbbi mentett futás)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Regresszió küszöb medián arányként")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Kilépési kód 1 regresszió esetén")
+    parser.add_argument("--list", action="store_true", help="Regisztrált benchmarkok listázása")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Minden mérés ebben a folyamatban (izoláció nélkül, gyorsabb)")
+    parser.add_argument("--timeout", type=float, default=None, help="Mérésenkénti időkorlát másodpercben")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Naplózás és print kimenet megtartása")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--param-index", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+
+    if args.worker:
+        # Izolált mérés: egyetlen (benchmark, paraméter), eredmény JSON-ként
+        case = discover()[args.worker]
+        result = run_case(case, case.params[args.param_index], repeat=args.repeat, quiet=True)
+        print(json.dumps(asdict(result), ensure_ascii=False))
+        return 0
+
+    cases = [case for name, case in sorted(discover().items())
+             if not args.filter or any(pattern in name for pattern in args.filter)]
+
+    if args.list:
+        for case in cases:
+            slow = f" (lassú: {list(case.slow_params)})" if case.slow_params else ""
+            print(f"{case.name}: {list(case.params)}{slow}")
+        return 0
+
+    print(f"⏱️ {len(cases)} benchmark futtatása...")
+    results = run_benchmarks(cases, include_slow=args.slow, repeat=args.repeat, quiet=not args.verbose,
+                             isolate=not args.in_process, timeout=args.timeout, progress=_print_result)
+
+    saved_path = None
+    if not args.no_save:
+        saved_path = save_results(results)
+        print(f"💾 Eredmények mentve: {saved_path.relative_to(PROJECT_ROOT)}")
+
+    baseline_path = args.compare or latest_results_file(exclude=saved_path)
+    regressions = 0
+    if baseline_path is not None and baseline_path.exists():
+        print(f"📉 Összevetés: {baseline_path.name}")
+        for row in compare(results, load_results(baseline_path), args.threshold):
+            if row["verdict"] == "new":
+                continue
+            marker = {"regression": "🔴", "improvement": "🟢"}.get(row["verdict"], "⚪")
+            print(f"  {marker} {row['key']:<60} {format_seconds(row['baseline']):>12} → "
+                  f"{format_seconds(row['current']):>12}  ({row['ratio']:.2f}×)")
+            regressions += row["verdict"] == "regression"
+
+    if regressions:
+        print(f"⚠️ {regressions} regresszió (küszöb {args.threshold:.2f}×)")
+    errors = sum(result.status == "error" for result in results)
+    if errors or (regressions and args.fail_on_regression):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Analytics Benchmarks - Trend statisztika számítás
+Global Weather Analyzer projekt
+
+📈 calculate_trend_statistics 5 és 55 éves napi soron (havi aggregáció,
+   lineáris regresszió, konfidencia sáv) - oszlopos (WeatherColumns) bemenettel
+"""
+
+from types import SimpleNamespace
+
+from .datasets import daily_payload
+from .harness import benchmark
+
+TREND_FIELD = "temperature_2m_max"
+
+
+def _trend_setup(years: int) -> SimpleNamespace:
+    from src.data.weather_columns import WeatherColumns
+    from src.gui.trend_analytics_tab import TrendDataProcessor
+
+    columns = WeatherColumns.from_daily_json(daily_payload(years)["daily"], "open-meteo")
+    # A számítás nem használ példány állapotot - a TrendDataProcessor konstruktora
+    # (CityManager + WeatherClient) kimarad a mérésből és az adatbázis függőségből
+    return SimpleNamespace(calculate=TrendDataProcessor.calculate_trend_statistics, columns=columns)
+
+
+@benchmark(group="analytics", params=[5, 55], setup=_trend_setup, repeat=5,
+           requires=("PySide6", "sklearn", "scipy"))
+def calculate_trend_statistics(context, years):
+    result = context.calculate(None, context.columns, TREND_FIELD, "Budapest",
+                               "🔥 Maximum hőmérséklet", f"{years} év", years)
+    if result is None:
+        raise RuntimeError("calculate_trend_statistics nem adott eredményt")
+    return result
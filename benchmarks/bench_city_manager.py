@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+CityManager Benchmarks - Település és város keresés
+Global Weather Analyzer projekt
+
+🔍 search_unified (magyar + globális), search_cities és
+   search_hungarian_settlements 40k globális városon és 3200 településen
+"""
+
+from types import SimpleNamespace
+
+from .datasets import cities_db, hungarian_db
+from .harness import benchmark
+
+SEARCH_TERMS = ["Bu", "kunha", "zzz"]
+
+
+def _manager_setup(term: str) -> SimpleNamespace:
+    from src.data.city_manager import CityManager
+
+    manager = CityManager(db_path=cities_db(), hungarian_db_path=hungarian_db())
+    return SimpleNamespace(manager=manager, close=manager.close)
+
+
+@benchmark(group="city_manager", params=SEARCH_TERMS, setup=_manager_setup, repeat=20)
+def search_unified(context, term):
+    return context.manager.search_unified(term, limit=20)
+
+
+@benchmark(group="city_manager", params=SEARCH_TERMS, setup=_manager_setup, repeat=20)
+def search_cities(context, term):
+    return context.manager.search_cities(term, limit=20)
+
+
+@benchmark(group="city_manager", params=SEARCH_TERMS, setup=_manager_setup, repeat=20)
+def search_hungarian_settlements(context, term):
+    return context.manager.search_hungarian_settlements(term, limit=20)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Fetch Benchmarks - MultiCityEngine lekérés a stand-in API ellen
+Global Weather Analyzer projekt
+
+🌍 analyze_multi_city 20 / 200 / 3000 városra (Global régió, szintetikus cities.db)
+🧪 A providerek a helyi stand-in szervert hívják (25 ms ± 15 ms késleltetés) -
+   a batching, a rácscella deduplikáció és az AIMD párhuzamosság együtt mérhető
+⏱️ Egy warmup kör után mér: az AIMD szabályzó már felfutott (állandósult áteresztés)
+"""
+
+from types import SimpleNamespace
+
+from .datasets import cities_db, hungarian_db, standin_server
+from .harness import benchmark
+
+ANALYSIS_DATE = "2024-07-15"
+
+
+def _reset_process_state() -> None:
+    """Provider egészségkép és állomás cache törlése - minden mérés hidegen indul."""
+    from src.data.provider_health import get_provider_health_tracker
+    from src.data.station_series_cache import get_station_series_cache
+
+    get_provider_health_tracker().reset()
+    get_station_series_cache().clear()
+
+
+def _engine_setup(city_count: int) -> SimpleNamespace:
+    standin_server()
+    from src.analytics.multi_city_engine import MultiCityEngine
+
+    engine = MultiCityEngine(db_path=str(cities_db()), hungarian_db_path=str(hungarian_db()))
+    # A régió városkorlátja példány szinten felülírva - a lekérdezés pontosan city_count várost dolgoz fel
+    engine.REGIONS = {**engine.REGIONS, "Global": {**engine.REGIONS["Global"], "max_cities": city_count}}
+    _reset_process_state()
+    return SimpleNamespace(engine=engine)
+
+
+@benchmark(group="fetch", params=[20, 200, 3000], setup=_engine_setup, repeat=3, warmup=1)
+def analyze_multi_city(context, city_count):
+    _reset_process_state()
+    result = context.engine.analyze_multi_city("hottest_today", "Global", ANALYSIS_DATE, limit=city_count)
+    if len(result.city_results) < city_count:
+        raise RuntimeError(f"analyze_multi_city: {len(result.city_results)}/{city_count} város eredmény")
+    return result
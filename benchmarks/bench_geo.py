@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Geo Benchmarks - GeoUtils clustering és város kiválasztás
+Global Weather Analyzer projekt
+
+📍 group_cities_by_proximity (közelség alapú csoportosítás)
+🏙️ optimize_cities_for_weather_analytics / find_optimal_cities_for_region
+   (távolság-populáció súlyozott kiválasztás) 40k városból
+🗺️ calculate_multi_city_coverage_area
+"""
+
+from types import SimpleNamespace
+
+from .datasets import synthetic_cities
+from .harness import benchmark
+
+FULL_CITY_COUNT = 40000
+
+
+def _geo_setup(city_count: int) -> SimpleNamespace:
+    from src.data.geo_utils import GeoUtils
+
+    return SimpleNamespace(geo=GeoUtils(), cities=list(synthetic_cities(FULL_CITY_COUNT)[:city_count]))
+
+
+@benchmark(group="geo", params=[1000, 4000, FULL_CITY_COUNT], slow_params=[FULL_CITY_COUNT],
+           setup=_geo_setup, repeat=1, warmup=0)
+def group_cities_by_proximity(context, city_count):
+    return context.geo.group_cities_by_proximity(context.cities, max_distance_km=100)
+
+
+@benchmark(group="geo", params=[4000, FULL_CITY_COUNT], setup=_geo_setup, repeat=1, warmup=0)
+def find_optimal_cities_for_region(context, city_count):
+    return context.geo.find_optimal_cities_for_region(context.cities, target_count=20)
+
+
+@benchmark(group="geo", params=[FULL_CITY_COUNT], setup=_geo_setup, repeat=1, warmup=0)
+def optimize_cities_for_weather_analytics(context, city_count):
+    return context.geo.optimize_cities_for_weather_analytics(context.cities, "wind", max_cities=30)
+
+
+@benchmark(group="geo", params=[FULL_CITY_COUNT], setup=_geo_setup, repeat=5)
+def calculate_multi_city_coverage_area(context, city_count):
+    return context.geo.calculate_multi_city_coverage_area(context.cities)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Rendering Benchmarks - Chart rajzolás és táblázat feltöltés
+Global Weather Analyzer projekt
+
+🔅 HeatmapCalendarChart, 🌹 WindRoseChart és 📋 DataTableTab frissítése
+   1 és 10 éves napi adaton (offscreen Qt platform, ha nincs megjelenítő)
+"""
+
+import os
+from types import SimpleNamespace
+
+from .datasets import daily_payload
+from .harness import benchmark
+
+RENDER_YEARS = [1, 10]
+
+
+def _qt_application():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+def _widget_setup(factory, years: int) -> SimpleNamespace:
+    app = _qt_application()
+    widget = factory()
+    widget.resize(1200, 800)
+    return SimpleNamespace(app=app, widget=widget, data=daily_payload(years), close=widget.deleteLater)
+
+
+def _heatmap_setup(years: int) -> SimpleNamespace:
+    from src.gui.charts.heatmap_chart import HeatmapCalendarChart
+    return _widget_setup(HeatmapCalendarChart, years)
+
+
+def _wind_rose_setup(years: int) -> SimpleNamespace:
+    from src.gui.charts.wind_rose_chart import WindRoseChart
+    return _widget_setup(WindRoseChart, years)
+
+
+def _table_setup(years: int) -> SimpleNamespace:
+    from src.gui.results_panel.data_table_tab import DataTableTab
+    return _widget_setup(DataTableTab, years)
+
+
+def _update(context) -> None:
+    context.widget.update_data(context.data)
+    context.app.processEvents()
+
+
+@benchmark(group="rendering", params=RENDER_YEARS, setup=_heatmap_setup, repeat=3,
+           requires=("PySide6", "matplotlib"))
+def heatmap_calendar(context, years):
+    _update(context)
+
+
+@benchmark(group="rendering", params=RENDER_YEARS, setup=_wind_rose_setup, repeat=3,
+           requires=("PySide6", "matplotlib"))
+def wind_rose(context, years):
+    _update(context)
+
+
+@benchmark(group="rendering", params=RENDER_YEARS, setup=_table_setup, repeat=3,
+           requires=("PySide6",))
+def data_table_population(context, years):
+    _update(context)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Benchmark Datasets - Szintetikus városok, adatbázisok és időjárási sorok
+Global Weather Analyzer projekt
+
+🏙️ VÁROSOK: Determinisztikus (seed) globális város lista magyar jellegű nevekkel,
+   log-normális populációval - a CityManager / GeoUtils / MultiCityEngine bemenete
+🗄️ ADATBÁZISOK: cities.db és hungarian_settlements.db a valódi sémák szükséges
+   oszlopaival, ideiglenes munkakönyvtárban (egyszer épül, a futás végén törlődik)
+🌦️ IDŐJÁRÁS: Open-Meteo formátumú napi sorok a stand-in szerver szintetikus
+   generátorával (ugyanaz az adat, amit a stand-in HTTP-n ad)
+🧪 STAND-IN: Folyamaton belüli stand-in API szerver, a providerek végpontjai
+   erre irányítva - nincs élő API hívás és rate limit
+"""
+
+import atexit
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Any
+
+import numpy as np
+
+SEED = 42
+
+_SYLLABLES = ["bu", "da", "pest", "ki", "kun", "ha", "las", "sze", "ged", "győr", "pé", "cs",
+              "deb", "re", "cen", "mis", "kolc", "nyír", "egy", "há", "za", "ba", "ja", "tó",
+              "fü", "red", "vár", "hely", "szent", "ke", "cs", "mét", "er", "dő", "fa", "lu"]
+
+_COUNTRIES = [("HU", "Hungary", "Europe"), ("AT", "Austria", "Europe"), ("DE", "Germany", "Europe"),
+              ("FR", "France", "Europe"), ("IT", "Italy", "Europe"), ("PL", "Poland", "Europe"),
+              ("US", "United States", "North America"), ("BR", "Brazil", "South America"),
+              ("IN", "India", "Asia"), ("CN", "China", "Asia"), ("NG", "Nigeria", "Africa"),
+              ("AU", "Australia", "Oceania")]
+
+_MEGYEK = ["Baranya", "Bács-Kiskun", "Békés", "Borsod-Abaúj-Zemplén", "Csongrád-Csanád", "Fejér",
+           "Győr-Moson-Sopron", "Hajdú-Bihar", "Heves", "Jász-Nagykun-Szolnok", "Komárom-Esztergom",
+           "Nógrád", "Pest", "Somogy", "Szabolcs-Szatmár-Bereg", "Tolna", "Vas", "Veszprém", "Zala"]
+
+
+# === MUNKAKÖNYVTÁR ===
+
+_workspace_lock = threading.Lock()
+_workspace_path = None
+
+
+def workspace() -> Path:
+    """A benchmark futás ideiglenes könyvtára (kilépéskor törlődik)."""
+    global _workspace_path
+    with _workspace_lock:
+        if _workspace_path is None:
+            _workspace_path = Path(tempfile.mkdtemp(prefix="weather_bench_"))
+            atexit.register(shutil.rmtree, _workspace_path, True)
+        return _workspace_path
+
+
+def isolate_app_data() -> Path:
+    """
+    Az alkalmazás adatkönyvtára (usage tracking, klíma archívum, cache-ek) a munkakönyvtárba.
+
+    A src.config importja előtt hívandó: a szintetikus lekérések így nem fogyasztják a
+    valódi havi kvótát, és nem írnak a felhasználó data/ könyvtárába.
+    """
+    data_dir = workspace() / "data"
+    os.environ["WEATHER_ANALYZER_DATA_DIR"] = str(data_dir)
+    config = sys.modules.get("src.config")
+    if config is not None and Path(config.DATA_DIR) != data_dir:
+        raise RuntimeError("A src.config már betöltődött a valódi adatkönyvtárral - a benchmark nem izolálható")
+    return data_dir
+
+
+# === VÁROSOK ===
+
+def _names(rng: np.random.Generator, count: int) -> List[str]:
+    syllable_counts = rng.integers(2, 5, size=count)
+    picks = rng.integers(0, len(_SYLLABLES), size=(count, 4))
+    return [
+        "".join(_SYLLABLES[index] for index in picks[row, :syllable_counts[row]]).capitalize() + f" {row}"
+        for row in range(count)
+    ]
+
+
+@lru_cache(maxsize=None)
+def synthetic_cities(count: int, seed: int = SEED) -> List[Dict[str, Any]]:
+    """
+    Globális városok (a MultiCityEngine városlista formátumában).
+
+    ~35% 100k feletti populációval, így a "Global" régió lekérdezés 40k városból
+    bőven ad 3000 feletti jelöltet.
+    """
+    rng = np.random.default_rng(seed)
+    latitudes = np.degrees(np.arcsin(rng.uniform(-0.85, 0.95, size=count)))
+    longitudes = rng.uniform(-180.0, 180.0, size=count)
+    populations = np.round(rng.lognormal(mean=11.0, sigma=1.4, size=count)).astype(np.int64)
+    countries = rng.integers(0, len(_COUNTRIES), size=count)
+    names = _names(rng, count)
+
+    cities = []
+    for index in range(count):
+        country_code, country, continent = _COUNTRIES[countries[index]]
+        cities.append({
+            "id": index + 1,
+            "city": names[index],
+            "name": names[index],
+            "country": country,
+            "country_code": country_code,
+            "continent": continent,
+            "lat": round(float(latitudes[index]), 4),
+            "lon": round(float(longitudes[index]), 4),
+            "population": int(populations[index]),
+        })
+    return cities
+
+
+@lru_cache(maxsize=None)
+def synthetic_settlements(count: int = 3200, seed: int = SEED) -> List[Dict[str, Any]]:
+    """Magyar települések (Magyarország befoglaló téglalapján belül)."""
+    rng = np.random.default_rng(seed + 1)
+    names = _names(rng, count)
+    populations = np.round(rng.lognormal(mean=7.0, sigma=1.3, size=count)).astype(np.int64)
+    megyek = rng.integers(0, len(_MEGYEK), size=count)
+    latitudes = rng.uniform(45.75, 48.55, size=count)
+    longitudes = rng.uniform(16.15, 22.85, size=count)
+
+    return [{
+        "id": index + 1,
+        "name": names[index],
+        "settlement_type": "város" if populations[index] > 10000 else "község",
+        "megye": _MEGYEK[megyek[index]],
+        "jaras": f"{_MEGYEK[megyek[index]]} {index % 7 + 1}. járás",
+        "terulet_hektar": float(rng.uniform(500, 20000)),
+        "population": int(populations[index]),
+        "lakasok_szama": int(populations[index] // 2.4),
+        "latitude": round(float(latitudes[index]), 4),
+        "longitude": round(float(longitudes[index]), 4),
+        "climate_zone": "Alföld" if longitudes[index] > 19.0 else "Dunántúl",
+        "region_priority": int(index % 10 + 1),
+    } for index in range(count)]
+
+
+# === ADATBÁZISOK ===
+
+@lru_cache(maxsize=None)
+def cities_db(count: int = 40000) -> Path:
+    """Szintetikus cities.db (a CityManager és a MultiCityEngine által olvasott oszlopokkal)."""
+    path = workspace() / f"cities_{count}.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("""
+            CREATE TABLE cities (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                city TEXT NOT NULL, lat REAL NOT NULL, lon REAL NOT NULL,
+                country TEXT NOT NULL, country_code TEXT NOT NULL, population INTEGER,
+                continent TEXT, admin_name TEXT, capital TEXT, timezone TEXT,
+                meteostat_station_id TEXT, data_quality_score INTEGER
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO cities (id, city, lat, lon, country, country_code, population, continent, "
+            "admin_name, capital, timezone, meteostat_station_id, data_quality_score) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, 'UTC', NULL, ?)",
+            [(city["id"], city["city"], city["lat"], city["lon"], city["country"], city["country_code"],
+              city["population"], city["continent"], city["country"], city["id"] % 10 + 1)
+             for city in synthetic_cities(count)]
+        )
+        conn.execute("CREATE INDEX idx_country_code ON cities (country_code)")
+        conn.execute("CREATE INDEX idx_population_desc ON cities (population DESC) WHERE population IS NOT NULL")
+        conn.execute("CREATE INDEX idx_city_name_search ON cities (city COLLATE NOCASE)")
+    return path
+
+
+@lru_cache(maxsize=None)
+def hungarian_db(count: int = 3200) -> Path:
+    """Szintetikus hungarian_settlements.db."""
+    path = workspace() / f"hungarian_settlements_{count}.db"
+    columns = ["id", "name", "settlement_type", "megye", "jaras", "terulet_hektar", "population",
+               "lakasok_szama", "latitude", "longitude", "climate_zone", "region_priority"]
+    with sqlite3.connect(path) as conn:
+        conn.execute("""
+            CREATE TABLE hungarian_settlements (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL, settlement_type TEXT, megye TEXT, jaras TEXT,
+                terulet_hektar REAL, population INTEGER, lakasok_szama INTEGER,
+                latitude REAL, longitude REAL, climate_zone TEXT, region_priority INTEGER
+            )
+        """)
+        conn.executemany(
+            f"INSERT INTO hungarian_settlements ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            [tuple(settlement[column] for column in columns) for settlement in synthetic_settlements(count)]
+        )
+        conn.execute("CREATE INDEX idx_name ON hungarian_settlements (name)")
+        conn.execute("CREATE INDEX idx_megye ON hungarian_settlements (megye)")
+    return path
+
+
+# === IDŐJÁRÁSI SOROK ===
+
+@lru_cache(maxsize=None)
+def daily_payload(years: int, latitude: float = 47.4979, longitude: float = 19.0402) -> Dict[str, Any]:
+    """Open-Meteo formátumú napi válasz ({"daily": {...}}) az utolsó `years` évre (2024 végéig)."""
+    from src.devtools.standin_server import synthetic_daily, _location_key, _nan_to_none
+
+    end = np.datetime64("2024-12-31", "D")
+    start = np.datetime64(f"{2025 - years}-01-01", "D")
+    dates = np.arange(start, end + np.timedelta64(1, "D"), dtype="datetime64[D]")
+    series = synthetic_daily(latitude, longitude, dates, _location_key("bench", latitude, longitude, SEED))
+
+    daily = {"time": np.datetime_as_string(dates, unit="D").tolist()}
+    for name, values in series.items():
+        daily[name] = _nan_to_none(values)
+    daily["wind_gusts_max"] = daily["windgusts_10m_max"]
+    return {"latitude": latitude, "longitude": longitude, "daily": daily}
+
+
+# === STAND-IN SZERVER ===
+
+_server_lock = threading.Lock()
+_server = None
+
+
+def standin_server(latency_ms: float = 25.0, jitter_ms: float = 15.0):
+    """
+    Folyamat szintű stand-in szerver, a providerek végpontjai rá irányítva.
+
+    A késleltetés a valódi archív API tipikus válaszidejét közelíti, így a
+    párhuzamosság és a batching hatása mérhető.
+    """
+    global _server
+    from src.devtools import StandInServer, StandInConfig
+
+    with _server_lock:
+        if _server is None:
+            _server = StandInServer(StandInConfig(latency_ms=latency_ms, latency_jitter_ms=jitter_ms, seed=SEED))
+            _server.start()
+            _server.install()
+            atexit.register(_server.stop)
+        else:
+            _server.configure(latency_ms=latency_ms, latency_jitter_ms=jitter_ms)
+        return _server
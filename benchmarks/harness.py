@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Benchmark Harness - Regisztráció, időmérés, eredmény mentés és összehasonlítás
+Global Weather Analyzer projekt
+
+📋 REGISZTRÁCIÓ: @benchmark dekorátor paraméter listával (asv stílus) - minden
+   paraméter érték külön mérés; a setup (adat előállítás) nincs időmérve
+⏱️ MÉRÉS: warmup + ismételt perf_counter mérés, min/medián/átlag/szórás
+🧱 IZOLÁCIÓ: Alapból minden (benchmark, paraméter) külön Python folyamatban fut -
+   a folyamat szintű állapot (AIMD szabályzók, cache-ek, Qt) nem szivárog át, és
+   egy összeomló mérés (pl. natív kiterjesztés hiba) nem viszi el a teljes futást
+💾 MENTÉS: benchmarks/results/<időbélyeg>_<git rev>.json (gép + verzió infóval)
+📉 ÖSSZEHASONLÍTÁS: medián arány egy korábbi futáshoz, regresszió küszöb felett jelölve
+
+Használat:
+    @benchmark(params=[20, 200, 3000], setup=build_engine, group="fetch")
+    def analyze_multi_city(context, city_count):
+        context.engine.analyze_multi_city("hottest_today", "Global", DATE, limit=city_count)
+"""
+
+import contextlib
+import gc
+import importlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Callable, Sequence
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCHMARKS_DIR.parent
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+
+# Alapértelmezett regresszió küszöb (medián arány)
+DEFAULT_REGRESSION_THRESHOLD = 1.25
+
+
+@dataclass
+class BenchmarkCase:
+    """Egy regisztrált benchmark (paraméterenként külön mérés)."""
+    name: str
+    func: Callable[..., Any]
+    group: str
+    params: Sequence[Any] = (None,)
+    slow_params: Sequence[Any] = ()
+    setup: Optional[Callable[[Any], Any]] = None
+    repeat: int = 5
+    warmup: int = 1
+    requires: Sequence[str] = ()
+
+    def missing_requirements(self) -> List[str]:
+        missing = []
+        for module_name in self.requires:
+            try:
+                importlib.import_module(module_name)
+            except ImportError:
+                missing.append(module_name)
+        return missing
+
+
+@dataclass
+class BenchmarkResult:
+    """Egy (benchmark, paraméter) mérés eredménye másodpercben."""
+    name: str
+    group: str
+    param: Optional[str]
+    status: str = "ok"          # ok | skipped | error
+    reason: Optional[str] = None
+    repeat: int = 0
+    min: Optional[float] = None
+    median: Optional[float] = None
+    mean: Optional[float] = None
+    stdev: Optional[float] = None
+    max: Optional[float] = None
+    setup_seconds: Optional[float] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.param}]" if self.param is not None else self.name
+
+
+# === REGISZTRÁCIÓ ===
+
+BENCHMARKS: Dict[str, BenchmarkCase] = {}
+
+
+def benchmark(name: Optional[str] = None, group: str = "misc", params: Optional[Sequence[Any]] = None,
+              slow_params: Sequence[Any] = (), setup: Optional[Callable[[Any], Any]] = None,
+              repeat: int = 5, warmup: int = 1, requires: Sequence[str] = ()):
+    """
+    Benchmark regisztrálása.
+
+    A mért függvény hívása: func(context, param) ha van setup (a setup(param) visszatérési
+    értéke a context), különben func(param) - paraméter nélkül func().
+    A slow_params értékek csak --slow kapcsolóval futnak.
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        case_name = name or func.__name__
+        BENCHMARKS[f"{group}.{case_name}"] = BenchmarkCase(
+            name=f"{group}.{case_name}", func=func, group=group,
+            params=tuple(params) if params is not None else (None,),
+            slow_params=tuple(slow_params), setup=setup,
+            repeat=repeat, warmup=warmup, requires=tuple(requires),
+        )
+        return func
+    return decorator
+
+
+def discover() -> Dict[str, BenchmarkCase]:
+    """A benchmarks/bench_*.py modulok betöltése (a dekorátorok regisztrálnak)."""
+    for path in sorted(BENCHMARKS_DIR.glob("bench_*.py")):
+        importlib.import_module(f"benchmarks.{path.stem}")
+    return BENCHMARKS
+
+
+# === MÉRÉS ===
+
+def _call(case: BenchmarkCase, context: Any, param: Any) -> Any:
+    if case.setup is not None:
+        return case.func(context, param)
+    if param is None:
+        return case.func()
+    return case.func(param)
+
+
+def run_case(case: BenchmarkCase, param: Any, repeat: Optional[int] = None, quiet: bool = True) -> BenchmarkResult:
+    """
+    Egy benchmark egy paraméterének mérése.
+
+    A GC a mérések alatt ki van kapcsolva (a setup után egy gyűjtés), a benchmark
+    stdout kimenete (debug print-ek) quiet módban elnyelődik.
+    """
+    result = BenchmarkResult(case.name, case.group, None if param is None else str(param))
+
+    missing = case.missing_requirements()
+    if missing:
+        result.status = "skipped"
+        result.reason = f"hiányzó modul: {', '.join(missing)}"
+        return result
+
+    repeat = repeat or case.repeat
+    sink = io.StringIO() if quiet else None
+    timings: List[float] = []
+
+    try:
+        with contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext():
+            setup_started = time.perf_counter()
+            context = case.setup(param) if case.setup is not None else None
+            result.setup_seconds = time.perf_counter() - setup_started
+
+            for _ in range(case.warmup):
+                _call(case, context, param)
+
+            gc.collect()
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    _call(case, context, param)
+                    timings.append(time.perf_counter() - started)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+
+            close = getattr(context, "close", None)
+            if callable(close):
+                close()
+
+    except Exception as e:
+        result.status = "error"
+        result.reason = f"{type(e).__name__}: {e}"
+        return result
+
+    result.repeat = len(timings)
+    result.min = min(timings)
+    result.median = statistics.median(timings)
+    result.mean = statistics.fmean(timings)
+    result.stdev = statistics.stdev(timings) if len(timings) > 1 else 0.0
+    result.max = max(timings)
+    return result
+
+
+def run_case_isolated(case: BenchmarkCase, param_index: int, repeat: Optional[int] = None,
+                      timeout: Optional[float] = None) -> BenchmarkResult:
+    """Egy mérés külön folyamatban (python -m benchmarks --worker ...); az eredmény JSON a stdout utolsó sora."""
+    param = case.params[param_index]
+    command = [sys.executable, "-m", "benchmarks", "--worker", case.name, "--param-index", str(param_index)]
+    if repeat:
+        command += ["--repeat", str(repeat)]
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+
+    result = BenchmarkResult(case.name, case.group, None if param is None else str(param))
+    try:
+        completed = subprocess.run(command, cwd=PROJECT_ROOT, env=env, capture_output=True,
+                                   text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        result.status = "error"
+        result.reason = f"időtúllépés ({timeout:.0f}s)"
+        return result
+
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        stderr_lines = [line for line in completed.stderr.strip().splitlines() if line.strip()]
+        result.status = "error"
+        result.reason = f"folyamat hiba (kód {completed.returncode})" + (f": {stderr_lines[0]}" if stderr_lines else "")
+        return result
+
+    return BenchmarkResult(**json.loads(lines[-1]))
+
+
+def run_benchmarks(cases: Sequence[BenchmarkCase], include_slow: bool = False, repeat: Optional[int] = None,
+                   quiet: bool = True, isolate: bool = True, timeout: Optional[float] = None,
+                   progress: Optional[Callable[[BenchmarkResult], None]] = None) -> List[BenchmarkResult]:
+    """Kiválasztott benchmarkok futtatása (lassú paraméterek csak include_slow esetén)."""
+    results = []
+    for case in cases:
+        for param_index, param in enumerate(case.params):
+            if param in case.slow_params and not include_slow:
+                continue
+            if isolate:
+                result = run_case_isolated(case, param_index, repeat=repeat, timeout=timeout)
+            else:
+                result = run_case(case, param, repeat=repeat, quiet=quiet)
+            results.append(result)
+            if progress:
+                progress(result)
+    return results
+
+
+# === MENTÉS / ÖSSZEHASONLÍTÁS ===
+
+def _git_revision() -> Optional[str]:
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def _environment() -> Dict[str, Any]:
+    versions = {}
+    for module_name in ("numpy", "pandas", "PySide6", "matplotlib"):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            versions[module_name] = getattr(module, "__version__", None)
+    return {
+        "machine": platform.node(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "python": platform.python_version(),
+        "versions": versions,
+    }
+
+
+def save_results(results: Sequence[BenchmarkResult], results_dir: Path = RESULTS_DIR) -> Path:
+    """Futás mentése JSON-ba; a fájlnév időbélyeg + git revízió (időrendben rendezhető)."""
+    results_dir.mkdir(parents=True, exist_ok=True)
+    revision = _git_revision()
+    timestamp = datetime.now()
+    path = results_dir / f"{timestamp:%Y%m%d-%H%M%S}_{revision or 'norev'}.json"
+
+    payload = {
+        "timestamp": timestamp.isoformat(timespec="seconds"),
+        "git_revision": revision,
+        "environment": _environment(),
+        "results": [asdict(result) for result in results],
+    }
+    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def load_results(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Mentett futás → {kulcs: eredmény dict}."""
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    loaded = {}
+    for item in payload.get("results", []):
+        key = f"{item['name']}[{item['param']}]" if item.get("param") is not None else item["name"]
+        loaded[key] = item
+    return loaded
+
+
+def latest_results_file(results_dir: Path = RESULTS_DIR, exclude: Optional[Path] = None) -> Optional[Path]:
+    """A legutóbbi mentett futás (opcionálisan egy fájl kihagyásával)."""
+    if not results_dir.exists():
+        return None
+    candidates = sorted(path for path in results_dir.glob("*.json") if path != exclude)
+    return candidates[-1] if candidates else None
+
+
+def compare(results: Sequence[BenchmarkResult], baseline: Dict[str, Dict[str, Any]],
+            threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Medián összevetés egy korábbi futással.
+
+    Returns:
+        Soronként: key, baseline, current, ratio, verdict ("regression" | "improvement" | "same" | "new")
+    """
+    rows = []
+    for result in results:
+        if result.status != "ok":
+            continue
+        previous = baseline.get(result.key)
+        if not previous or previous.get("status") != "ok" or not previous.get("median"):
+            rows.append({"key": result.key, "baseline": None, "current": result.median, "ratio": None, "verdict": "new"})
+            continue
+
+        ratio = result.median / previous["median"]
+        if ratio >= threshold:
+            verdict = "regression"
+        elif ratio <= 1.0 / threshold:
+            verdict = "improvement"
+        else:
+            verdict = "same"
+        rows.append({"key": result.key, "baseline": previous["median"], "current": result.median,
+                     "ratio": ratio, "verdict": verdict})
+    return rows
+
+
+def format_seconds(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    if value < 1e-3:
+        return f"{value * 1e6:.1f} µs"
+    if value < 1.0:
+        return f"{value * 1e3:.2f} ms"
+    return f"{value:.3f} s"
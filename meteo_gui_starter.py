@@ -12,19 +12,29 @@ Refaktorált architektúra:
 - AppController központi logika
 - MainWindow komponens koordináció
 - Moduláris design, thread pool management
+
+Hidegindítás mérés:
+    python meteo_gui_starter.py --import-report
+    → -X importtime stílusú import bontás (legdrágább modulok) + időbélyegek az első ablakig
 """
 
+import time
+
+# Folyamat indulási időpont - a hidegindítási mérések viszonyítási pontja
+_PROCESS_START = time.perf_counter()
+
 import sys
 import os
 import signal
+import subprocess
 import traceback
 from pathlib import Path
-from typing import Optional
+from typing import Optional, List, Tuple, Dict
 
 # PySide6 import with error handling
 try:
     from PySide6.QtWidgets import QApplication, QMessageBox
-    from PySide6.QtCore import Qt
+    from PySide6.QtCore import Qt, QTimer
     from PySide6.QtGui import QIcon
 except ImportError as e:
     print("❌ PySide6 import hiba!")
@@ -33,15 +43,126 @@ except ImportError as e:
     print(f"Részletes hiba: {e}")
     sys.exit(1)
 
+# Import-idő jelentés kérése (a project importok előtt ellenőrizve)
+IMPORT_REPORT_ENABLED = "--import-report" in sys.argv or os.environ.get("METEO_IMPORT_REPORT") == "1"
+if "--import-report" in sys.argv:
+    sys.argv.remove("--import-report")
+
 # Project imports
+_IMPORT_START = time.perf_counter()
 try:
     from src.config import AppInfo, ensure_directories
     from src.gui.main_window import MainWindow
+    from src.lazy_imports import get_lazy_import_report
 except ImportError as e:
     print("❌ Modul import hiba!")
     print("Ellenőrizze a projekt struktúrát és a PYTHONPATH-t.")
     print(f"Részletes hiba: {e}")
     sys.exit(1)
+_IMPORT_END = time.perf_counter()
+
+
+# === HIDEGINDÍTÁS MÉRÉS ===
+
+class StartupTimer:
+    """
+    Hidegindítási időbélyegek (folyamat indulásától mért ms).
+    
+    Az első ablak megjelenéséig mért szakaszok: project importok,
+    QApplication, MainWindow felépítése, első eseményciklus kör.
+    """
+    
+    def __init__(self):
+        self.milestones: List[Tuple[str, float]] = [
+            ("project importok kezdete", _IMPORT_START),
+            ("project importok vége", _IMPORT_END),
+        ]
+    
+    def mark(self, name: str) -> None:
+        """Időbélyeg rögzítése."""
+        self.milestones.append((name, time.perf_counter()))
+    
+    def elapsed_ms(self) -> float:
+        """Folyamat indulása óta eltelt idő (ms)."""
+        return (time.perf_counter() - _PROCESS_START) * 1000
+    
+    def print_report(self) -> None:
+        """Időbélyegek kiírása."""
+        print("\n⏱️ Hidegindítás időbélyegek (folyamat indulásától):")
+        previous = _PROCESS_START
+        for name, stamp in self.milestones:
+            print(f"   {(stamp - _PROCESS_START) * 1000:8.1f} ms  (+{(stamp - previous) * 1000:7.1f} ms)  {name}")
+            previous = stamp
+
+
+def parse_importtime_output(stderr_text: str) -> List[Tuple[str, int, int]]:
+    """
+    `-X importtime` kimenet feldolgozása.
+    
+    Returns:
+        (modul, self µs, kumulatív µs) lista
+    """
+    entries = []
+    for line in stderr_text.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+            entries.append((module.rstrip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return entries
+
+
+def print_import_time_report(module: str = "src.gui.main_window", top: int = 25) -> None:
+    """
+    -X importtime stílusú import bontás egy friss Python folyamatban.
+    
+    A saját folyamat importjai már lefutottak, ezért a mérés egy gyermek
+    folyamatban ismétli meg a GUI importját hideg modul cache-sel.
+    
+    Args:
+        module: A mérendő belépési modul
+        top: A kiírt legdrágább modulok száma
+    """
+    project_root = Path(__file__).parent
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=str(project_root), capture_output=True, text=True, timeout=120
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"⚠️ Import-idő mérés sikertelen: {e}")
+        return
+    
+    entries = parse_importtime_output(completed.stderr)
+    if not entries:
+        print(f"⚠️ Nincs -X importtime kimenet (exit code: {completed.returncode})")
+        return
+    
+    total_us = max(cumulative for _, _, cumulative in entries)
+    
+    # Top-level csomagok összesítése (a self idők összege csomagonként)
+    packages: Dict[str, int] = {}
+    for name, self_us, _ in entries:
+        root = name.strip().split(".")[0]
+        packages[root] = packages.get(root, 0) + self_us
+    
+    print(f"\n📦 Import-idő jelentés: import {module} → {total_us / 1000:.1f} ms ({len(entries)} modul)")
+    
+    print(f"\n   Legdrágább modulok (kumulatív):")
+    print(f"   {'kumulatív':>10} {'self':>9}  modul")
+    for name, self_us, cumulative_us in sorted(entries, key=lambda e: e[2], reverse=True)[:top]:
+        print(f"   {cumulative_us / 1000:8.1f}ms {self_us / 1000:7.1f}ms  {name.strip()}")
+    
+    print(f"\n   Csomagok (self idők összege):")
+    for root, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:15]:
+        print(f"   {self_us / 1000:8.1f}ms  {root}")
+    
+    # Lusta importok - ezek NEM terhelik az indulást
+    deferred = [name for name, load_time in get_lazy_import_report().items() if load_time is None]
+    if deferred:
+        print(f"\n   💤 Lusta (első használatig halasztott) modulok: {', '.join(deferred)}")
 
 
 class WeatherAnalyzerApp:
@@ -58,6 +179,7 @@ class WeatherAnalyzerApp:
         """Alkalmazás inicializálása."""
         self.app: Optional[QApplication] = None
         self.main_window: Optional[MainWindow] = None
+        self.startup_timer = StartupTimer()
         
         # Signal handlers beállítása
         self._setup_signal_handlers()
@@ -84,7 +206,11 @@ class WeatherAnalyzerApp:
             
             # === QAPPLICATION LÉTREHOZÁSA ===
             
+            # A QtWebEngine lusta importjához szükséges (a QApplication előtt kell beállítani)
+            QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+            
             self.app = QApplication(sys.argv)
+            self.startup_timer.mark("QApplication létrehozva")
             self.app.setApplicationName(AppInfo.NAME)
             self.app.setApplicationVersion(AppInfo.VERSION)
             self.app.setOrganizationName("Weather Analytics")
@@ -107,6 +233,7 @@ class WeatherAnalyzerApp:
             # - Worker management-et
             
             self.main_window = MainWindow()
+            self.startup_timer.mark("MainWindow létrehozva")
             print("✅ MainWindow létrehozva (MVC komponensekkel)")
             
             print("✅ Alkalmazás sikeresen inicializálva!")
@@ -143,6 +270,10 @@ class WeatherAnalyzerApp:
             # === FŐ ABLAK MEGJELENÍTÉSE ===
             
             self.main_window.show()
+            self.startup_timer.mark("MainWindow.show()")
+            
+            # Az első eseményciklus kör - az ablak ekkor már megjelent
+            QTimer.singleShot(0, self._on_first_window_shown)
             
             print("🎉 Alkalmazás sikeresen elindult!")
             print("📍 Válasszon települést az időjárási adatok lekérdezéséhez.")
@@ -165,6 +296,15 @@ class WeatherAnalyzerApp:
             self._show_error("Runtime hiba", str(e))
             return 1
     
+    def _on_first_window_shown(self) -> None:
+        """Első ablak megjelenése - hidegindítási idő kiírása."""
+        self.startup_timer.mark("első eseményciklus kör (ablak látható)")
+        print(f"⏱️ Első ablak: {self.startup_timer.elapsed_ms():.0f} ms a folyamat indulásától")
+        
+        if IMPORT_REPORT_ENABLED:
+            self.startup_timer.print_report()
+            print_import_time_report()
+    
     def shutdown(self) -> None:
         """Alkalmazás graceful leállítása."""
         try:
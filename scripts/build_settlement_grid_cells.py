@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Település → Rácscella Mapping Építő Script
+Global Weather Analyzer projekt
+
+Fájl: scripts/build_settlement_grid_cells.py
+
+Cél: A settlement_grid_cells tábla előre felépítése a hungarian_settlements.db-ben.
+A MultiCityEngine ezt használja a cella deduplikációhoz (egy lekérés / rácscella).
+A tábla futásidőben is automatikusan felépül, ha hiányzik vagy a koordináták
+megváltoztak (pl. fix_hungarian_coordinates.py futtatása után).
+
+Használat:
+    python scripts/build_settlement_grid_cells.py [adatbázis_útvonal]
+"""
+
+import sys
+import logging
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.grid_cells import SettlementCellMapping, GRID_RESOLUTIONS
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "hungarian_settlements.db"
+
+
+def main() -> int:
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DB_PATH
+
+    if not db_path.exists():
+        logger.error(f"❌ Adatbázis nem található: {db_path}")
+        return 1
+
+    mapping = SettlementCellMapping(db_path)
+
+    for provider_id, resolution in GRID_RESOLUTIONS.items():
+        count = mapping.build(provider_id, resolution)
+        stats = mapping.get_statistics(provider_id, resolution)
+
+        print(f"\n🌐 {provider_id} ({resolution:g}°): {count} település → {stats['cells']} cella")
+        for county, county_stats in stats["counties"].items():
+            print(f"   {county:<28} {county_stats['settlements']:>5} település → {county_stats['cells']:>4} cella")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -15,11 +15,93 @@ Status: READY - Magyar MVP alapja
 # Multi-City Analytics Engine - Magyar MVP alapja
 from .multi_city_engine import (
     MultiCityEngine, 
-    MultiCityQuery
+    MultiCityQuery,
+    CityDayMatrix
+)
+
+# Térbeli interpoláció - mintából minden településre és rácsra (IDW)
+from .spatial_interpolation import (
+    SpatialInterpolator,
+    InterpolatedField,
+    get_spatial_interpolator
+)
+
+# Területi összesítés - település → megye / régió tagság, choropleth statisztikák
+from .regional_aggregation import (
+    SettlementMembership,
+    RegionalAggregate,
+    get_settlement_membership
+)
+
+# Esemény detektálás - hőhullám, hideg / száraz / nedves időszak, vihar (run-length)
+from .event_detection import (
+    EventDefinition,
+    EventCatalog,
+    detect_events,
+    build_event_catalog,
+    matrix_event_catalog
+)
+
+# ETCCDI klímaindexek - település × év mátrixok, percentilis alapvonal gyorsítótár
+from .climate_indices import (
+    ClimateIndexEngine,
+    ClimateIndexResult,
+    INDEX_DEFINITIONS,
+    get_climate_index_engine
+)
+
+# Többmagos elemzés - process pool közös memóriás település × nap tömbökön
+from .parallel_runner import (
+    SharedMemoryRunner,
+    LinearTrendField,
+    get_analytics_runner
+)
+
+# Szélsőérték elemzés - éves maximumok, GEV / Gumbel, visszatérési szintek
+from .extreme_value import (
+    ReturnLevelResult,
+    annual_maxima,
+    fit_return_levels,
+    analyze_return_levels
 )
 
 __all__ = [
     # Multi-City Analytics - 3200+ magyar település támogatás
     'MultiCityEngine', 
-    'MultiCityQuery'
+    'MultiCityQuery',
+    'CityDayMatrix',
+    
+    # Térbeli interpoláció
+    'SpatialInterpolator',
+    'InterpolatedField',
+    'get_spatial_interpolator',
+    
+    # Területi összesítés
+    'SettlementMembership',
+    'RegionalAggregate',
+    'get_settlement_membership',
+    
+    # Esemény detektálás
+    'EventDefinition',
+    'EventCatalog',
+    'detect_events',
+    'build_event_catalog',
+    'matrix_event_catalog',
+    
+    # ETCCDI klímaindexek
+    'ClimateIndexEngine',
+    'ClimateIndexResult',
+    'INDEX_DEFINITIONS',
+    'get_climate_index_engine',
+    
+    # Többmagos elemzés
+    'SharedMemoryRunner',
+    'LinearTrendField',
+    'get_analytics_runner',
+    
+    # Szélsőérték elemzés
+    'ReturnLevelResult',
+    'annual_maxima',
+    'fit_return_levels',
+    'analyze_return_levels'
 ]
\ No newline at end of file
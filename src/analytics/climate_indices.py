@@ -0,0 +1,603 @@
+#!/usr/bin/env python3
+"""
+Climate Indices - ETCCDI klímaindexek település × év mátrixokként
+Global Weather Analyzer projekt
+
+📏 SZABVÁNYOS INDEXEK: az ETCCDI (Expert Team on Climate Change Detection and
+   Indices) alapkészlete - FD, ID, SU, TR, TXx/TXn/TNx/TNn, DTR, TX90p/TX10p/
+   TN90p/TN10p, GSL, CDD, CWD, R10mm, R20mm, Rx1day, Rx5day, SDII, PRCPTOT,
+   R95pTOT, R99pTOT
+⚡ VEKTORIZÁLT: bemenet település × nap tömbök, kimenet település × év mátrixok;
+   az éves összesítés ufunc.reduceat az év határokon, a spellek run-length
+   kódolással (event_detection) - csak a GSL iterál évenként, településeken át
+   vektorizáltan
+📊 PERCENTILIS ALAPVONAL: naptári naponkénti (5 napos ablak) küszöbök a bázis
+   időszakból, tartalom hash szerint memóriában és lemezen gyorsítótárazva
+💾 MEGŐRZÉS: az eredmények .npz-ként a ClimateIndexConfig.DIRECTORY alatt - a
+   térkép és a trend nézet újraszámolás nélkül olvassa (trend: év/évtized meredekség)
+
+Használat:
+    engine = get_climate_index_engine()
+    result = engine.compute({"temperature_2m_max": tx, "temperature_2m_min": tn,
+                             "precipitation_sum": pr}, dates, settlement_ids=ids)
+    result.index("SU")          # (település, év)
+    result.trend("TX90p")       # évtizedenkénti változás településenként
+    engine.save(result, "Dél-Alföld_1961_2024")
+
+Megjegyzés: a percentilis küszöbök lineáris interpolációval készülnek, a bázis
+időszakon belüli évekre az ETCCDI bootstrap korrekció nélkül.
+"""
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..config import ClimateIndexConfig
+from .event_detection import run_lengths
+
+logger = logging.getLogger(__name__)
+
+TX = "temperature_2m_max"
+TN = "temperature_2m_min"
+TM = "temperature_2m_mean"
+PR = "precipitation_sum"
+
+# Index → (leírás, mértékegység, szükséges változók)
+INDEX_DEFINITIONS = {
+    "FD": ("Fagyos napok (Tmin < 0 °C)", "nap", (TN,)),
+    "ID": ("Téli napok (Tmax < 0 °C)", "nap", (TX,)),
+    "SU": ("Nyári napok (Tmax > 25 °C)", "nap", (TX,)),
+    "TR": ("Trópusi éjszakák (Tmin > 20 °C)", "nap", (TN,)),
+    "TXx": ("Legmagasabb napi maximum", "°C", (TX,)),
+    "TXn": ("Legalacsonyabb napi maximum", "°C", (TX,)),
+    "TNx": ("Legmagasabb napi minimum", "°C", (TN,)),
+    "TNn": ("Legalacsonyabb napi minimum", "°C", (TN,)),
+    "DTR": ("Átlagos napi hőingás", "°C", (TX, TN)),
+    "TX90p": ("Meleg napok (Tmax > 90. percentilis)", "%", (TX,)),
+    "TX10p": ("Hűvös napok (Tmax < 10. percentilis)", "%", (TX,)),
+    "TN90p": ("Meleg éjszakák (Tmin > 90. percentilis)", "%", (TN,)),
+    "TN10p": ("Hideg éjszakák (Tmin < 10. percentilis)", "%", (TN,)),
+    "GSL": ("Vegetációs időszak hossza", "nap", (TM,)),
+    "CDD": ("Leghosszabb száraz időszak (< 1 mm)", "nap", (PR,)),
+    "CWD": ("Leghosszabb nedves időszak (≥ 1 mm)", "nap", (PR,)),
+    "R10mm": ("Napok ≥ 10 mm csapadékkal", "nap", (PR,)),
+    "R20mm": ("Napok ≥ 20 mm csapadékkal", "nap", (PR,)),
+    "Rx1day": ("Legnagyobb 1 napos csapadék", "mm", (PR,)),
+    "Rx5day": ("Legnagyobb 5 napos csapadék", "mm", (PR,)),
+    "SDII": ("Csapadékintenzitás (nedves napokon)", "mm/nap", (PR,)),
+    "PRCPTOT": ("Éves csapadék (nedves napok)", "mm", (PR,)),
+    "R95pTOT": ("Csapadék a 95. percentilis feletti napokon", "mm", (PR,)),
+    "R99pTOT": ("Csapadék a 99. percentilis feletti napokon", "mm", (PR,)),
+}
+
+# Percentilis index → (változó, percentilis, "calendar" = naptári naponként | "wet" = nedves napokból)
+PERCENTILE_BASELINES = {
+    "TX90p": (TX, 90.0, "calendar"),
+    "TX10p": (TX, 10.0, "calendar"),
+    "TN90p": (TN, 90.0, "calendar"),
+    "TN10p": (TN, 10.0, "calendar"),
+    "R95pTOT": (PR, 95.0, "wet"),
+    "R99pTOT": (PR, 99.0, "wet"),
+}
+
+
+class YearAxis:
+    """Napi tengely → év határok, várt napszám és 366 napos naptári nap index."""
+
+    def __init__(self, dates: np.ndarray):
+        self.dates = dates
+        year_of_day = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+        self.years, self.starts = np.unique(year_of_day, return_index=True)
+        self.bounds = np.append(self.starts, len(dates))
+        leap = (self.years % 4 == 0) & ((self.years % 100 != 0) | (self.years % 400 == 0))
+        self.expected = np.where(leap, 366, 365)
+
+        self.year_index = np.searchsorted(self.years, year_of_day)
+        doy = (dates - dates.astype("datetime64[Y]").astype("datetime64[D]")).astype(np.int64)
+        # Nem szökőévben március 1-től eggyel tolva: a naptári nap index mindig 0..365
+        self.doy = np.where(~leap[self.year_index] & (doy >= 59), doy + 1, doy)
+
+    @property
+    def year_count(self) -> int:
+        return len(self.years)
+
+    def positions(self, first_year: int, last_year: int) -> np.ndarray:
+        return np.flatnonzero((self.years[self.year_index] >= first_year) & (self.years[self.year_index] <= last_year))
+
+    def count(self, mask: np.ndarray) -> np.ndarray:
+        return np.add.reduceat(mask, self.starts, axis=1, dtype=np.int32)
+
+    def total(self, values: np.ndarray) -> np.ndarray:
+        return np.add.reduceat(np.where(np.isfinite(values), values, 0.0), self.starts, axis=1, dtype=np.float64)
+
+
+def _sorted_percentile(sorted_values: np.ndarray, counts: np.ndarray, percentile: float) -> np.ndarray:
+    """Percentilis az utolsó tengely mentén rendezett (NaN a végén) tömbből, lineáris interpolációval."""
+    rank = np.maximum(counts - 1, 0) * (percentile / 100.0)
+    low = np.floor(rank).astype(np.intp)
+    high = np.ceil(rank).astype(np.intp)
+    low_values = np.take_along_axis(sorted_values, low[..., None], axis=-1)[..., 0]
+    high_values = np.take_along_axis(sorted_values, high[..., None], axis=-1)[..., 0]
+    result = low_values + (high_values - low_values) * (rank - low)
+    return np.where(counts > 0, result, np.nan).astype(np.float32)
+
+
+def _max_spell(mask: np.ndarray, axis: YearAxis) -> np.ndarray:
+    """Leghosszabb True sorozat évenként (a sorozatok az év határán megszakadnak)."""
+    split = np.insert(mask, axis.starts[1:], False, axis=1)
+    rows, starts, ends = run_lengths(split)
+    longest = np.zeros((mask.shape[0], axis.year_count), dtype=np.int32)
+    if len(rows):
+        # A beszúrt elválasztók miatt az y. év a split tengelyen starts[y] + y-nál kezdődik
+        year = np.searchsorted(axis.starts + np.arange(axis.year_count), starts, side="right") - 1
+        np.maximum.at(longest, (rows, year), (ends - starts).astype(np.int32))
+    return longest
+
+
+@dataclass
+class ClimateIndexResult:
+    """ETCCDI indexek település × év mátrixokként (NaN: hiányos év)."""
+    years: np.ndarray                   # (Y,)
+    locations: List[str]                # (C,) megjelenítési nevek / azonosítók
+    indices: Dict[str, np.ndarray]      # index → (C, Y) float32
+    base_period: Tuple[int, int]
+    settlement_ids: Optional[np.ndarray] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def index(self, name: str) -> np.ndarray:
+        return self.indices[name]
+
+    def year_values(self, name: str, year: int) -> np.ndarray:
+        """Egy év indexértékei településenként (térkép réteghez)."""
+        position = np.searchsorted(self.years, year)
+        if position >= len(self.years) or self.years[position] != year:
+            return np.full(len(self.locations), np.nan, dtype=np.float32)
+        return self.indices[name][:, position]
+
+    def settlement_values(self, name: str, settlement_id: int) -> Optional[np.ndarray]:
+        """Egy település éves indexsora (trend nézethez) - None, ha a település nincs a készletben."""
+        if self.settlement_ids is None:
+            return None
+        rows = np.flatnonzero(self.settlement_ids == settlement_id)
+        return self.indices[name][rows[0]] if len(rows) else None
+
+    def trend(self, name: str, per_years: int = 10) -> np.ndarray:
+        """
+        Lineáris trend településenként (legkisebb négyzetek, hiányzó évek kihagyva).
+
+        Returns:
+            (C,) változás per_years évre vetítve (NaN, ha kevés az érvényes év)
+        """
+        values = self.indices[name].astype(np.float64)
+        valid = np.isfinite(values)
+        count = valid.sum(axis=1)
+        years = np.broadcast_to(self.years.astype(np.float64), values.shape)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_year = np.where(valid, years, 0.0).sum(axis=1) / count
+            mean_value = np.where(valid, values, 0.0).sum(axis=1) / count
+            dx = np.where(valid, years - mean_year[:, None], 0.0)
+            dy = np.where(valid, values - mean_value[:, None], 0.0)
+            slope = (dx * dy).sum(axis=1) / (dx * dx).sum(axis=1)
+
+        return np.where(count >= ClimateIndexConfig.MIN_TREND_YEARS, slope * per_years, np.nan)
+
+    # === MEGŐRZÉS ===
+
+    def save(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            years=self.years,
+            locations=np.asarray(self.locations, dtype=str),
+            settlement_ids=self.settlement_ids if self.settlement_ids is not None else np.empty(0, dtype=np.int64),
+            base_period=np.asarray(self.base_period),
+            index_names=np.asarray(list(self.indices), dtype=str),
+            **{f"index_{name}": values for name, values in self.indices.items()}
+        )
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ClimateIndexResult":
+        with np.load(path, allow_pickle=False) as archive:
+            settlement_ids = archive["settlement_ids"]
+            return cls(
+                years=archive["years"],
+                locations=archive["locations"].tolist(),
+                indices={name: archive[f"index_{name}"] for name in archive["index_names"].tolist()},
+                base_period=tuple(int(year) for year in archive["base_period"]),
+                settlement_ids=settlement_ids if len(settlement_ids) else None
+            )
+
+
+class ClimateIndexEngine:
+    """
+    ETCCDI indexek kötegelt számítása település × nap tömbökből.
+
+    A számítás CITY_CHUNK méretű település blokkokban fut (memória korlát); a
+    percentilis küszöbök a bázis időszak adatainak hash-e szerint gyorsítótárazottak.
+    """
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None,
+                 base_period: Optional[Tuple[int, int]] = None):
+        self.directory = Path(directory or ClimateIndexConfig.DIRECTORY)
+        self.base_period = tuple(base_period or ClimateIndexConfig.BASE_PERIOD)
+        self._baseline_cache: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+        self.baseline_hits = 0
+        self.baseline_misses = 0
+
+    # === PERCENTILIS ALAPVONALAK ===
+
+    def _effective_base_period(self, axis: YearAxis) -> Tuple[int, int]:
+        """A bázis időszak a rendelkezésre álló évekre vágva (átfedés nélkül: a teljes időszak)."""
+        first, last = max(self.base_period[0], int(axis.years[0])), min(self.base_period[1], int(axis.years[-1]))
+        if first > last:
+            return int(axis.years[0]), int(axis.years[-1])
+        return first, last
+
+    @staticmethod
+    def _calendar_gather(axis: YearAxis, base: np.ndarray) -> np.ndarray:
+        """(366, K) nap pozíciók: minden naptári naphoz a bázis évek ±ablak napjai (-1 = kitöltés)."""
+        half = ClimateIndexConfig.PERCENTILE_WINDOW_DAYS // 2
+        offsets = np.arange(-half, half + 1)
+        samples = (base[:, None] + offsets[None, :]).ravel()
+        targets = np.repeat(axis.doy[base], len(offsets))
+        inside = (samples >= 0) & (samples < len(axis.dates))
+        samples, targets = samples[inside], targets[inside]
+
+        order = np.argsort(targets, kind="stable")
+        samples, targets = samples[order], targets[order]
+        counts = np.bincount(targets, minlength=366)
+        first = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        gather = np.full((366, max(int(counts.max()), 1)), -1, dtype=np.int64)
+        gather[targets, np.arange(len(targets)) - first[targets]] = samples
+        return gather
+
+    def _cached_baseline(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            if key in self._baseline_cache:
+                self.baseline_hits += 1
+                return self._baseline_cache[key]
+        path = self.directory / "baselines" / f"{key}.npy"
+        if not path.exists():
+            return None
+        try:
+            thresholds = np.load(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Percentilis alapvonal nem olvasható ({path.name}): {e}")
+            return None
+        with self._lock:
+            self._baseline_cache[key] = thresholds
+            self.baseline_hits += 1
+        return thresholds
+
+    def _store_baseline(self, key: str, thresholds: np.ndarray) -> None:
+        with self._lock:
+            self._baseline_cache[key] = thresholds
+            self.baseline_misses += 1
+        try:
+            path = self.directory / "baselines" / f"{key}.npy"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            np.save(path, thresholds)
+        except OSError as e:
+            logger.warning(f"⚠️ Percentilis alapvonal nem menthető: {e}")
+
+    def _baselines(self, values: np.ndarray, axis: YearAxis, base: np.ndarray, kind: str,
+                   percentiles: Dict[str, float]) -> Dict[str, np.ndarray]:
+        """
+        Egy változó percentilis küszöbei: (C, 366) naptári naponként vagy (C,) a nedves napokból.
+
+        A bázis időszak adatai egyszer hash-elődnek és egyszer rendeződnek az összes kért percentilishez.
+        A hash a naptári ablak által olvasott ±fél ablaknyi szélső napokat is lefedi.
+        """
+        first, last = int(base[0]), int(base[-1]) + 1
+        if kind == "calendar":
+            half = ClimateIndexConfig.PERCENTILE_WINDOW_DAYS // 2
+            first, last = max(0, first - half), min(len(axis.dates), last + half)
+        digest = hashlib.sha1()
+        digest.update(repr((kind, ClimateIndexConfig.PERCENTILE_WINDOW_DAYS, ClimateIndexConfig.WET_DAY_MM,
+                            str(axis.dates[base[0]]), len(base), str(axis.dates[first]), last - first,
+                            values.shape[0])).encode())
+        digest.update(np.ascontiguousarray(values[:, first:last]).tobytes())
+        keys = {name: f"{digest.hexdigest()}_{percentile:g}" for name, percentile in percentiles.items()}
+
+        thresholds = {name: self._cached_baseline(key) for name, key in keys.items()}
+        missing = {name: percentiles[name] for name, cached in thresholds.items() if cached is None}
+        if not missing:
+            return thresholds
+
+        chunk = ClimateIndexConfig.CITY_CHUNK
+        if kind == "calendar":
+            gather = self._calendar_gather(axis, base)
+            padding = gather < 0
+            computed = {name: np.full((values.shape[0], 366), np.nan, dtype=np.float32) for name in missing}
+            for start in range(0, values.shape[0], chunk):
+                block = values[start:start + chunk][:, np.where(padding, 0, gather)]
+                block[:, padding] = np.nan
+                block.sort(axis=-1)
+                counts = np.isfinite(block).sum(axis=-1)
+                for name, percentile in missing.items():
+                    computed[name][start:start + chunk] = _sorted_percentile(block, counts, percentile)
+        else:
+            block = values[:, base].astype(np.float32)
+            block[~(block >= ClimateIndexConfig.WET_DAY_MM)] = np.nan
+            block.sort(axis=-1)
+            counts = np.isfinite(block).sum(axis=-1)
+            computed = {name: _sorted_percentile(block, counts, percentile) for name, percentile in missing.items()}
+
+        for name, values_for_name in computed.items():
+            self._store_baseline(keys[name], values_for_name)
+            thresholds[name] = values_for_name
+        return thresholds
+
+    # === SZÁMÍTÁS ===
+
+    def compute(self, series: Dict[str, np.ndarray], dates: Sequence,
+                indices: Optional[Sequence[str]] = None, locations: Optional[Sequence[str]] = None,
+                settlement_ids: Optional[Sequence[int]] = None,
+                progress_callback: Optional[Callable[[int, int], None]] = None) -> ClimateIndexResult:
+        """
+        ETCCDI indexek település × év mátrixai.
+
+        Args:
+            series: változó → (C, D) napi értékek (temperature_2m_max / _min / _mean,
+                precipitation_sum; hiányzó Tmean esetén (Tmax + Tmin) / 2)
+            dates: (D,) egybefüggő napi tengely
+            indices: Kért indexek (alapértelmezés: minden számolható)
+            progress_callback: (kész települések, összes település)
+        """
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        if not len(dates) or np.any(np.diff(dates).astype(np.int64) != 1):
+            raise ValueError("A klímaindexekhez egybefüggő napi tengely szükséges")
+
+        arrays = {name: np.atleast_2d(np.asarray(values, dtype=np.float32)) for name, values in series.items()}
+        if TM not in arrays and TX in arrays and TN in arrays:
+            arrays[TM] = (arrays[TX] + arrays[TN]) / 2
+        for name, values in arrays.items():
+            if values.shape[1] != len(dates):
+                raise ValueError(f"{name}: {values.shape[1]} nap, a tengely {len(dates)} nap")
+
+        requested = [name for name in (indices or INDEX_DEFINITIONS)
+                     if name in INDEX_DEFINITIONS and all(variable in arrays for variable in INDEX_DEFINITIONS[name][2])]
+        city_count = next(iter(arrays.values())).shape[0] if arrays else 0
+        axis = YearAxis(dates)
+        base_period = self._effective_base_period(axis)
+        base = axis.positions(*base_period)
+
+        baseline_groups: Dict[Tuple[str, str], Dict[str, float]] = {}
+        for name, (variable, percentile, kind) in PERCENTILE_BASELINES.items():
+            if name in requested:
+                baseline_groups.setdefault((variable, kind), {})[name] = percentile
+        thresholds: Dict[str, np.ndarray] = {}
+        for (variable, kind), percentiles in baseline_groups.items():
+            thresholds.update(self._baselines(arrays[variable], axis, base, kind, percentiles))
+
+        results = {name: np.full((city_count, axis.year_count), np.nan, dtype=np.float32) for name in requested}
+        chunk = ClimateIndexConfig.CITY_CHUNK
+        for start in range(0, city_count, chunk):
+            stop = min(start + chunk, city_count)
+            block = {name: values[start:stop] for name, values in arrays.items()}
+            block_thresholds = {name: values[start:stop] for name, values in thresholds.items()}
+            for name, values in self._compute_block(block, axis, block_thresholds, requested).items():
+                results[name][start:stop] = values
+            if progress_callback:
+                progress_callback(stop, city_count)
+
+        if locations is None:
+            locations = ([str(int(sid)) for sid in settlement_ids] if settlement_ids is not None
+                         else [str(row) for row in range(city_count)])
+
+        logger.info(f"📏 ETCCDI indexek: {len(requested)} index, {city_count} település × {axis.year_count} év "
+                    f"(bázis {base_period[0]}-{base_period[1]})")
+        return ClimateIndexResult(
+            years=axis.years,
+            locations=list(locations),
+            indices=results,
+            base_period=base_period,
+            settlement_ids=np.asarray(settlement_ids, dtype=np.int64) if settlement_ids is not None else None
+        )
+
+    def _compute_block(self, block: Dict[str, np.ndarray], axis: YearAxis,
+                       thresholds: Dict[str, np.ndarray], requested: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Egy település blokk összes kért indexe."""
+        wanted = set(requested)
+        out: Dict[str, np.ndarray] = {}
+        complete: Dict[str, np.ndarray] = {}
+        valid_days: Dict[str, np.ndarray] = {}
+
+        def completeness(variable: str) -> np.ndarray:
+            if variable not in complete:
+                valid_days[variable] = axis.count(np.isfinite(block[variable]))
+                complete[variable] = axis.expected - valid_days[variable] <= ClimateIndexConfig.MAX_MISSING_DAYS_PER_YEAR
+            return complete[variable]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            tx, tn, tm, pr = block.get(TX), block.get(TN), block.get(TM), block.get(PR)
+
+            # 🌡️ Küszöb napok és szélsőértékek
+            counts = {"FD": (tn, lambda: tn < 0), "ID": (tx, lambda: tx < 0),
+                      "SU": (tx, lambda: tx > 25), "TR": (tn, lambda: tn > 20)}
+            for name, (values, condition) in counts.items():
+                if name in wanted:
+                    out[name] = axis.count(condition())
+            extremes = {"TXx": (tx, np.fmax), "TXn": (tx, np.fmin), "TNx": (tn, np.fmax), "TNn": (tn, np.fmin)}
+            for name, (values, ufunc) in extremes.items():
+                if name in wanted:
+                    out[name] = ufunc.reduceat(values, axis.starts, axis=1)
+            if "DTR" in wanted:
+                spread = tx - tn
+                out["DTR"] = axis.total(spread) / axis.count(np.isfinite(spread))
+
+            # 📊 Percentilis alapú napok aránya
+            for name, (variable, _, kind) in PERCENTILE_BASELINES.items():
+                if name in wanted and kind == "calendar":
+                    values = block[variable]
+                    daily_threshold = thresholds[name][:, axis.doy]
+                    exceed = values > daily_threshold if name.endswith("90p") else values < daily_threshold
+                    out[name] = 100.0 * axis.count(exceed) / axis.count(np.isfinite(values))
+
+            # 🌱 Vegetációs időszak
+            if "GSL" in wanted:
+                out["GSL"] = self._growing_season_length(tm, axis)
+
+            # 🌧️ Csapadék indexek
+            if pr is not None:
+                wet = pr >= ClimateIndexConfig.WET_DAY_MM
+                if "CDD" in wanted:
+                    out["CDD"] = _max_spell(pr < ClimateIndexConfig.WET_DAY_MM, axis)
+                if "CWD" in wanted:
+                    out["CWD"] = _max_spell(wet, axis)
+                if "R10mm" in wanted:
+                    out["R10mm"] = axis.count(pr >= 10.0)
+                if "R20mm" in wanted:
+                    out["R20mm"] = axis.count(pr >= 20.0)
+                if "Rx1day" in wanted:
+                    out["Rx1day"] = np.fmax.reduceat(pr, axis.starts, axis=1)
+                if "Rx5day" in wanted:
+                    out["Rx5day"] = np.fmax.reduceat(self._running_sum(pr, 5), axis.starts, axis=1)
+                wet_total = axis.total(np.where(wet, pr, 0.0))
+                if "PRCPTOT" in wanted:
+                    out["PRCPTOT"] = wet_total
+                if "SDII" in wanted:
+                    wet_days = axis.count(wet)
+                    out["SDII"] = np.where(wet_days > 0, wet_total / np.maximum(wet_days, 1), 0.0)
+                for name in ("R95pTOT", "R99pTOT"):
+                    if name in wanted:
+                        out[name] = axis.total(np.where(wet & (pr > thresholds[name][:, None]), pr, 0.0))
+
+        # Hiányos évek kizárása (a szükséges változók mindegyikére)
+        for name, values in out.items():
+            usable = np.ones(values.shape, dtype=bool)
+            for variable in INDEX_DEFINITIONS[name][2]:
+                usable &= completeness(variable)
+            out[name] = np.where(usable, values, np.nan).astype(np.float32)
+        return out
+
+    @staticmethod
+    def _running_sum(values: np.ndarray, window: int) -> np.ndarray:
+        """window napos mozgó összeg a záró napra írva (NaN, ha az ablakban hiány van)."""
+        finite = np.isfinite(values)
+        sums = np.zeros((values.shape[0], values.shape[1] + 1))
+        missing = np.zeros((values.shape[0], values.shape[1] + 1), dtype=np.int32)
+        np.cumsum(np.where(finite, values, 0.0), axis=1, out=sums[:, 1:])
+        np.cumsum(~finite, axis=1, out=missing[:, 1:])
+
+        result = np.full(values.shape, np.nan)
+        result[:, window - 1:] = sums[:, window:] - sums[:, :-window]
+        gaps = np.zeros(values.shape, dtype=bool)
+        gaps[:, window - 1:] = (missing[:, window:] - missing[:, :-window]) > 0
+        result[gaps] = np.nan
+        return result
+
+    @staticmethod
+    def _growing_season_length(tm: np.ndarray, axis: YearAxis) -> np.ndarray:
+        """
+        GSL (északi félteke): a július 1. előtt induló első ≥6 napos Tmean > 5 °C szakasz
+        kezdetétől a július 1. utáni első ≥6 napos Tmean < 5 °C szakasz kezdetéig (ennek
+        hiányában az év végéig).
+        """
+        span = ClimateIndexConfig.GSL_SPAN_DAYS
+        threshold = ClimateIndexConfig.GSL_TEMPERATURE
+
+        def span_starts(mask: np.ndarray) -> np.ndarray:
+            running = np.zeros((mask.shape[0], mask.shape[1] + 1), dtype=np.int32)
+            np.cumsum(mask, axis=1, out=running[:, 1:])
+            starts = np.zeros(mask.shape, dtype=bool)
+            starts[:, :mask.shape[1] - span + 1] = (running[:, span:] - running[:, :-span]) == span
+            return starts
+
+        warm_starts = span_starts(tm > threshold)
+        cold_starts = span_starts(tm < threshold)
+        positions = np.arange(tm.shape[1])
+        gsl = np.zeros((tm.shape[0], axis.year_count), dtype=np.float32)
+
+        for year_position, year in enumerate(axis.years):
+            first, last = axis.bounds[year_position], axis.bounds[year_position + 1]
+            july = min(last, max(first, int(np.searchsorted(axis.dates, np.datetime64(f"{int(year)}-07-01")))))
+
+            warm = warm_starts[:, first:july]
+            has_start = warm.any(axis=1) if july > first else np.zeros(tm.shape[0], dtype=bool)
+            season_start = first + (warm.argmax(axis=1) if july > first else 0)
+
+            # Július 1. előtt záruló (hiányos) év: nincs őszi keresés - a teljességi maszk NaN-t ad
+            season_end = np.full(tm.shape[0], last)
+            if last > july:
+                cold = cold_starts[:, july:last] & (positions[july:last][None, :] > season_start[:, None])
+                season_end = np.where(cold.any(axis=1), july + cold.argmax(axis=1), last)
+            gsl[:, year_position] = np.where(has_start, season_end - season_start, 0)
+        return gsl
+
+    # === MEGŐRZÉS ===
+
+    def _result_path(self, name: str) -> Path:
+        safe = "".join(character if character.isalnum() or character in "-_" else "_" for character in name)
+        return self.directory / f"{safe}.npz"
+
+    def save(self, result: ClimateIndexResult, name: str) -> Path:
+        """Indexkészlet mentése (a térkép és a trend nézet név szerint tölti be)."""
+        path = result.save(self._result_path(name))
+        logger.info(f"💾 Klímaindexek mentve: {path}")
+        return path
+
+    def load(self, name: str) -> Optional[ClimateIndexResult]:
+        path = self._result_path(name)
+        if not path.exists():
+            return None
+        try:
+            return ClimateIndexResult.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"⚠️ Klímaindex készlet nem olvasható ({path.name}): {e}")
+            return None
+
+    def saved_sets(self) -> List[str]:
+        return sorted(path.stem for path in self.directory.glob("*.npz")) if self.directory.exists() else []
+
+    def latest_containing(self, settlement_id: int, index: str) -> Optional[Tuple[str, ClimateIndexResult]]:
+        """
+        A legutóbb mentett készlet, amely az adott település adott indexét tartalmazza.
+
+        Returns:
+            (készlet név, eredmény) vagy None
+        """
+        if not self.directory.exists():
+            return None
+        paths = sorted(self.directory.glob("*.npz"), key=lambda path: path.stat().st_mtime, reverse=True)
+        for path in paths:
+            result = self.load(path.stem)
+            if result is None or result.settlement_ids is None or index not in result.indices:
+                continue
+            if np.any(result.settlement_ids == settlement_id):
+                return path.stem, result
+        return None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "directory": str(self.directory),
+            "base_period": self.base_period,
+            "cached_baselines": len(self._baseline_cache),
+            "baseline_hits": self.baseline_hits,
+            "baseline_misses": self.baseline_misses,
+            "saved_sets": self.saved_sets(),
+        }
+
+
+# === KÖZÖS PÉLDÁNY ===
+
+_engine_instance: Optional[ClimateIndexEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_climate_index_engine() -> ClimateIndexEngine:
+    """A folyamat közös klímaindex motorja (megosztott alapvonal gyorsítótárral)."""
+    global _engine_instance
+    with _engine_lock:
+        if _engine_instance is None:
+            _engine_instance = ClimateIndexEngine()
+        return _engine_instance
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Extreme Value - Visszatérési szintek (GEV / Gumbel) sok helyszínre egyszerre
+Global Weather Analyzer projekt
+
+📈 CÉL: "mekkora az 50 éves napi csapadék / széllökés itt?" - a legnagyobb érték
+   listázása helyett éves maximumokra illesztett eloszlásból becsült visszatérési szintek
+⚡ VEKTORIZÁLT: éves maximumok fmax.reduceat-tel a napi (C, D) tömbből, L-momentumok
+   (valószínűséggel súlyozott momentumok) és a GEV / Gumbel paraméterek minden
+   helyszínre egyszerre (Hosking, 1990)
+🧮 MLE TARTALÉK: ahol az L-momentum GEV alak paraméter irreális, helyszínenként
+   maximum likelihood illesztés (scipy.stats, lusta import - ha nincs, marad az L-momentum)
+🎲 BOOTSTRAP: konfidencia intervallum újramintavételezett éves maximumokból, több magon
+   (SharedMemoryRunner); helyszínenkénti véletlen sorozat → azonos eredmény egy
+   folyamatban és a pool-ban
+
+Használat:
+    result = analyze_return_levels(precip, dates, locations=names)   # precip: (C, D)
+    result.level(50)          # (C,) 50 éves visszatérési szint
+    result.curve("Szeged")    # periódusok, szintek, alsó / felső határ
+
+Megjegyzés: a bootstrap mindig L-momentumokkal illeszt (az MLE tartalék csak a
+pontbecslést érinti).
+"""
+
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import ExtremeValueConfig
+from ..lazy_imports import lazy_module
+from .climate_indices import YearAxis
+
+logger = logging.getLogger(__name__)
+
+stats = lazy_module("scipy.stats")
+
+DISTRIBUTIONS = ("gev", "gumbel")
+EULER_GAMMA = 0.5772156649015329
+
+_gamma = np.frompyfunc(math.gamma, 1, 1)
+
+
+def annual_maxima(values: np.ndarray, dates: Sequence,
+                  min_days: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Éves maximumok soronként (a hiányos évek NaN-ok).
+
+    Args:
+        values: (D,) vagy (C, D) napi értékek
+        dates: (D,) egybefüggő napi tengely
+        min_days: Legalább ennyi érvényes nap kell egy évben (alapértelmezés: config)
+
+    Returns:
+        (évek (Y,), maximumok (C, Y) float64)
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    axis = YearAxis(np.asarray(dates, dtype="datetime64[D]"))
+    finite = np.isfinite(values)
+
+    maxima = np.fmax.reduceat(np.where(finite, values, np.nan), axis.starts, axis=1)
+    valid_days = axis.count(finite)
+    maxima[valid_days < (ExtremeValueConfig.MIN_DAYS_PER_YEAR if min_days is None else min_days)] = np.nan
+    return axis.years, maxima
+
+
+def lmoments(sample: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Minta L-momentumok soronként (NaN kihagyva, torzítatlan PWM becslés).
+
+    Returns:
+        (l1, l2, t3, n) - (C,) tömbök
+    """
+    ordered = np.sort(np.atleast_2d(sample), axis=1)  # NaN a sor végére
+    n = np.isfinite(ordered).sum(axis=1).astype(np.float64)
+    rank = np.arange(ordered.shape[1], dtype=np.float64)[None, :]  # j - 1
+    inside = rank < n[:, None]
+    x = np.where(inside, ordered, 0.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        w1 = np.where(inside, rank / (n[:, None] - 1), 0.0)
+        w2 = np.where(inside, rank * (rank - 1) / ((n[:, None] - 1) * (n[:, None] - 2)), 0.0)
+        b0 = x.sum(axis=1) / n
+        b1 = (w1 * x).sum(axis=1) / n
+        b2 = (w2 * x).sum(axis=1) / n
+        l2 = 2 * b1 - b0
+        t3 = (6 * b2 - 6 * b1 + b0) / l2
+    return b0, l2, t3, n
+
+
+def fit_lmoments(sample: np.ndarray, distribution: str = "gev") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    GEV / Gumbel paraméterek L-momentumokból minden sorra.
+
+    A GEV alak paraméter Hosking előjelével: k > 0 felülről korlátos (Weibull típus),
+    k < 0 vastag farok (Fréchet típus) - megegyezik a scipy.stats.genextreme c-jével.
+    Az alak alulról -0.999-re levágott (Γ(1 + k) pólusa előtt).
+
+    Returns:
+        (hely ξ, skála α, alak k) - Gumbel esetén k = 0
+    """
+    l1, l2, t3, n = lmoments(sample)
+    too_short = n < 3
+
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        if distribution == "gumbel":
+            scale = l2 / math.log(2)
+            location = l1 - EULER_GAMMA * scale
+            shape = np.zeros_like(l1)
+        elif distribution == "gev":
+            z = 2 / (3 + t3) - math.log(2) / math.log(3)
+            shape = 7.8590 * z + 2.9554 * z * z
+            near_zero = np.abs(shape) < 1e-6
+            safe_shape = np.where(near_zero | ~np.isfinite(shape), 1.0, np.maximum(shape, -0.999))
+            gamma_term = _gamma(1 + safe_shape).astype(np.float64)
+            scale = np.where(near_zero, l2 / math.log(2),
+                             l2 * safe_shape / ((1 - 2.0 ** -safe_shape) * gamma_term))
+            location = np.where(near_zero, l1 - EULER_GAMMA * scale,
+                                l1 - scale * (1 - gamma_term) / safe_shape)
+            # A hely/skála a levágott alakkal számolt - a visszaadott alak is az legyen
+            shape = np.where(near_zero, 0.0, np.maximum(shape, -0.999))
+        else:
+            raise ValueError(f"Ismeretlen eloszlás: {distribution} (választható: {', '.join(DISTRIBUTIONS)})")
+
+    invalid = too_short | ~np.isfinite(shape) | ~np.isfinite(scale) | (scale <= 0)
+    return (np.where(invalid, np.nan, location), np.where(invalid, np.nan, scale),
+            np.where(invalid, np.nan, shape))
+
+
+def return_levels(location: np.ndarray, scale: np.ndarray, shape: np.ndarray,
+                  periods: Sequence[float]) -> np.ndarray:
+    """Visszatérési szintek (C, P) a T éves periódusokra: F = 1 - 1/T kvantilis."""
+    y = -np.log(1 - 1 / np.asarray(periods, dtype=np.float64))[None, :]
+    location, scale, shape = (np.asarray(p, dtype=np.float64)[:, None] for p in (location, scale, shape))
+    gumbel = shape == 0
+    safe_shape = np.where(gumbel, 1.0, shape)
+    with np.errstate(invalid="ignore", over="ignore"):
+        return np.where(gumbel, location - scale * np.log(y),
+                        location + scale / safe_shape * (1 - y ** safe_shape))
+
+
+def fit_mle(sample: np.ndarray, distribution: str = "gev",
+            initial: Optional[Tuple[float, float, float]] = None) -> Optional[Tuple[float, float, float]]:
+    """
+    Maximum likelihood illesztés egy helyszín éves maximumaira (scipy.stats).
+
+    Returns:
+        (hely, skála, alak) vagy None (nincs scipy / sikertelen illesztés)
+    """
+    if not stats.available:
+        return None
+    sample = np.asarray(sample, dtype=np.float64)
+    sample = sample[np.isfinite(sample)]
+    try:
+        if distribution == "gumbel":
+            location, scale = stats.gumbel_r.fit(sample)
+            shape = 0.0
+        elif initial is not None and all(np.isfinite(initial)):
+            shape, location, scale = stats.genextreme.fit(
+                sample, float(np.clip(initial[2], -0.45, 0.45)), loc=initial[0], scale=initial[1])
+        else:
+            shape, location, scale = stats.genextreme.fit(sample)
+    except Exception as e:
+        logger.debug(f"MLE illesztés sikertelen: {e}")
+        return None
+    return (location, scale, shape) if np.isfinite(scale) and scale > 0 else None
+
+
+def bootstrap_return_levels(maxima: np.ndarray, periods: Sequence[float], distribution: str = "gev",
+                            samples: Optional[int] = None, confidence: Optional[float] = None,
+                            seed: Optional[int] = None, row_offset: int = 0,
+                            min_years: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bootstrap konfidencia intervallum a visszatérési szintekre (L-momentum újraillesztés).
+
+    Soronként külön véletlen sorozat (seed, row_offset + sor), így a részekre
+    bontott (process pool) futás ugyanazt adja, mint az egyben futó.
+
+    Returns:
+        (alsó, felső) - (C, P) tömbök
+    """
+    samples = ExtremeValueConfig.BOOTSTRAP_SAMPLES if samples is None else samples
+    confidence = ExtremeValueConfig.CONFIDENCE if confidence is None else confidence
+    seed = ExtremeValueConfig.BOOTSTRAP_SEED if seed is None else seed
+    min_years = ExtremeValueConfig.MIN_YEARS if min_years is None else min_years
+
+    maxima = np.atleast_2d(np.asarray(maxima, dtype=np.float64))
+    row_count, year_count = maxima.shape
+    ordered = np.sort(maxima, axis=1)
+    counts = np.isfinite(ordered).sum(axis=1)
+    quantiles = [(1 - confidence) / 2, (1 + confidence) / 2]
+    lower = np.full((row_count, len(periods)), np.nan)
+    upper = np.full((row_count, len(periods)), np.nan)
+
+    block_rows = ExtremeValueConfig.BOOTSTRAP_BLOCK_ROWS
+    for start in range(0, row_count, block_rows):
+        rows = [row for row in range(start, min(start + block_rows, row_count)) if counts[row] >= min_years]
+        if not rows:
+            continue
+        draws = np.stack([np.random.default_rng([seed, row_offset + row]).random((samples, year_count))
+                          for row in rows])
+        n = counts[rows][:, None, None]
+        picked = np.take_along_axis(ordered[rows][:, None, :], (draws * n).astype(np.int64), axis=2)
+        picked = np.where(np.arange(year_count)[None, None, :] < n, picked, np.nan)  # rövidebb sor: n húzás
+
+        parameters = fit_lmoments(picked.reshape(-1, year_count), distribution)
+        levels = return_levels(*parameters, periods).reshape(len(rows), samples, len(periods))
+        with np.errstate(invalid="ignore"):
+            bounds = np.nanquantile(levels, quantiles, axis=1)
+        lower[rows], upper[rows] = bounds[0], bounds[1]
+    return lower, upper
+
+
+@dataclass
+class ReturnLevelResult:
+    """Visszatérési szint görbék helyszínenként."""
+    locations: List[str]
+    distribution: str
+    periods: np.ndarray                 # (P,) év
+    location: np.ndarray                # (C,) ξ
+    scale: np.ndarray                   # (C,) α
+    shape: np.ndarray                   # (C,) k (Gumbel: 0)
+    methods: np.ndarray                 # (C,) "lmom" | "mle" | "" (nincs illesztés)
+    sample_years: np.ndarray            # (C,) érvényes éves maximumok száma
+    levels: np.ndarray                  # (C, P)
+    lower: Optional[np.ndarray] = None  # (C, P) bootstrap alsó határ
+    upper: Optional[np.ndarray] = None
+    confidence: Optional[float] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def _period_column(self, period: float) -> int:
+        matches = np.flatnonzero(np.isclose(self.periods, period))
+        if not len(matches):
+            raise KeyError(f"Nincs {period} éves visszatérési szint (elérhető: {self.periods.tolist()})")
+        return int(matches[0])
+
+    def level(self, period: float) -> np.ndarray:
+        """(C,) visszatérési szint egy periódusra."""
+        return self.levels[:, self._period_column(period)]
+
+    def curve(self, location: str) -> Dict[str, Any]:
+        """Egy helyszín visszatérési szint görbéje (táblázathoz / grafikonhoz)."""
+        row = self.locations.index(location)
+        return {
+            "location": location,
+            "distribution": self.distribution,
+            "method": str(self.methods[row]),
+            "sample_years": int(self.sample_years[row]),
+            "parameters": {"location": float(self.location[row]), "scale": float(self.scale[row]),
+                           "shape": float(self.shape[row])},
+            "periods": self.periods.tolist(),
+            "levels": self.levels[row].tolist(),
+            "lower": self.lower[row].tolist() if self.lower is not None else None,
+            "upper": self.upper[row].tolist() if self.upper is not None else None,
+        }
+
+
+def fit_return_levels(maxima: np.ndarray, distribution: str = "gev",
+                      periods: Optional[Sequence[float]] = None,
+                      locations: Optional[Sequence[str]] = None,
+                      bootstrap: bool = True, mle_fallback: Optional[bool] = None,
+                      samples: Optional[int] = None,
+                      progress_callback: Optional[Callable[[int, int], None]] = None) -> ReturnLevelResult:
+    """
+    Visszatérési szintek éves maximumokból (C, Y).
+
+    Args:
+        mle_fallback: irreális L-momentum GEV illesztésnél (|k| > MAX_GEV_SHAPE)
+            helyszínenkénti MLE (alapértelmezés: config)
+        bootstrap: konfidencia intervallum (több magon a közös elemző pool-lal)
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Ismeretlen eloszlás: {distribution} (választható: {', '.join(DISTRIBUTIONS)})")
+    maxima = np.atleast_2d(np.asarray(maxima, dtype=np.float64))
+    periods = np.asarray(ExtremeValueConfig.RETURN_PERIODS if periods is None else periods, dtype=np.float64)
+    row_count = maxima.shape[0]
+    if locations is None:
+        locations = [str(row) for row in range(row_count)]
+    mle_fallback = ExtremeValueConfig.MLE_FALLBACK if mle_fallback is None else mle_fallback
+
+    sample_years = np.isfinite(maxima).sum(axis=1)
+    location, scale, shape = fit_lmoments(maxima, distribution)
+    enough = sample_years >= ExtremeValueConfig.MIN_YEARS
+    location, scale, shape = (np.where(enough, p, np.nan) for p in (location, scale, shape))
+    methods = np.where(enough & np.isfinite(scale), "lmom", "").astype("U4")
+
+    unreliable = np.flatnonzero(enough & ((np.abs(shape) > ExtremeValueConfig.MAX_GEV_SHAPE) | ~np.isfinite(scale)))
+    if mle_fallback and len(unreliable):
+        if stats.available:
+            for row in unreliable:
+                fitted = fit_mle(maxima[row], distribution, (location[row], scale[row], shape[row]))
+                if fitted is not None:
+                    location[row], scale[row], shape[row] = fitted
+                    methods[row] = "mle"
+        else:
+            logger.info(f"ℹ️ {len(unreliable)} helyszín MLE illesztése kimarad (nincs scipy) - L-momentum becslés")
+
+    levels = return_levels(location, scale, shape, periods)
+    lower = upper = None
+    if bootstrap:
+        from .parallel_runner import get_analytics_runner
+        lower, upper = get_analytics_runner().return_level_bootstrap(
+            maxima, periods, distribution, samples=samples, progress_callback=progress_callback
+        )
+
+    logger.info(f"📈 Visszatérési szintek ({distribution}): {int(enough.sum())}/{row_count} helyszín, "
+                f"{int((methods == 'mle').sum())} MLE, bootstrap: {'igen' if bootstrap else 'nem'}")
+    return ReturnLevelResult(
+        locations=list(locations),
+        distribution=distribution,
+        periods=periods,
+        location=location,
+        scale=scale,
+        shape=shape,
+        methods=methods,
+        sample_years=sample_years,
+        levels=levels,
+        lower=lower,
+        upper=upper,
+        confidence=ExtremeValueConfig.CONFIDENCE if bootstrap else None
+    )
+
+
+def analyze_return_levels(values: np.ndarray, dates: Sequence, distribution: str = "gev",
+                          periods: Optional[Sequence[float]] = None,
+                          locations: Optional[Sequence[str]] = None,
+                          bootstrap: bool = True, mle_fallback: Optional[bool] = None,
+                          samples: Optional[int] = None,
+                          progress_callback: Optional[Callable[[int, int], None]] = None) -> ReturnLevelResult:
+    """
+    Visszatérési szintek napi (D,) vagy (C, D) adatokból: éves maximumok + illesztés.
+    """
+    years, maxima = annual_maxima(values, dates)
+    result = fit_return_levels(maxima, distribution, periods, locations, bootstrap, mle_fallback,
+                               samples, progress_callback)
+    result.metadata["years"] = (int(years[0]), int(years[-1])) if len(years) else None
+    return result
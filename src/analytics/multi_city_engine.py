@@ -46,7 +46,7 @@ import asyncio
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any, Union
 from datetime import datetime, date, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import statistics
 import time
@@ -54,9 +54,21 @@ import json
 import sys
 import os
 
+import numpy as np
+
 # 🔧 KRITIKUS JAVÍTÁS: Szabványos modellek importálása a UI kompatibilitáshoz
 from ..data.models import AnalyticsResult, CityWeatherResult, AnalyticsQuestion
 from ..data.enums import RegionScope, AnalyticsMetric, QuestionType, DataSource
+from ..data.grid_cells import SettlementCellMapping, GridCell, group_locations_by_cell
+from ..data.adaptive_concurrency import get_adaptive_limiter, AdaptiveLimiter
+from ..data.climate_archive import get_climate_archive
+from .spatial_interpolation import get_spatial_interpolator
+from .regional_aggregation import get_settlement_membership
+from .climate_indices import get_climate_index_engine
+from .parallel_runner import get_analytics_runner
+from .extreme_value import analyze_return_levels
+from ..config import MultiCityConfig, QuotaReservation, UsageTracker
+from ..devtools.tracing import span, analysis
 
 # Logging beállítás
 logger = logging.getLogger(__name__)
@@ -163,6 +175,38 @@ class CityWeatherData:
     temperature_range: Optional[float] = None
 
 
+@dataclass
+class CityDayMatrix:
+    """
+    Város × nap érték mátrix egy metrikára (animált idősoros térképhez).
+    
+    values[i, j] az i. város j. napi értéke (float32, NaN = hiányzó nap).
+    """
+    query_type: str
+    metric: str
+    region: str
+    dates: np.ndarray           # (D,) datetime64[D]
+    cities: List[str]
+    latitudes: np.ndarray       # (C,)
+    longitudes: np.ndarray      # (C,)
+    values: np.ndarray          # (C, D) float32
+    
+    @property
+    def day_count(self) -> int:
+        return len(self.dates)
+    
+    def date_strings(self) -> List[str]:
+        return [str(day) for day in self.dates]
+    
+    def day_values(self, index: int) -> np.ndarray:
+        """Egy nap értékei városonként (C,)."""
+        return self.values[:, index]
+    
+    def coverage(self) -> float:
+        """Kitöltött város-napok aránya."""
+        return float(np.isfinite(self.values).mean()) if self.values.size else 0.0
+
+
 class MultiCityEngine:
     """
     Multi-city időjárás elemzés koordinátor (ABSOLUTE DATABASE PATH FIX v2.8.2 + DUAL-API CLEAN + NULL-SAFE + DATA TRANSFORM FIXED + RÉGIÓ/MEGYE MAPPING TELJES + RÉGIÓ SZŰRÉS JAVÍTVA + WINDSPEED METRIC JAVÍTVA!)
@@ -275,9 +319,9 @@ class MultiCityEngine:
     }
     
     REGIONS = {
-        "Hungary": {"name": "Magyarország", "country_codes": ["HU"], "max_cities": 165, "batch_size": 8, "rate_limit_delay": 0.2},
-        "Europe": {"name": "Európa", "country_codes": ["AT", "BE", "BG", "HR", "CY", "CZ", "DK", "EE", "FI", "FR", "DE", "GR", "HU", "IE", "IT", "LV", "LT", "LU", "MT", "NL", "PL", "PT", "RO", "SK", "SI", "ES", "SE", "CH", "GB", "NO", "IS", "RS", "BA", "MK", "AL", "MD", "UA", "BY", "RU"], "max_cities": 150, "batch_size": 4, "rate_limit_delay": 0.4},
-        "Global": {"name": "Globális", "country_codes": [], "max_cities": 160, "batch_size": 8, "rate_limit_delay": 0.5},
+        "Hungary": {"name": "Magyarország", "country_codes": ["HU"], "max_cities": 165, "batch_size": 8},
+        "Europe": {"name": "Európa", "country_codes": ["AT", "BE", "BG", "HR", "CY", "CZ", "DK", "EE", "FI", "FR", "DE", "GR", "HU", "IE", "IT", "LV", "LT", "LU", "MT", "NL", "PL", "PT", "RO", "SK", "SI", "ES", "SE", "CH", "GB", "NO", "IS", "RS", "BA", "MK", "AL", "MD", "UA", "BY", "RU"], "max_cities": 150, "batch_size": 4},
+        "Global": {"name": "Globális", "country_codes": [], "max_cities": 160, "batch_size": 8},
     }
     
     # 🔥 KRITIKUS JAVÍTÁS: WINDSPEED METRIC JAVÍTVA!
@@ -349,7 +393,6 @@ class MultiCityEngine:
                         self.hungarian_db_path = env_hungarian_db
                         logger.info(f"🔧 FALLBACK: Using env variable path for hungarian_settlements.db")
         
-        self.max_workers = 8
         self.request_timeout = 90
         self.max_retries = 2
         self.retry_delay = 3.0
@@ -367,6 +410,20 @@ class MultiCityEngine:
         # Database path validálás
         self._validate_database_paths()
         
+        # 🌐 Település → rácscella mapping (cella deduplikációhoz)
+        self.grid_cell_mapping = SettlementCellMapping(self.hungarian_db_path)
+        
+        # 🗄️ Település klíma archívum (memmap) - a lefedett település-napok hálózat nélkül jönnek
+        self.climate_archive = get_climate_archive(self.hungarian_db_path) if self.hungarian_db_path.exists() else None
+        
+        # 🗺️ Mintából teljes településállomány + raszter (IDW)
+        self.spatial_interpolator = get_spatial_interpolator(self.hungarian_db_path) if self.hungarian_db_path.exists() else None
+        
+        # 🗺️ Település → megye / statisztikai régió tagság (choropleth összesítéshez)
+        self.settlement_membership = get_settlement_membership(
+            self.hungarian_db_path, self.statistical_regions()
+        ) if self.hungarian_db_path.exists() else None
+        
         try:
             from src.data.weather_client import WeatherClient
             self.weather_client = WeatherClient()
@@ -474,7 +531,7 @@ class MultiCityEngine:
                         logger.info(f"🎯 REGIONÁLIS SZŰRÉS: '{original_region}' → {target_counties}")
                         
                         # Hungarian settlements database használata
-                        base_select = 'SELECT name as city, "Magyarország" as country, "HU" as country_code, latitude as lat, longitude as lon, population, NULL as meteostat_station_id, region_priority as data_quality_score FROM hungarian_settlements'
+                        base_select = 'SELECT name as city, "Magyarország" as country, "HU" as country_code, latitude as lat, longitude as lon, population, NULL as meteostat_station_id, region_priority as data_quality_score, id as settlement_id FROM hungarian_settlements'
                         placeholders = ','.join(['?' for _ in target_counties])
                         query_str = f'{base_select} WHERE megye IN ({placeholders}) ORDER BY CASE WHEN population IS NOT NULL THEN population ELSE 0 END DESC LIMIT ?'
                         params = target_counties + [final_limit]
@@ -507,7 +564,8 @@ class MultiCityEngine:
                 cities = [{
                     'city': row[0], 'country': row[1], 'country_code': row[2],
                     'lat': row[3], 'lon': row[4], 'population': row[5],
-                    'meteostat_station_id': row[6], 'data_quality_score': row[7]
+                    'meteostat_station_id': row[6], 'data_quality_score': row[7],
+                    'settlement_id': row[8] if len(row) > 8 else None
                 } for row in results]
                 
                 if original_region in self.HUNGARIAN_REGIONAL_MAPPING:
@@ -525,6 +583,16 @@ class MultiCityEngine:
             return []
 
     def analyze_multi_city(self, query_type: str, region: str, date: str, limit: Optional[int] = None, question: Optional[AnalyticsQuestion] = None) -> AnalyticsResult:
+        """
+        Multi-city elemzés egy tracing elemzés határon belül (lásd _analyze_multi_city).
+        
+        ⏱️ Bekapcsolt tracingnél a lekérés, dekódolás, transzformáció és statisztika
+        szakaszok ideje ehhez az elemzéshez összesítődik (teljesítmény panel).
+        """
+        with analysis(f"multi-city {query_type} · {region} · {date}"):
+            return self._analyze_multi_city(query_type, region, date, limit, question)
+    
+    def _analyze_multi_city(self, query_type: str, region: str, date: str, limit: Optional[int] = None, question: Optional[AnalyticsQuestion] = None) -> AnalyticsResult:
         """
         🔧 KRITIKUS JAVÍTÁS: Multi-city elemzés - TELJES ADAT TRANSZFORMÁCIÓVAL + ERROR HANDLING + NONE-SAFE + RÉGIÓ/MEGYE MAPPING JAVÍTVA + LIMIT TYPE FIX + RÉGIÓ SZŰRÉS JAVÍTVA + WINDSPEED METRIC JAVÍTVA!
         
@@ -566,30 +634,43 @@ class MultiCityEngine:
                 logger.error("⚠ Nincsenek városok a lekérdezéshez")
                 return self._create_empty_analytics_result(question, "Nincsenek városok a lekérdezéshez")
             
-            # Időjárási adatok lekérdezése
-            weather_data = self._fetch_weather_data_dual_api_batch(cities, date, mapped_region)
+            # Időjárási adatok lekérdezése (archivált települések a klíma archívumból)
+            weather_data = self._fetch_weather_data_with_archive(cities, date, mapped_region)
             
             # Eredmények feldolgozása és rendezése
-            processed_data = self._process_weather_results(weather_data, query_type)
+            with span("statistics", "process_weather_results", cities=len(weather_data)):
+                processed_data = self._process_weather_results(weather_data, query_type)
             
             logger.info(f"🔧 PROCESSED DATA: {len(processed_data)} cities processed")
             
             # 🔧 KRITIKUS JAVÍTÁS: Adat transzformáció (CityWeatherData -> CityWeatherResult)
             transformed_results = []
-            for i, city_data in enumerate(processed_data):
-                if city_data.fetch_success:
-                    try:
-                        result_item = self._transform_to_city_weather_result(city_data, query_type)
-                        result_item.rank = i + 1
-                        transformed_results.append(result_item)
-                    except Exception as e:
-                        logger.error(f"⚠ Transform error for {city_data.city}: {e}")
-                        continue
+            with span("transform", "city_weather_results", cities=len(processed_data)):
+                for i, city_data in enumerate(processed_data):
+                    if city_data.fetch_success:
+                        try:
+                            result_item = self._transform_to_city_weather_result(city_data, query_type)
+                            result_item.rank = i + 1
+                            transformed_results.append(result_item)
+                        except Exception as e:
+                            logger.error(f"⚠ Transform error for {city_data.city}: {e}")
+                            continue
 
             logger.info(f"🔧 TRANSFORMED RESULTS: {len(transformed_results)} cities transformed")
 
             # 🔧 KRITIKUS JAVÍTÁS: Statisztika számítása a TELJES sikeres adathalmazon (NONE-SAFE)
-            stats = self._calculate_statistics_for_results_none_safe(transformed_results)
+            with span("statistics", "result_statistics"):
+                stats = self._calculate_statistics_for_results_none_safe(transformed_results)
+
+            # 🗺️ Magyar régiók: a lekért minta alapján becslés minden településre és rácsra
+            spatial_field = None
+            if mapped_region == "Hungary":
+                with span("statistics", "spatial_interpolation", samples=len(transformed_results)):
+                    spatial_field = self._interpolate_settlements(transformed_results, query_config["metric"], date, region)
+                with span("statistics", "regional_aggregation"):
+                    regional_statistics = self._aggregate_regions(transformed_results, spatial_field)
+            else:
+                regional_statistics = None
 
             # 🔧 KRITIKUS JAVÍTÁS: Helyes AnalyticsResult objektum létrehozása
             final_question = question
@@ -638,7 +719,9 @@ class MultiCityEngine:
                     total_cities_found=len(cities),
                     data_sources_used=[DataSource.AUTO], # WeatherClient kezeli
                     statistics=stats,
-                    provider_statistics=self._get_provider_stats(weather_data)
+                    provider_statistics=self._get_provider_stats(weather_data),
+                    spatial_field=spatial_field,
+                    regional_statistics=regional_statistics
                 )
                 
                 logger.info(f"✅ Multi-city elemzés befejezve (ABSOLUTE DATABASE PATH FIX v2.8.2): {len(limited_results)}/{len(cities)} eredmény, {len(transformed_results)} siker")
@@ -653,6 +736,258 @@ class MultiCityEngine:
             logger.error(f"⚠ CRITICAL ERROR in analyze_multi_city: {e}", exc_info=True)
             return self._create_empty_analytics_result(question, f"Kritikus hiba a multi-city elemzésben: {e}")
 
+    def _interpolate_settlements(self, results: List[CityWeatherResult], metric: str,
+                                 date: str, region: str) -> Optional[Any]:
+        """
+        IDW becslés a régió összes településére (és rácsára) a sikeres eredményekből.
+        
+        Returns:
+            InterpolatedField, vagy None (nincs interpolátor / kevés minta / hiba)
+        """
+        if self.spatial_interpolator is None or not results:
+            return None
+        try:
+            return self.spatial_interpolator.interpolate(
+                metric, date,
+                [result.latitude for result in results],
+                [result.longitude for result in results],
+                [result.value for result in results],
+                megyek=self.HUNGARIAN_REGIONAL_MAPPING.get(region),
+                elevations=[result.elevation for result in results]
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Térbeli interpoláció hiba: {e}")
+            return None
+
+    @classmethod
+    def statistical_regions(cls) -> Dict[str, List[str]]:
+        """A 7 KSH statisztikai régió → megyék (az egyedi megye bejegyzések nélkül)."""
+        return {name: megyek for name, megyek in cls.HUNGARIAN_REGIONAL_MAPPING.items() if megyek != [name]}
+
+    def _aggregate_regions(self, results: List[CityWeatherResult],
+                           spatial_field: Optional[Any]) -> Optional[Dict[str, Any]]:
+        """
+        Megyénkénti és régiónkénti statisztikák (átlag, min, max, lakosság-súlyozott átlag).
+        
+        Az interpolált teljes településállományból, ha van; különben a mért városokból.
+        
+        Returns:
+            {"county": RegionalAggregate, "region": RegionalAggregate} vagy None
+        """
+        membership = self.settlement_membership
+        if membership is None or not results:
+            return None
+        try:
+            if spatial_field is not None:
+                settlement_ids, values = spatial_field.settlement_ids, spatial_field.values
+            else:
+                settlement_ids = membership.settlement_ids_for_names([result.city_name for result in results])
+                values = [np.nan if result.value is None else result.value for result in results]
+            return {level: membership.aggregate(settlement_ids, values, level=level) for level in ("county", "region")}
+        except Exception as e:
+            logger.warning(f"⚠️ Területi összesítés hiba: {e}")
+            return None
+
+    def region_settlement_ids(self, region: str) -> np.ndarray:
+        """Egy régió / megye archívumbeli település azonosítói (ismeretlen régió: mind)."""
+        archive = self.climate_archive
+        membership = self.settlement_membership
+        megyek = self.HUNGARIAN_REGIONAL_MAPPING.get(region)
+        if archive is None:
+            return np.empty(0, dtype=np.int64)
+        if not megyek or membership is None:
+            return archive.settlement_ids()
+        county_positions = [membership.county_names.index(megye) for megye in megyek if megye in membership.county_names]
+        selected = membership.settlement_ids[np.isin(membership.county_index, county_positions)]
+        return np.intersect1d(selected, archive.settlement_ids())
+
+    def compute_climate_indices(self, region: str, start_year: int, end_year: int,
+                                indices: Optional[List[str]] = None, save: bool = True,
+                                progress_callback: Optional[callable] = None) -> Optional[Any]:
+        """
+        📏 ETCCDI klímaindexek a régió összes településére a klíma archívumból.
+        
+        Csak a már archivált település-napokat használja (nincs hálózati lekérés);
+        a hiányos évek indexe NaN. Az eredmény név szerint mentődik
+        ("<régió>_<kezdő év>_<záró év>"); a térkép a climate_index_trend-en át,
+        a trend nézet település szerint tölti be.
+        
+        Returns:
+            ClimateIndexResult vagy None (nincs archívum / település)
+        """
+        settlement_ids = self.region_settlement_ids(region)
+        if self.climate_archive is None or not len(settlement_ids):
+            return None
+        
+        start_date, end_date = f"{int(start_year)}-01-01", f"{int(end_year)}-12-31"
+        series = {}
+        dates = None
+        with span("transform", "climate_index_matrices", settlements=len(settlement_ids)):
+            for variable in self.CLIMATE_INDEX_VARIABLES:
+                _, dates, series[variable] = self.climate_archive.matrix(variable, start_date, end_date, settlement_ids)
+        
+        # Több magon (közös memória), kevés településnél a folyamaton belül
+        with span("statistics", "climate_indices", settlements=len(settlement_ids)):
+            result = get_analytics_runner().climate_indices(series, dates, indices=indices,
+                                                            settlement_ids=settlement_ids,
+                                                            progress_callback=progress_callback)
+        if save:
+            get_climate_index_engine().save(result, f"{region}_{int(start_year)}_{int(end_year)}")
+        return result
+
+    def climate_index_trend(self, name: str, index: str, per_years: int = 10) -> Optional[Dict[str, Any]]:
+        """
+        📏 Mentett klímaindex készlet trendje településenként és megyénként / régiónként.
+        
+        Returns:
+            {"result", "trend" (C,) per_years évre, "county", "region" (RegionalAggregate vagy None)}
+            vagy None (nincs ilyen készlet / index)
+        """
+        result = get_climate_index_engine().load(name)
+        if result is None or index not in result.indices or result.settlement_ids is None:
+            return None
+        
+        trend = result.trend(index, per_years)
+        regional = {"county": None, "region": None}
+        if self.settlement_membership is not None:
+            regional = {level: self.settlement_membership.aggregate(result.settlement_ids, trend, level=level)
+                        for level in regional}
+        return {"result": result, "trend": trend, **regional}
+    
+    def compute_return_levels(self, region: str, variable: str, start_year: int, end_year: int,
+                              distribution: str = "gev", periods: Optional[List[float]] = None,
+                              bootstrap: bool = True,
+                              progress_callback: Optional[callable] = None) -> Optional[Any]:
+        """
+        📈 Visszatérési szintek (pl. 50 éves napi csapadék / széllökés) a régió településeire.
+        
+        Az éves maximumok a klíma archívum napi mátrixából jönnek (nincs hálózati
+        lekérés); a bootstrap konfidencia intervallum a közös elemző pool-on fut.
+        
+        Returns:
+            ReturnLevelResult (helyszín = settlement_id szövegként) vagy None
+        """
+        settlement_ids = self.region_settlement_ids(region)
+        if self.climate_archive is None or not len(settlement_ids):
+            return None
+        
+        with span("transform", "return_level_matrix", settlements=len(settlement_ids)):
+            ids, dates, values = self.climate_archive.matrix(variable, f"{int(start_year)}-01-01",
+                                                             f"{int(end_year)}-12-31", settlement_ids)
+        with span("statistics", "return_levels", settlements=len(ids)):
+            result = analyze_return_levels(values, dates, distribution=distribution, periods=periods,
+                                           locations=[str(int(sid)) for sid in ids], bootstrap=bootstrap,
+                                           progress_callback=progress_callback)
+        result.metadata.update({"region": region, "variable": variable, "settlement_ids": np.asarray(ids)})
+        return result
+
+    def build_city_day_matrix(self, query_type: str, region: str, start_date: str, end_date: str,
+                              max_cities: Optional[int] = None,
+                              progress_callback: Optional[callable] = None) -> CityDayMatrix:
+        """
+        🎞️ Város × nap mátrix egy időszakra (animált térkép képkockáihoz).
+        
+        Napi analyze_multi_city hívások helyett városonként EGY időszak lekérés:
+        settlement_id-vel rendelkező városok a klíma archívumon keresztül (csak a
+        hiányzó darabok mennek hálózatra), a többi közvetlenül a WeatherClient-tel.
+        
+        Args:
+            progress_callback: (kész városok, összes város) visszajelzés
+            
+        Raises:
+            ValueError: Ismeretlen lekérdezés típus, régió vagy fordított időszak
+        """
+        if query_type not in self.QUERY_TYPES:
+            raise ValueError(f"Ismeretlen lekérdezés típus: {query_type}")
+        mapped_region = self.resolve_region_name(region)
+        metric = self.QUERY_TYPES[query_type]["metric"]
+        
+        dates = np.arange(np.datetime64(start_date[:10], 'D'), np.datetime64(end_date[:10], 'D') + 1)
+        if not len(dates):
+            raise ValueError(f"Üres időszak: {start_date} → {end_date}")
+        
+        cities = self.get_cities_for_region(region, max_cities=max_cities or self.REGIONS[mapped_region]["max_cities"])
+        values = np.full((len(cities), len(dates)), np.nan, dtype=np.float32)
+        
+        # 🛑 KVÓTA: városonként egy időszak lekérés lefoglalva (mint a napi batch útvonalon);
+        # ha a kvótás provider szabad kerete nem elég, a mátrix Open-Meteo-ról töltődik
+        provider_id = self.weather_client._select_provider()
+        provider_override = None
+        reservation = UsageTracker.reserve(provider_id, len(cities)) if provider_id else None
+        if provider_id and reservation is None:
+            logger.warning(f"🛑 {provider_id} kvóta nem elég {len(cities)} idősor lekéréshez "
+                           f"(szabad: {UsageTracker.remaining_quota(provider_id)}) - Open-Meteo használata")
+            provider_override = "open-meteo"
+        
+        try:
+            with analysis(f"city-day matrix {query_type} · {region} · {start_date} → {end_date}"):
+                limiter = self._adaptive_limiter(provider_override)
+                with ThreadPoolExecutor(max_workers=int(limiter.max_limit)) as executor:
+                    fetch_series = reservation.bind(self._fetch_city_series) if reservation else self._fetch_city_series
+                    futures = {
+                        executor.submit(fetch_series, city, start_date, end_date, provider_override): row
+                        for row, city in enumerate(cities)
+                    }
+                    for done, future in enumerate(as_completed(futures), start=1):
+                        row = futures[future]
+                        try:
+                            columns = future.result()
+                        except Exception as e:
+                            logger.warning(f"⚠️ Idősor lekérési hiba ({cities[row].get('city')}): {e}")
+                            columns = None
+                    
+                        if columns is not None and len(columns):
+                            with span("transform", "city_day_matrix_row"):
+                                series = self._metric_series(columns, metric)
+                                if series is not None:
+                                    positions = (columns.dates.astype('datetime64[D]') - dates[0]).astype(np.int64)
+                                    inside = (positions >= 0) & (positions < len(dates))
+                                    values[row, positions[inside]] = series[inside]
+                    
+                        if progress_callback:
+                            progress_callback(done, len(cities))
+        finally:
+            if reservation is not None:
+                reservation.release()
+        
+        matrix = CityDayMatrix(
+            query_type=query_type, metric=metric, region=region, dates=dates,
+            cities=[city['city'] for city in cities],
+            latitudes=np.array([city['lat'] for city in cities], dtype=np.float64),
+            longitudes=np.array([city['lon'] for city in cities], dtype=np.float64),
+            values=values
+        )
+        logger.info(f"🎞️ Város × nap mátrix: {len(cities)} város × {len(dates)} nap, kitöltöttség {matrix.coverage():.0%}")
+        return matrix
+    
+    def _fetch_city_series(self, city: Dict[str, Any], start_date: str, end_date: str,
+                           provider_override: Optional[str] = None) -> Optional[Any]:
+        """Egy város napi idősora (WeatherColumns) - archívumon keresztül, ha lehet."""
+        def fetch(piece_start: str, piece_end: str):
+            return self.weather_client.get_weather_data(
+                city['lat'], city['lon'], piece_start, piece_end,
+                user_override_provider=provider_override,
+                station_id=city.get('meteostat_station_id') or None
+            )
+        
+        settlement_id = city.get('settlement_id')
+        if self.climate_archive is not None and settlement_id is not None:
+            columns = self.climate_archive.read_through(settlement_id, start_date, end_date, fetch, self.ARCHIVE_FIELDS)
+            if columns is not None:
+                return columns
+        return fetch(start_date, end_date)
+    
+    @staticmethod
+    def _metric_series(columns: Any, metric: str) -> Optional[np.ndarray]:
+        """Metrika oszlop float32 tömbként (temperature_range: max - min)."""
+        if metric == "temperature_range":
+            temp_max, temp_min = columns.column("temperature_2m_max"), columns.column("temperature_2m_min")
+            if temp_max is None or temp_min is None:
+                return None
+            return (np.asarray(temp_max, dtype=np.float64) - np.asarray(temp_min, dtype=np.float64)).astype(np.float32)
+        column = columns.column(metric)
+        return None if column is None else np.asarray(column, dtype=np.float32)
+    
     def _get_provider_stats(self, weather_data: List[CityWeatherData]) -> Dict[str, int]:
         """Provider statisztikák kinyerése."""
         stats = {}
@@ -723,57 +1058,320 @@ class MultiCityEngine:
         
         return result
         
+    # Az archívumból olvasott / oda visszaírt CityWeatherData mezők
+    ARCHIVE_FIELDS = ("temperature_2m_max", "temperature_2m_min", "temperature_2m_mean",
+                      "precipitation_sum", "windspeed_10m_max", "windgusts_10m_max")
+    
+    # 📏 ETCCDI klímaindexek bemenő változói (klíma archívum mátrixok)
+    CLIMATE_INDEX_VARIABLES = ("temperature_2m_max", "temperature_2m_min", "temperature_2m_mean", "precipitation_sum")
+    
+    def _fetch_weather_data_with_archive(self, cities: List[Dict[str, Any]], date: str, region: str) -> List[CityWeatherData]:
+        """
+        Időjárási adatok a klíma archívumon keresztül.
+        
+        🗄️ A settlement_id-vel rendelkező városok lefedett napja egy memmap szeletből
+        jön (nincs hálózati lekérés); a többi a szokásos batch lekéréssel, majd a
+        sikeres települési eredmények visszaíródnak az archívumba.
+        """
+        archive = self.climate_archive
+        settlement_ids = [city.get('settlement_id') for city in cities]
+        if archive is None or all(settlement_id is None for settlement_id in settlement_ids):
+            local, remaining = self._fetch_weather_data_local_grid(cities, date)
+            return local + (self._fetch_weather_data_dual_api_batch(remaining, date, region) if remaining else [])
+        
+        with span("transform", "climate_archive_day", cities=len(cities)):
+            covered, columns = archive.day_records(date, settlement_ids, self.ARCHIVE_FIELDS)
+            archived = [self._city_data_from_archive(city, date, columns, index)
+                        for index, city in enumerate(cities) if covered[index]]
+        
+        missing = [city for index, city in enumerate(cities) if not covered[index]]
+        logger.info(f"🗄️ Klíma archívum: {len(archived)}/{len(cities)} település archívumból, {len(missing)} lekérés")
+        if not missing:
+            return archived
+        
+        # A helyi rács már lemez sebességű - eredménye nem íródik vissza az archívumba
+        local, missing = self._fetch_weather_data_local_grid(missing, date)
+        if not missing:
+            return archived + local
+        
+        fetched = self._fetch_weather_data_dual_api_batch(missing, date, region)
+        
+        # Sikeres települési eredmények visszaírása (a lekérés helyszíne azonosítja a települést)
+        ids_by_position = {(city['lat'], city['lon']): city.get('settlement_id') for city in missing}
+        store_ids, store_rows = [], []
+        for city_data in fetched:
+            settlement_id = ids_by_position.get((city_data.lat, city_data.lon))
+            if city_data.fetch_success and settlement_id is not None:
+                store_ids.append(settlement_id)
+                store_rows.append(city_data)
+        if store_ids:
+            archive.store_day(date, store_ids, {
+                field: [getattr(city_data, field) for city_data in store_rows] for field in self.ARCHIVE_FIELDS
+            })
+        
+        return archived + local + fetched
+    
+    def _fetch_weather_data_local_grid(self, cities: List[Dict[str, Any]],
+                                       date: str) -> Tuple[List[CityWeatherData], List[Dict[str, Any]]]:
+        """
+        🗂️ A helyi rács adatkészlet által lefedett városok egyetlen vektorizált olvasással.
+        
+        Returns:
+            (helyi rácsból kiszolgált városok, a távoli providerektől lekérendő városok)
+        """
+        provider = self.weather_client.providers.get("local-grid") if self.weather_client else None
+        if not cities or provider is None or not self.weather_client._is_provider_valid("local-grid"):
+            return [], cities
+        
+        covered = provider.dataset.covered_points([city['lat'] for city in cities],
+                                                  [city['lon'] for city in cities], date, date)
+        if not covered.any():
+            return [], cities
+        
+        local_cities = [city for index, city in enumerate(cities) if covered[index]]
+        try:
+            series = provider.get_weather_data_many([city['lat'] for city in local_cities],
+                                                    [city['lon'] for city in local_cities], date, date)
+        except Exception as e:
+            logger.warning(f"⚠️ Helyi rács olvasási hiba - távoli lekérés: {e}")
+            return [], cities
+        
+        with span("transform", "local_grid_day", cities=len(local_cities)):
+            columns = {
+                field: np.array([point.columns[field][0] if field in point.columns and len(point) else np.nan
+                                 for point in series], dtype=np.float64)
+                for field in self.ARCHIVE_FIELDS
+            }
+            local = [self._city_data_from_archive(city, date, columns, index, data_source=provider.provider_id)
+                     for index, city in enumerate(local_cities)]
+        
+        remaining = [city for index, city in enumerate(cities) if not covered[index]]
+        logger.info(f"🗂️ Helyi rács: {len(local)}/{len(cities)} város hálózat nélkül, {len(remaining)} távoli lekérés")
+        return local, remaining
+    
+    @staticmethod
+    def _city_data_from_archive(city: Dict[str, Any], date: str, columns: Dict[str, Any], index: int,
+                                data_source: str = "climate-archive") -> CityWeatherData:
+        """Archivált (vagy helyi rácsból olvasott) település-nap → CityWeatherData (NaN → None)."""
+        values = {name: None if np.isnan(column[index]) else float(column[index]) for name, column in columns.items()}
+        temp_max, temp_min = values.get('temperature_2m_max'), values.get('temperature_2m_min')
+        return CityWeatherData(
+            city=city['city'], country=city['country'], country_code=city['country_code'],
+            lat=city['lat'], lon=city['lon'], population=city.get('population'),
+            date=date,
+            meteostat_station_id=city.get('meteostat_station_id'),
+            data_quality_score=city.get('data_quality_score'),
+            data_source=data_source,
+            fetch_timestamp=datetime.now().isoformat(),
+            fetch_success=True,
+            temperature_range=temp_max - temp_min if temp_max is not None and temp_min is not None else None,
+            **values
+        )
+    
     def _fetch_weather_data_dual_api_batch(self, cities: List[Dict[str, Any]], date: str, region: str) -> List[CityWeatherData]:
-        """Párhuzamos időjárás lekérdezés (DUAL-API BATCH PROCESSING)."""
-        weather_data = []
+        """
+        Párhuzamos időjárás lekérdezés (DUAL-API BATCH PROCESSING).
+        
+        🌐 CELLA DEDUPLIKÁCIÓ: Rács alapú provider esetén egyedi rácscellánként
+        egy lekérés, az eredmény a cella összes településére szétosztva.
+        📡 ÁLLOMÁS DEDUPLIKÁCIÓ: Állomás alapú provider (Meteostat) esetén az azonos
+        meteostat_station_id-jű városok egyetlen állomás lekérésen osztoznak.
+        🛑 KVÓTA: Kvótás providernél a tervezett lekérések száma indítás előtt
+        lefoglalódik; ha a szabad kvóta nem elég, a futás Open-Meteo-ra vált.
+        """
         if not self.weather_client:
             logger.error("⚠ WeatherClient nem elérhető")
             return [self._create_empty_city_data(city) for city in cities]
-
-        region_config = self.REGIONS[region]
-        batch_size = region_config["batch_size"]
-        rate_limit_delay = region_config["rate_limit_delay"]
         
-        batches = [cities[i:i + batch_size] for i in range(0, len(cities), batch_size)]
-        logger.info(f"🔄 Dual-API batch processing: {len(batches)} batch, {batch_size} város/batch")
+        provider_id = self.weather_client._select_provider()
+        provider_override = None
+        cell_groups, cell_targets = self._plan_fetch_targets(cities, provider_id)
         
-        for batch_idx, batch in enumerate(batches):
-            batch_start_time = time.time()
-            print(f"📊 Batch {batch_idx + 1}/{len(batches)}: {len(batch)} város (DUAL-API)...", end="", flush=True)
-            
-            batch_results = self._process_dual_api_batch(batch, date, rate_limit_delay)
-            weather_data.extend(batch_results)
-            
-            batch_time = time.time() - batch_start_time
-            successful_in_batch = len([r for r in batch_results if r.fetch_success])
-            
-            sources_in_batch = self._get_provider_stats(batch_results)
-            source_info = ", ".join([f"{k}: {v}" for k, v in sources_in_batch.items()])
-            print(f" ✅ {successful_in_batch}/{len(batch)} siker ({source_info}) ({batch_time:.1f}s)")
-            
-            if batch_idx < len(batches) - 1:
-                time.sleep(rate_limit_delay)
+        reservation = UsageTracker.reserve(provider_id, len(cell_targets)) if provider_id else None
+        if provider_id and reservation is None:
+            logger.warning(f"🛑 {provider_id} kvóta nem elég {len(cell_targets)} lekéréshez "
+                           f"(szabad: {UsageTracker.remaining_quota(provider_id)}) - Open-Meteo használata")
+            provider_override = "open-meteo"
+            cell_groups, cell_targets = self._plan_fetch_targets(cities, provider_override)
+        
+        try:
+            cell_results = self._fetch_locations_batched(cell_targets, date, region, provider_override, reservation)
+        finally:
+            if reservation is not None:
+                reservation.release()
+        
+        if cell_groups is None:
+            return cell_results
+        
+        results_by_cell = {
+            cell: result for cell, result in zip(cell_groups.keys(), self._order_like(cell_targets, cell_results))
+        }
+        
+        # Szétosztás a cella településeire (saját azonosító mezőkkel)
+        weather_data = []
+        for cell, members in cell_groups.items():
+            cell_result = results_by_cell[cell]
+            for city in members:
+                weather_data.append(replace(
+                    cell_result,
+                    city=city['city'], country=city['country'], country_code=city['country_code'],
+                    lat=city['lat'], lon=city['lon'], population=city.get('population'),
+                    meteostat_station_id=city.get('meteostat_station_id'),
+                    data_quality_score=city.get('data_quality_score')
+                ))
+        
+        return weather_data
+    
+    def _plan_fetch_targets(self, cities: List[Dict[str, Any]],
+                            provider_id: Optional[str]) -> Tuple[Optional[Dict[Any, List[Dict[str, Any]]]], List[Dict[str, Any]]]:
+        """
+        Lekérési célok a provider szerint deduplikálva.
+        
+        Returns:
+            (csoport → városok vagy None ha nincs deduplikáció, lekérendő célok)
+        """
+        cell_groups = self._group_cities_by_grid_cell(cities, provider_id)
+        if cell_groups is not None:
+            # Cellánként egy reprezentáns - a cella középpontjával (így a coalescing kulcs is azonos)
+            cell_targets = [
+                dict(members[0], lat=cell.latitude, lon=cell.longitude)
+                for cell, members in cell_groups.items()
+            ]
+            logger.info(f"🌐 Rácscella deduplikáció: {len(cities)} település → {len(cell_targets)} cella "
+                        f"({len(cities) - len(cell_targets)} lekérés megspórolva)")
+            return cell_groups, cell_targets
+        
+        station_groups = self._group_cities_by_station(cities, provider_id)
+        if station_groups is not None:
+            # Állomásonként egy reprezentáns város (a lekérés az állomás azonosítóval megy)
+            station_targets = [members[0] for members in station_groups.values()]
+            logger.info(f"📡 Állomás deduplikáció: {len(cities)} város → {len(station_targets)} lekérés "
+                        f"({len(cities) - len(station_targets)} lekérés megspórolva)")
+            return station_groups, station_targets
+        
+        return None, cities
+    
+    def _group_cities_by_station(self, cities: List[Dict[str, Any]],
+                                 provider_id: Optional[str]) -> Optional[Dict[Any, List[Dict[str, Any]]]]:
+        """
+        Városok csoportosítása Meteostat állomás szerint (állomás nélküli város saját csoport).
+        
+        Returns:
+            Állomás → városok, vagy None ha a provider nem állomás alapú / nincs megosztott állomás
+        """
+        if len(cities) < 2:
+            return None
+        
+        provider = self.weather_client.providers.get(provider_id) if provider_id else None
+        if not provider or not provider.supports_stations:
+            return None
+        
+        groups: Dict[Any, List[Dict[str, Any]]] = {}
+        for index, city in enumerate(cities):
+            station_id = city.get('meteostat_station_id')
+            groups.setdefault(str(station_id) if station_id else ('city', index), []).append(city)
+        
+        return groups if len(groups) < len(cities) else None
+    
+    def _group_cities_by_grid_cell(self, cities: List[Dict[str, Any]],
+                                   provider_id: Optional[str]) -> Optional[Dict[GridCell, List[Dict[str, Any]]]]:
+        """
+        Városok csoportosítása a kiválasztott provider rácscellái szerint.
+        
+        Returns:
+            Cella → városok, vagy None ha a deduplikáció ki van kapcsolva / a provider nem rács alapú
+        """
+        if not MultiCityConfig.GRID_CELL_DEDUP_ENABLED or len(cities) < 2:
+            return None
+        
+        precomputed = None
+        if any(city.get('settlement_id') is not None for city in cities):
+            precomputed = self.grid_cell_mapping.load(provider_id) if provider_id else None
+        
+        return group_locations_by_cell(cities, provider_id, precomputed) if provider_id else None
+    
+    @staticmethod
+    def _order_like(targets: List[Dict[str, Any]], results: List[CityWeatherData]) -> List[CityWeatherData]:
+        """A párhuzamos lekérés eredményei a célok sorrendjében (as_completed nem sorrendtartó)."""
+        by_position: Dict[Tuple[float, float], CityWeatherData] = {
+            (result.lat, result.lon): result for result in results
+        }
+        return [by_position[(target['lat'], target['lon'])] for target in targets]
+    
+    def _adaptive_limiter(self, provider_override: Optional[str] = None) -> AdaptiveLimiter:
+        """A kiválasztott provider AIMD szabályzója (párhuzamosság és batch méret forrása)."""
+        provider_id = provider_override or self.weather_client._select_provider() or "open-meteo"
+        return get_adaptive_limiter(provider_id)
+    
+    def _fetch_locations_batched(self, cities: List[Dict[str, Any]], date: str, region: str,
+                                 provider_override: Optional[str] = None,
+                                 reservation: Optional[QuotaReservation] = None) -> List[CityWeatherData]:
+        """
+        Helyszínek lekérdezése batch-ekben, batch-en belül párhuzamosan.
+        
+        📈 ADAPTÍV: Nincs fix worker szám és batch közti késleltetés - a provider AIMD
+        szabályzója adja a tényleges párhuzamosságot (429/5xx-re visszavesz, Retry-After
+        alatt vár), a batch méret a pillanatnyi limithez igazodik.
+        """
+        weather_data = []
+        min_batch_size = self.REGIONS[region]["batch_size"]
+        limiter = self._adaptive_limiter(provider_override)
+        
+        logger.info(f"🔄 Dual-API adaptív batch processing: {len(cities)} helyszín, "
+                    f"párhuzamosság {limiter.limit} (max {limiter.max_limit:.0f})")
+        
+        # A pool a szabályzó felső korlátjáig nőhet; a valódi tempót a szabályzó adja
+        with ThreadPoolExecutor(max_workers=int(limiter.max_limit)) as executor:
+            position = 0
+            batch_idx = 0
+            while position < len(cities):
+                batch_size = max(min_batch_size, limiter.limit * 2)
+                batch = cities[position:position + batch_size]
+                position += len(batch)
+                batch_idx += 1
+                
+                batch_start_time = time.time()
+                print(f"📊 Batch {batch_idx}: {len(batch)} város (DUAL-API, párhuzamosság {limiter.limit})...",
+                      end="", flush=True)
+                
+                batch_results = self._process_dual_api_batch(batch, date, executor, provider_override, reservation)
+                weather_data.extend(batch_results)
+                
+                batch_time = time.time() - batch_start_time
+                successful_in_batch = len([r for r in batch_results if r.fetch_success])
+                
+                sources_in_batch = self._get_provider_stats(batch_results)
+                source_info = ", ".join([f"{k}: {v}" for k, v in sources_in_batch.items()])
+                print(f" ✅ {successful_in_batch}/{len(batch)} siker ({source_info}) ({batch_time:.1f}s)")
         
         print(f"🎉 Dual-API batch processing befejezve: {len(weather_data)} város")
         return weather_data
 
-    def _process_dual_api_batch(self, batch: List[Dict[str, Any]], date: str, rate_limit_delay: float) -> List[CityWeatherData]:
-        """Batch feldolgozása ThreadPoolExecutor-ral."""
+    def _process_dual_api_batch(self, batch: List[Dict[str, Any]], date: str, executor: ThreadPoolExecutor,
+                                provider_override: Optional[str] = None,
+                                reservation: Optional[QuotaReservation] = None) -> List[CityWeatherData]:
+        """Batch feldolgozása a közös ThreadPoolExecutor-ral (a kérések a foglalásból fogynak)."""
         batch_results = []
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {executor.submit(self._fetch_single_city_weather_dual_api, city, date): city for city in batch}
-            
-            for future in as_completed(futures):
-                city = futures[future]
-                try:
-                    city_data = future.result(timeout=self.request_timeout)
-                    batch_results.append(city_data)
-                except Exception as e:
-                    logger.error(f"⚠ Hiba a város feldolgozásánál ({city.get('city')}): {e}", exc_info=True)
-                    batch_results.append(self._create_empty_city_data(city, str(e)))
+        fetch_city = self._fetch_single_city_weather_dual_api
+        if reservation is not None:
+            fetch_city = reservation.bind(fetch_city)
+        futures = {
+            executor.submit(fetch_city, city, date, provider_override): city
+            for city in batch
+        }
+        
+        for future in as_completed(futures):
+            city = futures[future]
+            try:
+                city_data = future.result(timeout=self.request_timeout)
+                batch_results.append(city_data)
+            except Exception as e:
+                logger.error(f"⚠ Hiba a város feldolgozásánál ({city.get('city')}): {e}", exc_info=True)
+                batch_results.append(self._create_empty_city_data(city, str(e)))
         return batch_results
 
-    def _fetch_single_city_weather_dual_api(self, city: Dict[str, Any], date: str) -> CityWeatherData:
+    def _fetch_single_city_weather_dual_api(self, city: Dict[str, Any], date: str,
+                                            provider_override: Optional[str] = None) -> CityWeatherData:
         """
         Egyetlen város DUAL-API lekérdezése retry logikával.
         
@@ -784,7 +1382,11 @@ class MultiCityEngine:
         for attempt in range(self.max_retries):
             try:
                 # WeatherClient hívás - tuple visszatérési érték kezelése
-                weather_result = self.weather_client.get_weather_data(city['lat'], city['lon'], date, date)
+                weather_result = self.weather_client.get_weather_data(
+                    city['lat'], city['lon'], date, date,
+                    user_override_provider=provider_override,
+                    station_id=city.get('meteostat_station_id') or None
+                )
                 
                 # Check if result is tuple (weather_data, source) or just weather_data
                 if isinstance(weather_result, tuple) and len(weather_result) == 2:
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Parallel Runner - Többmagos elemzés közös memóriás (shared_memory) tömbökön
+Global Weather Analyzer projekt
+
+🧮 CÉL: a CPU-igényes település × nap kernelek (trendek, klímaindexek, anomáliák,
+   visszatérési szint bootstrap) több magon fussanak - a MultiCityEngine ThreadPoolExecutor-a csak I/O-ra jó (GIL)
+🧠 KÖZÖS MEMÓRIA: a bemenő és kimenő tömbök multiprocessing.shared_memory
+   blokkokban vannak; a feladatok csak a blokk nevét, alakját és a sor
+   tartományt kapják - az adat nem pickle-ödik
+🧩 SOR DARABOK: ANALYTICS_CHUNK_ROWS település / feladat, a worker közvetlenül a
+   kimenő közös tömb saját soraiba ír
+🔁 ELLENŐRZÖTT VISSZAESÉS: kevés településnél vagy egy workerrel a kernel a
+   folyamaton belül fut; összeomlott pool esetén is (azonos eredménnyel)
+📦 AZONOS EREDMÉNY MODELL: climate_indices() ClimateIndexResult-ot ad, ugyanazt,
+   mint a ClimateIndexEngine.compute
+
+Használat:
+    runner = get_analytics_runner()
+    result = runner.climate_indices(series, dates, settlement_ids=ids)
+    trend = runner.trends(values, dates)            # LinearTrendField
+    anomalies = runner.anomalies(values, dates)     # (C, D) float32
+    lower, upper = runner.return_level_bootstrap(maxima, periods)
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import get_context, shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import HardwareConfig, ClimateIndexConfig, ExtremeValueConfig
+from .climate_indices import INDEX_DEFINITIONS, TM, TN, TX, ClimateIndexResult, YearAxis, get_climate_index_engine
+from .extreme_value import bootstrap_return_levels
+
+logger = logging.getLogger(__name__)
+
+# (blokk név, alak, dtype) - ennyi megy át a folyamatok között egy tömbről
+ArrayDescriptor = Tuple[str, Tuple[int, ...], str]
+
+
+@dataclass
+class LinearTrendField:
+    """Lineáris trend településenként (hiányzó napok kihagyva)."""
+    slope_per_decade: np.ndarray    # (C,) változás / 10 év
+    intercept: np.ndarray           # (C,) érték az első napon
+    r_squared: np.ndarray           # (C,)
+    count: np.ndarray               # (C,) érvényes napok
+
+
+# === KERNELEK (modul szintű függvények - a spawn workerek név szerint érik el) ===
+
+def linear_trends(values: np.ndarray, dates: np.ndarray) -> Dict[str, np.ndarray]:
+    """Vektorizált legkisebb négyzetes egyenes soronként (x: évek az első naptól)."""
+    values = values.astype(np.float64)
+    valid = np.isfinite(values)
+    count = valid.sum(axis=1)
+    years = (dates - dates[0]).astype(np.float64) / 365.25
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_x = (valid * years).sum(axis=1) / count
+        mean_y = np.where(valid, values, 0.0).sum(axis=1) / count
+        dx = np.where(valid, years - mean_x[:, None], 0.0)
+        dy = np.where(valid, values - mean_y[:, None], 0.0)
+        sxx, syy, sxy = (dx * dx).sum(axis=1), (dy * dy).sum(axis=1), (dx * dy).sum(axis=1)
+        slope = sxy / sxx
+        r_squared = np.where(syy > 0, sxy * sxy / (sxx * syy), 0.0)
+
+    enough = count >= 3
+    return {
+        "slope_per_decade": np.where(enough, slope * 10.0, np.nan),
+        "intercept": np.where(enough, mean_y - slope * mean_x, np.nan),
+        "r_squared": np.where(enough, r_squared, np.nan),
+        "count": count.astype(np.float64),
+    }
+
+
+def calendar_anomalies(values: np.ndarray, dates: np.ndarray,
+                       base_period: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """Eltérés a bázis időszak naptári napi átlagától (366 napos naptár, soronként)."""
+    axis = YearAxis(dates)
+    first, last = base_period or ClimateIndexConfig.BASE_PERIOD
+    first, last = max(first, int(axis.years[0])), min(last, int(axis.years[-1]))
+    base = axis.positions(first, last) if first <= last else np.arange(len(dates))
+
+    # Naptári nap szerint rendezett bázis napok → naponkénti összeg / darab egy reduceat-tel
+    order = base[np.argsort(axis.doy[base], kind="stable")]
+    days, group_starts = np.unique(axis.doy[order], return_index=True)
+    block = values[:, order].astype(np.float64)
+    finite = np.isfinite(block)
+    sums = np.add.reduceat(np.where(finite, block, 0.0), group_starts, axis=1)
+    counts = np.add.reduceat(finite, group_starts, axis=1, dtype=np.int32)
+
+    climatology = np.full((values.shape[0], 366), np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        climatology[:, days] = np.where(counts > 0, sums / counts, np.nan)
+    return (values - climatology[:, axis.doy]).astype(np.float32)
+
+
+def _climate_indices_kernel(inputs: Dict[str, np.ndarray], outputs: Dict[str, np.ndarray],
+                            dates: np.ndarray, rows: slice, params: Dict[str, Any]) -> None:
+    result = get_climate_index_engine().compute(
+        {name: values[rows] for name, values in inputs.items()}, dates, indices=list(outputs)
+    )
+    for name, values in result.indices.items():
+        outputs[name][rows] = values
+
+
+def _trends_kernel(inputs: Dict[str, np.ndarray], outputs: Dict[str, np.ndarray],
+                   dates: np.ndarray, rows: slice, params: Dict[str, Any]) -> None:
+    for name, values in linear_trends(inputs["values"][rows], dates).items():
+        outputs[name][rows] = values
+
+
+def _anomalies_kernel(inputs: Dict[str, np.ndarray], outputs: Dict[str, np.ndarray],
+                      dates: np.ndarray, rows: slice, params: Dict[str, Any]) -> None:
+    outputs["anomalies"][rows] = calendar_anomalies(inputs["values"][rows], dates, params.get("base_period"))
+
+
+def _return_level_bootstrap_kernel(inputs: Dict[str, np.ndarray], outputs: Dict[str, np.ndarray],
+                                   dates: np.ndarray, rows: slice, params: Dict[str, Any]) -> None:
+    lower, upper = bootstrap_return_levels(inputs["maxima"][rows], row_offset=rows.start, **params)
+    outputs["lower"][rows] = lower
+    outputs["upper"][rows] = upper
+
+
+KERNELS: Dict[str, Callable[..., None]] = {
+    "climate_indices": _climate_indices_kernel,
+    "trends": _trends_kernel,
+    "anomalies": _anomalies_kernel,
+    "return_level_bootstrap": _return_level_bootstrap_kernel,
+}
+
+
+# === KÖZÖS MEMÓRIA ===
+
+def _create_shared(shape: Tuple[int, ...], dtype: Any, source: Optional[np.ndarray] = None,
+                   fill: Optional[float] = None) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    dtype = np.dtype(dtype)
+    block = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * dtype.itemsize, 1))
+    view = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    if source is not None:
+        view[...] = source
+    elif fill is not None:
+        view.fill(fill)
+    return block, view
+
+
+def _attach(descriptors: Dict[str, ArrayDescriptor]) -> Tuple[List[shared_memory.SharedMemory], Dict[str, np.ndarray]]:
+    blocks, views = [], {}
+    for name, (block_name, shape, dtype) in descriptors.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        views[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    return blocks, views
+
+
+def _run_chunk(kernel: str, inputs: Dict[str, ArrayDescriptor], outputs: Dict[str, ArrayDescriptor],
+               dates: np.ndarray, start: int, stop: int, params: Dict[str, Any]) -> int:
+    """Worker belépési pont: csatolás név szerint, kernel a sor tartományra, leválás."""
+    input_blocks, input_views = _attach(inputs)
+    output_blocks, output_views = _attach(outputs)
+    try:
+        KERNELS[kernel](input_views, output_views, dates, slice(start, stop), params)
+        return stop - start
+    finally:
+        # A nézetek a blokkok lezárása előtt engedendők el (különben BufferError)
+        input_views.clear()
+        output_views.clear()
+        for block in input_blocks + output_blocks:
+            block.close()
+
+
+class SharedMemoryRunner:
+    """
+    Process pool település × nap kernelekhez.
+
+    A pool lustán indul és újrahasznosul; a közös memória blokkok feladatonként
+    jönnek létre és a feladat végén felszabadulnak.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_rows: Optional[int] = None,
+                 min_parallel_rows: Optional[int] = None):
+        self.max_workers = max_workers or HardwareConfig.ANALYTICS_PROCESS_WORKERS
+        self.chunk_rows = chunk_rows or HardwareConfig.ANALYTICS_CHUNK_ROWS
+        self.min_parallel_rows = (HardwareConfig.ANALYTICS_PARALLEL_MIN_ROWS
+                                  if min_parallel_rows is None else min_parallel_rows)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.stats = {"parallel_jobs": 0, "inline_jobs": 0, "chunks": 0, "fallbacks": 0, "shared_mb": 0.0}
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=get_context(HardwareConfig.ANALYTICS_START_METHOD)
+                )
+                logger.info(f"🧮 Elemző process pool indítva: {self.max_workers} worker")
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    # === ÁLTALÁNOS FUTTATÁS ===
+
+    def run(self, kernel: str, inputs: Dict[str, np.ndarray], dates: Sequence,
+            outputs: Dict[str, Tuple[Tuple[int, ...], Any]], params: Optional[Dict[str, Any]] = None,
+            progress_callback: Optional[Callable[[int, int], None]] = None,
+            chunk_rows: Optional[int] = None, min_parallel_rows: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Kernel futtatása soronkénti darabokban.
+
+        Args:
+            inputs: név → (C, ...) bemenő tömb (azonos sorszám)
+            outputs: név → (alak, dtype) - NaN kezdőértékű kimenő tömbök (első tengely: C)
+            progress_callback: (kész sorok, összes sor)
+            chunk_rows / min_parallel_rows: felülírás soronként drága kerneleknek (pl. bootstrap)
+
+        Returns:
+            név → kimenő tömb (a folyamat saját memóriájában)
+        """
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        params = params or {}
+        row_count = next(iter(inputs.values())).shape[0] if inputs else 0
+
+        min_rows = self.min_parallel_rows if min_parallel_rows is None else min_parallel_rows
+        if self.max_workers > 1 and row_count >= min_rows:
+            try:
+                return self._run_parallel(kernel, inputs, dates, outputs, params, row_count,
+                                          chunk_rows or self.chunk_rows, progress_callback)
+            except BrokenProcessPool as e:
+                logger.warning(f"⚠️ Process pool összeomlott ({e}) - futtatás a folyamaton belül")
+                self.stats["fallbacks"] += 1
+                with self._lock:
+                    self._executor = None
+
+        results = {name: np.full(shape, np.nan, dtype=dtype) for name, (shape, dtype) in outputs.items()}
+        KERNELS[kernel](inputs, results, dates, slice(0, row_count), params)
+        self.stats["inline_jobs"] += 1
+        if progress_callback:
+            progress_callback(row_count, row_count)
+        return results
+
+    def _run_parallel(self, kernel: str, inputs: Dict[str, np.ndarray], dates: np.ndarray,
+                      outputs: Dict[str, Tuple[Tuple[int, ...], Any]], params: Dict[str, Any],
+                      row_count: int, chunk_rows: int,
+                      progress_callback: Optional[Callable[[int, int], None]]) -> Dict[str, np.ndarray]:
+        blocks: List[shared_memory.SharedMemory] = []
+        input_descriptors: Dict[str, ArrayDescriptor] = {}
+        output_views: Dict[str, np.ndarray] = {}
+        output_descriptors: Dict[str, ArrayDescriptor] = {}
+        started = time.perf_counter()
+        try:
+            for name, values in inputs.items():
+                values = np.asarray(values)
+                block, _ = _create_shared(values.shape, values.dtype, source=values)
+                blocks.append(block)
+                input_descriptors[name] = (block.name, values.shape, values.dtype.str)
+            for name, (shape, dtype) in outputs.items():
+                block, view = _create_shared(tuple(shape), dtype, fill=np.nan)
+                blocks.append(block)
+                output_views[name] = view
+                output_descriptors[name] = (block.name, tuple(shape), np.dtype(dtype).str)
+            self.stats["shared_mb"] += sum(block.size for block in blocks) / 1024 / 1024
+
+            pool = self._pool()
+            futures = [
+                pool.submit(_run_chunk, kernel, input_descriptors, output_descriptors, dates,
+                            start, min(start + chunk_rows, row_count), params)
+                for start in range(0, row_count, chunk_rows)
+            ]
+            done = 0
+            for future in as_completed(futures):
+                done += future.result()
+                if progress_callback:
+                    progress_callback(done, row_count)
+
+            results = {name: view.copy() for name, view in output_views.items()}
+            self.stats["parallel_jobs"] += 1
+            self.stats["chunks"] += len(futures)
+            logger.info(f"🧮 {kernel}: {row_count} sor, {len(futures)} darab, {self.max_workers} worker, "
+                        f"{time.perf_counter() - started:.2f} s")
+            return results
+        finally:
+            output_views.clear()
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    # === KERNEL API-K (azonos eredmény modell, mint az egyszálú út) ===
+
+    def climate_indices(self, series: Dict[str, np.ndarray], dates: Sequence,
+                        indices: Optional[Sequence[str]] = None, locations: Optional[Sequence[str]] = None,
+                        settlement_ids: Optional[Sequence[int]] = None,
+                        progress_callback: Optional[Callable[[int, int], None]] = None) -> ClimateIndexResult:
+        """ETCCDI indexek a ClimateIndexEngine.compute-tal megegyező eredménnyel, több magon."""
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        arrays = {name: np.atleast_2d(np.asarray(values, dtype=np.float32)) for name, values in series.items()}
+        if TM not in arrays and TX in arrays and TN in arrays:
+            arrays[TM] = (arrays[TX] + arrays[TN]) / 2
+        requested = [name for name in (indices or INDEX_DEFINITIONS)
+                     if name in INDEX_DEFINITIONS and all(variable in arrays for variable in INDEX_DEFINITIONS[name][2])]
+        row_count = next(iter(arrays.values())).shape[0] if arrays else 0
+
+        axis = YearAxis(dates)
+        outputs = {name: ((row_count, axis.year_count), np.float32) for name in requested}
+        results = self.run("climate_indices", arrays, dates, outputs, progress_callback=progress_callback)
+
+        engine = get_climate_index_engine()
+        if locations is None:
+            locations = ([str(int(sid)) for sid in settlement_ids] if settlement_ids is not None
+                         else [str(row) for row in range(row_count)])
+        return ClimateIndexResult(
+            years=axis.years,
+            locations=list(locations),
+            indices=results,
+            base_period=engine._effective_base_period(axis),
+            settlement_ids=np.asarray(settlement_ids, dtype=np.int64) if settlement_ids is not None else None
+        )
+
+    def trends(self, values: np.ndarray, dates: Sequence,
+               progress_callback: Optional[Callable[[int, int], None]] = None) -> LinearTrendField:
+        values = np.atleast_2d(np.asarray(values, dtype=np.float32))
+        row_count = values.shape[0]
+        outputs = {name: ((row_count,), np.float64) for name in ("slope_per_decade", "intercept", "r_squared", "count")}
+        results = self.run("trends", {"values": values}, dates, outputs, progress_callback=progress_callback)
+        return LinearTrendField(results["slope_per_decade"], results["intercept"],
+                                results["r_squared"], results["count"].astype(np.int64))
+
+    def anomalies(self, values: np.ndarray, dates: Sequence, base_period: Optional[Tuple[int, int]] = None,
+                  progress_callback: Optional[Callable[[int, int], None]] = None) -> np.ndarray:
+        values = np.atleast_2d(np.asarray(values, dtype=np.float32))
+        outputs = {"anomalies": (values.shape, np.float32)}
+        return self.run("anomalies", {"values": values}, dates, outputs,
+                        {"base_period": base_period}, progress_callback)["anomalies"]
+
+    def return_level_bootstrap(self, maxima: np.ndarray, periods: Sequence[float], distribution: str = "gev",
+                               samples: Optional[int] = None, confidence: Optional[float] = None,
+                               seed: Optional[int] = None,
+                               progress_callback: Optional[Callable[[int, int], None]] = None
+                               ) -> Tuple[np.ndarray, np.ndarray]:
+        """Bootstrap visszatérési szint határok (C, P) az éves maximumokból (C, Y)."""
+        maxima = np.atleast_2d(np.asarray(maxima, dtype=np.float64))
+        shape = (maxima.shape[0], len(periods))
+        params = {"periods": [float(period) for period in periods], "distribution": distribution,
+                  "samples": samples, "confidence": confidence, "seed": seed}
+        results = self.run("return_level_bootstrap", {"maxima": maxima}, (),
+                           {"lower": (shape, np.float64), "upper": (shape, np.float64)}, params, progress_callback,
+                           chunk_rows=ExtremeValueConfig.BOOTSTRAP_CHUNK_ROWS,
+                           min_parallel_rows=ExtremeValueConfig.BOOTSTRAP_PARALLEL_MIN_ROWS)
+        return results["lower"], results["upper"]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "chunk_rows": self.chunk_rows,
+            "pool_running": self._executor is not None,
+            **self.stats,
+        }
+
+
+# === KÖZÖS PÉLDÁNY ===
+
+_runner_instance: Optional[SharedMemoryRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_analytics_runner() -> SharedMemoryRunner:
+    """A folyamat közös elemző process pool-ja."""
+    global _runner_instance
+    with _runner_lock:
+        if _runner_instance is None:
+            _runner_instance = SharedMemoryRunner()
+        return _runner_instance
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Regional Aggregation - Település → megye / statisztikai régió tagság és területi összesítés
+Global Weather Analyzer projekt
+
+🗺️ CÉL: a megye réteg (choropleth) közvetlenül időjárási értékekkel színezhető
+   legyen - megyénként átlag, min, max és lakosság-súlyozott átlag bármely metrikára
+🔢 ELŐRE SZÁMOLT TAGSÁG: a települések megye és régió indexe egyszer készül el
+   egész tömbökként (hungarian_settlements.db megye oszlop + counties.geojson
+   sorrend; ismeretlen megyéjű településeknél pont-poligon térbeli join)
+⚡ EGY MENET: az összesítés np.bincount / ufunc.at egyetlen vektorizált menete,
+   településszámtól függetlenül nincs Python ciklus
+
+Használat:
+    membership = get_settlement_membership(hungarian_db_path, regions)
+    counties = membership.aggregate(field.settlement_ids, field.values, level="county")
+    counties.as_dict()["Baranya"]["weighted_mean"]
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from ..config import RegionalAggregationConfig
+from ..lazy_imports import lazy_module
+
+logger = logging.getLogger(__name__)
+
+# Pont-poligon join az ismeretlen megyéjű településekre (shapely 2 vektorizált contains_xy)
+shapely = lazy_module("shapely")
+
+LEVELS = ("county", "region")
+STATISTICS = ("mean", "min", "max", "weighted_mean")
+
+
+def normalize_county_name(name: Optional[str]) -> str:
+    name = (name or "").strip()
+    return RegionalAggregationConfig.COUNTY_NAME_ALIASES.get(name, name)
+
+
+@dataclass
+class RegionalAggregate:
+    """Területi összesítés egy metrikára (NaN ott, ahol nincs érvényes település)."""
+    level: str
+    names: List[str]
+    count: np.ndarray           # (G,) érvényes települések száma
+    population: np.ndarray      # (G,) a súlyozásban részt vevő lakosság
+    mean: np.ndarray
+    minimum: np.ndarray
+    maximum: np.ndarray
+    weighted_mean: np.ndarray   # lakosság-súlyozott átlag (lakosság nélkül: egyszerű átlag)
+
+    def statistic(self, name: str) -> np.ndarray:
+        return {"mean": self.mean, "min": self.minimum, "max": self.maximum,
+                "weighted_mean": self.weighted_mean}[name]
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """{terület: {count, population, mean, min, max, weighted_mean}} - csak a lefedett területek."""
+        result = {}
+        for index, name in enumerate(self.names):
+            if not self.count[index]:
+                continue
+            result[name] = {
+                "count": int(self.count[index]),
+                "population": float(self.population[index]),
+                **{statistic: float(self.statistic(statistic)[index]) for statistic in STATISTICS},
+            }
+        return result
+
+
+class SettlementMembership:
+    """
+    Települések megye / régió tagsága egész index tömbökként.
+
+    county_index[i] a county_names, region_index[i] a region_names pozíciója
+    (-1: ismeretlen); a sorok settlement_id szerint rendezettek.
+    """
+
+    def __init__(self, hungarian_db_path: Union[str, Path],
+                 regions: Optional[Dict[str, Sequence[str]]] = None,
+                 counties_geojson: Optional[Union[str, Path]] = None):
+        self.hungarian_db_path = Path(hungarian_db_path)
+        self.counties_geojson = Path(counties_geojson or RegionalAggregationConfig.COUNTIES_GEOJSON)
+        self.regions = {name: list(megyek) for name, megyek in (regions or {}).items()}
+        self.spatially_joined = 0
+        self._build()
+
+    # === TAGSÁG ===
+
+    def _load_county_features(self) -> List[Dict[str, Any]]:
+        if not self.counties_geojson.exists():
+            return []
+        try:
+            with open(self.counties_geojson, "r", encoding="utf-8") as handle:
+                return json.load(handle).get("features", [])
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Megye GeoJSON nem olvasható ({self.counties_geojson}): {e}")
+            return []
+
+    def _build(self) -> None:
+        with sqlite3.connect(f"file:{self.hungarian_db_path}?mode=ro", uri=True) as conn:
+            rows = conn.execute(
+                "SELECT id, name, megye, population, latitude, longitude FROM hungarian_settlements ORDER BY id"
+            ).fetchall()
+
+        self.settlement_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.names = [row[1] or "" for row in rows]
+        self.population = np.array([row[3] or 0 for row in rows], dtype=np.float64)
+        latitudes = np.array([np.nan if row[4] is None else row[4] for row in rows], dtype=np.float64)
+        longitudes = np.array([np.nan if row[5] is None else row[5] for row in rows], dtype=np.float64)
+        db_counties = [normalize_county_name(row[2]) for row in rows]
+
+        # Megye sorrend: a GeoJSON feature sorrendje (így a térkép rétegével egyezik), majd a többi DB megye
+        features = self._load_county_features()
+        property_name = RegionalAggregationConfig.COUNTY_NAME_PROPERTY
+        feature_names = [normalize_county_name(feature.get("properties", {}).get(property_name)) for feature in features]
+        self.county_names = [name for name in dict.fromkeys(feature_names) if name]
+        known = set(self.county_names)
+        self.county_names += sorted({name for name in db_counties if name and name not in known})
+
+        position = {name: index for index, name in enumerate(self.county_names)}
+        self.county_index = np.array([position.get(name, -1) for name in db_counties], dtype=np.int16)
+
+        unknown = np.flatnonzero((self.county_index < 0) & np.isfinite(latitudes) & np.isfinite(longitudes))
+        if len(unknown) and features and shapely.available:
+            self._spatial_join(unknown, latitudes, longitudes, features, feature_names, position)
+
+        # Statisztikai régiók a megyékből
+        self.region_names = list(self.regions)
+        county_to_region = np.full(len(self.county_names) + 1, -1, dtype=np.int8)  # utolsó elem: -1 megye
+        for region_position, megyek in enumerate(self.regions.values()):
+            for megye in megyek:
+                if megye in position:
+                    county_to_region[position[megye]] = region_position
+        self.region_index = county_to_region[self.county_index]
+
+        self._id_by_name = {name: int(settlement_id) for name, settlement_id in zip(self.names, self.settlement_ids)}
+
+        logger.info(f"🗺️ Település tagság: {len(self.settlement_ids)} település, {len(self.county_names)} megye, "
+                    f"{len(self.region_names)} régió, {self.spatially_joined} térbeli join")
+
+    def _spatial_join(self, rows: np.ndarray, latitudes: np.ndarray, longitudes: np.ndarray,
+                      features: List[Dict[str, Any]], feature_names: List[str], position: Dict[str, int]) -> None:
+        """Ismeretlen megyéjű települések megyéje pont-poligon vizsgálattal."""
+        from shapely.geometry import shape
+
+        for feature, name in zip(features, feature_names):
+            if name not in position or not feature.get("geometry"):
+                continue
+            pending = rows[self.county_index[rows] < 0]
+            if not len(pending):
+                break
+            inside = shapely.contains_xy(shape(feature["geometry"]), longitudes[pending], latitudes[pending])
+            self.county_index[pending[inside]] = position[name]
+            self.spatially_joined += int(inside.sum())
+
+    # === LEKÉRDEZÉS ===
+
+    def rows_for(self, settlement_ids: Sequence[Optional[int]]) -> np.ndarray:
+        """settlement_id-k → sor indexek (-1: ismeretlen / None)."""
+        ids = np.array([-1 if value is None else value for value in settlement_ids], dtype=np.int64)
+        rows = np.searchsorted(self.settlement_ids, ids)
+        rows = np.minimum(rows, len(self.settlement_ids) - 1)
+        return np.where(self.settlement_ids[rows] == ids, rows, -1)
+
+    def settlement_ids_for_names(self, names: Sequence[str]) -> List[Optional[int]]:
+        return [self._id_by_name.get(name) for name in names]
+
+    def group_index(self, level: str) -> np.ndarray:
+        if level not in LEVELS:
+            raise ValueError(f"Ismeretlen összesítési szint: {level}")
+        return self.county_index if level == "county" else self.region_index
+
+    def group_names(self, level: str) -> List[str]:
+        return self.county_names if level == "county" else self.region_names
+
+    # === ÖSSZESÍTÉS ===
+
+    def aggregate(self, settlement_ids: Sequence[Optional[int]], values: Sequence[float],
+                  level: str = "county") -> RegionalAggregate:
+        """
+        Településenkénti értékek → megyénkénti / régiónkénti statisztikák egy menetben.
+
+        Args:
+            settlement_ids: Települések (ismeretlen / None kimarad)
+            values: Értékek (NaN kimarad)
+            level: "county" vagy "region"
+        """
+        names = self.group_names(level)
+        group_count = len(names)
+        values = np.asarray(values, dtype=np.float64)
+        rows = self.rows_for(settlement_ids)
+
+        groups = np.where(rows >= 0, self.group_index(level)[rows], -1)
+        valid = (groups >= 0) & np.isfinite(values)
+        groups, values = groups[valid].astype(np.intp), values[valid]
+        weights = self.population[rows[valid]]
+
+        count = np.bincount(groups, minlength=group_count)
+        total = np.bincount(groups, weights=values, minlength=group_count)
+        weight_total = np.bincount(groups, weights=weights, minlength=group_count)
+        weighted_total = np.bincount(groups, weights=values * weights, minlength=group_count)
+
+        maximum = np.full(group_count, -np.inf)
+        minimum = np.full(group_count, np.inf)
+        np.maximum.at(maximum, groups, values)
+        np.minimum.at(minimum, groups, values)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, total / count, np.nan)
+            weighted_mean = np.where(weight_total > 0, weighted_total / weight_total, mean)
+
+        empty = count == 0
+        maximum[empty] = np.nan
+        minimum[empty] = np.nan
+
+        return RegionalAggregate(level, list(names), count, weight_total, mean, minimum, maximum, weighted_mean)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "settlements": len(self.settlement_ids),
+            "counties": len(self.county_names),
+            "regions": len(self.region_names),
+            "unassigned_settlements": int((self.county_index < 0).sum()),
+            "spatially_joined": self.spatially_joined,
+            "counties_geojson": str(self.counties_geojson) if self.counties_geojson.exists() else None,
+        }
+
+
+# === KÖZÖS PÉLDÁNY ===
+
+_membership_instance: Optional[SettlementMembership] = None
+_membership_lock = threading.Lock()
+
+
+def get_settlement_membership(hungarian_db_path: Optional[Union[str, Path]] = None,
+                              regions: Optional[Dict[str, Sequence[str]]] = None) -> Optional[SettlementMembership]:
+    """
+    A folyamat közös település tagság táblája (első hívás építi fel).
+
+    Returns:
+        SettlementMembership vagy None, ha a települési adatbázis nem elérhető
+    """
+    global _membership_instance
+    with _membership_lock:
+        if _membership_instance is not None:
+            return _membership_instance
+
+        if hungarian_db_path is None:
+            from ..config import DATA_DIR
+            hungarian_db_path = DATA_DIR / "hungarian_settlements.db"
+        if not Path(hungarian_db_path).exists():
+            return None
+
+        try:
+            _membership_instance = SettlementMembership(hungarian_db_path, regions)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"⚠️ Település tagság tábla nem hozható létre: {e}")
+            return None
+        return _membership_instance
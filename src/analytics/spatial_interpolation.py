@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Spatial Interpolation - Mintavételezett települések → teljes településállomány és raszter
+Global Weather Analyzer projekt
+
+🗺️ CÉL: a régió lekérdezések csak max_cities mintát kérnek le; az IDW
+   (inverz távolság súlyozás) ebből becsüli a metrikát MINDEN magyar
+   településre és egy szabályos rácsra - országos térképhez pár száz lekérés elég
+🌳 KD-FA: k legközelebbi minta scipy cKDTree-vel (ha telepítve), különben
+   darabolt NumPy brute-force (argpartition) - mindkettő vektorizált
+⛰️ MAGASSÁGI KORREKCIÓ: hőmérséklet metrikáknál, ha a települési adatbázisban van
+   magasság oszlop, a minták tengerszintre redukálva (lapse rate), az IDW után a
+   cél magasságára visszaszámolva
+💾 CACHE: (metrika, dátum, mintahalmaz, célterület) kulcsú LRU - ugyanaz a
+   mintahalmaz nem számolódik újra (pl. overlay frissítés, paraméter váltás)
+
+Használat:
+    interpolator = get_spatial_interpolator(hungarian_db_path)
+    field = interpolator.interpolate("temperature_2m_max", "2024-07-15", lats, lons, values,
+                                     megyek=["Baranya", "Somogy", "Tolna"])
+    field.values        # településenkénti becslés (a mintáknál a mért érték)
+    field.raster        # (sor, oszlop) rács, északról délre - a térképen kívüli cellák NaN
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Any, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..config import SpatialInterpolationConfig
+from ..lazy_imports import lazy_attribute
+
+logger = logging.getLogger(__name__)
+
+cKDTree = lazy_attribute("scipy.spatial", "cKDTree")
+
+EARTH_RADIUS_KM = 6371.0
+
+# Egy minta ennél közelebb → a település mért értéke (nem becslés)
+SAMPLE_MATCH_KM = 0.5
+
+# Brute-force KNN darab mérete (lekérdezés × minta távolság elemek)
+_BRUTE_FORCE_CHUNK_ELEMENTS = 4_000_000
+
+
+# === TÁVOLSÁG / SZOMSZÉDOK (tiszta NumPy) ===
+
+def project_km(latitudes: np.ndarray, longitudes: np.ndarray, reference_latitude: float) -> np.ndarray:
+    """Helyi ekvidisztáns vetület km-ben (Magyarország méretű területen <0.5% hiba)."""
+    scale = np.radians(1.0) * EARTH_RADIUS_KM
+    return np.column_stack([
+        np.asarray(longitudes, dtype=np.float64) * scale * np.cos(np.radians(reference_latitude)),
+        np.asarray(latitudes, dtype=np.float64) * scale,
+    ])
+
+
+class NeighborIndex:
+    """
+    k legközelebbi szomszéd index (km koordinátákon).
+
+    scipy cKDTree, ha elérhető; különben darabolt brute-force, ami a
+    néhány száz - néhány ezer pontos mintákra szintén vektorizált és gyors.
+    """
+
+    def __init__(self, points: np.ndarray):
+        self.points = np.ascontiguousarray(points, dtype=np.float64)
+        self._tree = cKDTree(self.points) if cKDTree.available else None
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def query(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns: (távolságok, indexek), mindkettő (Q, k) alakú, távolság szerint növekvő."""
+        k = max(1, min(k, len(self.points)))
+        queries = np.asarray(queries, dtype=np.float64)
+
+        if self._tree is not None:
+            distances, indices = self._tree.query(queries, k=k)
+            return distances.reshape(len(queries), k), indices.reshape(len(queries), k)
+
+        distances = np.empty((len(queries), k), dtype=np.float64)
+        indices = np.empty((len(queries), k), dtype=np.int64)
+        point_norms = (self.points ** 2).sum(axis=1)
+        chunk = max(1, _BRUTE_FORCE_CHUNK_ELEMENTS // max(len(self.points), 1))
+        for start in range(0, len(queries), chunk):
+            block = queries[start:start + chunk]
+            # |q|² + |p|² - 2 q·p (BLAS mátrixszorzás a páronkénti különbség tömb helyett)
+            squared = (block ** 2).sum(axis=1)[:, np.newaxis] + point_norms[np.newaxis, :] - 2.0 * block @ self.points.T
+            np.maximum(squared, 0.0, out=squared)
+            nearest = (np.argpartition(squared, k - 1, axis=1)[:, :k] if k < len(self.points)
+                       else np.broadcast_to(np.arange(len(self.points)), squared.shape))
+            nearest_squared = np.take_along_axis(squared, nearest, axis=1)
+            order = np.argsort(nearest_squared, axis=1)
+            indices[start:start + chunk] = np.take_along_axis(nearest, order, axis=1)
+            distances[start:start + chunk] = np.sqrt(np.take_along_axis(nearest_squared, order, axis=1))
+        return distances, indices
+
+
+def idw(distances: np.ndarray, indices: np.ndarray, sample_values: np.ndarray,
+        power: float = SpatialInterpolationConfig.POWER) -> np.ndarray:
+    """
+    Inverz távolság súlyozás a (Q, k) szomszéd táblából.
+
+    Egybeeső pontnál (távolság ~0) a minta értéke jön, nem 0-val osztás.
+    """
+    neighbor_values = sample_values[indices]
+    exact = distances[:, 0] < 1e-9
+    with np.errstate(divide="ignore"):
+        weights = 1.0 / np.maximum(distances, 1e-9) ** power
+    estimates = (weights * neighbor_values).sum(axis=1) / weights.sum(axis=1)
+    estimates[exact] = neighbor_values[exact, 0]
+    return estimates
+
+
+@dataclass
+class InterpolatedField:
+    """Egy metrika-nap becsült mezője a célterület összes településére és egy rácsra."""
+    metric: str
+    date: str
+    settlement_ids: np.ndarray
+    names: np.ndarray
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    values: np.ndarray            # településenként (mintánál a mért érték)
+    sampled: np.ndarray           # bool - a településen van minta
+    sample_count: int
+    raster_latitudes: np.ndarray  # sorok középpontja, északról délre
+    raster_longitudes: np.ndarray
+    raster: np.ndarray            # (sor, oszlop) float32, a területen kívül NaN
+    lapse_rate_corrected: bool = False
+
+    @property
+    def estimated_count(self) -> int:
+        return int(np.count_nonzero(~self.sampled))
+
+    def raster_bounds(self) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """A rács cellahatárai ((dél, nyugat), (észak, kelet)) - image overlay illesztéshez."""
+        half_lat = abs(float(self.raster_latitudes[0] - self.raster_latitudes[-1])) / max(len(self.raster_latitudes) - 1, 1) / 2
+        half_lon = abs(float(self.raster_longitudes[-1] - self.raster_longitudes[0])) / max(len(self.raster_longitudes) - 1, 1) / 2
+        return ((float(self.raster_latitudes[-1]) - half_lat, float(self.raster_longitudes[0]) - half_lon),
+                (float(self.raster_latitudes[0]) + half_lat, float(self.raster_longitudes[-1]) + half_lon))
+
+
+class SpatialInterpolator:
+    """
+    Magyar települések IDW interpolátora.
+
+    A települések (és a célterületenkénti rács maszkok) egyszer töltődnek be;
+    egy interpoláció költsége a minták KD-fája + két vektorizált lekérdezés.
+    """
+
+    def __init__(self, hungarian_db_path: Union[str, Path]):
+        self.hungarian_db_path = Path(hungarian_db_path)
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple[Any, ...], InterpolatedField]" = OrderedDict()
+        self._rasters: Dict[Tuple[str, ...], Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self._load_settlements()
+
+    # === TELEPÜLÉSEK ===
+
+    def _load_settlements(self) -> None:
+        with sqlite3.connect(f"file:{self.hungarian_db_path}?mode=ro", uri=True) as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(hungarian_settlements)")}
+            elevation_column = next((name for name in SpatialInterpolationConfig.ELEVATION_COLUMNS if name in columns), None)
+            rows = conn.execute(
+                f"SELECT id, name, latitude, longitude, megye, {elevation_column or 'NULL'} "
+                "FROM hungarian_settlements WHERE latitude IS NOT NULL AND longitude IS NOT NULL ORDER BY id"
+            ).fetchall()
+
+        self.settlement_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.names = np.array([row[1] or "" for row in rows], dtype=object)
+        self.latitudes = np.array([row[2] for row in rows], dtype=np.float64)
+        self.longitudes = np.array([row[3] for row in rows], dtype=np.float64)
+        self.megyek = np.array([row[4] or "" for row in rows], dtype=object)
+        self.elevations = np.array([np.nan if row[5] is None else row[5] for row in rows], dtype=np.float64)
+        self.has_elevation = bool(elevation_column) and bool(np.isfinite(self.elevations).any())
+
+        self.reference_latitude = float(self.latitudes.mean()) if len(rows) else 47.0
+        self.points_km = project_km(self.latitudes, self.longitudes, self.reference_latitude)
+        self._settlement_index = NeighborIndex(self.points_km) if len(rows) else None
+
+    def _target_rows(self, megyek: Optional[Sequence[str]]) -> np.ndarray:
+        if not megyek:
+            return np.arange(len(self.settlement_ids))
+        return np.flatnonzero(np.isin(self.megyek, list(megyek)))
+
+    def _raster_for(self, target_key: Tuple[str, ...], rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        A célterület rácsa: (sor szélességek, oszlop hosszúságok, cella km pontok, maszk).
+
+        A maszk a céltelepülések foglaltsági rácsának RASTER_MAX_DISTANCE_KM sugarú
+        dilatációja (integrál kép, O(cellák)) - a határon/megyén kívüli cellák
+        kimaradnak. Célterületenként egyszer számolódik.
+        """
+        cached = self._rasters.get(target_key)
+        if cached is not None:
+            return cached
+
+        resolution = SpatialInterpolationConfig.RASTER_RESOLUTION
+        margin = resolution * 2
+        south, north = self.latitudes[rows].min() - margin, self.latitudes[rows].max() + margin
+        west, east = self.longitudes[rows].min() - margin, self.longitudes[rows].max() + margin
+        raster_latitudes = np.arange(north, south - resolution / 2, -resolution)
+        raster_longitudes = np.arange(west, east + resolution / 2, resolution)
+        height, width = len(raster_latitudes), len(raster_longitudes)
+
+        occupied = np.zeros((height + 1, width + 1), dtype=np.int64)
+        cell_rows = np.clip(np.rint((north - self.latitudes[rows]) / resolution).astype(np.int64), 0, height - 1)
+        cell_cols = np.clip(np.rint((self.longitudes[rows] - west) / resolution).astype(np.int64), 0, width - 1)
+        np.add.at(occupied, (cell_rows + 1, cell_cols + 1), 1)
+        integral = occupied.cumsum(axis=0).cumsum(axis=1)
+
+        cell_km = np.radians(resolution) * EARTH_RADIUS_KM
+        radius_rows = int(np.ceil(SpatialInterpolationConfig.RASTER_MAX_DISTANCE_KM / cell_km))
+        radius_cols = int(np.ceil(SpatialInterpolationConfig.RASTER_MAX_DISTANCE_KM
+                                  / (cell_km * np.cos(np.radians(self.reference_latitude)))))
+        top = np.clip(np.arange(height) - radius_rows, 0, height)
+        bottom = np.clip(np.arange(height) + radius_rows + 1, 0, height)
+        left = np.clip(np.arange(width) - radius_cols, 0, width)
+        right = np.clip(np.arange(width) + radius_cols + 1, 0, width)
+        window = (integral[np.ix_(bottom, right)] - integral[np.ix_(top, right)]
+                  - integral[np.ix_(bottom, left)] + integral[np.ix_(top, left)])
+        mask = (window > 0).ravel()
+
+        grid_lat, grid_lon = np.meshgrid(raster_latitudes, raster_longitudes, indexing="ij")
+        cells_km = project_km(grid_lat.ravel(), grid_lon.ravel(), self.reference_latitude)
+
+        cached = (raster_latitudes, raster_longitudes, cells_km, mask)
+        with self._lock:
+            self._rasters[target_key] = cached
+        return cached
+
+    # === INTERPOLÁCIÓ ===
+
+    @staticmethod
+    def _sample_key(latitudes: np.ndarray, longitudes: np.ndarray, values: np.ndarray) -> str:
+        digest = hashlib.sha1()
+        for array in (latitudes, longitudes, values):
+            digest.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+    def _sample_elevations(self, sample_km: np.ndarray, explicit: Optional[Sequence[Optional[float]]]) -> np.ndarray:
+        """Minta magasságok: megadott érték, különben a legközelebbi település magassága."""
+        _, nearest = self._settlement_index.query(sample_km, 1)
+        elevations = self.elevations[nearest[:, 0]]
+        if explicit is not None:
+            given = np.array([np.nan if value is None else value for value in explicit], dtype=np.float64)
+            elevations = np.where(np.isfinite(given), given, elevations)
+        return elevations
+
+    def interpolate(self, metric: str, date: str,
+                    latitudes: Sequence[float], longitudes: Sequence[float], values: Sequence[Optional[float]],
+                    megyek: Optional[Sequence[str]] = None,
+                    elevations: Optional[Sequence[Optional[float]]] = None) -> Optional[InterpolatedField]:
+        """
+        Minta (lat, lon, érték) → becsült mező a célterület minden településére és rácsára.
+
+        Args:
+            metric: Metrika neve (a magassági korrekció és a cache kulcs része)
+            megyek: Célterület megyéi (None = egész ország)
+            elevations: Opcionális minta magasságok (m)
+
+        Returns:
+            InterpolatedField, vagy None ha kevés az érvényes minta
+        """
+        if self._settlement_index is None:
+            return None
+
+        sample_lat = np.asarray(latitudes, dtype=np.float64)
+        sample_lon = np.asarray(longitudes, dtype=np.float64)
+        sample_values = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+        valid = np.isfinite(sample_lat) & np.isfinite(sample_lon) & np.isfinite(sample_values)
+        if np.count_nonzero(valid) < SpatialInterpolationConfig.MIN_SAMPLES:
+            return None
+        sample_lat, sample_lon, sample_values = sample_lat[valid], sample_lon[valid], sample_values[valid]
+        explicit_elevations = [elevations[index] for index in np.flatnonzero(valid)] if elevations is not None else None
+
+        target_key = tuple(sorted(megyek)) if megyek else ()
+        cache_key = (metric, str(date)[:10], self._sample_key(sample_lat, sample_lon, sample_values), target_key)
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                self.cache_hits += 1
+                return cached
+            self.cache_misses += 1
+
+        rows = self._target_rows(megyek)
+        if len(rows) == 0:
+            return None
+
+        sample_km = project_km(sample_lat, sample_lon, self.reference_latitude)
+        sample_index = NeighborIndex(sample_km)
+        neighbors = SpatialInterpolationConfig.NEIGHBORS
+
+        # ⛰️ Tengerszintre redukálás (csak hőmérséklet, csak ha minden minta magassága ismert)
+        lapse = 0.0
+        sample_elevations = None
+        if self.has_elevation and metric in SpatialInterpolationConfig.LAPSE_RATE_METRICS:
+            sample_elevations = self._sample_elevations(sample_km, explicit_elevations)
+            if np.isfinite(sample_elevations).all() and np.isfinite(self.elevations[rows]).all():
+                lapse = SpatialInterpolationConfig.LAPSE_RATE
+        residuals = sample_values + lapse * sample_elevations if lapse else sample_values
+
+        # Települések
+        distances, indices = sample_index.query(self.points_km[rows], neighbors)
+        settlement_values = idw(distances, indices, residuals)
+        if lapse:
+            settlement_values -= lapse * self.elevations[rows]
+        sampled = distances[:, 0] <= SAMPLE_MATCH_KM
+        settlement_values[sampled] = sample_values[indices[sampled, 0]]
+
+        # Rács (a magassági korrekció a legközelebbi település magasságával - nincs DEM)
+        raster_latitudes, raster_longitudes, cells_km, mask = self._raster_for(target_key, rows)
+        raster = np.full(len(cells_km), np.nan, dtype=np.float32)
+        if mask.any():
+            cell_distances, cell_indices = sample_index.query(cells_km[mask], neighbors)
+            cell_values = idw(cell_distances, cell_indices, residuals)
+            if lapse:
+                _, nearest = self._settlement_index.query(cells_km[mask], 1)
+                cell_values -= lapse * self.elevations[nearest[:, 0]]
+            raster[mask] = cell_values
+        raster = raster.reshape(len(raster_latitudes), len(raster_longitudes))
+
+        field = InterpolatedField(
+            metric=metric, date=str(date)[:10],
+            settlement_ids=self.settlement_ids[rows], names=self.names[rows],
+            latitudes=self.latitudes[rows], longitudes=self.longitudes[rows],
+            values=settlement_values, sampled=sampled, sample_count=len(sample_values),
+            raster_latitudes=raster_latitudes, raster_longitudes=raster_longitudes, raster=raster,
+            lapse_rate_corrected=bool(lapse),
+        )
+
+        with self._lock:
+            self._cache[cache_key] = field
+            while len(self._cache) > SpatialInterpolationConfig.CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+        logger.info(f"🗺️ IDW interpoláció ({metric}, {field.date}): {len(sample_values)} minta → "
+                    f"{len(rows)} település ({field.estimated_count} becsült), "
+                    f"{raster.shape[0]}×{raster.shape[1]} rács" + (", magassági korrekcióval" if lapse else ""))
+        return field
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "settlements": len(self.settlement_ids),
+                "has_elevation": self.has_elevation,
+                "kd_tree": "scipy" if cKDTree.available else "numpy",
+                "cached_fields": len(self._cache),
+                "cached_rasters": len(self._rasters),
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+            }
+
+
+# === KÖZÖS PÉLDÁNY ===
+
+_interpolator_instance: Optional[SpatialInterpolator] = None
+_interpolator_lock = threading.Lock()
+
+
+def get_spatial_interpolator(hungarian_db_path: Optional[Union[str, Path]] = None) -> Optional[SpatialInterpolator]:
+    """
+    A folyamat közös interpolátora.
+
+    Returns:
+        SpatialInterpolator vagy None, ha ki van kapcsolva / a települési adatbázis nem elérhető
+    """
+    global _interpolator_instance
+    if not SpatialInterpolationConfig.ENABLED:
+        return None
+
+    with _interpolator_lock:
+        if _interpolator_instance is not None:
+            return _interpolator_instance
+
+        if hungarian_db_path is None:
+            from ..config import DATA_DIR
+            hungarian_db_path = DATA_DIR / "hungarian_settlements.db"
+        if not Path(hungarian_db_path).exists():
+            return None
+
+        try:
+            _interpolator_instance = SpatialInterpolator(hungarian_db_path)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"⚠️ Térbeli interpolátor nem hozható létre: {e}")
+            return None
+        return _interpolator_instance
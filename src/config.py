@@ -10,16 +10,22 @@ CLEAN DUAL-API VERZIÓ: Csak Open-Meteo + Meteostat
 """
 
 import os
+import copy
 import json
+import atexit
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
 from pathlib import Path
-from typing import Dict, Any, Optional, Literal, List
+from typing import Dict, Any, Optional, Literal, List, Callable
 from datetime import datetime, timedelta
 
 # Project root directory (one level up from src/)
 PROJECT_ROOT = Path(__file__).parent.parent
 
-# Data directories
-DATA_DIR = PROJECT_ROOT / "data"
+# Data directories (WEATHER_ANALYZER_DATA_DIR: alternatív adatkönyvtár, pl. benchmark munkaterület)
+DATA_DIR = Path(os.getenv("WEATHER_ANALYZER_DATA_DIR") or PROJECT_ROOT / "data")
 CACHE_DIR = DATA_DIR / "cache"
 CLIMATE_CACHE_DIR = DATA_DIR / "climate_cache"
 EXPORTS_DIR = PROJECT_ROOT / "exports"
@@ -37,17 +43,22 @@ CACHE_DB_PATH = DATA_DIR / "cache.db"
 # Legacy compatibility
 LEGACY_DB_PATH = PROJECT_ROOT / "legacy" / "meteo_data.db"
 
+# 🧪 Helyi stand-in API szerver (src/devtools/standin_server.py) - offline benchmark/teszt
+# Beállítva az archív Open-Meteo és a Meteostat végpontok erre a szerverre mutatnak
+API_STANDIN_URL = os.getenv("WEATHER_ANALYZER_API_STANDIN", "").rstrip("/") or None
+
 # API Configuration
 class APIConfig:
     """API endpoints and configuration - CLEAN DUAL-API SYSTEM"""
     
     # Open-Meteo API (primary global data source - FREE)
     OPEN_METEO_BASE = "https://api.open-meteo.com/v1"
-    OPEN_METEO_ARCHIVE = "https://archive-api.open-meteo.com/v1/archive"
+    OPEN_METEO_ARCHIVE = (f"{API_STANDIN_URL}/v1/archive" if API_STANDIN_URL
+                          else "https://archive-api.open-meteo.com/v1/archive")
     OPEN_METEO_GEOCODING = "https://geocoding-api.open-meteo.com/v1/search"
     
     # Meteostat API (premium multi-city & historical data - 10k requests/month)
-    METEOSTAT_BASE = "https://meteostat.p.rapidapi.com"
+    METEOSTAT_BASE = f"{API_STANDIN_URL}/meteostat" if API_STANDIN_URL else "https://meteostat.p.rapidapi.com"
     METEOSTAT_API_KEY = os.getenv("METEOSTAT_API_KEY")
     METEOSTAT_MONTHLY_LIMIT = 10000  # 10k requests/month ($10 USD)
     METEOSTAT_RATE_LIMIT = 0.1  # 100ms minimum between requests
@@ -72,11 +83,30 @@ class APIConfig:
     OPENMETEO_RATE_LIMIT = 0.1  # 10 requests/second
     METEOSTAT_RATE_LIMIT = 0.1  # 100ms delay for premium API
     METEOSTAT_MONTHLY_LIMIT = 10000  # 10k requests/month
+    METEOSTAT_STATION_CACHE_SIZE = 512  # cache-elt állomás idősorok (LRU)
+    
+    # 📈 Adaptív (AIMD) párhuzamosság provider-enként - a fix késleltetések helyett
+    # concurrency: egyszerre repülő kérések (additív növelés siker esetén, felezés 429/5xx-re)
+    # interval: két kérés indítása közti minimális idő (siker esetén csökken, 429/5xx-re duplázódik)
+    ADAPTIVE_CONCURRENCY = {
+        "open-meteo": {"initial": 4, "min": 1, "max": 16, "initial_interval": OPENMETEO_RATE_LIMIT, "max_interval": 10.0},
+        "meteostat": {"initial": 2, "min": 1, "max": 8, "initial_interval": METEOSTAT_RATE_LIMIT, "max_interval": 10.0},
+    }
+    AIMD_DECREASE_FACTOR = 0.5
+    RETRY_AFTER_DEFAULT = 5.0      # 429 Retry-After fejléc nélkül (s)
+    RETRY_AFTER_MAX = 120.0        # túl nagy Retry-After levágása (s)
+    RETRY_AFTER_FAILOVER = 15.0    # ennél hosszabb Retry-After → fallback provider a kivárás helyett (s)
+    
+    # 🌪️ Óránkénti adatok csak lefúrásra (viharnap stb.) - napi széllökés a windgusts_10m_max aggregátumból
+    HOURLY_WINDOW_VARIABLES = ("wind_gusts_10m", "windspeed_10m")
+    HOURLY_WINDOW_MAX_DAYS = 31        # egy lefúrási ablak max hossza
+    HOURLY_WINDOW_CACHE_SIZE = 64      # tárolt óránkénti ablakok száma (LRU)
     
     # Source Display Names
     SOURCE_DISPLAY_NAMES = {
         "open-meteo": "🌍 Open-Meteo API",
-        "meteostat": "💎 Meteostat API"
+        "meteostat": "💎 Meteostat API",
+        "local-grid": "🗂️ Helyi rács (NetCDF/Zarr)"
     }
 
 
@@ -212,6 +242,13 @@ class ProviderConfig:
             "icon": "💎",
             "cost": "$10 USD/hónap",
             "features": ["10k request/hónap", "Gazdag történeti adatok", "Station-based accuracy"]
+        },
+        "local-grid": {
+            "name": "Helyi rács (NetCDF/Zarr)",
+            "description": "Helyi rácsos reanalízis kivonat (pl. ERA5-Land) - hálózat és kvóta nélkül",
+            "icon": "🗂️",
+            "cost": "Ingyenes",
+            "limitations": ["Csak a rács és az időszak által lefedett kérések", "WEATHER_ANALYZER_LOCAL_GRID szükséges"]
         }
     }
     
@@ -226,6 +263,18 @@ class ProviderConfig:
     # Cost calculation
     METEOSTAT_COST_PER_REQUEST = 0.001  # $0.001 per request (rough estimate)
     MONTHLY_BUDGET_USD = 10.0  # $10 monthly budget
+    
+    # 💾 Usage tracking: memóriában számolva, periodikus atomikus mentéssel
+    USAGE_FLUSH_INTERVAL = 5.0  # seconds - a változások legfeljebb ennyi idő után lemezre kerülnek
+    
+    # 🩺 Provider health tracking & circuit breaker
+    HEALTH_WINDOW_SIZE = 50              # gördülő minta ablak (utolsó N hívás)
+    HEALTH_MIN_SAMPLES = 5               # hibaarány alapú nyitáshoz szükséges minták
+    CIRCUIT_FAILURE_THRESHOLD = 3        # egymást követő hibák → nyitott áramkör
+    CIRCUIT_ERROR_RATE_THRESHOLD = 0.5   # gördülő hibaarány → nyitott áramkör
+    CIRCUIT_OPEN_SECONDS = 30.0          # első nyitás hossza (sikertelen próbánál duplázódik)
+    CIRCUIT_MAX_OPEN_SECONDS = 600.0
+    PREFERRED_PROVIDER_BIAS = 0.5        # preferált provider pontszám szorzója (kisebb = jobb)
 
 # GUI Configuration
 class GUIConfig:
@@ -242,6 +291,7 @@ class GUIConfig:
     # Update intervals
     WEATHER_UPDATE_INTERVAL = 600  # 10 minutes
     WARNING_UPDATE_INTERVAL = 300  # 5 minutes
+    LAZY_TAB_IDLE_DELAY_MS = 250  # Hidden tabs refresh after this idle delay (-1 = only when visible)
     
     # ✅ PROVIDER SELECTOR: GUI-specific settings
     PROVIDER_SELECTOR_POSITION = "control_panel"  # or "status_bar" or "both"
@@ -257,11 +307,139 @@ class HardwareConfig:
     MAX_CONCURRENT_REQUESTS = 8
     CHART_CACHE_SIZE = 50  # Number of charts to keep in memory
     DATA_CHUNK_SIZE = 10000  # Rows per processing chunk
+    CHART_RENDER_WORKERS = 2  # Offscreen chart render threads (keep the GUI thread free; GIL-bound, not per-core)
+    TASK_SCHEDULER_MAX_WORKERS = 4  # Shared background task pool (geocoding, weather, SQL, analysis)
+    ANALYTICS_PROCESS_WORKERS = max(1, min(8, (os.cpu_count() or 2) - 1))  # CPU-heavy kernels (process pool)
+    ANALYTICS_CHUNK_ROWS = 256  # Settlements per process-pool task
+    ANALYTICS_PARALLEL_MIN_ROWS = 512  # Below this the kernel runs in-process (pool + copy would dominate)
+    ANALYTICS_START_METHOD = "spawn"  # No fork from a process with Qt / network threads
     
     # GPU acceleration (for future features)
     USE_GPU_ACCELERATION = True
     GPU_MEMORY_LIMIT = 6  # GB (conservative limit for RTX 3050)
 
+# Tracing Configuration
+class TracingConfig:
+    """Hot-path span tracing (developer performance panel, Chrome trace export)"""
+    
+    ENABLED = os.getenv("WEATHER_ANALYZER_TRACING", "").lower() in ("1", "true", "yes")
+    MAX_EVENTS = 200000       # Ring buffer of recorded spans (oldest dropped first)
+    RECENT_ANALYSES = 20      # Per-stage summaries kept for the performance panel
+
+# Climate Archive Configuration
+class ClimateArchiveConfig:
+    """Memory-mapped per-settlement daily climate archive (Hungarian settlements)"""
+    
+    ENABLED = os.getenv("WEATHER_ANALYZER_CLIMATE_ARCHIVE", "1").lower() not in ("0", "false", "no")
+    DIRECTORY = CLIMATE_CACHE_DIR / "settlement_archive"
+    START_DATE = "1940-01-01"  # ERA5 archive start
+    END_DATE = "2040-12-31"    # Fixed day axis (sparse files - only fetched pages use disk)
+    
+    # Archived daily variables → int16 scale (value = stored × scale)
+    VARIABLES = {
+        "temperature_2m_max": 0.01,          # °C
+        "temperature_2m_min": 0.01,          # °C
+        "temperature_2m_mean": 0.01,         # °C
+        "precipitation_sum": 0.1,            # mm
+        "windspeed_10m_max": 0.1,            # km/h
+        "windgusts_10m_max": 0.1,            # km/h
+        "winddirection_10m_dominant": 0.1,   # °
+    }
+    
+    FINALIZATION_LAG_DAYS = 7  # Newer days may still be revised upstream - never archived
+    FETCH_CHUNK_DAYS = 366     # Provider request size when filling gaps
+
+# Local Gridded Dataset Configuration
+class LocalGridConfig:
+    """Local gridded reanalysis extract (NetCDF / Zarr, e.g. ERA5-Land over Hungary) as a weather provider"""
+
+    # Dataset path: .nc file, .zarr store or a directory of .nc files (empty → provider disabled)
+    PATH = os.getenv("WEATHER_ANALYZER_LOCAL_GRID", "")
+    INTERPOLATION = os.getenv("WEATHER_ANALYZER_LOCAL_GRID_INTERPOLATION", "bilinear")  # bilinear | nearest
+    TIME_CHUNK_DAYS = 366  # Dask chunk along time (only when dask is installed)
+
+    # Output column → candidate dataset variable names (first match wins).
+    # Daily extract expected; units converted from the variable's "units" attribute.
+    VARIABLE_ALIASES = {
+        "temperature_2m_max": ("temperature_2m_max", "t2m_max", "mx2t", "tmax", "tasmax"),
+        "temperature_2m_min": ("temperature_2m_min", "t2m_min", "mn2t", "tmin", "tasmin"),
+        "temperature_2m_mean": ("temperature_2m_mean", "t2m", "t2m_mean", "tmean", "tas"),
+        "precipitation_sum": ("precipitation_sum", "tp", "precip", "pr"),
+        "windspeed_10m_max": ("windspeed_10m_max", "si10_max", "ws10_max", "sfcWindmax"),
+        "windgusts_10m_max": ("windgusts_10m_max", "fg10", "i10fg", "gust_max"),
+        "winddirection_10m_dominant": ("winddirection_10m_dominant", "wdir10", "wd10"),
+    }
+
+# Spatial Interpolation Configuration
+class SpatialInterpolationConfig:
+    """IDW interpolation of a sampled settlement subset to every settlement and a regular raster"""
+
+    ENABLED = os.getenv("WEATHER_ANALYZER_SPATIAL_INTERPOLATION", "1").lower() not in ("0", "false", "no")
+    NEIGHBORS = 8               # k nearest samples per target
+    POWER = 2.0                 # IDW distance exponent
+    MIN_SAMPLES = 3             # fewer samples → no interpolation
+    RASTER_RESOLUTION = 0.02    # degrees (~2 km over Hungary)
+    RASTER_MAX_DISTANCE_KM = 8.0  # raster cells farther from any settlement are masked (outside the country)
+    CACHE_SIZE = 32             # cached (metric, date, sample set) fields
+
+    # Elevation / lapse-rate correction (only when an elevation column is available)
+    LAPSE_RATE = 0.0065         # °C / m (standard atmosphere)
+    LAPSE_RATE_METRICS = ("temperature_2m_max", "temperature_2m_min", "temperature_2m_mean")
+    ELEVATION_COLUMNS = ("elevation", "magassag", "altitude")
+
+class RegionalAggregationConfig:
+    """Settlement → county / statistical region membership and per-area aggregation (choropleth)"""
+
+    COUNTIES_GEOJSON = DATA_DIR / "geojson" / "counties.geojson"
+    COUNTY_NAME_PROPERTY = "megye"  # feature property holding the county name
+    COUNTY_NAME_ALIASES = {"főváros": "Budapest", "Csongrád": "Csongrád-Csanád"}
+    DEFAULT_STATISTIC = "weighted_mean"  # "mean" | "max" | "min" | "weighted_mean"
+
+class EventDetectionConfig:
+    """Run-length event detection thresholds (heat waves, cold spells, dry/wet spells, gust storms)"""
+
+    HOT_DAY_TEMPERATURE = 30.0   # hot day: Tmax strictly above (hot-day count and heat waves)
+    HEAT_WAVE_MIN_DAYS = 3
+
+    # event type → (variable, comparison, threshold, min_duration days)
+    EVENTS = {
+        "heat_wave": ("temperature_2m_max", ">", HOT_DAY_TEMPERATURE, HEAT_WAVE_MIN_DAYS),
+        "cold_spell": ("temperature_2m_min", "<=", -10.0, 3),
+        "dry_spell": ("precipitation_sum", "<=", 0.1, 3),
+        "wet_spell": ("precipitation_sum", ">=", 1.0, 3),
+        "gust_storm": ("windgusts_10m_max", ">=", 70.0, 1),
+    }
+    SEASONS = {"winter": (12, 1, 2), "spring": (3, 4, 5), "summer": (6, 7, 8), "autumn": (9, 10, 11)}
+
+class ClimateIndexConfig:
+    """ETCCDI climate indices (city × year) computed in batch from city × day arrays"""
+
+    DIRECTORY = CLIMATE_CACHE_DIR / "climate_indices"  # persisted index sets + percentile baselines
+    BASE_PERIOD = (1991, 2020)        # percentile baseline years (clipped to the available data)
+    PERCENTILE_WINDOW_DAYS = 5        # calendar-day window centred on each day (ETCCDI)
+    MAX_MISSING_DAYS_PER_YEAR = 15    # more missing days → the year's index is NaN
+    WET_DAY_MM = 1.0
+    GSL_TEMPERATURE = 5.0             # growing season: 6-day spans above / below this Tmean
+    GSL_SPAN_DAYS = 6
+    CITY_CHUNK = 256                  # settlements per computation block (memory bound)
+    MIN_TREND_YEARS = 10              # fewer valid years → no trend
+
+# Extreme Value (Return Period) Configuration
+class ExtremeValueConfig:
+    """Annual-maximum GEV / Gumbel fits and return levels for many locations at once"""
+
+    RETURN_PERIODS = (2, 5, 10, 20, 50, 100)  # years
+    MIN_YEARS = 10                    # fewer valid annual maxima → no fit
+    MIN_DAYS_PER_YEAR = 300           # incomplete years are left out of the annual maxima
+    MAX_GEV_SHAPE = 0.5               # |k| beyond this the L-moment GEV fit is treated as unreliable
+    MLE_FALLBACK = True               # refit unreliable locations by MLE (scipy, per location)
+    BOOTSTRAP_SAMPLES = 500
+    CONFIDENCE = 0.95
+    BOOTSTRAP_SEED = 1991             # per-location streams → identical CIs in-process and in the pool
+    BOOTSTRAP_BLOCK_ROWS = 32         # locations resampled at once (memory: rows × samples × years)
+    BOOTSTRAP_CHUNK_ROWS = 64         # locations per process-pool task
+    BOOTSTRAP_PARALLEL_MIN_ROWS = 128  # bootstrap is costly per location → pool pays off much earlier
+
 # Multi-City Configuration
 class MultiCityConfig:
     """Multi-city analytics specific settings"""
@@ -278,6 +456,10 @@ class MultiCityConfig:
     # Fallback configuration
     ENABLE_FALLBACK_TO_OPENMETEO = True  # Fallback if Meteostat fails
     FALLBACK_THRESHOLD = 0.3  # Switch to fallback if >30% failures
+    
+    # Grid-cell deduplication (Open-Meteo archive = gridded reanalysis)
+    GRID_CELL_DEDUP_ENABLED = True  # Fetch each unique provider grid cell only once
+    OPEN_METEO_GRID_RESOLUTION = 0.1  # Degrees - ERA5-Land grid (~11 km × 7.5 km in Hungary)
 
 # Application Metadata
 class AppInfo:
@@ -388,20 +570,85 @@ class UserPreferences:
         return UserPreferences.save_provider_preferences(prefs)
 
 # ✅ PROVIDER SELECTOR: Usage tracking
-class UsageTracker:
-    """API usage tracking for Provider Selector"""
+# A futó kérések foglalása (QuotaReservation.applied / bind) - kontextusonként
+_active_reservation: ContextVar[Optional["QuotaReservation"]] = ContextVar("quota_reservation", default=None)
+
+
+class QuotaReservation:
+    """
+    Lefoglalt provider kvóta egy tervezett batch-hez.
     
-    @staticmethod
-    def load_usage_data() -> Dict[str, Any]:
-        """
-        Load API usage tracking data
-        
-        Returns:
-            Dictionary with usage statistics
-        """
+    Csak a foglaláshoz kötött kérések (applied() / bind() alatt) fogyasztják a
+    lefoglalt keretet; a többi kérés csak a szabad (nem lefoglalt) kvótából mehet.
+    A batch végén a release() a fel nem használt részt visszaadja. Context
+    managerként is használható.
+    """
+    
+    def __init__(self, provider: str, count: int):
+        self.provider = provider
+        self.count = count
+        self.remaining = count
+        self.released = False
+    
+    def release(self) -> None:
+        _usage_store().release(self)
+    
+    @contextmanager
+    def applied(self):
+        """Az aktuális szál (kontextus) kérései ebből a foglalásból fogynak."""
+        token = _active_reservation.set(self)
+        try:
+            yield self
+        finally:
+            _active_reservation.reset(token)
+    
+    def bind(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """func a foglaláshoz kötve - bármelyik (pl. pool) szálon fut."""
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.applied():
+                return func(*args, **kwargs)
+        return wrapper
+    
+    def __enter__(self) -> "QuotaReservation":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class _UsageStore:
+    """
+    Folyamat szintű, szálbiztos usage számláló.
+    
+    A kérések csak a memóriában frissülnek; a változás legfeljebb
+    USAGE_FLUSH_INTERVAL másodperc után (és kilépéskor) egyetlen atomikus
+    fájlcserével kerül lemezre - nincs kérésenkénti teljes JSON újraírás.
+    """
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._usage: Optional[Dict[str, Any]] = None
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._reservations: Dict[str, List[QuotaReservation]] = {}
+        atexit.register(self.flush)
+    
+    # === ÁLLAPOT ===
+    
+    def _state(self) -> Dict[str, Any]:
+        """Memóriabeli állapot (első eléréskor lemezről), hónapváltáskor nullázva."""
         current_month = datetime.now().strftime("%Y-%m")
-        
-        default_usage = {
+        if self._usage is None:
+            self._usage = self._read(current_month)
+        elif self._usage.get("current_month") != current_month:
+            self._usage = UsageTracker._reset_monthly_usage(self._usage, current_month)
+            self._mark_dirty()
+        return self._usage
+    
+    @staticmethod
+    def _default_usage(current_month: str) -> Dict[str, Any]:
+        return {
             "current_month": current_month,
             "meteostat": {
                 "requests_this_month": 0,
@@ -418,22 +665,185 @@ class UsageTracker:
             "month_start_date": f"{current_month}-01",
             "last_updated": datetime.now().isoformat()
         }
-        
+    
+    def _read(self, current_month: str) -> Dict[str, Any]:
+        default_usage = self._default_usage(current_month)
         try:
             if USAGE_TRACKING_FILE.exists():
                 with open(USAGE_TRACKING_FILE, 'r', encoding='utf-8') as f:
                     usage = json.load(f)
-                    
-                    # Reset if new month
-                    if usage.get("current_month") != current_month:
-                        usage = UsageTracker._reset_monthly_usage(usage, current_month)
-                    
-                    return {**default_usage, **usage}
-            else:
-                return default_usage
+                
+                # Reset if new month
+                if usage.get("current_month") != current_month:
+                    usage = UsageTracker._reset_monthly_usage(usage, current_month)
+                
+                return {**default_usage, **usage}
         except Exception as e:
             print(f"Error loading usage data: {e}")
-            return default_usage
+        return default_usage
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return copy.deepcopy(self._state())
+    
+    def replace(self, usage_data: Dict[str, Any]) -> bool:
+        with self._lock:
+            self._usage = copy.deepcopy(usage_data)
+            self._dirty = True
+        return self.flush()
+    
+    # === SZÁMLÁLÁS ===
+    
+    def track(self, provider: str, request_count: int, reservation: Optional[QuotaReservation] = None) -> None:
+        key = UsageTracker._usage_key(provider)
+        today = datetime.now().strftime("%Y-%m-%d")
+        
+        with self._lock:
+            usage = self._state()
+            stats = usage.get(key)
+            if stats is not None:
+                stats["requests_this_month"] = stats.get("requests_this_month", 0) + request_count
+                stats["last_request"] = datetime.now().isoformat()
+                breakdown = stats.setdefault("daily_breakdown", {})
+                breakdown[today] = breakdown.get(today, 0) + request_count
+                
+                if key == "meteostat":
+                    stats["estimated_cost_usd"] = (
+                        stats["requests_this_month"] * ProviderConfig.METEOSTAT_COST_PER_REQUEST
+                    )
+            
+            usage["total_requests"] = usage.get("total_requests", 0) + request_count
+            if self._owns(reservation, key):
+                reservation.remaining -= min(reservation.remaining, request_count)
+            self._mark_dirty()
+    
+    # === KVÓTA ===
+    
+    def _used(self, key: str) -> int:
+        return self._state().get(key, {}).get("requests_this_month", 0)
+    
+    def _reserved(self, key: str) -> int:
+        return sum(reservation.remaining for reservation in self._reservations.get(key, []))
+    
+    def remaining(self, provider: str, include_reserved: bool = False) -> Optional[int]:
+        """Szabad (nem felhasznált és nem lefoglalt) kvóta, None ha a provider korlátlan."""
+        key = UsageTracker._usage_key(provider)
+        limit = UsageTracker.MONTHLY_LIMITS.get(key)
+        if limit is None:
+            return None
+        with self._lock:
+            reserved = 0 if include_reserved else self._reserved(key)
+            return max(0, limit - self._used(key) - reserved)
+    
+    def reserve(self, provider: str, count: int) -> Optional[QuotaReservation]:
+        key = UsageTracker._usage_key(provider)
+        reservation = QuotaReservation(key, count)
+        if key not in UsageTracker.MONTHLY_LIMITS:
+            reservation.remaining = 0  # korlátlan provider - nincs mit lefoglalni
+            return reservation
+        
+        with self._lock:
+            if self.remaining(key) < count:
+                return None
+            self._reservations.setdefault(key, []).append(reservation)
+        return reservation
+    
+    def release(self, reservation: QuotaReservation) -> None:
+        with self._lock:
+            if reservation.released:
+                return
+            reservation.released = True
+            reservation.remaining = 0
+            reservations = self._reservations.get(reservation.provider, [])
+            if reservation in reservations:
+                reservations.remove(reservation)
+    
+    def has_budget(self, provider: str, request_count: int,
+                   reservation: Optional[QuotaReservation] = None) -> bool:
+        """
+        Kemény korlát: a saját foglalás maradékából és a szabad (más foglalásaitól
+        mentes) kvótából futhat-e a kérés.
+        """
+        key = UsageTracker._usage_key(provider)
+        if key not in UsageTracker.MONTHLY_LIMITS:
+            return True
+        with self._lock:
+            own = reservation.remaining if self._owns(reservation, key) else 0
+            return own + self.remaining(key) >= request_count
+    
+    @staticmethod
+    def _owns(reservation: Optional[QuotaReservation], key: str) -> bool:
+        return reservation is not None and not reservation.released and reservation.provider == key
+    
+    # === MENTÉS ===
+    
+    def _mark_dirty(self) -> None:
+        self._dirty = True
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(ProviderConfig.USAGE_FLUSH_INTERVAL, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def flush(self) -> bool:
+        """Függő változások atomikus mentése (ideiglenes fájl + os.replace)."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty or self._usage is None:
+                return True
+            
+            try:
+                ensure_directories()
+                self._usage["last_updated"] = datetime.now().isoformat()
+                temp_file = USAGE_TRACKING_FILE.with_name(USAGE_TRACKING_FILE.name + ".tmp")
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self._usage, f, indent=2, ensure_ascii=False)
+                os.replace(temp_file, USAGE_TRACKING_FILE)
+                self._dirty = False
+                return True
+            except Exception as e:
+                print(f"Error saving usage data: {e}")
+                return False
+
+
+_usage_store_instance: Optional[_UsageStore] = None
+_usage_store_lock = threading.Lock()
+
+
+def _usage_store() -> _UsageStore:
+    global _usage_store_instance
+    with _usage_store_lock:
+        if _usage_store_instance is None:
+            _usage_store_instance = _UsageStore()
+        return _usage_store_instance
+
+
+class UsageTracker:
+    """
+    API usage tracking for Provider Selector
+    
+    💾 In-memory, szálbiztos számlálás periodikus atomikus mentéssel
+    🛑 Kvóta őr: reserve() a batch indítása előtt, has_budget() kérésenként
+    """
+    
+    # Havi kérés limitek (usage kulcs szerint) - a többi provider korlátlan
+    MONTHLY_LIMITS = {"meteostat": APIConfig.METEOSTAT_MONTHLY_LIMIT}
+    
+    @staticmethod
+    def _usage_key(provider: str) -> str:
+        """Provider azonosító → usage fájl kulcs ("open-meteo" → "open_meteo")."""
+        return provider.replace("-", "_")
+    
+    @staticmethod
+    def load_usage_data() -> Dict[str, Any]:
+        """
+        Load API usage tracking data
+        
+        Returns:
+            Dictionary with usage statistics (a memóriabeli állapot másolata)
+        """
+        return _usage_store().snapshot()
     
     @staticmethod
     def save_usage_data(usage_data: Dict[str, Any]) -> bool:
@@ -446,59 +856,78 @@ class UsageTracker:
         Returns:
             True if saved successfully, False otherwise
         """
-        try:
-            ensure_directories()
-            usage_data["last_updated"] = datetime.now().isoformat()
-            
-            with open(USAGE_TRACKING_FILE, 'w', encoding='utf-8') as f:
-                json.dump(usage_data, f, indent=2, ensure_ascii=False)
-            return True
-        except Exception as e:
-            print(f"Error saving usage data: {e}")
-            return False
+        return _usage_store().replace(usage_data)
     
     @staticmethod
-    def track_request(provider: str, request_count: int = 1) -> Dict[str, Any]:
+    def track_request(provider: str, request_count: int = 1,
+                      reservation: Optional[QuotaReservation] = None) -> Dict[str, Any]:
         """
         Track API request usage
         
         Args:
             provider: Provider name ("open-meteo" or "meteostat")
             request_count: Number of requests to track
+            reservation: Foglalás, amelyből a kérések fogynak (None: szabad kvóta)
             
         Returns:
             Updated usage statistics
         """
-        usage = UsageTracker.load_usage_data()
-        today = datetime.now().strftime("%Y-%m-%d")
-        now = datetime.now().isoformat()
+        _usage_store().track(provider, request_count, reservation)
+        return UsageTracker.load_usage_data()
+    
+    @staticmethod
+    def record_requests(provider: str, request_count: int = 1,
+                        reservation: Optional[QuotaReservation] = None) -> None:
+        """
+        Kérések számlálása másolat visszaadása nélkül (hálózati réteg, kérésenként).
         
-        if provider in usage:
-            # Update provider-specific stats
-            usage[provider]["requests_this_month"] += request_count
-            usage[provider]["last_request"] = now
-            
-            # Update daily breakdown
-            if "daily_breakdown" not in usage[provider]:
-                usage[provider]["daily_breakdown"] = {}
-            
-            if today not in usage[provider]["daily_breakdown"]:
-                usage[provider]["daily_breakdown"][today] = 0
-            usage[provider]["daily_breakdown"][today] += request_count
-            
-            # Update Meteostat cost estimation
-            if provider == "meteostat":
-                cost_per_request = ProviderConfig.METEOSTAT_COST_PER_REQUEST
-                usage[provider]["estimated_cost_usd"] = (
-                    usage[provider]["requests_this_month"] * cost_per_request
-                )
+        Args:
+            reservation: A kérést indító foglalás - csak ez fogy (lásd active_reservation)
+        """
+        _usage_store().track(provider, request_count, reservation)
+    
+    @staticmethod
+    def remaining_quota(provider: str, include_reserved: bool = False) -> Optional[int]:
+        """
+        Szabad havi kvóta, None ha korlátlan.
         
-        # Update total
-        usage["total_requests"] += request_count
+        Args:
+            include_reserved: A lefoglalt (futó batch-ekhez tartozó) keretet is szabadnak tekinti
+        """
+        return _usage_store().remaining(provider, include_reserved)
+    
+    @staticmethod
+    def reserve(provider: str, request_count: int) -> Optional[QuotaReservation]:
+        """
+        Kvóta lefoglalása egy batch indítása előtt.
+        
+        Returns:
+            QuotaReservation, vagy None ha a szabad kvóta nem elég
+        """
+        return _usage_store().reserve(provider, request_count)
+    
+    @staticmethod
+    def has_budget(provider: str, request_count: int = 1,
+                   reservation: Optional[QuotaReservation] = None) -> bool:
+        """
+        Kemény kvóta őr: elküldhető-e most request_count kérés.
         
-        # Save and return
-        UsageTracker.save_usage_data(usage)
-        return usage
+        Foglalás nélkül csak a szabad (nem lefoglalt) kvóta számít.
+        """
+        return _usage_store().has_budget(provider, request_count, reservation)
+    
+    @staticmethod
+    def active_reservation(provider: str) -> Optional[QuotaReservation]:
+        """Az aktuális kontextushoz kötött (applied / bind) foglalás, ha erre a providerre szól."""
+        reservation = _active_reservation.get()
+        if reservation is None or reservation.provider != UsageTracker._usage_key(provider):
+            return None
+        return reservation
+    
+    @staticmethod
+    def save() -> bool:
+        """Függő usage változások azonnali mentése (pl. alkalmazás leállításkor)."""
+        return _usage_store().flush()
     
     @staticmethod
     def get_usage_summary() -> Dict[str, Any]:
@@ -508,19 +937,27 @@ class UsageTracker:
         Returns:
             Dictionary with usage summary
         """
-        usage = UsageTracker.load_usage_data()
+        store = _usage_store()
+        with store._lock:
+            usage = store._state()
+            meteostat_usage = usage.get("meteostat", {})
+            meteostat_requests = meteostat_usage.get("requests_this_month", 0)
+            meteostat_reserved = store._reserved("meteostat")
+            meteostat_cost = meteostat_usage.get("estimated_cost_usd", 0.0)
+            openmeteo_requests = usage.get("open_meteo", {}).get("requests_this_month", 0)
+            total_requests = usage.get("total_requests", 0)
         
-        meteostat_requests = usage.get("meteostat", {}).get("requests_this_month", 0)
         meteostat_limit = APIConfig.METEOSTAT_MONTHLY_LIMIT
         meteostat_percentage = (meteostat_requests / meteostat_limit) * 100
         
         return {
             "meteostat_requests": meteostat_requests,
+            "meteostat_reserved": meteostat_reserved,
             "meteostat_limit": meteostat_limit,
             "meteostat_percentage": meteostat_percentage,
-            "meteostat_cost": usage.get("meteostat", {}).get("estimated_cost_usd", 0.0),
-            "openmeteo_requests": usage.get("open_meteo", {}).get("requests_this_month", 0),
-            "total_requests": usage.get("total_requests", 0),
+            "meteostat_cost": meteostat_cost,
+            "openmeteo_requests": openmeteo_requests,
+            "total_requests": total_requests,
             "warning_level": UsageTracker._get_warning_level(meteostat_percentage),
             "days_remaining": UsageTracker._get_days_remaining_in_month()
         }
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Adaptive Concurrency - AIMD párhuzamosság szabályzó Retry-After támogatással
+Global Weather Analyzer projekt
+
+📈 AIMD: Egészséges válaszoknál additív növelés (+1 kérés / teljes ablaknyi siker),
+   429/5xx válasznál multiplikatív csökkentés (felezés)
+⏱️ TEMPÓ: A kérésindítások közti minimális idő ugyanígy adaptív (fix sleep helyett)
+🛑 RETRY-AFTER: 429/503 válasz Retry-After fejléce alatt a provider minden kérése vár
+🌍 FOLYAMAT SZINTŰ: Provider-enként egy szabályzó - minden WeatherClient és a
+   MultiCityEngine párhuzamos lekérései ugyanazon a korláton osztoznak
+
+Használat:
+    limiter = get_adaptive_limiter("open-meteo")
+    with limiter.slot() as slot:
+        response = session.get(...)
+        slot.report(response.status_code, response.headers.get("Retry-After"))
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Any, Iterator, Union
+
+from ..config import APIConfig
+
+logger = logging.getLogger(__name__)
+
+# Torlódást jelző HTTP státuszok (multiplikatív csökkentés)
+CONGESTION_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[Union[str, int, float]]) -> Optional[float]:
+    """
+    Retry-After fejléc értelmezése (másodperc vagy HTTP dátum).
+
+    Returns:
+        Várakozás másodpercben (0 - RETRY_AFTER_MAX), vagy None ha nincs/érvénytelen
+    """
+    if value is None or value == "":
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        try:
+            retry_at = parsedate_to_datetime(str(value))
+        except (TypeError, ValueError, IndexError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), APIConfig.RETRY_AFTER_MAX)
+
+
+class _Slot:
+    """Egy lefoglalt kérés hely - a kimenetelt a report() rögzíti."""
+
+    __slots__ = ("status_code", "retry_after", "failed", "started_at")
+
+    def __init__(self):
+        self.started_at = 0.0
+        self.status_code: Optional[int] = None
+        self.retry_after: Optional[float] = None
+        self.failed = False
+
+    def report(self, status_code: int, retry_after: Optional[Union[str, int, float]] = None) -> None:
+        self.status_code = status_code
+        self.retry_after = parse_retry_after(retry_after)
+
+
+class AdaptiveLimiter:
+    """
+    Egy provider AIMD szabályzója.
+
+    A limit lebegőpontos: sikerenként 1/limit-tel nő (teljes ablaknyi siker = +1),
+    torlódásnál a csökkentési szorzóval esik. A kérésindítási intervallum
+    hasonlóan viselkedik, így a szabályzó a provider valódi korlátja körül marad.
+    Egy torlódási eseményre csak egyszer csökkent: az utolsó csökkentés előtt
+    indult kérések 429/5xx válaszai (ugyanaz a túllövés) csak a Retry-After-t frissítik.
+    """
+
+    def __init__(self, provider_id: str, initial: int = 4, minimum: int = 1, maximum: int = 16,
+                 initial_interval: float = 0.1, max_interval: float = 10.0,
+                 decrease_factor: float = APIConfig.AIMD_DECREASE_FACTOR):
+        self.provider_id = provider_id
+        self.min_limit = float(minimum)
+        self.max_limit = float(maximum)
+        self.max_interval = max_interval
+        self.decrease_factor = decrease_factor
+
+        self._limit = float(min(max(initial, minimum), maximum))
+        self._interval = initial_interval
+        self._in_flight = 0
+        self._next_start = 0.0
+        self._blocked_until = 0.0
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+
+        self._stats = {"requests": 0, "successes": 0, "congestion": 0, "errors": 0,
+                       "retry_after_waits": 0, "wait_seconds": 0.0}
+
+    # === LEFOGLALÁS ===
+
+    def acquire(self) -> float:
+        """
+        Várakozás szabad helyre, a tempó intervallumra és egy esetleges Retry-After tiltásra.
+
+        Returns:
+            A kérés indulási ideje (monotonic)
+        """
+        waited_from = time.monotonic()
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if self._in_flight >= int(self._limit):
+                    self._condition.wait()
+                    continue
+
+                ready_at = max(self._next_start, self._blocked_until)
+                if now < ready_at:
+                    self._condition.wait(ready_at - now)
+                    continue
+
+                self._in_flight += 1
+                self._next_start = now + self._interval
+                self._stats["requests"] += 1
+                self._stats["wait_seconds"] += now - waited_from
+                return now
+
+    def release(self, slot: _Slot) -> None:
+        """Kimenetel alapján a limit és a tempó igazítása, hely felszabadítása."""
+        with self._condition:
+            self._in_flight = max(0, self._in_flight - 1)
+            now = time.monotonic()
+
+            if slot.status_code in CONGESTION_STATUS_CODES:
+                self._on_congestion(slot, now)
+            elif slot.failed or slot.status_code is None:
+                # Hálózati hiba / timeout - torlódásnak tekintjük, de Retry-After nélkül
+                self._stats["errors"] += 1
+                if slot.started_at >= self._last_decrease:
+                    self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+                    self._last_decrease = now
+            elif slot.status_code < 400:
+                self._on_success()
+
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self) -> Iterator[_Slot]:
+        """Kérés hely context managerként - kivétel esetén hibaként rögzítve."""
+        slot = _Slot()
+        slot.started_at = self.acquire()
+        try:
+            yield slot
+        except BaseException:
+            if slot.status_code is None:
+                slot.failed = True
+            raise
+        finally:
+            self.release(slot)
+
+    # === AIMD ===
+
+    def _on_success(self) -> None:
+        self._stats["successes"] += 1
+        self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+        # Tempó: lassú visszaállás (additív csökkentés az intervallum 5%-ával, 0 felé)
+        self._interval = max(0.0, self._interval - max(0.005, self._interval * 0.05))
+
+    def _on_congestion(self, slot: _Slot, now: float) -> None:
+        self._stats["congestion"] += 1
+
+        retry_after = slot.retry_after
+        if retry_after is None and slot.status_code == 429:
+            retry_after = APIConfig.RETRY_AFTER_DEFAULT
+        if retry_after:
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+            self._stats["retry_after_waits"] += 1
+
+        if slot.started_at < self._last_decrease:
+            # Ugyanannak a túllövésnek egy korábban indult kérése - már csökkentettünk
+            return
+
+        previous_limit = self._limit
+        self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+        self._interval = min(self.max_interval, max(self._interval * 2, 0.1))
+        self._last_decrease = now
+
+        logger.warning(
+            f"📉 {self.provider_id}: HTTP {slot.status_code} - párhuzamosság {previous_limit:.1f} → {self._limit:.1f}, "
+            f"tempó {self._interval:.2f}s" + (f", várakozás {retry_after:.1f}s (Retry-After)" if retry_after else "")
+        )
+
+    # === ÁLLAPOT ===
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._condition:
+            stats = dict(self._stats)
+            stats.update({
+                "limit": round(self._limit, 2),
+                "in_flight": self._in_flight,
+                "interval": round(self._interval, 3),
+                "blocked_for": max(0.0, self._blocked_until - time.monotonic()),
+            })
+            return stats
+
+
+# === KÖZÖS PÉLDÁNYOK (provider-enként) ===
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_adaptive_limiter(provider_id: str) -> AdaptiveLimiter:
+    """A provider folyamat szintű AIMD szabályzója (konfiguráció: APIConfig.ADAPTIVE_CONCURRENCY)."""
+    with _limiters_lock:
+        limiter = _limiters.get(provider_id)
+        if limiter is None:
+            settings = APIConfig.ADAPTIVE_CONCURRENCY.get(provider_id, {})
+            limiter = AdaptiveLimiter(
+                provider_id,
+                initial=settings.get("initial", 4),
+                minimum=settings.get("min", 1),
+                maximum=settings.get("max", 16),
+                initial_interval=settings.get("initial_interval", 0.1),
+                max_interval=settings.get("max_interval", 10.0),
+            )
+            _limiters[provider_id] = limiter
+        return limiter
+
+
+def get_concurrency_stats() -> Dict[str, Dict[str, Any]]:
+    """Minden provider szabályzó állapota."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {provider_id: limiter.get_stats() for provider_id, limiter in limiters.items()}
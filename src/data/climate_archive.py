@@ -0,0 +1,651 @@
+#!/usr/bin/env python3
+"""
+Climate Archive - Memory-mapped napi klíma archívum a magyar településekre
+Global Weather Analyzer projekt
+
+🗄️ ELRENDEZÉS: település × nap × változó folytonos int16 tömb (.npy memmap) a
+   hungarian_settlements.db összes településére, 1940-től egy fix nap tengelyen
+🗜️ TÖMÖRÍTETT KÓDOLÁS: változónként skálázott int16 (pl. 0.01 °C), a "lekérve,
+   de nincs érték" jelölése külön sentinel - a napi rekord 14 bájt
+✅ LEFEDETTSÉG: település × nap uint8 bitmaszk (változónként egy bit) - a nulla
+   kezdőérték = még nem lekérve, így a fájlok ritkák (sparse) maradnak
+🔁 INKREMENTÁLIS TÖLTÉS: read_through() csak a hiányzó időszakokat kéri le a
+   providerektől; a multi-city lekérések napi eredményei is beíródnak
+⚡ ZERO-COPY: raw() / day_view() a memmap nézetét adja (nincs másolás); a float
+   dekódolás csak a kért szeletet érinti
+⏳ VÉGLEGESÍTÉS: az utolsó FINALIZATION_LAG_DAYS nap sosem archiválódik (a
+   provider még pótolhatja) - ezek mindig élőben jönnek
+
+Használat:
+    archive = get_climate_archive(hungarian_db_path)
+    series = archive.read_through(settlement_id, "1980-01-01", "2024-12-31",
+                                  lambda start, end: client.get_weather_data(lat, lon, start, end))
+    ids, values = archive.day_values("1983-07-27", "temperature_2m_max", archive.settlement_ids("Baranya"))
+"""
+
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Callable, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..config import ClimateArchiveConfig
+from .weather_columns import WeatherColumns
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_VERSION = 1
+ARCHIVE_SOURCE = "climate-archive"
+
+# "Lekérve, de a provider nem adott értéket" (a lefedettségi bit be van állítva)
+NODATA = np.int16(-32768)
+_INT16_LIMIT = 32767
+
+
+def _to_day(value: Union[str, date, np.datetime64]) -> np.datetime64:
+    if isinstance(value, np.datetime64):
+        return value.astype("datetime64[D]")
+    return np.datetime64(str(value)[:10], "D")
+
+
+def _day_string(day: np.datetime64) -> str:
+    return str(day.astype("datetime64[D]"))
+
+
+def _true_runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """Egybefüggő True szakaszok [kezdet, vég) indexpárjai (vektorizált)."""
+    if not mask.any():
+        return []
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    return list(zip(np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist()))
+
+
+class ClimateArchive:
+    """
+    Település × nap × változó memmap archívum.
+
+    A tömb sora a település (id szerint rendezve), a nap tengely START_DATE-től
+    END_DATE-ig tart. Írás zár alatt, olvasás zár nélkül (memmap nézetek).
+    """
+
+    def __init__(self, hungarian_db_path: Union[str, Path],
+                 directory: Optional[Union[str, Path]] = None):
+        self.hungarian_db_path = Path(hungarian_db_path)
+        self.directory = Path(directory or ClimateArchiveConfig.DIRECTORY)
+        self.variables: Tuple[str, ...] = tuple(ClimateArchiveConfig.VARIABLES)
+        self.scales = np.array([ClimateArchiveConfig.VARIABLES[name] for name in self.variables], dtype=np.float64)
+        self.start_day = _to_day(ClimateArchiveConfig.START_DATE)
+        self.end_day = _to_day(ClimateArchiveConfig.END_DATE)
+        self.day_count = int((self.end_day - self.start_day).astype(np.int64)) + 1
+
+        self._lock = threading.Lock()
+        self._variable_index = {name: index for index, name in enumerate(self.variables)}
+
+        self._load_settlements()
+        self._open_or_create()
+
+    # === TELEPÜLÉSEK ===
+
+    def _load_settlements(self) -> None:
+        with sqlite3.connect(f"file:{self.hungarian_db_path}?mode=ro", uri=True) as conn:
+            rows = conn.execute(
+                "SELECT id, name, latitude, longitude, megye, COALESCE(population, 0) "
+                "FROM hungarian_settlements WHERE latitude IS NOT NULL AND longitude IS NOT NULL ORDER BY id"
+            ).fetchall()
+
+        self.settlement_id_array = np.array([row[0] for row in rows], dtype=np.int64)
+        self.latitudes = np.array([row[2] for row in rows], dtype=np.float64)
+        self.longitudes = np.array([row[3] for row in rows], dtype=np.float64)
+        self.megyek = np.array([row[4] or "" for row in rows], dtype=object)
+        self._rows: Dict[int, int] = {int(row[0]): index for index, row in enumerate(rows)}
+
+        # Név → id (azonos nevű településeknél a népesebb nyer)
+        self._names: Dict[str, int] = {}
+        populations: Dict[str, int] = {}
+        for settlement_id, name, _, _, _, population in rows:
+            key = (name or "").casefold()
+            if key not in self._names or population > populations[key]:
+                self._names[key] = settlement_id
+                populations[key] = population
+
+        self._coordinates: Dict[Tuple[float, float], int] = {
+            (round(row[2], 4), round(row[3], 4)): row[0] for row in rows
+        }
+
+    def settlement_id_for_name(self, name: str) -> Optional[int]:
+        """Település azonosító név alapján (kis/nagybetű független)."""
+        return self._names.get((name or "").strip().casefold())
+
+    def settlement_id_at(self, latitude: float, longitude: float) -> Optional[int]:
+        """Település azonosító pontos (4 tizedesre kerekített) koordináta egyezéssel."""
+        return self._coordinates.get((round(float(latitude), 4), round(float(longitude), 4)))
+
+    def settlement_ids(self, megye: Optional[str] = None) -> np.ndarray:
+        """Az archívum települései (opcionálisan egy megyére szűrve)."""
+        if megye is None:
+            return self.settlement_id_array
+        return self.settlement_id_array[self.megyek == megye]
+
+    def _row_indices(self, settlement_ids: Sequence[Optional[int]]) -> np.ndarray:
+        """Azonosítók → sor indexek (-1 ha nincs az archívumban)."""
+        return np.array([self._rows.get(int(sid), -1) if sid is not None else -1 for sid in settlement_ids],
+                        dtype=np.int64)
+
+    # === FÁJLOK ===
+
+    @property
+    def _values_path(self) -> Path:
+        return self.directory / "values.npy"
+
+    @property
+    def _coverage_path(self) -> Path:
+        return self.directory / "coverage.npy"
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.directory / "archive.json"
+
+    def _expected_meta(self) -> Dict[str, Any]:
+        return {
+            "version": ARCHIVE_VERSION,
+            "start_date": _day_string(self.start_day),
+            "end_date": _day_string(self.end_day),
+            "variables": dict(zip(self.variables, self.scales.tolist())),
+            "settlement_ids": self.settlement_id_array.tolist(),
+        }
+
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        if not (self._meta_path.exists() and self._values_path.exists() and self._coverage_path.exists()):
+            return None
+        try:
+            return json.loads(self._meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _open_or_create(self) -> None:
+        """
+        Archívum megnyitása; változott településkészletnél soronkénti migráció.
+
+        Csak formátum változás (verzió, időtengely, változók / skálák) építi újra az archívumot.
+        """
+        expected = self._expected_meta()
+        shape = (len(self.settlement_id_array), self.day_count, len(self.variables))
+
+        existing = self._read_meta()
+        same_layout = existing is not None and all(
+            existing.get(key) == expected[key] for key in ("version", "start_date", "end_date", "variables"))
+
+        if same_layout and existing.get("settlement_ids") != expected["settlement_ids"]:
+            try:
+                self._migrate_settlements(existing.get("settlement_ids") or [], shape)
+                self._meta_path.write_text(json.dumps(expected), encoding="utf-8")
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Klíma archívum migráció sikertelen: {e} - újraépítés")
+                same_layout = False
+
+        if not same_layout:
+            if existing is not None:
+                logger.warning("🗄️ Klíma archívum formátuma változott (verzió / időtengely / változók) - újraépítés")
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # open_memmap ritka fájlt hoz létre: a nulla kezdőérték = nincs lefedettség
+            np.lib.format.open_memmap(self._values_path, mode="w+", dtype=np.int16, shape=shape).flush()
+            np.lib.format.open_memmap(self._coverage_path, mode="w+", dtype=np.uint8, shape=shape[:2]).flush()
+            self._meta_path.write_text(json.dumps(expected), encoding="utf-8")
+            logger.info(f"🗄️ Klíma archívum létrehozva: {shape[0]} település × {shape[1]} nap × {shape[2]} változó")
+
+        self.values = np.load(self._values_path, mmap_mode="r+")
+        self.coverage = np.load(self._coverage_path, mmap_mode="r+")
+
+    def _migrate_settlements(self, previous_ids: Sequence[int], shape: Tuple[int, int, int]) -> None:
+        """
+        Sorok átrendezése az új településkészletre (settlement_id szerint).
+
+        Csak a lefedett szakaszok másolódnak (a fájlok ritkák maradnak); a megszűnt
+        települések sorai elmaradnak, az újak üresen indulnak. Az új fájlok a régiek
+        helyére atomikusan kerülnek.
+        """
+        old_values = np.load(self._values_path, mmap_mode="r")
+        old_coverage = np.load(self._coverage_path, mmap_mode="r")
+        if old_values.shape != (len(previous_ids),) + shape[1:] or old_coverage.shape != (len(previous_ids), shape[1]):
+            raise ValueError(f"a régi tömbök mérete nem egyezik a metaadattal ({old_values.shape})")
+
+        values_tmp = self.directory / "values.migrating.npy"
+        coverage_tmp = self.directory / "coverage.migrating.npy"
+        new_values = np.lib.format.open_memmap(values_tmp, mode="w+", dtype=np.int16, shape=shape)
+        new_coverage = np.lib.format.open_memmap(coverage_tmp, mode="w+", dtype=np.uint8, shape=shape[:2])
+
+        previous_rows = {int(sid): row for row, sid in enumerate(previous_ids)}
+        kept = 0
+        for new_row, settlement_id in enumerate(self.settlement_id_array.tolist()):
+            old_row = previous_rows.get(settlement_id)
+            if old_row is None:
+                continue
+            runs = _true_runs(np.asarray(old_coverage[old_row]) != 0)
+            for run_start, run_end in runs:
+                new_values[new_row, run_start:run_end] = old_values[old_row, run_start:run_end]
+                new_coverage[new_row, run_start:run_end] = old_coverage[old_row, run_start:run_end]
+            kept += 1 if runs else 0
+
+        new_values.flush()
+        new_coverage.flush()
+        del new_values, new_coverage, old_values, old_coverage
+        os.replace(values_tmp, self._values_path)
+        os.replace(coverage_tmp, self._coverage_path)
+
+        dropped = len(set(previous_rows) - set(self._rows))
+        logger.info(f"🗄️ Klíma archívum migrálva: {shape[0]} település ({kept} adattal megtartva, "
+                    f"{dropped} megszűnt, {len(set(self._rows) - set(previous_rows))} új)")
+
+    def flush(self) -> None:
+        with self._lock:
+            self.values.flush()
+            self.coverage.flush()
+
+    # === IDŐTENGELY ===
+
+    def _day_index(self, day: Union[str, date, np.datetime64]) -> int:
+        return int((_to_day(day) - self.start_day).astype(np.int64))
+
+    def _last_final_index(self) -> int:
+        """Az utolsó archiválható nap indexe (a véglegesítési késleltetésen túl)."""
+        last_final = np.datetime64(date.today() - timedelta(days=ClimateArchiveConfig.FINALIZATION_LAG_DAYS), "D")
+        return min(self.day_count - 1, self._day_index(last_final))
+
+    def _variable_mask(self, variables: Optional[Sequence[str]]) -> Tuple[np.ndarray, int]:
+        """Változó nevek → (oszlop indexek, lefedettségi bitmaszk). Ismeretlen változó nem számít."""
+        names = self.variables if variables is None else [name for name in variables if name in self._variable_index]
+        indices = np.array([self._variable_index[name] for name in names], dtype=np.int64)
+        bits = 0
+        for index in indices.tolist():
+            bits |= 1 << index
+        return indices, bits
+
+    # === ZERO-COPY NÉZETEK ===
+
+    def raw(self, settlement_id: int, start_date: str, end_date: str) -> Optional[np.ndarray]:
+        """Egy település nyers int16 (nap × változó) szelete - memmap nézet, nincs másolás."""
+        row = self._rows.get(int(settlement_id))
+        if row is None:
+            return None
+        first, last = max(0, self._day_index(start_date)), min(self.day_count - 1, self._day_index(end_date))
+        return self.values[row, first:last + 1, :]
+
+    def day_view(self, day: Union[str, date]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Egy nap összes települése: (int16 település × változó, lefedettség) memmap nézetek."""
+        index = self._day_index(day)
+        if not 0 <= index < self.day_count:
+            return None
+        return self.values[:, index, :], self.coverage[:, index]
+
+    # === DEKÓDOLÁS ===
+
+    def _decode(self, raw: np.ndarray, coverage: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        """int16 → float64 a kért változókra; NODATA és a nem lefedett változó → NaN."""
+        selected = raw[..., indices]
+        decoded = selected.astype(np.float64) * self.scales[indices]
+        covered = (coverage[..., None] >> indices.astype(np.uint8)) & 1
+        decoded[(selected == NODATA) | (covered == 0)] = np.nan
+        return decoded
+
+    def day_values(self, day: Union[str, date], variable: str,
+                   settlement_ids: Optional[Sequence[Optional[int]]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Egy változó egy napra, településenként.
+
+        Returns:
+            (település azonosítók, float64 értékek - NaN ahol nincs lefedve vagy nincs érték)
+        """
+        ids = self.settlement_id_array if settlement_ids is None else np.asarray(
+            [-1 if sid is None else sid for sid in settlement_ids], dtype=np.int64)
+        values = np.full(len(ids), np.nan)
+        view = self.day_view(day)
+        if view is None or variable not in self._variable_index:
+            return ids, values
+
+        raw, coverage = view
+        rows = self._row_indices(ids.tolist()) if settlement_ids is not None else np.arange(len(ids))
+        known = rows >= 0
+        indices = np.array([self._variable_index[variable]])
+        values[known] = self._decode(raw[rows[known]], coverage[rows[known]], indices)[:, 0]
+        return ids, values
+
+    def day_records(self, day: Union[str, date], settlement_ids: Sequence[Optional[int]],
+                    variables: Optional[Sequence[str]] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Több változó egy napra a megadott településekre.
+
+        Returns:
+            (lefedett maszk - minden kért változó lekérve, változó → float64 értékek)
+        """
+        indices, bits = self._variable_mask(variables)
+        names = [self.variables[index] for index in indices.tolist()]
+        covered = np.zeros(len(settlement_ids), dtype=bool)
+        columns = {name: np.full(len(settlement_ids), np.nan) for name in names}
+
+        view = self.day_view(day)
+        if view is None or self._day_index(day) > self._last_final_index():
+            return covered, columns
+
+        raw, coverage = view
+        rows = self._row_indices(settlement_ids)
+        known = np.flatnonzero(rows >= 0)
+        day_coverage = coverage[rows[known]]
+        covered[known] = (day_coverage & bits) == bits
+
+        decoded = self._decode(raw[rows[known]], day_coverage, indices)
+        for position, name in enumerate(names):
+            columns[name][known] = decoded[:, position]
+        return covered, columns
+
+    # === LEFEDETTSÉG ===
+
+    def missing_ranges(self, settlement_id: int, start_date: str, end_date: str,
+                       variables: Optional[Sequence[str]] = None) -> List[Tuple[str, str]]:
+        """
+        A kért (archiválható) időszak le nem kért darabjai (YYYY-MM-DD párok).
+
+        A tengelyen kívüli és a véglegesítési késleltetésen belüli napok nem szerepelnek.
+        """
+        row = self._rows.get(int(settlement_id))
+        if row is None:
+            return []
+        first = max(0, self._day_index(start_date))
+        last = min(self._last_final_index(), self._day_index(end_date))
+        if first > last:
+            return []
+
+        _, bits = self._variable_mask(variables)
+        missing = (self.coverage[row, first:last + 1] & bits) != bits
+        return [
+            (_day_string(self.start_day + first + run_start), _day_string(self.start_day + first + run_end - 1))
+            for run_start, run_end in _true_runs(missing)
+        ]
+
+    # === ÍRÁS ===
+
+    def _encode(self, values: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        scaled = np.rint(values / self.scales[indices])
+        encoded = np.clip(np.nan_to_num(scaled, nan=0.0), -_INT16_LIMIT, _INT16_LIMIT).astype(np.int16)
+        encoded[np.isnan(values)] = NODATA
+        return encoded
+
+    def store(self, settlement_id: int, columns: WeatherColumns, start_date: str, end_date: str) -> int:
+        """
+        Egy lekért időszak beírása.
+
+        Csak a válaszban szereplő napok válnak lefedetté (a napon hiányzó változó NODATA,
+        de korábban meglévő érték nem íródik felül NODATA-val). A válaszból kimaradt
+        napok - pl. a provider egy sikertelen al-batch-e - lefedetlenek maradnak, így a
+        következő read_through() újra lekéri őket.
+
+        Returns:
+            Beírt napok száma
+        """
+        row = self._rows.get(int(settlement_id))
+        if row is None:
+            return 0
+        first = max(0, self._day_index(start_date))
+        last = min(self._last_final_index(), self._day_index(end_date))
+        if first > last:
+            return 0
+
+        if not len(columns):
+            return 0
+        length = last - first + 1
+        positions = (columns.dates - self.start_day).astype(np.int64) - first
+        inside = (positions >= 0) & (positions < length)
+        returned = np.unique(positions[inside])
+        if not len(returned):
+            return 0
+
+        block = np.full((length, len(self.variables)), np.nan)
+        for index, name in enumerate(self.variables):
+            column = columns.column(name)
+            if column is not None:
+                block[positions[inside], index] = column[inside]
+
+        all_indices = np.arange(len(self.variables))
+        encoded = self._encode(block[returned], all_indices)
+        days = returned + first
+
+        with self._lock:
+            existing = self.values[row, days, :]
+            previous_bits = self.coverage[row, days]
+            keep = (encoded == NODATA) & (((previous_bits[:, None] >> all_indices.astype(np.uint8)) & 1) == 1)
+            encoded[keep] = existing[keep]
+            self.values[row, days, :] = encoded
+            self.coverage[row, days] = (1 << len(self.variables)) - 1
+
+        return len(returned)
+
+    def store_day(self, day: Union[str, date], settlement_ids: Sequence[int],
+                  columns: Dict[str, Sequence[Optional[float]]]) -> int:
+        """
+        Egy nap értékei több településre (pl. multi-city eredmény).
+
+        Csak a megadott változók lefedettsége áll be - a többi változó nap később tölthető.
+
+        Returns:
+            Beírt települések száma
+        """
+        index = self._day_index(day)
+        if not 0 <= index <= self._last_final_index():
+            return 0
+
+        rows = self._row_indices(settlement_ids)
+        known = np.flatnonzero(rows >= 0)
+        names = [name for name in columns if name in self._variable_index]
+        if not len(known) or not names:
+            return 0
+
+        indices = np.array([self._variable_index[name] for name in names], dtype=np.int64)
+        block = np.array([[np.nan if value is None else value for value in columns[name]] for name in names],
+                         dtype=np.float64).T[known]
+        encoded = self._encode(block, indices)
+        bits = np.uint8(sum(1 << int(i) for i in indices))
+
+        target_rows = rows[known]
+        with self._lock:
+            current = self.values[target_rows, index, :]
+            current[:, indices] = encoded
+            self.values[target_rows, index, :] = current
+            self.coverage[target_rows, index] |= bits
+
+        return len(known)
+
+    # === OLVASÁS ===
+
+    def series(self, settlement_id: int, start_date: str, end_date: str,
+               variables: Optional[Sequence[str]] = None, complete_only: bool = True) -> Optional[WeatherColumns]:
+        """
+        Egy település napi sora a kért időszakra.
+
+        Args:
+            complete_only: True esetén None, ha nem minden nap lefedett; False esetén
+                csak a lefedett napok kerülnek a sorba
+
+        Returns:
+            WeatherColumns (data_source: "climate-archive") vagy None
+        """
+        row = self._rows.get(int(settlement_id))
+        if row is None:
+            return None
+        first = max(0, self._day_index(start_date))
+        last = min(self.day_count - 1, self._day_index(end_date))
+        if first > last:
+            return WeatherColumns.empty(ARCHIVE_SOURCE)
+
+        indices, bits = self._variable_mask(variables)
+        coverage = self.coverage[row, first:last + 1]
+        covered = (coverage & bits) == bits
+        if complete_only and not covered.all():
+            return None
+
+        day_positions = np.flatnonzero(covered)
+        decoded = self._decode(self.values[row, first:last + 1, :][day_positions], coverage[day_positions], indices)
+        dates = self.start_day + first + day_positions
+        return WeatherColumns(
+            dates.astype("datetime64[D]"),
+            {self.variables[index]: decoded[:, position] for position, index in enumerate(indices.tolist())},
+            ARCHIVE_SOURCE
+        )
+
+    def matrix(self, variable: str, start_date: str, end_date: str,
+               settlement_ids: Optional[Sequence[Optional[int]]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Egy változó település × nap mátrixa (klímaindexekhez, tömeges elemzésekhez).
+
+        Returns:
+            (település azonosítók, datetime64[D] napok, float32 (település × nap) - NaN ahol
+            nincs lefedve, nincs érték, vagy a település nincs az archívumban)
+        """
+        ids = self.settlement_id_array if settlement_ids is None else np.asarray(
+            [-1 if sid is None else sid for sid in settlement_ids], dtype=np.int64)
+        first = max(0, self._day_index(start_date))
+        last = min(self.day_count - 1, self._day_index(end_date))
+        dates = (self.start_day + np.arange(first, last + 1)).astype("datetime64[D]")
+        values = np.full((len(ids), len(dates)), np.nan, dtype=np.float32)
+        if variable not in self._variable_index or not len(dates):
+            return ids, dates, values
+
+        rows = self._row_indices(ids.tolist()) if settlement_ids is not None else np.arange(len(ids))
+        known = np.flatnonzero(rows >= 0)
+        column = self._variable_index[variable]
+        raw = self.values[rows[known], first:last + 1, column]
+        covered = (self.coverage[rows[known], first:last + 1] >> np.uint8(column)) & 1
+        decoded = raw.astype(np.float32) * np.float32(self.scales[column])
+        decoded[(raw == NODATA) | (covered == 0)] = np.nan
+        values[known] = decoded
+        return ids, dates, values
+
+    def read_through(self, settlement_id: int, start_date: str, end_date: str,
+                     fetch: Callable[[str, str], Any], variables: Optional[Sequence[str]] = None,
+                     progress: Optional[Callable[[int, int], None]] = None) -> Optional[WeatherColumns]:
+        """
+        Archívumból olvasás, a hiányzó időszakok provider lekérésével és beírásával.
+
+        A még nem végleges utolsó napok mindig élőben jönnek és nem íródnak be.
+        Sikertelen darab lekérés nem szakítja meg a töltést (a darab kimarad).
+
+        Args:
+            fetch: (start, end) → WeatherColumns lekérő (pl. WeatherClient.get_weather_data)
+            progress: (kész darab, összes darab) visszajelzés
+
+        Returns:
+            WeatherColumns vagy None, ha a település nincs az archívumban
+        """
+        if self._rows.get(int(settlement_id)) is None:
+            return None
+
+        chunks: List[Tuple[str, str]] = []
+        chunk = timedelta(days=ClimateArchiveConfig.FETCH_CHUNK_DAYS - 1)
+        for gap_start, gap_end in self.missing_ranges(settlement_id, start_date, end_date, variables):
+            piece_start, gap_end_date = date.fromisoformat(gap_start), date.fromisoformat(gap_end)
+            while piece_start <= gap_end_date:
+                piece_end = min(piece_start + chunk, gap_end_date)
+                chunks.append((piece_start.isoformat(), piece_end.isoformat()))
+                piece_start = piece_end + timedelta(days=1)
+
+        # Nem végleges (vagy tengelyen túli) vég - élő lekérés, archiválás nélkül
+        live_from = max(self._last_final_index() + 1, 0)
+        live_start = self.start_day + live_from
+        live_range = None
+        if _to_day(end_date) >= live_start:
+            live_range = (max(_day_string(live_start), start_date[:10]), end_date[:10])
+
+        total = len(chunks) + (1 if live_range else 0)
+        if chunks:
+            logger.info(f"🗄️ Klíma archívum töltése: település {settlement_id}, {len(chunks)} hiányzó darab")
+
+        for done, (piece_start, piece_end) in enumerate(chunks, start=1):
+            try:
+                fetched = fetch(piece_start, piece_end)
+                if isinstance(fetched, tuple):
+                    fetched = fetched[0]
+                if fetched is not None and not isinstance(fetched, WeatherColumns):
+                    fetched = WeatherColumns.from_records(list(fetched), {name: name for name in self.variables},
+                                                          ARCHIVE_SOURCE)
+                if fetched is not None:
+                    self.store(settlement_id, fetched, piece_start, piece_end)
+            except Exception as e:
+                logger.warning(f"⚠️ Archívum töltési hiba ({settlement_id} {piece_start} → {piece_end}): {e}")
+            if progress:
+                progress(done, total)
+
+        archived_end = _day_string(min(_to_day(end_date), live_start - 1))
+        archived = self.series(settlement_id, start_date, archived_end, variables, complete_only=False)
+
+        if live_range is None:
+            return archived
+        try:
+            live = fetch(*live_range)
+            if isinstance(live, tuple):
+                live = live[0]
+        except Exception as e:
+            logger.warning(f"⚠️ Élő (nem végleges) időszak lekérési hiba {live_range}: {e}")
+            live = None
+        if progress:
+            progress(total, total)
+        if not isinstance(live, WeatherColumns) or not len(live):
+            return archived
+        return WeatherColumns.concat([archived, live], ARCHIVE_SOURCE)
+
+    # === STATISZTIKA ===
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Archívum méret és kitöltöttség (a lefedettségi mátrix egy menetes bejárásával)."""
+        filled_days = int(np.count_nonzero(self.coverage))
+        settlements_with_data = int(np.count_nonzero(self.coverage.any(axis=1)))
+        total_cells = self.coverage.size
+        return {
+            "settlements": len(self.settlement_id_array),
+            "days": self.day_count,
+            "variables": list(self.variables),
+            "filled_settlement_days": filled_days,
+            "fill_ratio": filled_days / total_cells if total_cells else 0.0,
+            "settlements_with_data": settlements_with_data,
+            "logical_size_mb": (self.values.nbytes + self.coverage.nbytes) / 1024 / 1024,
+            "directory": str(self.directory),
+        }
+
+
+# === KÖZÖS PÉLDÁNY ===
+
+_archive_instance: Optional[ClimateArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_climate_archive(hungarian_db_path: Optional[Union[str, Path]] = None) -> Optional[ClimateArchive]:
+    """
+    A folyamat közös klíma archívuma.
+
+    Returns:
+        ClimateArchive vagy None, ha ki van kapcsolva / a települési adatbázis nem elérhető
+    """
+    global _archive_instance
+    if not ClimateArchiveConfig.ENABLED:
+        return None
+
+    with _archive_lock:
+        if _archive_instance is not None:
+            return _archive_instance
+
+        if hungarian_db_path is None:
+            from ..config import DATA_DIR
+            hungarian_db_path = DATA_DIR / "hungarian_settlements.db"
+        if not Path(hungarian_db_path).exists():
+            return None
+
+        try:
+            _archive_instance = ClimateArchive(hungarian_db_path)
+        except (OSError, sqlite3.Error, ValueError) as e:
+            logger.warning(f"⚠️ Klíma archívum nem nyitható meg: {e}")
+            return None
+        return _archive_instance
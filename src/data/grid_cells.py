@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Grid Cells - Település koordináták provider rácscellákra illesztése
+Global Weather Analyzer projekt
+
+🌐 RÁCS ILLESZTÉS: Az Open-Meteo archív adat gridded reanalízis - a szomszédos
+   települések gyakran ugyanarra a rácscellára esnek
+🔁 CELLA DEDUPLIKÁCIÓ: Minden egyedi cellát egyszer kérünk le, az eredményt
+   a cella összes településére szétosztjuk
+💾 ELŐRE SZÁMOLT MAPPING: település → cella tábla a hungarian_settlements.db mellett
+   (settlement_grid_cells tábla, automatikusan újraépül ha a koordináták változnak)
+
+Használat:
+    mapping = SettlementCellMapping(hungarian_db_path)
+    cells = mapping.load("open-meteo")            # settlement_id → GridCell
+    groups = group_locations_by_cell(cities, "open-meteo", cells)
+"""
+
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..config import MultiCityConfig
+
+logger = logging.getLogger(__name__)
+
+# Provider → rácsfelbontás (fok). Hiányzó provider (pl. Meteostat állomások) → nincs rács
+GRID_RESOLUTIONS: Dict[str, float] = {
+    "open-meteo": MultiCityConfig.OPEN_METEO_GRID_RESOLUTION,
+}
+
+
+@dataclass(frozen=True)
+class GridCell:
+    """Egy provider rácscella (egész indexekkel, így hash-elhető és pontos)."""
+    provider_id: str
+    resolution: float
+    lat_index: int
+    lon_index: int
+
+    @property
+    def latitude(self) -> float:
+        """Cella középpont szélesség."""
+        return round(self.lat_index * self.resolution, 6)
+
+    @property
+    def longitude(self) -> float:
+        """Cella középpont hosszúság."""
+        return round(self.lon_index * self.resolution, 6)
+
+    @property
+    def cell_id(self) -> str:
+        return f"{self.provider_id}:{self.resolution:g}:{self.lat_index}:{self.lon_index}"
+
+
+def grid_resolution_for(provider_id: Optional[str]) -> Optional[float]:
+    """Provider rácsfelbontása (None ha a provider nem rács alapú)."""
+    if not provider_id:
+        return None
+    return GRID_RESOLUTIONS.get(provider_id)
+
+
+def snap_indices(latitudes: Union[Sequence[float], np.ndarray],
+                 longitudes: Union[Sequence[float], np.ndarray],
+                 resolution: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Koordináták vektorizált illesztése a legközelebbi rácspontra (egész indexek)."""
+    lat_idx = np.rint(np.asarray(latitudes, dtype=np.float64) / resolution).astype(np.int64)
+    lon_idx = np.rint(np.asarray(longitudes, dtype=np.float64) / resolution).astype(np.int64)
+    return lat_idx, lon_idx
+
+
+def snap_to_cell(provider_id: str, latitude: float, longitude: float,
+                 resolution: Optional[float] = None) -> Optional[GridCell]:
+    """Egy koordináta rácscellája (None ha a provider nem rács alapú)."""
+    resolution = resolution or grid_resolution_for(provider_id)
+    if resolution is None:
+        return None
+    return GridCell(provider_id, resolution,
+                    int(round(latitude / resolution)), int(round(longitude / resolution)))
+
+
+def group_locations_by_cell(locations: Sequence[Dict[str, Any]], provider_id: str,
+                            precomputed: Optional[Dict[int, GridCell]] = None,
+                            id_key: str = "settlement_id",
+                            lat_key: str = "lat", lon_key: str = "lon") -> Optional[Dict[GridCell, List[Dict[str, Any]]]]:
+    """
+    Helyszínek csoportosítása rácscellák szerint.
+
+    Az előre számolt mappingben szereplő településeknél a tárolt cellát
+    használja, a többinél helyben illeszt.
+
+    Returns:
+        Cella → helyszínek (bemeneti sorrendben), vagy None ha a provider nem rács alapú
+    """
+    resolution = grid_resolution_for(provider_id)
+    if resolution is None:
+        return None
+
+    groups: Dict[GridCell, List[Dict[str, Any]]] = {}
+    for location in locations:
+        cell = None
+        if precomputed:
+            settlement_id = location.get(id_key)
+            if settlement_id is not None:
+                cell = precomputed.get(settlement_id)
+        if cell is None:
+            cell = snap_to_cell(provider_id, location[lat_key], location[lon_key], resolution)
+        groups.setdefault(cell, []).append(location)
+
+    return groups
+
+
+class SettlementCellMapping:
+    """
+    Előre számolt település → rácscella mapping a települési adatbázisban.
+
+    A settlement_grid_cells tábla a település koordinátáit is tárolja, így
+    koordináta javítás után (scripts/fix_hungarian_coordinates.py) a mapping
+    automatikusan újraépül. Írásvédett adatbázisnál memóriában számol.
+    """
+
+    TABLE = "settlement_grid_cells"
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self._cache: Dict[Tuple[str, float], Dict[int, GridCell]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, provider_id: str, resolution: Optional[float] = None) -> Dict[int, GridCell]:
+        """
+        settlement_id → GridCell mapping (szükség esetén felépítve).
+
+        Returns:
+            Mapping - üres dict ha a provider nem rács alapú vagy az adatbázis nem elérhető
+        """
+        resolution = resolution or grid_resolution_for(provider_id)
+        if resolution is None or not self.db_path.exists():
+            return {}
+
+        cache_key = (provider_id, resolution)
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            try:
+                mapping = self._load_or_build(provider_id, resolution)
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Rácscella mapping nem elérhető ({self.db_path.name}): {e}")
+                return {}
+
+            self._cache[cache_key] = mapping
+            return mapping
+
+    def build(self, provider_id: str, resolution: Optional[float] = None) -> int:
+        """
+        Mapping (újra)építése és mentése.
+
+        Returns:
+            Leképezett települések száma
+        """
+        resolution = resolution or grid_resolution_for(provider_id)
+        if resolution is None:
+            raise ValueError(f"A provider nem rács alapú: {provider_id}")
+
+        with sqlite3.connect(self.db_path) as conn:
+            rows = self._read_settlements(conn)
+            self._write_mapping(conn, provider_id, resolution, rows)
+
+        with self._lock:
+            self._cache.pop((provider_id, resolution), None)
+        return len(rows)
+
+    def get_statistics(self, provider_id: str, resolution: Optional[float] = None) -> Dict[str, Any]:
+        """Települések és egyedi cellák száma (országosan és megyénként)."""
+        mapping = self.load(provider_id, resolution)
+        if not mapping:
+            return {"settlements": 0, "cells": 0, "counties": {}}
+
+        with sqlite3.connect(self.db_path) as conn:
+            county_rows = conn.execute("SELECT id, megye FROM hungarian_settlements").fetchall()
+
+        county_cells: Dict[str, set] = {}
+        county_settlements: Dict[str, int] = {}
+        for settlement_id, county in county_rows:
+            cell = mapping.get(settlement_id)
+            if cell is None:
+                continue
+            county = county or "Ismeretlen"
+            county_cells.setdefault(county, set()).add(cell)
+            county_settlements[county] = county_settlements.get(county, 0) + 1
+
+        return {
+            "settlements": len(mapping),
+            "cells": len(set(mapping.values())),
+            "counties": {
+                county: {"settlements": county_settlements[county], "cells": len(cells)}
+                for county, cells in sorted(county_cells.items())
+            }
+        }
+
+    # === BELSŐ ===
+
+    def _load_or_build(self, provider_id: str, resolution: float) -> Dict[int, GridCell]:
+        """Tárolt mapping betöltése, elavult/hiányzó esetén újraépítés."""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = self._read_settlements(conn)
+
+            if self._is_stale(conn, provider_id, resolution):
+                try:
+                    self._write_mapping(conn, provider_id, resolution, rows)
+                except sqlite3.Error as e:
+                    # Írásvédett adatbázis - memóriában számolunk
+                    logger.warning(f"⚠️ Rácscella mapping nem menthető, memóriában számolva: {e}")
+                    return self._compute(provider_id, resolution, rows)
+
+            stored = conn.execute(
+                f"SELECT settlement_id, lat_index, lon_index FROM {self.TABLE} "
+                "WHERE provider = ? AND resolution = ?",
+                (provider_id, resolution)
+            ).fetchall()
+
+        return {
+            settlement_id: GridCell(provider_id, resolution, lat_index, lon_index)
+            for settlement_id, lat_index, lon_index in stored
+        }
+
+    def _read_settlements(self, conn: sqlite3.Connection) -> List[Tuple[int, float, float]]:
+        return conn.execute(
+            "SELECT id, latitude, longitude FROM hungarian_settlements "
+            "WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+        ).fetchall()
+
+    def _is_stale(self, conn: sqlite3.Connection, provider_id: str, resolution: float) -> bool:
+        """Hiányzik-e a tábla, vagy eltér-e bármely település koordinátája a tároltól."""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (self.TABLE,)
+        ).fetchone()
+        if not exists:
+            return True
+
+        mismatch = conn.execute(
+            f"""
+            SELECT COUNT(*) FROM hungarian_settlements s
+            LEFT JOIN {self.TABLE} c
+                ON c.settlement_id = s.id AND c.provider = ? AND c.resolution = ?
+            WHERE s.latitude IS NOT NULL AND s.longitude IS NOT NULL
+              AND (c.settlement_id IS NULL OR c.latitude != s.latitude OR c.longitude != s.longitude)
+            """,
+            (provider_id, resolution)
+        ).fetchone()[0]
+        return mismatch > 0
+
+    def _compute(self, provider_id: str, resolution: float,
+                 rows: List[Tuple[int, float, float]]) -> Dict[int, GridCell]:
+        if not rows:
+            return {}
+        ids, lats, lons = zip(*rows)
+        lat_idx, lon_idx = snap_indices(lats, lons, resolution)
+        return {
+            int(settlement_id): GridCell(provider_id, resolution, int(lat_i), int(lon_i))
+            for settlement_id, lat_i, lon_i in zip(ids, lat_idx, lon_idx)
+        }
+
+    def _write_mapping(self, conn: sqlite3.Connection, provider_id: str, resolution: float,
+                       rows: List[Tuple[int, float, float]]) -> None:
+        """Mapping tábla létrehozása és a provider/felbontás sorainak cseréje."""
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                settlement_id INTEGER NOT NULL,
+                provider TEXT NOT NULL,
+                resolution REAL NOT NULL,
+                lat_index INTEGER NOT NULL,
+                lon_index INTEGER NOT NULL,
+                cell_id TEXT NOT NULL,
+                latitude REAL NOT NULL,
+                longitude REAL NOT NULL,
+                PRIMARY KEY (settlement_id, provider, resolution)
+            )
+        """)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_cell ON {self.TABLE} (cell_id)")
+
+        cells = self._compute(provider_id, resolution, rows)
+        coords = {settlement_id: (lat, lon) for settlement_id, lat, lon in rows}
+
+        conn.execute(f"DELETE FROM {self.TABLE} WHERE provider = ? AND resolution = ?",
+                     (provider_id, resolution))
+        conn.executemany(
+            f"INSERT INTO {self.TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (settlement_id, provider_id, resolution, cell.lat_index, cell.lon_index,
+                 cell.cell_id, coords[settlement_id][0], coords[settlement_id][1])
+                for settlement_id, cell in cells.items()
+            ]
+        )
+        conn.commit()
+
+        unique_cells = len(set(cells.values()))
+        logger.info(f"🌐 Rácscella mapping felépítve: {len(cells)} település → {unique_cells} cella "
+                    f"({provider_id}, {resolution:g}°)")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Hourly Window Cache - Lefúrási (drill-in) óránkénti ablakok külön cache-e
+Global Weather Analyzer projekt
+
+🌪️ IGÉNY SZERINTI ÓRÁNKÉNTI ADAT: A single-city pipeline napi windgusts_10m_max
+   aggregátumot kér, óránkénti adat csak a felhasználó által kiválasztott
+   rövid ablakra (pl. egy viharnap) töltődik le
+💾 KÜLÖN CACHE: Az óránkénti ablakok a napi adatoktól függetlenül, LRU szerint tárolódnak
+✂️ LEFEDÉS: Egy nagyobb, már letöltött ablakból a kisebb ablak kivágással kiszolgálható
+
+Használat:
+    cache = get_hourly_window_cache()
+    hourly = cache.get(47.4979, 19.0402, "2024-06-10", "2024-06-10", ("wind_gusts_10m",))
+    if hourly is None:
+        cache.put(lat, lon, start, end, variables, response["hourly"])
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Sequence, Tuple
+
+from ..config import APIConfig
+from .request_coalescer import COORDINATE_DECIMALS
+
+logger = logging.getLogger(__name__)
+
+_LocationKey = Tuple[float, float, Tuple[str, ...]]
+
+
+class HourlyWindowCache:
+    """
+    Óránkénti ablakok memóriabeli LRU cache-e.
+
+    A kulcs (kerekített koordináta, változók), alatta ablakonként a teljes
+    Open-Meteo "hourly" blokk (time + változó listák).
+    """
+
+    def __init__(self, max_windows: int = APIConfig.HOURLY_WINDOW_CACHE_SIZE):
+        self.max_windows = max_windows
+        self._windows: "OrderedDict[Tuple[_LocationKey, str, str], Dict[str, List[Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _location_key(latitude: float, longitude: float, variables: Sequence[str]) -> _LocationKey:
+        return (round(latitude, COORDINATE_DECIMALS), round(longitude, COORDINATE_DECIMALS),
+                tuple(sorted(variables)))
+
+    def get(self, latitude: float, longitude: float, start_date: str, end_date: str,
+            variables: Sequence[str]) -> Optional[Dict[str, List[Any]]]:
+        """
+        Ablak óránkénti adatai (pontos vagy lefedő ablakból kivágva).
+
+        Returns:
+            "hourly" dict (time + változók) vagy None ha nincs a cache-ben
+        """
+        location = self._location_key(latitude, longitude, variables)
+
+        with self._lock:
+            for key, hourly in reversed(self._windows.items()):
+                cached_location, cached_start, cached_end = key
+                if cached_location != location or cached_start > start_date or cached_end < end_date:
+                    continue
+
+                self._windows.move_to_end(key)
+                self._hits += 1
+                if (cached_start, cached_end) == (start_date, end_date):
+                    return hourly
+                return self._slice(hourly, start_date, end_date)
+
+            self._misses += 1
+            return None
+
+    def put(self, latitude: float, longitude: float, start_date: str, end_date: str,
+            variables: Sequence[str], hourly: Dict[str, List[Any]]) -> None:
+        """Letöltött óránkénti ablak tárolása (a legrégebben használt ablak kiesik)."""
+        key = (self._location_key(latitude, longitude, variables), start_date, end_date)
+
+        with self._lock:
+            self._windows[key] = hourly
+            self._windows.move_to_end(key)
+            while len(self._windows) > self.max_windows:
+                self._windows.popitem(last=False)
+
+        logger.debug(f"🌪️ Óránkénti ablak cache-elve: {start_date} → {end_date} "
+                     f"({len(hourly.get('time', []))} óra)")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._windows.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statisztika."""
+        with self._lock:
+            return {
+                "windows": len(self._windows),
+                "hours": sum(len(hourly.get("time", [])) for hourly in self._windows.values()),
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    @staticmethod
+    def _slice(hourly: Dict[str, List[Any]], start_date: str, end_date: str) -> Dict[str, List[Any]]:
+        """Kisebb ablak kivágása (az óránkénti időpontok ISO stringek, YYYY-MM-DDTHH:MM)."""
+        times = hourly.get("time", [])
+        indices = [i for i, time_value in enumerate(times) if start_date <= time_value[:10] <= end_date]
+        if not indices:
+            return {key: [] for key in hourly}
+        first, last = indices[0], indices[-1] + 1
+        return {key: values[first:last] if isinstance(values, list) else values
+                for key, values in hourly.items()}
+
+
+# === KÖZÖS PÉLDÁNY ===
+
+_cache_instance: Optional[HourlyWindowCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_hourly_window_cache() -> HourlyWindowCache:
+    """A folyamat közös HourlyWindowCache példánya."""
+    global _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            _cache_instance = HourlyWindowCache()
+        return _cache_instance
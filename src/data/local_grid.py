@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Local Grid - Helyi rácsos reanalízis adatkészlet (NetCDF / Zarr) olvasása
+Global Weather Analyzer projekt
+
+🗂️ FORRÁS: napi felbontású rácsos kivonat (pl. ERA5-Land Magyarország fölött)
+   egy .nc fájlban, .zarr tárban vagy .nc fájlok könyvtárában
+💤 LUSTA, DARABOLT OLVASÁS: az xarray csak a metaadatot nyitja meg, az értékek
+   kéréskor, és csak a szükséges rácscellák × napok kerülnek beolvasásra (dask
+   jelenlétében idő szerint darabolva)
+⚡ VEKTORIZÁLT KINYERÉS: sok pont egyszerre - a pontok stencil cellái (nearest: 1,
+   bilinear: 4) egyedi cellákká deduplikálva, egyetlen pontonkénti indexeléssel
+   olvasva, majd NumPy súlyozással (NaN-tűrő súly újranormálás a partvonalon)
+🌡️ EGYSÉGEK: a változó "units" attribútuma alapján K → °C, m → mm, m/s → km/h
+
+Az xarray opcionális: hiányában a provider egyszerűen nem érvényes, és a
+fallback lánc a távoli providerekkel folytatódik.
+
+Használat:
+    grid = LocalGridDataset("/data/era5land_hu.zarr")
+    series = grid.read_points(lats, lons, "2020-01-01", "2020-12-31")  # List[WeatherColumns]
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..config import LocalGridConfig
+from ..lazy_imports import lazy_module
+from .weather_columns import WeatherColumns
+
+logger = logging.getLogger(__name__)
+
+xr = lazy_module("xarray")
+dask = lazy_module("dask")
+
+LOCAL_GRID_SOURCE = "local-grid"
+
+_LATITUDE_NAMES = ("latitude", "lat", "y", "rlat")
+_LONGITUDE_NAMES = ("longitude", "lon", "x", "rlon")
+_TIME_NAMES = ("time", "valid_time", "date", "day")
+
+# Szögben mért oszlop - a lineáris súlyozás értelmetlen (350° és 10° átlaga nem 180°)
+_CIRCULAR_COLUMNS = frozenset({"winddirection_10m_dominant"})
+
+# units attribútum → (szorzó, eltolás) a repo egységeire (°C, mm, km/h, °)
+_UNIT_CONVERSIONS = {
+    "k": (1.0, -273.15),
+    "kelvin": (1.0, -273.15),
+    "m": (1000.0, 0.0),
+    "m of water equivalent": (1000.0, 0.0),
+    "kg m-2 s-1": (86400.0, 0.0),
+    "kg m**-2 s**-1": (86400.0, 0.0),
+    "m s-1": (3.6, 0.0),
+    "m s**-1": (3.6, 0.0),
+    "m/s": (3.6, 0.0),
+}
+
+
+def unit_conversion(units: Optional[str]) -> Tuple[float, float]:
+    """A változó units attribútuma → (szorzó, eltolás); ismeretlen/megfelelő egység → (1, 0)."""
+    return _UNIT_CONVERSIONS.get((units or "").strip().lower(), (1.0, 0.0))
+
+
+# === STENCIL (tiszta NumPy) ===
+
+def axis_positions(axis: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Koordináták → tört index egy monoton (növekvő vagy csökkenő) tengelyen.
+
+    Szabálytalan rácsköz esetén is helyes (szakaszonként lineáris); a tengelyen
+    kívüli értékek a szélső indexre vágódnak.
+    """
+    indices = np.arange(len(axis), dtype=np.float64)
+    if len(axis) > 1 and axis[0] > axis[-1]:
+        return np.interp(values, axis[::-1], indices[::-1])
+    return np.interp(values, axis, indices)
+
+
+def axis_contains(axis: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """A tengely fél cellával kibővített tartományába esik-e az érték."""
+    half = abs(float(axis[-1] - axis[0])) / (len(axis) - 1) / 2 if len(axis) > 1 else 0.5
+    low, high = float(min(axis[0], axis[-1])), float(max(axis[0], axis[-1]))
+    return (values >= low - half) & (values <= high + half)
+
+
+def interpolation_stencil(lat_axis: np.ndarray, lon_axis: np.ndarray,
+                          latitudes: np.ndarray, longitudes: np.ndarray,
+                          method: str = "bilinear") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pontonkénti stencil: (sor indexek, oszlop indexek, súlyok), mind (K, N) alakú.
+
+    nearest: K=1 a legközelebbi cella; bilinear: K=4 a környező cellák
+    (1 cellás tengely mentén a súly a szomszédra 0).
+    """
+    lat_pos = axis_positions(lat_axis, latitudes)
+    lon_pos = axis_positions(lon_axis, longitudes)
+
+    if method == "nearest":
+        rows = np.rint(lat_pos).astype(np.int64)[np.newaxis]
+        cols = np.rint(lon_pos).astype(np.int64)[np.newaxis]
+        return rows, cols, np.ones_like(rows, dtype=np.float64)
+
+    row0 = np.clip(np.floor(lat_pos).astype(np.int64), 0, max(len(lat_axis) - 2, 0))
+    col0 = np.clip(np.floor(lon_pos).astype(np.int64), 0, max(len(lon_axis) - 2, 0))
+    row1 = np.minimum(row0 + 1, len(lat_axis) - 1)
+    col1 = np.minimum(col0 + 1, len(lon_axis) - 1)
+    fy = np.clip(lat_pos - row0, 0.0, 1.0)
+    fx = np.clip(lon_pos - col0, 0.0, 1.0)
+
+    rows = np.stack([row0, row0, row1, row1])
+    cols = np.stack([col0, col1, col0, col1])
+    weights = np.stack([(1 - fy) * (1 - fx), (1 - fy) * fx, fy * (1 - fx), fy * fx])
+    return rows, cols, weights
+
+
+def combine_stencil(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Stencil értékek súlyozott összege NaN-tűrően.
+
+    Args:
+        values: (T, K, N) a stencil cellák idősorai
+        weights: (K, N)
+
+    Returns:
+        (T, N) - a hiányzó (pl. tenger) cellák súlya kimarad és a maradék
+        újranormálódik; ha minden cella hiányzik, NaN
+    """
+    valid = np.isfinite(values)
+    weighted = np.where(valid, values * weights[np.newaxis], 0.0).sum(axis=1)
+    total = np.where(valid, weights[np.newaxis], 0.0).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, weighted / total, np.nan)
+
+
+def unique_cells(rows: np.ndarray, cols: np.ndarray, width: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """A stencil cellái deduplikálva: (egyedi sorok, egyedi oszlopok, inverz index a (K, N) alakra)."""
+    codes = rows * width + cols
+    unique_codes, inverse = np.unique(codes.ravel(), return_inverse=True)
+    return unique_codes // width, unique_codes % width, inverse.reshape(codes.shape)
+
+
+class LocalGridDataset:
+    """
+    Napi rácsos adatkészlet lusta olvasója.
+
+    A megnyitás (csak metaadat) az első használatkor történik; a tengelyek
+    NumPy tömbként a memóriában maradnak, az értékek kérésenként olvasódnak.
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None, interpolation: Optional[str] = None):
+        configured = path if path is not None else LocalGridConfig.PATH
+        self.path: Optional[Path] = Path(configured) if configured else None
+        self.interpolation = (interpolation or LocalGridConfig.INTERPOLATION).lower()
+        if self.interpolation not in ("bilinear", "nearest"):
+            logger.warning(f"⚠️ Ismeretlen interpoláció: {self.interpolation} - bilinear használata")
+            self.interpolation = "bilinear"
+
+        self._lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._dataset = None
+        self._open_error: Optional[str] = None
+
+        self.lat_dim = self.lon_dim = self.time_dim = ""
+        self.lat_axis = np.array([], dtype=np.float64)
+        self.lon_axis = np.array([], dtype=np.float64)
+        self.dates = np.array([], dtype="datetime64[D]")
+        self.lon_wraps = False
+        # kimeneti oszlop → (adatkészlet változó, szorzó, eltolás)
+        self.column_sources: Dict[str, Tuple[str, float, float]] = {}
+
+    # === MEGNYITÁS ===
+
+    @property
+    def configured(self) -> bool:
+        return self.path is not None
+
+    def is_available(self) -> bool:
+        """Konfigurálva, létezik, az xarray telepítve és a metaadat megnyitható."""
+        if not self.configured or not xr.available or not self.path.exists():
+            return False
+        return self._ensure_open()
+
+    def _ensure_open(self) -> bool:
+        if self._dataset is not None:
+            return True
+        if self._open_error is not None:
+            return False
+        with self._lock:
+            if self._dataset is None and self._open_error is None:
+                try:
+                    self._open()
+                except Exception as e:
+                    self._open_error = f"{type(e).__name__}: {e}"
+                    logger.warning(f"⚠️ Helyi rács adatkészlet nem nyitható meg ({self.path}): {self._open_error}")
+        return self._dataset is not None
+
+    def _open(self) -> None:
+        chunks = {} if dask.available else None
+        path = self.path
+
+        if path.suffix == ".zarr" or (path / ".zgroup").exists() or (path / "zarr.json").exists():
+            dataset = xr.open_zarr(str(path), chunks=chunks)
+        elif path.is_dir():
+            files = sorted(path.glob("*.nc"))
+            if not files:
+                raise FileNotFoundError(f"nincs .nc fájl: {path}")
+            if len(files) > 1 and not dask.available:
+                raise ImportError("több .nc fájl megnyitásához dask szükséges")
+            dataset = (xr.open_mfdataset([str(file) for file in files], combine="by_coords", chunks=chunks)
+                       if len(files) > 1 else xr.open_dataset(str(files[0]), chunks=chunks))
+        else:
+            dataset = xr.open_dataset(str(path), chunks=chunks)
+
+        self.lat_dim = self._find_name(dataset, _LATITUDE_NAMES, "szélesség")
+        self.lon_dim = self._find_name(dataset, _LONGITUDE_NAMES, "hosszúság")
+        self.time_dim = self._find_name(dataset, _TIME_NAMES, "idő")
+
+        if dask.available:
+            dataset = dataset.chunk({self.time_dim: LocalGridConfig.TIME_CHUNK_DAYS})
+
+        self.lat_axis = np.asarray(dataset[self.lat_dim].values, dtype=np.float64)
+        self.lon_axis = np.asarray(dataset[self.lon_dim].values, dtype=np.float64)
+        self.dates = np.asarray(dataset[self.time_dim].values).astype("datetime64[D]")
+        self.lon_wraps = bool(self.lon_axis.size and self.lon_axis.max() > 180.0)
+
+        if self.dates.size > 1 and not np.all(np.diff(self.dates) > np.timedelta64(0, "D")):
+            raise ValueError("az idő tengely nem napi felbontású / nem szigorúan növekvő")
+
+        for column, aliases in LocalGridConfig.VARIABLE_ALIASES.items():
+            for name in aliases:
+                if name in dataset.data_vars:
+                    self.column_sources[column] = (name, *unit_conversion(dataset[name].attrs.get("units")))
+                    break
+        if not self.column_sources:
+            raise ValueError("egyik ismert változó sincs az adatkészletben")
+
+        self._dataset = dataset
+        logger.info(f"🗂️ Helyi rács megnyitva: {path.name} - {len(self.lat_axis)}×{len(self.lon_axis)} cella, "
+                    f"{self.dates[0]} → {self.dates[-1]}, változók: {', '.join(self.column_sources)}")
+
+    @staticmethod
+    def _find_name(dataset: Any, candidates: Sequence[str], label: str) -> str:
+        for name in candidates:
+            if name in dataset.dims or name in dataset.coords:
+                return name
+        raise ValueError(f"nem található {label} koordináta ({', '.join(candidates)})")
+
+    # === LEFEDETTSÉG ===
+
+    def _normalize_longitudes(self, longitudes: np.ndarray) -> np.ndarray:
+        return np.mod(longitudes, 360.0) if self.lon_wraps else longitudes
+
+    def covers(self, latitude: float, longitude: float, start_date: str, end_date: str) -> bool:
+        """A pont a rácson belül van és a teljes időszak az adatkészletben."""
+        if not self._ensure_open():
+            return False
+        start, end = np.datetime64(start_date[:10], "D"), np.datetime64(end_date[:10], "D")
+        if start < self.dates[0] or end > self.dates[-1]:
+            return False
+        return bool(axis_contains(self.lat_axis, np.array([latitude]))[0]
+                    and axis_contains(self.lon_axis, self._normalize_longitudes(np.array([longitude])))[0])
+
+    def covered_points(self, latitudes: Sequence[float], longitudes: Sequence[float],
+                       start_date: str, end_date: str) -> np.ndarray:
+        """Pontonkénti lefedettség (bool tömb) - a tömeges lekérés szűréséhez."""
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        if not self._ensure_open():
+            return np.zeros(len(latitudes), dtype=bool)
+        start, end = np.datetime64(start_date[:10], "D"), np.datetime64(end_date[:10], "D")
+        if start < self.dates[0] or end > self.dates[-1]:
+            return np.zeros(len(latitudes), dtype=bool)
+        longitudes = self._normalize_longitudes(np.asarray(longitudes, dtype=np.float64))
+        return axis_contains(self.lat_axis, latitudes) & axis_contains(self.lon_axis, longitudes)
+
+    # === OLVASÁS ===
+
+    def read_points(self, latitudes: Sequence[float], longitudes: Sequence[float],
+                    start_date: str, end_date: str) -> List[WeatherColumns]:
+        """
+        Sok pont napi idősora egyetlen olvasással változónként.
+
+        Returns:
+            Pontonként egy WeatherColumns (data_source: "local-grid"), a bemenet sorrendjében
+        """
+        if not self._ensure_open():
+            raise OSError(self._open_error or "a helyi rács adatkészlet nem elérhető")
+
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = self._normalize_longitudes(np.asarray(longitudes, dtype=np.float64))
+
+        start, end = np.datetime64(start_date[:10], "D"), np.datetime64(end_date[:10], "D")
+        first = int(np.searchsorted(self.dates, start, side="left"))
+        last = int(np.searchsorted(self.dates, end, side="right"))
+        dates = self.dates[first:last]
+
+        stencils = {method: interpolation_stencil(self.lat_axis, self.lon_axis, latitudes, longitudes, method)
+                    for method in {self.interpolation, "nearest"}}
+        cells = {method: unique_cells(rows, cols, len(self.lon_axis))
+                 for method, (rows, cols, _) in stencils.items()}
+
+        columns: Dict[str, np.ndarray] = {}
+        for column, (name, scale, offset) in self.column_sources.items():
+            method = "nearest" if column in _CIRCULAR_COLUMNS else self.interpolation
+            unique_rows, unique_cols, inverse = cells[method]
+            values = self._read_cells(name, first, last, unique_rows, unique_cols)  # (T, U)
+            point_values = combine_stencil(values[:, inverse], stencils[method][2])
+            columns[column] = point_values * scale + offset if (scale != 1.0 or offset != 0.0) else point_values
+
+        return [
+            WeatherColumns(dates, {column: values[:, index] for column, values in columns.items()}, LOCAL_GRID_SOURCE)
+            for index in range(len(latitudes))
+        ]
+
+    def _read_cells(self, name: str, first: int, last: int,
+                    rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Egy változó (T, U) blokkja: időszelet × egyedi cellák pontonkénti indexeléssel."""
+        array = self._dataset[name]
+        extra_dims = {dim: 0 for dim in array.dims if dim not in (self.time_dim, self.lat_dim, self.lon_dim)}
+        if extra_dims:
+            array = array.isel(extra_dims)
+
+        selection = array.isel({
+            self.time_dim: slice(first, last),
+            self.lat_dim: xr.DataArray(rows, dims="cell"),
+            self.lon_dim: xr.DataArray(cols, dims="cell"),
+        }).transpose(self.time_dim, "cell")
+
+        with self._read_lock:
+            return np.asarray(selection.values, dtype=np.float64)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        opened = self._dataset is not None
+        return {
+            "path": str(self.path) if self.path else None,
+            "opened": opened,
+            "error": self._open_error,
+            "interpolation": self.interpolation,
+            "shape": (len(self.lat_axis), len(self.lon_axis)) if opened else None,
+            "date_range": (str(self.dates[0]), str(self.dates[-1])) if opened and self.dates.size else None,
+            "variables": dict(self.column_sources),
+        }
@@ -971,6 +971,14 @@ class AnalyticsResult:
     # Timestamp
     created_at: datetime = field(default_factory=datetime.now)
     
+    # Térbeli interpoláció: a minta alapján becsült teljes településállomány + raszter
+    # (analytics.spatial_interpolation.InterpolatedField, magyar régióknál)
+    spatial_field: Optional[Any] = None
+    
+    # Területi összesítés: {"county": RegionalAggregate, "region": RegionalAggregate}
+    # (analytics.regional_aggregation, magyar régióknál - choropleth színezéshez)
+    regional_statistics: Optional[Dict[str, Any]] = None
+    
     def __len__(self) -> int:
         """Eredmények száma."""
         return len(self.city_results)
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Provider Health - Késleltetés- és hibatudatos provider routing circuit breakerrel
+Global Weather Analyzer projekt
+
+🩺 EGÉSZSÉG MÉRÉS: Provider-enként gördülő p50/p95 késleltetés, hibaarány, 429-ek
+⚡ CIRCUIT BREAKER: closed → open (gyors elutasítás) → half-open (egyetlen próba)
+🎯 ROUTING: A jelöltek rangsorolása mért egészség és hátralévő kvóta alapján
+🔁 OLCSÓ HIBA: Egy lassú/hibás provider egyetlen próbába kerül, nem teljes
+   retry ciklusba településenként
+
+A tracker folyamat szintű - minden WeatherClient példány (trend tab, MultiCityEngine,
+AnalysisWorker) ugyanazt az egészségképet látja.
+
+Használat:
+    tracker = get_provider_health_tracker()
+    if tracker.acquire("open-meteo"):
+        started = time.perf_counter()
+        ... hívás ...
+        tracker.record_success("open-meteo", time.perf_counter() - started)
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, List, Optional, Any, Callable, Deque, Sequence
+
+import numpy as np
+
+from ..config import ProviderConfig
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"        # normál működés
+    OPEN = "open"            # gyors elutasítás a cooldown lejártáig
+    HALF_OPEN = "half_open"  # egyetlen próba hívás engedélyezve
+
+
+@dataclass
+class _CallSample:
+    latency: float
+    ok: bool
+    rate_limited: bool
+
+
+@dataclass
+class _ProviderHealth:
+    """Egy provider gördülő mintái és áramkör állapota."""
+    samples: Deque[_CallSample] = field(
+        default_factory=lambda: deque(maxlen=ProviderConfig.HEALTH_WINDOW_SIZE)
+    )
+    state: CircuitState = CircuitState.CLOSED
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    open_seconds: float = ProviderConfig.CIRCUIT_OPEN_SECONDS
+    probe_in_flight: bool = False
+    total_calls: int = 0
+    total_failures: int = 0
+    total_rate_limited: int = 0
+    rejected_calls: int = 0
+
+
+class ProviderHealthTracker:
+    """
+    Folyamat szintű provider egészség nyilvántartás és circuit breaker.
+
+    Az idő forrása cserélhető (clock), hogy a cooldown logika determinisztikusan
+    ellenőrizhető legyen.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._providers: Dict[str, _ProviderHealth] = {}
+
+    def _health(self, provider_id: str) -> _ProviderHealth:
+        health = self._providers.get(provider_id)
+        if health is None:
+            health = _ProviderHealth()
+            self._providers[provider_id] = health
+        return health
+
+    # === ÁRAMKÖR ===
+
+    def is_available(self, provider_id: str) -> bool:
+        """
+        Routing döntéshez: hívható-e most a provider (állapot módosítás nélkül).
+
+        Nyitott áramkör a cooldown lejárta után újra elérhető (próbára).
+        """
+        with self._lock:
+            health = self._health(provider_id)
+            if health.state == CircuitState.CLOSED:
+                return True
+            if health.state == CircuitState.OPEN:
+                return self._clock() - health.opened_at >= health.open_seconds
+            return not health.probe_in_flight
+
+    def acquire(self, provider_id: str) -> bool:
+        """
+        Hívás engedélyezése közvetlenül a hálózati hívás előtt.
+
+        Lejárt cooldown esetén half-open állapotba lép és egyetlen próbát enged;
+        a próba eredményét a record_success/record_failure zárja le.
+        """
+        with self._lock:
+            health = self._health(provider_id)
+
+            if health.state == CircuitState.OPEN:
+                if self._clock() - health.opened_at < health.open_seconds:
+                    health.rejected_calls += 1
+                    return False
+                health.state = CircuitState.HALF_OPEN
+                health.probe_in_flight = False
+                logger.info(f"🩺 {provider_id}: half-open - próba hívás engedélyezve")
+
+            if health.state == CircuitState.HALF_OPEN:
+                if health.probe_in_flight:
+                    health.rejected_calls += 1
+                    return False
+                health.probe_in_flight = True
+
+            return True
+
+    def is_probing(self, provider_id: str) -> bool:
+        """Half-open próba van-e folyamatban (ilyenkor nincs retry)."""
+        with self._lock:
+            return self._health(provider_id).state == CircuitState.HALF_OPEN
+
+    def record_success(self, provider_id: str, latency: float) -> None:
+        with self._lock:
+            health = self._health(provider_id)
+            health.samples.append(_CallSample(latency, True, False))
+            health.total_calls += 1
+            health.consecutive_failures = 0
+
+            if health.state != CircuitState.CLOSED:
+                logger.info(f"🩺 {provider_id}: próba sikeres ({latency * 1000:.0f} ms) - áramkör zárva")
+                # A régi (nyitás előtti) hibák ne nyissák újra azonnal az áramkört
+                health.samples.clear()
+                health.samples.append(_CallSample(latency, True, False))
+            health.state = CircuitState.CLOSED
+            health.probe_in_flight = False
+            health.open_seconds = ProviderConfig.CIRCUIT_OPEN_SECONDS
+
+    def record_failure(self, provider_id: str, latency: float, rate_limited: bool = False) -> None:
+        with self._lock:
+            health = self._health(provider_id)
+            health.samples.append(_CallSample(latency, False, rate_limited))
+            health.total_calls += 1
+            health.total_failures += 1
+            health.total_rate_limited += 1 if rate_limited else 0
+            health.consecutive_failures += 1
+
+            if health.state == CircuitState.HALF_OPEN:
+                # Sikertelen próba - hosszabb cooldown
+                health.open_seconds = min(health.open_seconds * 2, ProviderConfig.CIRCUIT_MAX_OPEN_SECONDS)
+                self._open(provider_id, health, "sikertelen próba")
+            elif health.state == CircuitState.CLOSED and self._should_open(health, rate_limited):
+                self._open(provider_id, health,
+                           f"{health.consecutive_failures} egymást követő hiba" + (" (rate limit)" if rate_limited else ""))
+
+    def _should_open(self, health: _ProviderHealth, rate_limited: bool) -> bool:
+        # Egy-egy 429-et az AIMD szabályzó kezel (visszavétel + Retry-After),
+        # az áramkör csak tartós hibasorozatnál nyit
+        if health.consecutive_failures >= ProviderConfig.CIRCUIT_FAILURE_THRESHOLD:
+            return True
+        if len(health.samples) >= ProviderConfig.HEALTH_MIN_SAMPLES:
+            return self._error_rate(health) >= ProviderConfig.CIRCUIT_ERROR_RATE_THRESHOLD
+        return False
+
+    def _open(self, provider_id: str, health: _ProviderHealth, reason: str) -> None:
+        health.state = CircuitState.OPEN
+        health.opened_at = self._clock()
+        health.probe_in_flight = False
+        logger.warning(f"⚡ {provider_id}: áramkör nyitva ({reason}) - "
+                       f"{health.open_seconds:.0f}s gyors elutasítás")
+
+    # === METRIKÁK ===
+
+    @staticmethod
+    def _error_rate(health: _ProviderHealth) -> float:
+        if not health.samples:
+            return 0.0
+        return sum(1 for sample in health.samples if not sample.ok) / len(health.samples)
+
+    @staticmethod
+    def _latency_percentiles(health: _ProviderHealth) -> Optional[np.ndarray]:
+        latencies = [sample.latency for sample in health.samples if sample.ok]
+        if not latencies:
+            return None
+        return np.percentile(latencies, [50, 95])
+
+    def score(self, provider_id: str, remaining_quota: float = 1.0) -> float:
+        """
+        Routing pontszám (kisebb = jobb).
+
+        p95 késleltetés, a hibaarány és a 429-ek büntetése, valamint a fogyó kvóta
+        alapján. Minta nélküli és próbára váró provider semleges (0) pontszámot kap.
+        """
+        with self._lock:
+            health = self._health(provider_id)
+            if not health.samples or health.state != CircuitState.CLOSED:
+                # Nincs minta, vagy próbára váró (lejárt cooldown) provider: a nyitás előtti
+                # minták elavultak - semleges pontszám, hogy a próba valóban megtörténjen
+                base = 0.0
+            else:
+                percentiles = self._latency_percentiles(health)
+                p95 = float(percentiles[1]) if percentiles is not None else 10.0
+                rate_limited = sum(1 for sample in health.samples if sample.rate_limited) / len(health.samples)
+                base = p95 * (1.0 + 4.0 * self._error_rate(health) + 8.0 * rate_limited)
+
+        # Kvóta: 20% alatt meredeken romló pontszám, elfogyott kvóta → kerülendő
+        if remaining_quota <= 0.0:
+            return float("inf")
+        if remaining_quota < 0.2:
+            base = (base + 1.0) / (remaining_quota / 0.2)
+        return base
+
+    def rank(self, provider_ids: Sequence[str], preferred: Optional[str] = None,
+             quota_fn: Optional[Callable[[str], float]] = None) -> List[str]:
+        """
+        Jelöltek rangsorolása: elérhető (nem nyitott áramkörű) providerek pontszám
+        szerint, a preferált provider kedvezménnyel; nyitott áramkörűek kimaradnak.
+        """
+        ranked = []
+        for order, provider_id in enumerate(provider_ids):
+            if not self.is_available(provider_id):
+                continue
+            remaining_quota = quota_fn(provider_id) if quota_fn else 1.0
+            provider_score = self.score(provider_id, remaining_quota)
+            if provider_id == preferred:
+                provider_score *= ProviderConfig.PREFERRED_PROVIDER_BIAS
+            ranked.append((provider_score, provider_id != preferred, order, provider_id))
+
+        return [provider_id for *_, provider_id in sorted(ranked)]
+
+    def get_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Provider-enkénti egészségkép (UI / debug)."""
+        with self._lock:
+            snapshot = {}
+            for provider_id, health in self._providers.items():
+                percentiles = self._latency_percentiles(health)
+                snapshot[provider_id] = {
+                    "state": health.state.value,
+                    "p50_ms": float(percentiles[0]) * 1000 if percentiles is not None else None,
+                    "p95_ms": float(percentiles[1]) * 1000 if percentiles is not None else None,
+                    "error_rate": self._error_rate(health),
+                    "rate_limited": sum(1 for sample in health.samples if sample.rate_limited),
+                    "samples": len(health.samples),
+                    "total_calls": health.total_calls,
+                    "total_failures": health.total_failures,
+                    "total_rate_limited": health.total_rate_limited,
+                    "rejected_calls": health.rejected_calls,
+                    "open_seconds": health.open_seconds,
+                }
+            return snapshot
+
+    def reset(self, provider_id: Optional[str] = None) -> None:
+        """Egészségkép törlése (egy vagy minden provider)."""
+        with self._lock:
+            if provider_id is None:
+                self._providers.clear()
+            else:
+                self._providers.pop(provider_id, None)
+
+
+# === KÖZÖS PÉLDÁNY ===
+
+_tracker_instance: Optional[ProviderHealthTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_provider_health_tracker() -> ProviderHealthTracker:
+    """A folyamat közös ProviderHealthTracker példánya."""
+    global _tracker_instance
+    with _tracker_lock:
+        if _tracker_instance is None:
+            _tracker_instance = ProviderHealthTracker()
+        return _tracker_instance
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Request Coalescer - Folyamat szintű single-flight regiszter a weather provider-ek előtt
+Global Weather Analyzer projekt
+
+🔁 SINGLE-FLIGHT: Azonos (provider, helyszín, változók, időszak) kérés egyetlen hálózati hívás
+✂️ ÁTFEDŐ IDŐSZAKOK: Egy már repülő kéréssel átfedő időszakból csak a lefedetlen rész kerül lekérésre
+📣 FAN-OUT: A feldolgozott eredmény minden várakozóhoz eljut (WeatherColumns oszlopos
+   összefűzéssel, régi List[Dict] eredménynél rekord másolatokkal)
+📊 STATISZTIKA: Megosztott kérések, megspórolt napok, hálózati hívások
+
+A regiszter csak a repülő (in-flight) kéréseket tartja nyilván - a kész
+eredmények nem maradnak benne, azok cache-elése más réteg feladata.
+
+Használat:
+    coalescer = get_request_coalescer()
+    records = coalescer.fetch_range(
+        "open-meteo", 47.4979, 19.0402, "2024-01-01", "2024-12-31",
+        variables=("temperature_2m_max",),
+        fetch_fn=lambda start, end: provider.get_weather_data(lat, lon, start, end)
+    )
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Any, Callable, Tuple, Hashable, Sequence
+
+from .weather_columns import WeatherColumns
+
+logger = logging.getLogger(__name__)
+
+# Koordináta kerekítés a kulcsban (~11 m) - ennél közelebbi pontok azonos kérésnek számítanak
+COORDINATE_DECIMALS = 4
+
+RangeFetchFn = Callable[[str, str], List[Dict[str, Any]]]
+
+
+@dataclass
+class _InFlightRange:
+    """Egy repülő időszak-kérés és az eredménye."""
+    start: date
+    end: date
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Optional[List[Dict[str, Any]]] = None
+    error: Optional[BaseException] = None
+    waiters: int = 0
+
+
+@dataclass
+class _InFlightCall:
+    """Egy repülő, pontos kulcsú kérés (nem időszak alapú)."""
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+    waiters: int = 0
+
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value[:10], "%Y-%m-%d").date()
+
+
+def subtract_ranges(start: date, end: date,
+                    covered: Sequence[Tuple[date, date]]) -> List[Tuple[date, date]]:
+    """
+    Zárt [start, end] napi intervallumból a lefedett intervallumok kivonása.
+
+    Returns:
+        A lefedetlen, rendezett részintervallumok listája
+    """
+    uncovered = []
+    cursor = start
+
+    for covered_start, covered_end in sorted(covered):
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            uncovered.append((cursor, covered_start - timedelta(days=1)))
+        cursor = max(cursor, covered_end + timedelta(days=1))
+        if cursor > end:
+            break
+
+    if cursor <= end:
+        uncovered.append((cursor, end))
+
+    return uncovered
+
+
+class RequestCoalescer:
+    """
+    Folyamat szintű in-flight regiszter.
+
+    Minden WeatherClient példány (trend tab, MultiCityEngine, AnalysisWorker)
+    ugyanazt a regisztert használja, így a párhuzamos, azonos vagy átfedő
+    kérések egyetlen hálózati hívásba olvadnak.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ranges: Dict[Hashable, List[_InFlightRange]] = {}
+        self._calls: Dict[Hashable, _InFlightCall] = {}
+
+        self._stats = {
+            "requests": 0,
+            "network_calls": 0,
+            "shared_calls": 0,
+            "split_requests": 0,
+            "days_requested": 0,
+            "days_fetched": 0,
+        }
+
+    # === IDŐSZAK ALAPÚ KÉRÉSEK ===
+
+    def fetch_range(self, provider_id: str, latitude: float, longitude: float,
+                    start_date: str, end_date: str, variables: Sequence[str],
+                    fetch_fn: RangeFetchFn) -> List[Dict[str, Any]]:
+        """
+        Napi rekordok lekérése átfedés-tudatos single-flight koordinációval.
+
+        Args:
+            provider_id: Provider azonosító (a kulcs része)
+            latitude, longitude: Koordináták
+            start_date, end_date: Időszak (YYYY-MM-DD, zárt)
+            variables: Lekért változók (a kulcs része)
+            fetch_fn: Tényleges lekérés egy részidőszakra (start, end) → rekordok
+
+        Returns:
+            A kért időszak rekordjai dátum szerint rendezve
+
+        Raises:
+            A saját vagy a megosztott lekérés kivétele
+        """
+        key = (
+            provider_id,
+            round(latitude, COORDINATE_DECIMALS),
+            round(longitude, COORDINATE_DECIMALS),
+            tuple(variables)
+        )
+        start, end = _parse_date(start_date), _parse_date(end_date)
+        requested_days = (end - start).days + 1
+
+        with self._lock:
+            flights = self._ranges.setdefault(key, [])
+            borrowed = [f for f in flights if f.start <= end and f.end >= start]
+            uncovered = subtract_ranges(start, end, [(f.start, f.end) for f in borrowed])
+            owned = [_InFlightRange(piece_start, piece_end) for piece_start, piece_end in uncovered]
+            flights.extend(owned)
+
+            for flight in borrowed:
+                flight.waiters += 1
+
+            fetched_days = sum((f.end - f.start).days + 1 for f in owned)
+            self._stats["requests"] += 1
+            self._stats["network_calls"] += len(owned)
+            self._stats["shared_calls"] += len(borrowed)
+            self._stats["split_requests"] += 1 if borrowed and owned else 0
+            self._stats["days_requested"] += requested_days
+            self._stats["days_fetched"] += fetched_days
+
+        if borrowed:
+            logger.info(
+                f"🔁 Coalesced kérés: {provider_id} {key[1]}, {key[2]} {start_date} → {end_date} - "
+                f"{len(borrowed)} megosztott, {len(owned)} saját részidőszak "
+                f"({requested_days - fetched_days}/{requested_days} nap megspórolva)"
+            )
+
+        # Saját részidőszakok lekérése - minden esetben lezárva, hogy a várakozók ne ragadjanak be
+        for flight in owned:
+            try:
+                flight.result = fetch_fn(flight.start.isoformat(), flight.end.isoformat())
+            except BaseException as e:
+                flight.error = e
+            finally:
+                with self._lock:
+                    flights.remove(flight)
+                    if not flights and self._ranges.get(key) is flights:
+                        del self._ranges[key]
+                flight.done.set()
+
+        for flight in owned:
+            if flight.error is not None:
+                raise flight.error
+
+        for flight in borrowed:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+
+        if not borrowed and len(owned) == 1:
+            # Egyszerű eset - az eredeti eredmény változatlanul
+            return owned[0].result or []
+
+        results = [flight.result for flight in borrowed + owned if flight.result is not None]
+
+        if results and all(isinstance(result, WeatherColumns) for result in results):
+            # Oszlopos összefűzés - a megosztott tömbök nem módosulnak, a szűrés másolatot ad
+            merged_columns = WeatherColumns.concat(results, provider_id)
+            return merged_columns.between(start.isoformat(), end.isoformat())
+
+        merged: Dict[str, Dict[str, Any]] = {}
+        start_str, end_str = start.isoformat(), end.isoformat()
+
+        for flight in borrowed:
+            # Megosztott eredmény: rekord másolat, hogy a fogyasztók ne írják egymás adatát
+            for record in flight.result or []:
+                record_date = str(record.get("date", ""))[:10]
+                if start_str <= record_date <= end_str:
+                    merged.setdefault(record_date, dict(record))
+
+        for flight in owned:
+            for record in flight.result or []:
+                record_date = str(record.get("date", ""))[:10]
+                if start_str <= record_date <= end_str:
+                    merged.setdefault(record_date, record)
+
+        return [merged[record_date] for record_date in sorted(merged)]
+
+    # === PONTOS KULCSÚ KÉRÉSEK ===
+
+    def single_flight(self, key: Hashable, fetch_fn: Callable[[], Any]) -> Any:
+        """
+        Pontosan azonos kérések egyesítése (pl. nyers API válasz lekérés).
+
+        Az első hívó végzi a lekérést, a közben érkezők az eredményét kapják.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            owner = call is None
+            if owner:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self._stats["network_calls"] += 1
+            else:
+                call.waiters += 1
+                self._stats["shared_calls"] += 1
+            self._stats["requests"] += 1
+
+        if owner:
+            try:
+                call.result = fetch_fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.done.set()
+        else:
+            logger.info(f"🔁 Coalesced kérés (azonos kulcs): {call.waiters} várakozó")
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    # === ÁLLAPOT ===
+
+    def in_flight_count(self) -> int:
+        """Repülő kérések száma."""
+        with self._lock:
+            return sum(len(flights) for flights in self._ranges.values()) + len(self._calls)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Coalescing statisztika."""
+        with self._lock:
+            stats = dict(self._stats)
+        requested = stats["days_requested"]
+        stats["days_saved"] = requested - stats["days_fetched"]
+        stats["days_saved_ratio"] = (stats["days_saved"] / requested) if requested else 0.0
+        return stats
+
+
+# === KÖZÖS PÉLDÁNY ===
+
+_coalescer_instance: Optional[RequestCoalescer] = None
+_coalescer_lock = threading.Lock()
+
+
+def get_request_coalescer() -> RequestCoalescer:
+    """A folyamat közös RequestCoalescer példánya."""
+    global _coalescer_instance
+    with _coalescer_lock:
+        if _coalescer_instance is None:
+            _coalescer_instance = RequestCoalescer()
+        return _coalescer_instance
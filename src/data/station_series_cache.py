@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Station Series Cache - Meteostat állomás idősorok cache-e
+Global Weather Analyzer projekt
+
+📡 ÁLLOMÁS ALAPÚ LEKÉRÉS: A tárolt meteostat_station_id-vel a /stations/daily
+   végpont közvetlenül az állomás mért sorát adja - nincs /point interpoláció
+💾 IDŐSOR CACHE: Állomásonként egy összefűzött oszlopos idősor és a lefedett
+   időszakok listája; az újabb kérés csak a hiányzó időszakokat tölti le
+🔁 MEGOSZTÁS: Az azonos állomáshoz tartozó városok ugyanazt a sort kapják,
+   így a 10k/hó Meteostat kvóta állomásonként, nem városonként fogy
+
+Használat:
+    cache = get_station_series_cache()
+    for start, end in cache.missing_ranges("12843", "2024-01-01", "2024-12-31"):
+        cache.put("12843", start, end, fetched_columns)
+    series = cache.get("12843", "2024-01-01", "2024-12-31")
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Any, Tuple
+
+from ..config import APIConfig
+from .request_coalescer import subtract_ranges
+from .weather_columns import WeatherColumns
+
+logger = logging.getLogger(__name__)
+
+
+def _to_date(value: str) -> date:
+    return date.fromisoformat(value[:10])
+
+
+def _merge_ranges(ranges: List[Tuple[date, date]]) -> List[Tuple[date, date]]:
+    """Átfedő és szomszédos zárt időszakok összevonása."""
+    merged: List[Tuple[date, date]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class _StationSeries:
+    __slots__ = ("columns", "covered")
+
+    def __init__(self, columns: WeatherColumns, covered: List[Tuple[date, date]]):
+        self.columns = columns
+        self.covered = covered
+
+
+class StationSeriesCache:
+    """
+    Meteostat állomás idősorok memóriabeli LRU cache-e.
+
+    A lefedett időszakok a lekért (nem csak a visszakapott) napokat jelentik -
+    egy adathiányos állomásnál sem kérjük le újra ugyanazt az időszakot.
+    """
+
+    def __init__(self, max_stations: int = APIConfig.METEOSTAT_STATION_CACHE_SIZE):
+        self.max_stations = max_stations
+        self._stations: "OrderedDict[str, _StationSeries]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def missing_ranges(self, station_id: str, start_date: str, end_date: str) -> List[Tuple[str, str]]:
+        """A kért időszak még le nem töltött darabjai (YYYY-MM-DD párok)."""
+        start, end = _to_date(start_date), _to_date(end_date)
+        with self._lock:
+            series = self._stations.get(station_id)
+            covered = series.covered if series else []
+            missing = subtract_ranges(start, end, covered)
+
+            if missing:
+                self._misses += 1
+
+        return [(piece_start.isoformat(), piece_end.isoformat()) for piece_start, piece_end in missing]
+
+    def get(self, station_id: str, start_date: str, end_date: str) -> Optional[WeatherColumns]:
+        """
+        Állomás sor a kért időszakra, ha teljesen lefedett.
+
+        Returns:
+            WeatherColumns (üres is lehet, ha az állomásnak nincs adata) vagy None
+        """
+        start, end = _to_date(start_date), _to_date(end_date)
+        with self._lock:
+            series = self._stations.get(station_id)
+            if series is None or subtract_ranges(start, end, series.covered):
+                return None
+            self._hits += 1
+            self._stations.move_to_end(station_id)
+            return series.columns.between(start_date, end_date)
+
+    def put(self, station_id: str, start_date: str, end_date: str, columns: WeatherColumns) -> None:
+        """Letöltött időszak beolvasztása az állomás sorába."""
+        fetched = (_to_date(start_date), _to_date(end_date))
+        with self._lock:
+            series = self._stations.get(station_id)
+            if series is None:
+                self._stations[station_id] = _StationSeries(columns.sorted_unique(), [fetched])
+            else:
+                series.columns = WeatherColumns.concat([series.columns, columns], series.columns.data_source)
+                series.covered = _merge_ranges(series.covered + [fetched])
+            self._stations.move_to_end(station_id)
+
+            while len(self._stations) > self.max_stations:
+                self._stations.popitem(last=False)
+
+        logger.debug(f"📡 Állomás sor cache-elve: {station_id} {start_date} → {end_date} ({len(columns)} nap)")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stations.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statisztika."""
+        with self._lock:
+            return {
+                "stations": len(self._stations),
+                "days": sum(len(series.columns) for series in self._stations.values()),
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+# === KÖZÖS PÉLDÁNY ===
+
+_cache_instance: Optional[StationSeriesCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_station_series_cache() -> StationSeriesCache:
+    """A folyamat közös StationSeriesCache példánya."""
+    global _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            _cache_instance = StationSeriesCache()
+        return _cache_instance
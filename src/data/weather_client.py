@@ -14,6 +14,7 @@ Global Weather Analyzer projekt
 - ✅ API PARAMÉTER NÉVJAVÍTÁS: windspeed → wind_speed, windgusts → wind_gusts  
 - ✅ get_weather_data() MINDIG List[Dict] visszatérés (nem tuple!)
 - ✅ data_source minden rekordba beépítve
+- ⚡ Oszlopos válasz dekódolás: orjson → NumPy float64 oszlopok + datetime64 index (WeatherColumns)
 - ✅ Konzisztens API - nincs többé tuple unpacking hiba
 - ✅ Backward compatibility megőrizve
 - 🔧 KRITIKUS FIX: Daily paraméterek listában maradnak (nem string!)
@@ -36,6 +37,7 @@ from datetime import datetime, timedelta
 import json
 from dataclasses import dataclass
 import statistics
+import numpy as np
 from abc import ABC, abstractmethod
 
 # 🌍 Provider routing imports
@@ -46,7 +48,28 @@ from ..gui.utils import (
 )
 
 # ✅ CONFIG IMPORT JAVÍTÁS
-from ..config import APIConfig
+from ..config import APIConfig, UsageTracker
+
+# 🔁 Folyamat szintű single-flight regiszter (azonos/átfedő kérések egyesítése)
+from .request_coalescer import get_request_coalescer
+
+# ⚡ Oszlopos (NumPy) válasz dekódolás
+from .weather_columns import WeatherColumns, decode_json
+
+# 🩺 Provider egészség (késleltetés, hibaarány, 429) és circuit breaker
+from .provider_health import ProviderHealthTracker, get_provider_health_tracker
+
+# 📈 Adaptív (AIMD) párhuzamosság és Retry-After kezelés provider-enként
+from .adaptive_concurrency import get_adaptive_limiter, get_concurrency_stats, parse_retry_after
+
+# 📡 Meteostat állomás idősorok cache-e (állomásonként egy lekérés / időszak)
+from .station_series_cache import get_station_series_cache
+
+# ⏱️ Hot-path span tracing (kikapcsolva no-op)
+from ..devtools.tracing import span
+
+# 🗂️ Helyi rácsos reanalízis adatkészlet (NetCDF / Zarr)
+from .local_grid import LocalGridDataset
 
 # Logging beállítás - MULTI-YEAR támogatással
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -104,36 +127,118 @@ class ProviderValidationError(WeatherAPIError):
     pass
 
 
+class ProviderRateLimitError(WeatherAPIError):
+    """Provider rate limit (HTTP 429) - a Retry-After idő kivárása után újrapróbálható"""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ProviderQuotaExceededError(WeatherAPIError):
+    """A provider havi kvótája elfogyott (vagy le van foglalva) - hívás nélkül elutasítva"""
+    pass
+
+
+class ProviderCircuitOpenError(WeatherAPIError):
+    """A provider áramköre nyitva - hívás nélkül elutasítva"""
+    pass
+
+
 class WeatherProvider(ABC):
     """Abstract base class minden weather provider-hez."""
     
+    # Lekért változók - a request coalescing kulcs része
+    variables: Tuple[str, ...] = ()
+    
+    # Állomás azonosítós lekérés támogatása (get_weather_data(..., station_id=...))
+    supports_stations: bool = False
+    
+    # Helyi (hálózat és kvóta nélküli) adatforrás - lefedettség esetén a lánc elejére kerül
+    is_local: bool = False
+    
     def __init__(self, provider_id: str, display_name: str):
         self.provider_id = provider_id
         self.display_name = display_name
         self.session = requests.Session()
         self.request_count = 0
         self.last_request_time = 0
-        self.min_request_interval = 0.1
+        
+        # 📈 Folyamat szintű AIMD szabályzó (párhuzamosság + tempó + Retry-After)
+        self.limiter = get_adaptive_limiter(provider_id)
         
         logger.info(f"Weather provider inicializálva: {display_name}")
     
     @abstractmethod
     def get_weather_data(self, latitude: float, longitude: float,
-                        start_date: str, end_date: str) -> List[Dict[str, Any]]:
+                        start_date: str, end_date: str) -> WeatherColumns:
         pass
     
     @abstractmethod
     def validate_provider(self) -> bool:
         pass
     
-    def _rate_limit_check(self) -> None:
-        """Rate limiting ellenőrzés és késleltetés."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+    def covers(self, latitude: float, longitude: float, start_date: str, end_date: str) -> bool:
+        """Kiszolgálható-e a kérés (a távoli providerek mindent lefednek)."""
+        return True
+    
+    def _send_request(self, url: str, params: Dict[str, Any]) -> requests.Response:
+        """
+        HTTP kérés az AIMD szabályzón keresztül.
         
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            time.sleep(sleep_time)
+        A szabályzó várakoztat (szabad hely, tempó, Retry-After), majd a válasz
+        státusza alapján növeli vagy csökkenti a provider párhuzamosságát.
+        🛑 Kvótás providernél a kérés csak a hívó saját foglalásából (QuotaReservation.applied /
+        bind) vagy a szabad keretből mehet ki; minden elküldött kérés a memóriabeli
+        UsageTracker-ben számolódik, a hívó foglalását terhelve.
+        """
+        reservation = UsageTracker.active_reservation(self.provider_id)
+        if not UsageTracker.has_budget(self.provider_id, reservation=reservation):
+            raise ProviderQuotaExceededError(f"{self.display_name} havi kvóta elfogyott")
+        
+        with self.limiter.slot() as slot:
+            with span("provider_request", self.provider_id) as request_span:
+                response = self.session.get(url, params=params, timeout=APIConfig.REQUEST_TIMEOUT)
+                request_span.set(status=response.status_code, bytes=len(response.content))
+            slot.report(response.status_code, response.headers.get("Retry-After"))
+        
+        UsageTracker.record_requests(self.provider_id, reservation=reservation)
+        self._update_request_tracking()
+        return response
+    
+    def _rate_limit_error(self, response: requests.Response) -> ProviderRateLimitError:
+        """HTTP 429 → ProviderRateLimitError a Retry-After idővel."""
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        suffix = f" (Retry-After: {retry_after:.0f}s)" if retry_after is not None else ""
+        return ProviderRateLimitError(f"{self.display_name} rate limit túllépve{suffix}", retry_after)
+    
+    def _fetch_batch(self, latitude: float, longitude: float,
+                     start_date: str, end_date: str) -> WeatherColumns:
+        """
+        Egy batch lekérése; 429 esetén egyszer újrapróbálva.
+        
+        Az újrapróbálás a szabályzón keresztül automatikusan kivárja a Retry-After
+        időt - túl hosszú tiltásnál a hiba továbbmegy (fallback provider).
+        """
+        try:
+            return self.get_weather_data_single(latitude, longitude, start_date, end_date)
+        except ProviderRateLimitError as e:
+            if e.retry_after is not None and e.retry_after > APIConfig.RETRY_AFTER_FAILOVER:
+                raise
+            logger.info(f"  ⏳ {self.provider_id} rate limit - batch újrapróbálása a Retry-After után")
+            return self.get_weather_data_single(latitude, longitude, start_date, end_date)
+    
+    def _report_batch_failure(self, health: ProviderHealthTracker, started: float, error: Exception) -> None:
+        """
+        🩺 Lenyelt batch hiba jelentése az áramkörnek.
+        
+        Nyitott áramkörnél a maradék batch-ek helyett megszakít - a fallback lánc
+        a következő providerrel folytatja.
+        """
+        health.record_failure(self.provider_id, time.perf_counter() - started,
+                              rate_limited=isinstance(error, ProviderRateLimitError))
+        if not health.is_available(self.provider_id):
+            raise ProviderCircuitOpenError(f"{self.provider_id} áramkör nyitva - batch lekérés megszakítva") from error
     
     def _update_request_tracking(self) -> None:
         """Request tracking frissítése."""
@@ -150,6 +255,17 @@ class WeatherProvider(ABC):
 class OpenMeteoProvider(WeatherProvider):
     """🔥 MULTI-YEAR TÁMOGATÁS: Open-Meteo API provider batching logikával."""
     
+    # 🎯 VALÓS API MEZŐK - DEBUG ALAPJÁN JAVÍTOTT NEVEK + SZÉLIRÁNY HOZZÁADVA
+    variables = (
+        "temperature_2m_max",
+        "temperature_2m_min", 
+        "temperature_2m_mean",
+        "precipitation_sum",
+        "windspeed_10m_max",         # ✅ VALÓS API NÉV
+        "windgusts_10m_max",         # 🔧 JAVÍTÁS: wind_gusts_max → windgusts_10m_max
+        "winddirection_10m_dominant" # 🌪️ KRITIKUS JAVÍTÁS: HELYES API NÉV! (nem wind_direction_10m_dominant!)
+    )
+    
     def __init__(self):
         super().__init__("open-meteo", "🌍 Open-Meteo API")
         self.base_url = APIConfig.OPEN_METEO_ARCHIVE
@@ -160,19 +276,18 @@ class OpenMeteoProvider(WeatherProvider):
         
         # 🔥 BATCHING KONFIGURÁCIÓ - 55 ÉVES RATE LIMIT OPTIMALIZÁLÁS
         self.max_days_per_request = 90   # OPTIMALIZÁLT: 365 → 90 nap (3 hónap/batch)
-        self.batch_delay = 0.6  # OPTIMALIZÁLT: 2.0 → 0.6 sec (100 batch/min, biztonsági margin)
         
         logger.info(f"🔥 OpenMeteoProvider - 55 ÉVES RATE LIMIT OPTIMALIZÁLÁS aktiválva")
         logger.info(f"📅 Max days/request: {self.max_days_per_request} (rate limit optimalizált)")
-        logger.info(f"⏱️ Batch delay: {self.batch_delay}s (100 batch/min limit)")
-        logger.info(f"📊 55 év ≈ 223 batch × 0.6s ≈ 2.2 perc lekérdezés")
+        logger.info(f"📈 Adaptív tempó: párhuzamosság {self.limiter.limit} "
+                    f"(max {self.limiter.max_limit:.0f}), 429/5xx → visszavétel + Retry-After")
     
     def validate_provider(self) -> bool:
         """Open-Meteo mindig elérhető (nincs API kulcs szükséges)."""
         return True
     
     def get_weather_data(self, latitude: float, longitude: float,
-                        start_date: str, end_date: str) -> List[Dict[str, Any]]:
+                        start_date: str, end_date: str) -> WeatherColumns:
         """
         🔥 SMART DISPATCH: Automatikus batching vs single request
         
@@ -195,7 +310,7 @@ class OpenMeteoProvider(WeatherProvider):
             return self.get_weather_data_single(latitude, longitude, start_date, end_date)
     
     def get_weather_data_single(self, latitude: float, longitude: float,
-                               start_date: str, end_date: str) -> List[Dict[str, Any]]:
+                               start_date: str, end_date: str) -> WeatherColumns:
         """
         Egyszeri Open-Meteo API lekérdezés (max 90 nap) - RATE LIMIT OPTIMALIZÁLT
         
@@ -207,16 +322,7 @@ class OpenMeteoProvider(WeatherProvider):
             "longitude": longitude,
             "start_date": start_date,
             "end_date": end_date,
-            # 🎯 VALÓS API MEZŐK - DEBUG ALAPJÁN JAVÍTOTT NEVEK + SZÉLIRÁNY HOZZÁADVA
-            "daily": [
-                "temperature_2m_max",
-                "temperature_2m_min", 
-                "temperature_2m_mean",
-                "precipitation_sum",
-                "windspeed_10m_max",         # ✅ VALÓS API NÉV
-                "windgusts_10m_max",         # 🔧 JAVÍTÁS: wind_gusts_max → windgusts_10m_max
-                "winddirection_10m_dominant" # 🌪️ KRITIKUS JAVÍTÁS: HELYES API NÉV! (nem wind_direction_10m_dominant!)
-            ],
+            "daily": list(self.variables),
             "timezone": "auto",
             "models": "best_match"  # 🎯 EGYETLEN MODELL (nem többszörös)
         }
@@ -224,7 +330,7 @@ class OpenMeteoProvider(WeatherProvider):
         return self._make_api_request(params)
     
     def get_weather_data_batched(self, latitude: float, longitude: float,
-                                start_date: str, end_date: str) -> List[Dict[str, Any]]:
+                                start_date: str, end_date: str) -> WeatherColumns:
         """
         🔥 TÖBBÉVES LEKÉRDEZÉS BATCHING LOGIKÁVAL
         
@@ -250,9 +356,10 @@ class OpenMeteoProvider(WeatherProvider):
         batches = self._generate_batches(start_dt, end_dt)
         logger.info(f"📦 Generált batch-ek: {len(batches)} db")
         
-        all_weather_data = []
+        batch_results: List[WeatherColumns] = []
         successful_batches = 0
         failed_batches = 0
+        health = get_provider_health_tracker()
         
         for i, (batch_start, batch_end) in enumerate(batches, 1):
             batch_start_str = batch_start.strftime("%Y-%m-%d")
@@ -261,37 +368,35 @@ class OpenMeteoProvider(WeatherProvider):
             
             logger.info(f"📦 Batch {i}/{len(batches)}: {batch_start_str} → {batch_end_str} ({batch_days} nap)")
             
+            started = time.perf_counter()
             try:
-                # Single batch lekérdezése
-                batch_data = self.get_weather_data_single(
+                # Single batch lekérdezése - a tempót az AIMD szabályzó adja (nincs fix delay)
+                batch_data = self._fetch_batch(
                     latitude, longitude, batch_start_str, batch_end_str
                 )
                 
                 if batch_data:
-                    all_weather_data.extend(batch_data)
+                    batch_results.append(batch_data)
                     successful_batches += 1
                     logger.info(f"  ✅ Siker: {len(batch_data)} nap hozzáadva")
                 else:
                     failed_batches += 1
                     logger.warning(f"  ⚠️ Üres batch: {batch_start_str} → {batch_end_str}")
                 
-                # Rate limiting batch-ek között
-                if i < len(batches):  # Utolsó batch után nincs késleltetés
-                    logger.debug(f"  ⏳ Batch delay: {self.batch_delay}s")
-                    time.sleep(self.batch_delay)
-                
             except WeatherAPIError as e:
                 failed_batches += 1
                 logger.error(f"  ❌ Batch hiba: {e}")
+                self._report_batch_failure(health, started, e)
                 # Folytatjuk a következő batch-csel
                 continue
             except Exception as e:
                 failed_batches += 1
                 logger.error(f"  ❌ Váratlan batch hiba: {e}")
+                self._report_batch_failure(health, started, e)
                 continue
         
-        # Eredmények rendezése dátum szerint (biztonsági intézkedés)
-        all_weather_data.sort(key=lambda x: x.get('date', ''))
+        # Oszlopos összefűzés dátum szerint rendezve (biztonsági intézkedés)
+        all_weather_data = WeatherColumns.concat(batch_results, self.provider_id)
         
         # Összesítő jelentés
         success_rate = (successful_batches / len(batches)) * 100 if batches else 0
@@ -343,14 +448,12 @@ class OpenMeteoProvider(WeatherProvider):
         
         return batches
     
-    def _make_api_request(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _make_api_request(self, params: Dict[str, Any]) -> WeatherColumns:
         """
         Open-Meteo API kérés végrehajtása (SINGLE REQUEST)
         
         🔧 KRITIKUS JAVÍTÁS v4.5: Daily paraméterek LISTÁBAN maradnak!
         """
-        self._rate_limit_check()
-        
         # 🔧 KRITIKUS FIX: NE alakítsd át string-gé a daily paramétereket!
         # Az Open-Meteo API a lista formátumot várja!
         # TÖRŐLT HIBÁS KÓD:
@@ -362,18 +465,19 @@ class OpenMeteoProvider(WeatherProvider):
             logger.debug(f"🌍 API REQUEST: {params['start_date']} → {params['end_date']}")
             logger.debug(f"🌍 Daily params (LIST): {params['daily']}")
             
-            response = self.session.get(self.base_url, params=params, timeout=APIConfig.REQUEST_TIMEOUT)
-            self._update_request_tracking()
+            response = self._send_request(self.base_url, params)
             
             if response.status_code == 200:
                 try:
-                    data = response.json()
+                    with span("json_decode", self.provider_id):
+                        data = decode_json(response.content)
                     
                     if "daily" not in data:
                         logger.error(f"❌ MISSING 'daily' key in response: {data}")
                         raise WeatherAPIError(f"Érvénytelen Open-Meteo API válasz: {data}")
                     
-                    return self._process_response(data)
+                    with span("transform", self.provider_id):
+                        return self._process_response(data)
                     
                 except json.JSONDecodeError as je:
                     logger.error(f"❌ JSON DECODE ERROR: {je}")
@@ -383,7 +487,7 @@ class OpenMeteoProvider(WeatherProvider):
                 logger.error(f"❌ 400 BAD REQUEST: {response.text}")
                 raise WeatherAPIError(f"Open-Meteo hibás paraméterek: {response.text}")
             elif response.status_code == 429:
-                raise WeatherAPIError("Open-Meteo rate limit túllépve")
+                raise self._rate_limit_error(response)
             elif response.status_code == 500:
                 raise WeatherAPIError("Open-Meteo szerver hiba")
             else:
@@ -397,57 +501,38 @@ class OpenMeteoProvider(WeatherProvider):
         except requests.exceptions.RequestException as e:
             raise WeatherAPIError(f"Open-Meteo kérés hiba: {str(e)}")
     
-    def _process_response(self, response_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _process_response(self, response_data: Dict[str, Any]) -> WeatherColumns:
         """
         Open-Meteo API válasz feldolgozása
         
         🔧 JAVÍTÁS v4.6: data_source minden rekordba beépítve + SZÉLIRÁNY FELDOLGOZÁS
+        ⚡ OSZLOPOS: A "daily" listák közvetlenül float64 oszlopokba kerülnek,
+           a rekord dict-ek csak a fogyasztó kérésére épülnek fel
         """
         daily_data = response_data.get("daily", {})
-        dates = daily_data.get("time", [])
         
-        if not dates:
+        if not daily_data.get("time"):
             logger.warning("⚠️ Nincs dátum a válaszban")
-            return []
+            return WeatherColumns.empty(self.provider_id)
         
-        # Metrikák kinyerése
-        metrics = {}
-        for key, values in daily_data.items():
-            if key != "time" and isinstance(values, list):
-                metrics[key] = values
+        weather_data = WeatherColumns.from_daily_json(daily_data, self.provider_id)
         
         # 🌪️ SZÉLIRÁNY ELLENŐRZÉS
-        if "winddirection_10m_dominant" in metrics:
-            wind_directions = metrics["winddirection_10m_dominant"]
-            valid_directions = [d for d in wind_directions if d is not None]
-            logger.info(f"🌪️ Szélirány adatok feldolgozva: {len(valid_directions)}/{len(wind_directions)} érvényes értékek")
+        wind_directions = weather_data.column("winddirection_10m_dominant")
+        if wind_directions is not None:
+            valid_directions = int(np.count_nonzero(~np.isnan(wind_directions)))
+            logger.info(f"🌪️ Szélirány adatok feldolgozva: {valid_directions}/{len(wind_directions)} érvényes értékek")
         else:
             logger.warning("⚠️ Nincs szélirány adat a válaszban!")
         
         # 🌪️ SZÉLLÖKÉS ELLENŐRZÉS
-        if "windgusts_10m_max" in metrics:
-            wind_gusts = metrics["windgusts_10m_max"]
-            valid_gusts = [g for g in wind_gusts if g is not None]
-            logger.info(f"🌪️ Széllökés adatok feldolgozva: {len(valid_gusts)}/{len(wind_gusts)} érvényes értékek")
+        wind_gusts = weather_data.column("windgusts_10m_max")
+        if wind_gusts is not None:
+            valid_gusts = int(np.count_nonzero(~np.isnan(wind_gusts)))
+            logger.info(f"🌪️ Széllökés adatok feldolgozva: {valid_gusts}/{len(wind_gusts)} érvényes értékek")
         else:
             logger.warning("⚠️ Nincs széllökés adat a válaszban!")
         
-        # Napi adatok összeállítása
-        weather_data = []
-        for i, date in enumerate(dates):
-            # 🔧 JAVÍTÁS v4.5: data_source MINDEN rekordba beépítve
-            daily_record = {
-                "date": date, 
-                "data_source": self.provider_id  # ✅ KRITIKUS: Itt kerül be a forrás!
-            }
-            
-            for metric_name, metric_values in metrics.items():
-                if i < len(metric_values):
-                    value = metric_values[i]
-                    daily_record[metric_name] = value if value is not None else None
-            
-            weather_data.append(daily_record)
-        
         logger.debug(f"✅ Feldolgozva: {len(weather_data)} nap (data_source: {self.provider_id})")
         return weather_data
 
@@ -455,6 +540,12 @@ class OpenMeteoProvider(WeatherProvider):
 class MeteostatProvider(WeatherProvider):
     """🌍 Meteostat API provider implementáció - 55+ éves adatok támogatással."""
     
+    # A point/daily végpont mindig a teljes napi rekordot adja
+    variables = ("point/daily",)
+    
+    # 📡 Tárolt meteostat_station_id-vel közvetlen állomás lekérés
+    supports_stations = True
+    
     def __init__(self):
         super().__init__("meteostat", "💎 Meteostat API")
         self.base_url = APIConfig.METEOSTAT_BASE
@@ -468,8 +559,6 @@ class MeteostatProvider(WeatherProvider):
                 "X-RapidAPI-Host": "meteostat.p.rapidapi.com"
             })
         
-        self.min_request_interval = APIConfig.METEOSTAT_RATE_LIMIT
-        
         # 🔥 METEOSTAT MAX RANGE: 10 év per request
         self.max_years_per_request = 10
         logger.info(f"💎 MeteostatProvider - MAX {self.max_years_per_request} év/request")
@@ -478,7 +567,8 @@ class MeteostatProvider(WeatherProvider):
         return bool(self.api_key and len(self.api_key.strip()) >= 32)
     
     def get_weather_data(self, latitude: float, longitude: float,
-                        start_date: str, end_date: str) -> List[Dict[str, Any]]:
+                        start_date: str, end_date: str,
+                        station_id: Optional[str] = None) -> WeatherColumns:
         """
         🔥 METEOSTAT SMART DISPATCH
         
@@ -486,10 +576,20 @@ class MeteostatProvider(WeatherProvider):
         
         Meteostat támogatja a hosszabb időszakokat (akár 10 év),
         de nagy időszakok esetén batch-elni érdemes.
+        
+        📡 Ismert állomásnál (station_id) a mért állomás sor jön a cache-ből vagy
+        a /stations/daily végpontról - a /point interpoláció kimarad. Üres állomás
+        sor esetén a koordináta alapú lekérés a fallback.
         """
         if not self.validate_provider():
             raise ProviderValidationError("Meteostat API kulcs hiányzik vagy érvénytelen")
         
+        if station_id:
+            station_data = self.get_station_weather_data(station_id, start_date, end_date)
+            if station_data:
+                return station_data
+            logger.info(f"📡 Állomás {station_id}: nincs adat {start_date} → {end_date} - /point fallback")
+        
         start_dt = datetime.strptime(start_date, "%Y-%m-%d")
         end_dt = datetime.strptime(end_date, "%Y-%m-%d")
         years_diff = (end_dt - start_dt).days / 365.25
@@ -503,8 +603,67 @@ class MeteostatProvider(WeatherProvider):
             logger.info(f"📅 METEOSTAT SINGLE: {years_diff:.1f} év <= {self.max_years_per_request} év limit")
             return self.get_weather_data_single(latitude, longitude, start_date, end_date)
     
+    def get_cached_station_data(self, station_id: str, start_date: str, end_date: str) -> Optional[WeatherColumns]:
+        """Állomás sor a cache-ből (hálózati hívás nélkül), ha a teljes időszak lefedett."""
+        return get_station_series_cache().get(station_id, start_date, end_date)
+    
+    def get_station_weather_data(self, station_id: str, start_date: str, end_date: str) -> WeatherColumns:
+        """
+        📡 Állomás alapú lekérés - csak a cache-ből hiányzó időszakok mennek a hálózatra.
+        
+        Az azonos állomásra párhuzamosan érkező kérések (több város ugyanazzal az
+        állomással) egyetlen lekérésbe olvadnak.
+        """
+        cache = get_station_series_cache()
+        coalescer = get_request_coalescer()
+        
+        for piece_start, piece_end in cache.missing_ranges(station_id, start_date, end_date):
+            columns = coalescer.single_flight(
+                ("meteostat-station", station_id, piece_start, piece_end),
+                lambda piece_start=piece_start, piece_end=piece_end: self._fetch_station_range(
+                    station_id, piece_start, piece_end
+                )
+            )
+            cache.put(station_id, piece_start, piece_end, columns)
+        
+        station_data = cache.get(station_id, start_date, end_date)
+        return station_data if station_data is not None else WeatherColumns.empty(self.provider_id)
+    
+    def _fetch_station_range(self, station_id: str, start_date: str, end_date: str) -> WeatherColumns:
+        """Állomás sor letöltése 10 éves batch-ekben (a hiba továbbmegy - részleges sor nem cache-elődik)."""
+        batches = self._year_batches(datetime.strptime(start_date, "%Y-%m-%d"),
+                                     datetime.strptime(end_date, "%Y-%m-%d"))
+        logger.info(f"📡 Meteostat állomás {station_id}: {start_date} → {end_date} ({len(batches)} kérés)")
+        
+        parts = [
+            self._make_api_request(
+                {"station": station_id, "start": batch_start.strftime("%Y-%m-%d"),
+                 "end": batch_end.strftime("%Y-%m-%d")},
+                endpoint="stations/daily"
+            )
+            for batch_start, batch_end in batches
+        ]
+        return WeatherColumns.concat(parts, self.provider_id)
+    
+    def _year_batches(self, start_dt: datetime, end_dt: datetime) -> List[Tuple[datetime, datetime]]:
+        """Időszak felbontása max_years_per_request éves batch-ekre."""
+        batches = []
+        current_start = start_dt
+        
+        while current_start <= end_dt:
+            # 10 éves batch
+            current_end = min(
+                current_start.replace(year=current_start.year + self.max_years_per_request),
+                end_dt
+            )
+            
+            batches.append((current_start, current_end))
+            current_start = current_end + timedelta(days=1)
+        
+        return batches
+    
     def get_weather_data_single(self, latitude: float, longitude: float,
-                               start_date: str, end_date: str) -> List[Dict[str, Any]]:
+                               start_date: str, end_date: str) -> WeatherColumns:
         """
         Egyszeri Meteostat lekérdezés
         
@@ -520,80 +679,80 @@ class MeteostatProvider(WeatherProvider):
         return self._make_api_request(params)
     
     def get_weather_data_batched(self, latitude: float, longitude: float,
-                                start_date: str, end_date: str) -> List[Dict[str, Any]]:
+                                start_date: str, end_date: str) -> WeatherColumns:
         """
         🔥 METEOSTAT BATCHING - 10 éves batch-ek
         
         🔧 JAVÍTÁS v4.5: MINDIG List[Dict] visszatérés
         """
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-        
-        batches = []
-        current_start = start_dt
-        
-        while current_start <= end_dt:
-            # 10 éves batch
-            current_end = min(
-                current_start.replace(year=current_start.year + self.max_years_per_request),
-                end_dt
-            )
-            
-            batches.append((current_start, current_end))
-            current_start = current_end + timedelta(days=1)
+        batches = self._year_batches(datetime.strptime(start_date, "%Y-%m-%d"),
+                                     datetime.strptime(end_date, "%Y-%m-%d"))
         
         logger.info(f"💎 METEOSTAT BATCHES: {len(batches)} db")
         
-        all_data = []
+        batch_results: List[WeatherColumns] = []
+        failed_batches = 0
+        last_error: Optional[Exception] = None
+        health = get_provider_health_tracker()
+        
         for i, (batch_start, batch_end) in enumerate(batches, 1):
+            batch_start_str = batch_start.strftime("%Y-%m-%d")
+            batch_end_str = batch_end.strftime("%Y-%m-%d")
+            
+            logger.info(f"💎 Batch {i}/{len(batches)}: {batch_start_str} → {batch_end_str}")
+            
+            started = time.perf_counter()
             try:
-                batch_start_str = batch_start.strftime("%Y-%m-%d")
-                batch_end_str = batch_end.strftime("%Y-%m-%d")
-                
-                logger.info(f"💎 Batch {i}/{len(batches)}: {batch_start_str} → {batch_end_str}")
-                
-                batch_data = self.get_weather_data_single(
+                batch_data = self._fetch_batch(
                     latitude, longitude, batch_start_str, batch_end_str
                 )
                 
                 if batch_data:
-                    all_data.extend(batch_data)
+                    batch_results.append(batch_data)
                     logger.info(f"  ✅ Meteostat batch siker: {len(batch_data)} nap")
-                
-                # Rate limiting
-                if i < len(batches):
-                    time.sleep(self.min_request_interval)
                     
+            except ProviderQuotaExceededError:
+                # 🛑 Elfogyott kvótánál a többi batch is elbukna - nem provider hiba
+                raise
             except Exception as e:
+                failed_batches += 1
+                last_error = e
                 logger.error(f"  ❌ Meteostat batch hiba: {e}")
+                self._report_batch_failure(health, started, e)
                 continue
         
-        return sorted(all_data, key=lambda x: x.get('date', ''))
+        if batches and failed_batches == len(batches):
+            raise WeatherAPIError(f"Meteostat batch lekérdezés teljesen sikertelen ({failed_batches} batch)") from last_error
+        
+        return WeatherColumns.concat(batch_results, self.provider_id)
     
-    def _make_api_request(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _make_api_request(self, params: Dict[str, Any], endpoint: str = "point/daily") -> WeatherColumns:
         """
         🔧 JAVÍTÁS v4.5: MINDIG List[Dict] visszatérés
-        """
-        self._rate_limit_check()
         
-        endpoint = f"{self.base_url}/point/daily"
+        Args:
+            params: Lekérdezési paraméterek (lat/lon vagy station + start/end)
+            endpoint: "point/daily" (interpolált) vagy "stations/daily" (mért állomás sor)
+        """
+        endpoint = f"{self.base_url}/{endpoint}"
         
         try:
-            response = self.session.get(endpoint, params=params, timeout=APIConfig.REQUEST_TIMEOUT)
-            self._update_request_tracking()
+            response = self._send_request(endpoint, params)
             
             if response.status_code == 200:
-                data = response.json()
+                with span("json_decode", self.provider_id):
+                    data = decode_json(response.content)
                 if "data" not in data:
                     raise WeatherAPIError(f"Érvénytelen Meteostat API válasz: {data}")
-                return self._process_response(data)
+                with span("transform", self.provider_id):
+                    return self._process_response(data)
             
             elif response.status_code == 401:
                 raise ProviderValidationError("Meteostat API hitelesítési hiba")
             elif response.status_code == 403:
                 raise WeatherAPIError("Meteostat API hozzáférés megtagadva")
             elif response.status_code == 429:
-                raise WeatherAPIError("Meteostat rate limit túllépve")
+                raise self._rate_limit_error(response)
             elif response.status_code == 500:
                 raise WeatherAPIError("Meteostat szerver hiba")
             else:
@@ -608,19 +767,19 @@ class MeteostatProvider(WeatherProvider):
         except json.JSONDecodeError:
             raise WeatherAPIError("Meteostat JSON dekódolási hiba")
     
-    def _process_response(self, response_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _process_response(self, response_data: Dict[str, Any]) -> WeatherColumns:
         """
         🔧 JAVÍTÁS v4.6: data_source minden rekordba beépítve + HELYES FIELD MAPPING + SZÉLIRÁNY
+        ⚡ OSZLOPOS: A Meteostat rekordok mezőnként float64 oszlopokba kerülnek
         """
         raw_data = response_data.get("data", [])
         
         if not raw_data:
             logger.warning("Nincs adat a Meteostat válaszban")
-            return []
+            return WeatherColumns.empty(self.provider_id)
         
         # ✅ JAVÍTOTT FIELD MAPPING - HELYES API NEVEK + SZÉLIRÁNY
         field_mapping = {
-            "date": "date",
             "tavg": "temperature_2m_mean",
             "tmin": "temperature_2m_min",
             "tmax": "temperature_2m_max",
@@ -631,29 +790,62 @@ class MeteostatProvider(WeatherProvider):
             "tsun": "sunshine_duration"
         }
         
-        weather_data = []
-        for record in raw_data:
-            # 🔧 JAVÍTÁS v4.5: data_source MINDEN rekordba beépítve
-            daily_record = {
-                "data_source": self.provider_id  # ✅ KRITIKUS: Itt kerül be a forrás!
-            }
-            
-            for meteostat_field, openmeteo_field in field_mapping.items():
-                if meteostat_field in record:
-                    value = record[meteostat_field]
-                    daily_record[openmeteo_field] = value if value is not None else None
-            
-            if "temperature_2m_max" in daily_record and daily_record["temperature_2m_max"]:
-                daily_record["apparent_temperature_max"] = daily_record["temperature_2m_max"]
-            if "temperature_2m_min" in daily_record and daily_record["temperature_2m_min"]:
-                daily_record["apparent_temperature_min"] = daily_record["temperature_2m_min"]
-            
-            weather_data.append(daily_record)
+        weather_data = WeatherColumns.from_records(raw_data, field_mapping, self.provider_id)
+        
+        # Hőérzet közelítés a mért hőmérsékletből (a tömbök megosztva, nem másolva)
+        if "temperature_2m_max" in weather_data.columns:
+            weather_data = weather_data.with_column("apparent_temperature_max", weather_data.columns["temperature_2m_max"])
+        if "temperature_2m_min" in weather_data.columns:
+            weather_data = weather_data.with_column("apparent_temperature_min", weather_data.columns["temperature_2m_min"])
         
         logger.debug(f"✅ Meteostat feldolgozva: {len(weather_data)} nap (data_source: {self.provider_id})")
         return weather_data
 
 
+class LocalGridProvider(WeatherProvider):
+    """
+    🗂️ Helyi rácsos reanalízis provider (NetCDF / Zarr, pl. ERA5-Land kivonat).
+    
+    Hálózat, rate limit és kvóta nélkül, lemez sebességgel szolgál ki; csak a
+    rács és az időtengely által lefedett kéréseket vállalja (covers), a többi
+    a fallback láncban a távoli providerekhez megy.
+    """
+    
+    variables = ("local-grid",)
+    is_local = True
+    
+    def __init__(self, path: Optional[str] = None, interpolation: Optional[str] = None):
+        super().__init__("local-grid", "🗂️ Helyi rács (NetCDF/Zarr)")
+        self.dataset = LocalGridDataset(path, interpolation)
+    
+    def validate_provider(self) -> bool:
+        return self.dataset.is_available()
+    
+    def covers(self, latitude: float, longitude: float, start_date: str, end_date: str) -> bool:
+        return self.dataset.covers(latitude, longitude, start_date, end_date)
+    
+    def get_weather_data(self, latitude: float, longitude: float,
+                        start_date: str, end_date: str) -> WeatherColumns:
+        return self.get_weather_data_many([latitude], [longitude], start_date, end_date)[0]
+    
+    def get_weather_data_many(self, latitudes: List[float], longitudes: List[float],
+                              start_date: str, end_date: str) -> List[WeatherColumns]:
+        """
+        Sok pont egyszerre: változónként egyetlen darabolt olvasás a pontok
+        stencil celláira, majd vektorizált nearest / bilinear súlyozás.
+        """
+        with span("provider_request", self.provider_id, points=len(latitudes)) as request_span:
+            try:
+                results = self.dataset.read_points(latitudes, longitudes, start_date, end_date)
+            except (OSError, KeyError, ValueError, ImportError) as e:
+                raise ProviderNotAvailableError(f"{self.display_name} olvasási hiba: {e}") from e
+            request_span.set(days=len(results[0]) if results else 0)
+        
+        self._update_request_tracking()
+        logger.debug(f"🗂️ Helyi rács: {len(latitudes)} pont × {len(results[0]) if results else 0} nap")
+        return results
+
+
 class WeatherClient:
     """🔥 MULTI-YEAR Weather Client - 55 éves trend elemzések támogatásával."""
     
@@ -664,12 +856,17 @@ class WeatherClient:
         
         self.providers: Dict[str, WeatherProvider] = {
             "open-meteo": OpenMeteoProvider(),
-            "meteostat": MeteostatProvider()
+            "meteostat": MeteostatProvider(),
+            "local-grid": LocalGridProvider()
         }
         
         self.max_retries = APIConfig.MAX_RETRIES
         self.retry_delay = 1.0
         
+        # 🩺 Közös egészség tracker + egyszeri provider validáció (API kulcs futás közben nem változik)
+        self.health = get_provider_health_tracker()
+        self._provider_validity: Dict[str, bool] = {}
+        
         self.provider_change_callback: Optional[Callable[[str, str], None]] = None
         self.provider_fallback_callback: Optional[Callable[[str, str], None]] = None
         
@@ -683,7 +880,8 @@ class WeatherClient:
     
     def get_weather_data(self, latitude: float, longitude: float,
                         start_date: str, end_date: str,
-                        user_override_provider: Optional[str] = None) -> List[Dict[str, Any]]:
+                        user_override_provider: Optional[str] = None,
+                        station_id: Optional[str] = None) -> WeatherColumns:
         """
         🔥 MULTI-YEAR: Időjárási adatok lekérdezése automatikus batching-gal.
         
@@ -695,9 +893,12 @@ class WeatherClient:
             latitude, longitude: Koordináták
             start_date, end_date: Időszak (YYYY-MM-DD)
             user_override_provider: Kényszerített provider
+            station_id: Ismert Meteostat állomás (meteostat_station_id) - állomás
+                alapú provider esetén interpoláció helyett az állomás sor jön
             
         Returns:
-            List[Dict]: Napi adatok, data_source minden rekordban
+            WeatherColumns: Napi adatok oszloposan - Sequence[Dict] nézettel,
+            data_source minden rekordban
         """
         
         logger.info(f"🔥 MULTI-YEAR WEATHER REQUEST v4.6:")
@@ -712,13 +913,18 @@ class WeatherClient:
         selected_provider = self._select_provider(user_override_provider)
         logger.info(f"🎯 SELECTED PROVIDER: {selected_provider}")
         
-        if not selected_provider:
-            raise ProviderNotAvailableError("Egyik provider sem elérhető")
-        
-        # 🌍 Provider fallback chain
-        fallback_chain = self._get_provider_fallback_chain(selected_provider)
+        # 🌍 Provider fallback chain (a pontot lefedő helyi adatkészlet automatikus módban elöl)
+        fallback_chain = self._with_local_providers(
+            self._get_provider_fallback_chain(selected_provider) if selected_provider else [],
+            latitude, longitude, start_date, end_date,
+            prefer=not user_override_provider and self.preferred_provider == "auto"
+        )
         logger.info(f"🔄 FALLBACK CHAIN: {fallback_chain}")
         
+        if not fallback_chain:
+            raise ProviderNotAvailableError("Egyik provider sem elérhető")
+        selected_provider = fallback_chain[0]
+        
         last_error = None
         for attempt_provider in fallback_chain:
             try:
@@ -726,52 +932,42 @@ class WeatherClient:
                 
                 # Provider instance lekérdezése
                 provider = self.providers.get(attempt_provider)
-                if not provider or not provider.validate_provider():
+                if not provider or not self._is_provider_valid(attempt_provider):
                     logger.warning(f"⚠️ PROVIDER NOT AVAILABLE: {attempt_provider}")
                     continue
                 
+                if not provider.covers(latitude, longitude, start_date, end_date):
+                    logger.info(f"🗺️ PROVIDER DOES NOT COVER REQUEST: {attempt_provider}")
+                    continue
+                
                 logger.info(f"✅ PROVIDER VALIDATED: {attempt_provider}")
                 
-                # Retry logika provider-specifikusan
-                weather_data = self._retry_weather_request(
-                    provider, latitude, longitude, start_date, end_date
-                )
+                if station_id and provider.supports_stations:
+                    # 📡 Állomás sor: cache találat hívás (és kvóta) nélkül, egyébként
+                    # a hiányzó időszakok az állomás végpontról
+                    weather_data = provider.get_cached_station_data(station_id, start_date, end_date)
+                    if weather_data:
+                        logger.info(f"📡 Állomás cache találat: {station_id}")
+                    else:
+                        weather_data = self._retry_weather_request(
+                            provider, latitude, longitude, start_date, end_date, station_id=station_id
+                        )
+                else:
+                    # Retry logika provider-specifikusan - azonos/átfedő repülő kérésekkel egyesítve
+                    weather_data = get_request_coalescer().fetch_range(
+                        provider.provider_id, latitude, longitude, start_date, end_date,
+                        variables=provider.variables,
+                        fetch_fn=lambda start, end, provider=provider: self._retry_weather_request(
+                            provider, latitude, longitude, start, end
+                        )
+                    )
                 
                 # Response analysis
                 logger.info(f"📊 PROVIDER RESPONSE ANALYSIS:")
                 logger.info(f"  📅 Records returned: {len(weather_data)}")
                 
                 if weather_data:
-                    first_record = weather_data[0]
-                    last_record = weather_data[-1]
-                    logger.info(f"  📅 Date range: {first_record.get('date')} → {last_record.get('date')}")
-                    
-                    # Data source tracking
-                    data_sources = set(record.get('data_source', 'unknown') for record in weather_data)
-                    logger.info(f"  🌍 Data sources: {data_sources}")
-                    
-                    # Wind data analysis - ✅ JAVÍTOTT NEVEK + SZÉLIRÁNY
-                    wind_speed_values = [r.get('windspeed_10m_max') for r in weather_data if r.get('windspeed_10m_max') is not None]
-                    wind_gusts_values = [r.get('windgusts_10m_max') for r in weather_data if r.get('windgusts_10m_max') is not None]
-                    wind_direction_values = [r.get('winddirection_10m_dominant') for r in weather_data if r.get('winddirection_10m_dominant') is not None]
-                    
-                    if wind_speed_values:
-                        logger.info(f"  💨 Wind speed range: {min(wind_speed_values):.1f} → {max(wind_speed_values):.1f} km/h")
-                        logger.info(f"  📊 Valid wind speed records: {len(wind_speed_values)}/{len(weather_data)} ({len(wind_speed_values)/len(weather_data)*100:.1f}%)")
-                    
-                    if wind_gusts_values:
-                        logger.info(f"  🌪️ Wind gusts range: {min(wind_gusts_values):.1f} → {max(wind_gusts_values):.1f} km/h")
-                        logger.info(f"  📊 Valid wind gusts records: {len(wind_gusts_values)}/{len(weather_data)} ({len(wind_gusts_values)/len(weather_data)*100:.1f}%)")
-                    
-                    if wind_direction_values:
-                        logger.info(f"  🧭 Wind direction range: {min(wind_direction_values):.0f}° → {max(wind_direction_values):.0f}°")
-                        logger.info(f"  📊 Valid wind direction records: {len(wind_direction_values)}/{len(weather_data)} ({len(wind_direction_values)/len(weather_data)*100:.1f}%)")
-                    
-                    # Temperature analysis
-                    temp_max_values = [r.get('temperature_2m_max') for r in weather_data if r.get('temperature_2m_max') is not None]
-                    if temp_max_values:
-                        logger.info(f"  🌡️ Temperature range: {min(temp_max_values):.1f}°C → {max(temp_max_values):.1f}°C")
-                        logger.info(f"  📊 Valid temp records: {len(temp_max_values)}/{len(weather_data)} ({len(temp_max_values)/len(weather_data)*100:.1f}%)")
+                    self._log_response_summary(weather_data)
                 
                 # Sikeres lekérdezés kezelése
                 self._handle_successful_request(attempt_provider, selected_provider)
@@ -782,8 +978,9 @@ class WeatherClient:
                 
                 logger.info(f"🎉 SUCCESS: {len(weather_data)} nap ({get_source_display_name(attempt_provider)})")
                 
-                # 🔧 KRITIKUS JAVÍTÁS v4.5: EGYSÉGES VISSZATÉRÉS - CSAK List[Dict]!
-                return weather_data  # ✅ Nincs tuple, csak tiszta lista!
+                # 🔧 KRITIKUS JAVÍTÁS v4.5: EGYSÉGES VISSZATÉRÉS - nincs tuple!
+                # ⚡ WeatherColumns: List[Dict]-ként indexelhető/iterálható, oszloposan tárolva
+                return weather_data
                 
             except (WeatherAPIError, ProviderValidationError) as e:
                 last_error = e
@@ -795,74 +992,180 @@ class WeatherClient:
         logger.error(f"❌ ALL PROVIDERS FAILED. Last error: {last_error}")
         raise ProviderNotAvailableError(f"Minden provider sikertelen. Utolsó hiba: {last_error}")
     
+    def _log_response_summary(self, weather_data: WeatherColumns) -> None:
+        """
+        Provider válasz összesítő log - oszloponként egyetlen NumPy menet
+        (nem rekordonkénti listaépítés és min/max bejárás).
+        """
+        total = len(weather_data)
+        logger.info(f"  📅 Date range: {weather_data.dates[0]} → {weather_data.dates[-1]}")
+        logger.info(f"  🌍 Data sources: {{'{weather_data.data_source}'}}")
+        
+        # Wind data analysis - ✅ JAVÍTOTT NEVEK + SZÉLIRÁNY, majd hőmérséklet
+        summaries = (
+            ("windspeed_10m_max", "💨 Wind speed range", "wind speed", " km/h", 1),
+            ("windgusts_10m_max", "🌪️ Wind gusts range", "wind gusts", " km/h", 1),
+            ("winddirection_10m_dominant", "🧭 Wind direction range", "wind direction", "°", 0),
+            ("temperature_2m_max", "🌡️ Temperature range", "temp", "°C", 1),
+        )
+        for column_name, range_label, count_label, unit, decimals in summaries:
+            stats = weather_data.column_stats(column_name)
+            if stats is None:
+                continue
+            valid, min_value, max_value = stats
+            logger.info(f"  {range_label}: {min_value:.{decimals}f}{unit} → {max_value:.{decimals}f}{unit}")
+            logger.info(f"  📊 Valid {count_label} records: {valid}/{total} ({valid / total * 100:.1f}%)")
+    
+    def _is_provider_valid(self, provider_id: str) -> bool:
+        """Provider konfiguráció (API kulcs) validálása - egyszer, utána cache-ből."""
+        valid = self._provider_validity.get(provider_id)
+        if valid is None:
+            provider = self.providers.get(provider_id)
+            valid = bool(provider and provider.validate_provider())
+            self._provider_validity[provider_id] = valid
+        return valid
+    
+    def _remaining_quota(self, provider_id: str) -> float:
+        """
+        Hátralévő havi kvóta aránya (0-1) - korlátlan providernél 1.0.
+        
+        A lefoglalt keret szabadnak számít: egy futó batch saját foglalása ne
+        terelje el a batch kéréseit a providertől.
+        """
+        remaining = UsageTracker.remaining_quota(provider_id, include_reserved=True)
+        if remaining is None:
+            return 1.0
+        return remaining / UsageTracker.MONTHLY_LIMITS[UsageTracker._usage_key(provider_id)]
+    
+    def _rank_providers(self, preferred: Optional[str]) -> List[str]:
+        """
+        Érvényes távoli providerek rangsora mért egészség és kvóta alapján (nyitott áramkörűek nélkül).
+        
+        A helyi providerek nem vesznek részt: lefedettségük pontfüggő, ezért
+        kérésenként kerülnek a láncba (_with_local_providers).
+        """
+        candidates = [
+            provider_id for provider_id, provider in self.providers.items()
+            if not provider.is_local and self._is_provider_valid(provider_id)
+        ]
+        return self.health.rank(candidates, preferred=preferred, quota_fn=self._remaining_quota)
+    
+    def _with_local_providers(self, chain: List[str], latitude: float, longitude: float,
+                              start_date: str, end_date: str, prefer: bool) -> List[str]:
+        """
+        A kérést lefedő, érvényes helyi providerek beillesztése a láncba.
+        
+        prefer esetén a lánc elejére (lemez sebesség, nincs kvóta), egyébként a
+        végére - a kért távoli provider marad az első, a helyi adat a tartalék.
+        """
+        local = [
+            provider_id for provider_id, provider in self.providers.items()
+            if provider.is_local and provider_id not in chain
+            and self._is_provider_valid(provider_id) and self.health.is_available(provider_id)
+            and provider.covers(latitude, longitude, start_date, end_date)
+        ]
+        return local + chain if prefer else chain + local
+    
     def _select_provider(self, user_override: Optional[str] = None) -> Optional[str]:
         if user_override:
-            if user_override in self.providers and self.providers[user_override].validate_provider():
-                logger.info(f"👤 USER OVERRIDE: {get_source_display_name(user_override)}")
-                return user_override
+            if user_override in self.providers and self._is_provider_valid(user_override):
+                if self.health.is_available(user_override):
+                    logger.info(f"🎯 USER OVERRIDE: {user_override}")
+                    return user_override
+                logger.warning(f"⚡ USER OVERRIDE CIRCUIT OPEN, HEALTH ROUTING: {user_override}")
             else:
                 logger.warning(f"⚠️ USER OVERRIDE FAILED: {user_override}")
         
         if self.preferred_provider == "auto":
             optimal = get_optimal_data_source("single_city", prefer_free=True)
-            if optimal in self.providers and self.providers[optimal].validate_provider():
-                logger.info(f"🤖 AUTO SELECTED: {optimal}")
-                return optimal
-            
-            for provider_id, provider in self.providers.items():
-                if provider.validate_provider():
-                    logger.info(f"🔄 FALLBACK SELECTED: {provider_id}")
-                    return provider_id
+            ranked = self._rank_providers(optimal)
+            if ranked:
+                if ranked[0] == optimal:
+                    logger.info(f"🤖 AUTO SELECTED: {optimal}")
+                else:
+                    logger.info(f"🩺 HEALTH ROUTED: {ranked[0]} (optimális: {optimal})")
+                return ranked[0]
             
             return None
         else:
             if self.preferred_provider in self.providers:
-                if self.providers[self.preferred_provider].validate_provider():
+                if self._is_provider_valid(self.preferred_provider) and self.health.is_available(self.preferred_provider):
                     return self.preferred_provider
                 else:
                     logger.warning(f"⚠️ PREFERRED FAILED, AUTO FALLBACK: {self.preferred_provider}")
-                    return self._select_provider(None)
+                    ranked = self._rank_providers(self.preferred_provider)
+                    return ranked[0] if ranked else None
             else:
                 logger.error(f"❌ UNKNOWN PREFERRED: {self.preferred_provider}")
                 return None
     
     def _get_provider_fallback_chain(self, primary_provider: str) -> List[str]:
-        available_providers = [
-            provider_id for provider_id, provider in self.providers.items()
-            if provider.validate_provider()
-        ]
+        """Elsődleges provider, majd a többi egészség szerint rangsorolva (nyitott áramkörűek nélkül)."""
+        ranked = self._rank_providers(primary_provider)
         
-        if primary_provider in available_providers:
-            available_providers.remove(primary_provider)
-            available_providers.insert(0, primary_provider)
+        if primary_provider in ranked:
+            ranked.remove(primary_provider)
+        if self.health.is_available(primary_provider):
+            ranked.insert(0, primary_provider)
         
-        return available_providers
+        return ranked
     
     def _retry_weather_request(self, provider: WeatherProvider, latitude: float, longitude: float,
-                              start_date: str, end_date: str) -> List[Dict[str, Any]]:
+                              start_date: str, end_date: str, **fetch_kwargs: Any) -> WeatherColumns:
         """
         🔧 JAVÍTÁS v4.5: MINDIG List[Dict] visszatérés
+        
+        🩺 Minden kísérlet mérve (késleltetés, hiba, 429). Nyitott áramkörnél hívás
+        nélkül, half-open próbánál vagy az áramkör nyitásakor retry nélkül ad fel -
+        a fallback lánc a következő providerrel folytatja.
+        📈 429 esetén nincs fix várakozás: a következő kísérletet az AIMD szabályzó
+        a Retry-After lejártáig tartja vissza; túl hosszú tiltásnál fallback.
         """
-        logger.info(f"🔄 STARTING RETRY SEQUENCE for {provider.provider_id}")
+        provider_id = provider.provider_id
+        logger.info(f"🔄 STARTING RETRY SEQUENCE for {provider_id}")
         
         for attempt in range(self.max_retries):
+            if not UsageTracker.has_budget(provider_id, reservation=UsageTracker.active_reservation(provider_id)):
+                raise ProviderQuotaExceededError(f"{provider_id} havi kvóta elfogyott - kihagyva")
+            if not self.health.acquire(provider_id):
+                raise ProviderCircuitOpenError(f"{provider_id} áramkör nyitva - kihagyva")
+            probing = self.health.is_probing(provider_id)
+            
+            started = time.perf_counter()
             try:
-                logger.info(f"🔄 ATTEMPT {attempt + 1}/{self.max_retries}")
-                result = provider.get_weather_data(latitude, longitude, start_date, end_date)
+                logger.info(f"🔄 ATTEMPT {attempt + 1}/{self.max_retries}" + (" (próba)" if probing else ""))
+                result = provider.get_weather_data(latitude, longitude, start_date, end_date, **fetch_kwargs)
+                self.health.record_success(provider_id, time.perf_counter() - started)
                 logger.info(f"✅ ATTEMPT SUCCESS: {len(result)} records")
                 return result
             
             except WeatherAPIError as e:
+                rate_limited = isinstance(e, ProviderRateLimitError)
+                self.health.record_failure(provider_id, time.perf_counter() - started, rate_limited=rate_limited)
                 logger.error(f"❌ ATTEMPT {attempt + 1} FAILED: {e}")
-                if attempt < self.max_retries - 1:
+                
+                if probing or isinstance(e, ProviderQuotaExceededError) or not self.health.is_available(provider_id):
+                    logger.warning(f"⚡ {provider_id}: nincs további retry (próba/kvóta/nyitott áramkör)")
+                    raise
+                
+                if rate_limited and e.retry_after is not None and e.retry_after > APIConfig.RETRY_AFTER_FAILOVER:
+                    logger.warning(f"⏳ {provider_id}: Retry-After {e.retry_after:.0f}s - fallback a kivárás helyett")
+                    raise
+                
+                if rate_limited and attempt < self.max_retries - 1:
+                    logger.info(f"⏳ RETRYING after Retry-After ({provider_id} szabályzó)")
+                elif attempt < self.max_retries - 1:
                     delay = self.retry_delay * (attempt + 1)
                     logger.info(f"⏳ RETRYING in {delay}s...")
                     time.sleep(delay)
                 else:
                     logger.error(f"❌ MAX RETRIES REACHED")
                     raise
-        
-        return []
+            
+            except BaseException:
+                # Váratlan hiba - a próba ne ragadjon be half-open állapotban
+                self.health.record_failure(provider_id, time.perf_counter() - started)
+                raise
     
     def _handle_successful_request(self, used_provider: str, requested_provider: str) -> None:
         self.current_provider = used_provider
@@ -904,21 +1207,26 @@ class WeatherClient:
     
     def get_available_providers(self) -> List[str]:
         return [
-            provider_id for provider_id, provider in self.providers.items()
-            if provider.validate_provider()
+            provider_id for provider_id in self.providers
+            if self._is_provider_valid(provider_id)
         ]
     
     def get_provider_status(self) -> Dict[str, Dict[str, Any]]:
         status = {}
         
+        health = self.health.get_snapshot()
+        concurrency = get_concurrency_stats()
+        
         for provider_id, provider in self.providers.items():
-            available = provider.validate_provider()
+            available = self._is_provider_valid(provider_id)
             status[provider_id] = {
                 "display_name": provider.display_name,
                 "available": available,
                 "request_count": provider.get_request_count(),
                 "usage_count": self.provider_usage_stats.get(provider_id, 0),
-                "is_current": self.current_provider == provider_id
+                "is_current": self.current_provider == provider_id,
+                "health": health.get(provider_id),
+                "concurrency": concurrency.get(provider_id)
             }
         
         return status
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Weather Columns - Oszlopos (NumPy) napi időjárás adatok
+Global Weather Analyzer projekt
+
+⚡ GYORS DEKÓDOLÁS: orjson (ha telepítve) → json fallback, a válasz közvetlenül
+   típusos NumPy oszlopokba kerül (float64, hiányzó érték = NaN)
+📅 DÁTUM INDEX: datetime64[D] tömb - rendezés, szűrés, összefűzés vektorizáltan
+🧾 LUSTA REKORDOK: A régi List[Dict] nézet (rekord dict-ek) csak kérésre épül fel,
+   így a meglévő fogyasztók (weather_data[0].get(...), for record in ...) változatlanok
+
+Használat:
+    columns = WeatherColumns.from_daily_json(response_data["daily"], "open-meteo")
+    columns.column("temperature_2m_max")     # np.ndarray (float64)
+    columns[0]                               # {"date": "2024-01-01", "data_source": ..., ...}
+    columns.to_daily_dict()                  # {"time": [...], "temperature_2m_max": [...]}
+"""
+
+import json
+import logging
+from collections.abc import Sequence
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Gyors JSON parser (opcionális)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def decode_json(payload: Union[bytes, str]) -> Any:
+    """
+    JSON válasz dekódolása - orjson ha elérhető, egyébként a standard json.
+
+    Raises:
+        ValueError: Érvénytelen JSON (a json.JSONDecodeError is ValueError)
+    """
+    if ORJSON_AVAILABLE:
+        # orjson.JSONDecodeError a json.JSONDecodeError alosztálya
+        return orjson.loads(payload)
+    if isinstance(payload, bytes):
+        payload = payload.decode("utf-8")
+    return json.loads(payload)
+
+
+def _to_float_column(values: Iterable[Any], length: int) -> np.ndarray:
+    """Érték lista → float64 tömb (None → NaN), a dátumok hosszára igazítva."""
+    try:
+        column = np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        # Vegyes/nem numerikus értékek - elemenkénti konverzió
+        column = np.array([_safe_float(value) for value in values], dtype=np.float64)
+
+    if column.ndim != 1:
+        column = column.reshape(-1)
+    if len(column) < length:
+        column = np.concatenate([column, np.full(length - len(column), np.nan)])
+    elif len(column) > length:
+        column = column[:length]
+    return column
+
+
+def _safe_float(value: Any) -> float:
+    try:
+        return float(value) if value is not None else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _to_date_index(dates: Iterable[Any]) -> np.ndarray:
+    """Dátum stringek → datetime64[D] tömb (időbélyeg részt levágva)."""
+    try:
+        return np.array(dates, dtype="datetime64[D]")
+    except (TypeError, ValueError):
+        return np.array([str(value)[:10] for value in dates], dtype="datetime64[D]")
+
+
+class WeatherColumns(Sequence):
+    """
+    Napi időjárás adatok oszlopos tárolása.
+
+    Sequence interfészt ad (len, index, slice, iterálás), ahol az elemek a
+    régi rekord dict-ek - ezek csak elérésükkor jönnek létre. A tömböket a
+    példányok megoszthatják, ezért a fogyasztók ne módosítsák őket helyben.
+    """
+
+    __slots__ = ("dates", "columns", "data_source")
+
+    def __init__(self, dates: np.ndarray, columns: Dict[str, np.ndarray], data_source: str):
+        self.dates = dates
+        self.columns = columns
+        self.data_source = data_source
+
+    # === LÉTREHOZÁS ===
+
+    @classmethod
+    def empty(cls, data_source: str) -> "WeatherColumns":
+        return cls(np.array([], dtype="datetime64[D]"), {}, data_source)
+
+    @classmethod
+    def from_daily_json(cls, daily: Dict[str, Any], data_source: str) -> "WeatherColumns":
+        """Open-Meteo "daily" blokk (time + metrika listák) → oszlopok."""
+        times = daily.get("time") or []
+        dates = _to_date_index(times)
+        columns = {
+            key: _to_float_column(values, len(dates))
+            for key, values in daily.items()
+            if key != "time" and isinstance(values, list)
+        }
+        return cls(dates, columns, data_source)
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]], field_mapping: Dict[str, str],
+                     data_source: str, date_field: str = "date") -> "WeatherColumns":
+        """
+        Rekord lista (pl. Meteostat "data") → oszlopok.
+
+        Args:
+            records: Forrás rekordok
+            field_mapping: Forrás mező → cél oszlop név (a dátum mező nélkül)
+            data_source: Provider azonosító
+            date_field: Dátum mező neve a forrás rekordokban
+        """
+        dates = _to_date_index([record.get(date_field) for record in records])
+        present_fields = set().union(*records) if records else set()
+        present = [field for field in field_mapping if field in present_fields]
+        columns = {
+            field_mapping[field]: _to_float_column([record.get(field) for record in records], len(dates))
+            for field in present
+        }
+        return cls(dates, columns, data_source)
+
+    @classmethod
+    def concat(cls, parts: Iterable["WeatherColumns"],
+               data_source: Optional[str] = None) -> "WeatherColumns":
+        """
+        Több blokk összefűzése dátum szerint rendezve, duplikált napok nélkül.
+
+        Az egyes blokkokból hiányzó oszlopok NaN-nal töltődnek.
+        """
+        parts = [part for part in parts if part is not None]
+        if not parts:
+            return cls.empty(data_source or "unknown")
+        if len(parts) == 1:
+            return parts[0].sorted_unique()
+
+        names: List[str] = []
+        for part in parts:
+            names.extend(name for name in part.columns if name not in names)
+
+        dates = np.concatenate([part.dates for part in parts])
+        columns = {
+            name: np.concatenate([
+                part.columns[name] if name in part.columns else np.full(len(part), np.nan)
+                for part in parts
+            ])
+            for name in names
+        }
+        return cls(dates, columns, data_source or parts[0].data_source).sorted_unique()
+
+    # === MŰVELETEK ===
+
+    def sorted_unique(self) -> "WeatherColumns":
+        """Dátum szerint rendezett, napi egyedi nézet (az első előfordulás marad)."""
+        if len(self.dates) < 2:
+            return self
+        if np.all(self.dates[1:] > self.dates[:-1]):
+            return self
+        _, first_idx = np.unique(self.dates, return_index=True)
+        return self.take(first_idx)
+
+    def take(self, indices: np.ndarray) -> "WeatherColumns":
+        """Sorok kiválasztása index vagy bool maszk alapján (másolat)."""
+        return WeatherColumns(
+            self.dates[indices],
+            {name: values[indices] for name, values in self.columns.items()},
+            self.data_source
+        )
+
+    def between(self, start_date: str, end_date: str) -> "WeatherColumns":
+        """Zárt [start_date, end_date] időszak sorai."""
+        start, end = np.datetime64(start_date[:10], "D"), np.datetime64(end_date[:10], "D")
+        mask = (self.dates >= start) & (self.dates <= end)
+        if mask.all():
+            return self
+        return self.take(mask)
+
+    def with_column(self, name: str, values: np.ndarray) -> "WeatherColumns":
+        """Új példány egy hozzáadott/lecserélt oszloppal."""
+        columns = dict(self.columns)
+        columns[name] = values
+        return WeatherColumns(self.dates, columns, self.data_source)
+
+    # === OSZLOP HOZZÁFÉRÉS ===
+
+    def column(self, name: str) -> Optional[np.ndarray]:
+        """Egy oszlop tömbje (None ha nincs ilyen oszlop)."""
+        return self.columns.get(name)
+
+    def date_strings(self) -> List[str]:
+        """Dátumok ISO stringként (YYYY-MM-DD)."""
+        return np.datetime_as_string(self.dates, unit="D").tolist()
+
+    def column_stats(self, name: str) -> Optional[Tuple[int, float, float]]:
+        """
+        Oszlop statisztika egy menetben: (érvényes elemek, min, max).
+
+        Returns:
+            None ha az oszlop hiányzik vagy nincs érvényes értéke
+        """
+        values = self.columns.get(name)
+        if values is None:
+            return None
+        valid = int(np.count_nonzero(~np.isnan(values)))
+        if valid == 0:
+            return None
+        return valid, float(np.nanmin(values)), float(np.nanmax(values))
+
+    # === RÉGI (REKORD) NÉZETEK ===
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Egy nap rekord dict-je (NaN → None)."""
+        record: Dict[str, Any] = {
+            "date": str(self.dates[index]),
+            "data_source": self.data_source,
+        }
+        for name, values in self.columns.items():
+            value = values[index]
+            record[name] = None if np.isnan(value) else float(value)
+        return record
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Teljes List[Dict] nézet (oszloponként egy tolist, nem elemenkénti numpy elérés)."""
+        names = list(self.columns)
+        value_lists = [self._column_list(name) for name in names]
+        data_source = self.data_source
+        return [
+            {"date": date, "data_source": data_source, **dict(zip(names, row_values))}
+            for date, *row_values in zip(self.date_strings(), *value_lists)
+        ]
+
+    def to_daily_dict(self) -> Dict[str, List[Any]]:
+        """Open-Meteo stílusú "daily" dict: {"time": [...], oszlop: [...]} (NaN → None)."""
+        daily: Dict[str, List[Any]] = {"time": self.date_strings()}
+        for name in self.columns:
+            daily[name] = self._column_list(name)
+        return daily
+
+    def _column_list(self, name: str) -> List[Optional[float]]:
+        values = self.columns[name]
+        if not np.isnan(values).any():
+            return values.tolist()
+        return np.where(np.isnan(values), None, values).tolist()
+
+    # === SEQUENCE INTERFÉSZ ===
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("WeatherColumns index out of range")
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.to_records())
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return f"<WeatherColumns {self.data_source} (üres)>"
+        return (f"<WeatherColumns {self.data_source} {self.dates[0]} → {self.dates[-1]} "
+                f"({len(self)} nap, {len(self.columns)} oszlop)>")
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Devtools Module - Fejlesztői és mérési eszközök
+===============================================
+- Stand-in API szerver: helyi Open-Meteo archív és Meteostat végpontok
+  szintetikus vagy felvett adatokkal, késleltetés- és hibainjektálással
+- Offline, determinisztikus benchmarkokhoz (élő API és rate limit nélkül)
+- Span tracing: hot-path szakaszok időmérése, elemzésenkénti összesítés,
+  Chrome trace export (kikapcsolva gyakorlatilag nulla költség)
+"""
+
+from .standin_server import (
+    StandInServer,
+    StandInConfig
+)
+from .tracing import (
+    Tracer,
+    STAGES,
+    get_tracer,
+    span,
+    analysis,
+    traced
+)
+
+__all__ = [
+    'StandInServer',
+    'StandInConfig',
+    'Tracer',
+    'STAGES',
+    'get_tracer',
+    'span',
+    'analysis',
+    'traced'
+]
@@ -0,0 +1,670 @@
+#!/usr/bin/env python3
+"""
+Stand-in API Server - Helyi Open-Meteo archív és Meteostat végpontok
+Global Weather Analyzer projekt
+
+🧪 OFFLINE BENCHMARK: A WeatherClient, MultiCityEngine és a trend pipeline élő
+   API és rate limit nélkül, determinisztikusan mérhető
+🌍 VÉGPONTOK: /v1/archive (Open-Meteo), /meteostat/point/daily,
+   /meteostat/stations/daily - a providerek által használt formátumban
+🎲 SZINTETIKUS ADAT: Helyszín + nap alapú hash zaj (vektorizált NumPy) - átfedő
+   időszakok és ismételt kérések ugyanazt az értéket adják; Open-Meteo oldalon
+   0.1°-os rácsra illesztve, mint az ERA5-Land archívum
+📼 FELVÉTEL / VISSZAJÁTSZÁS: mode="record" a valódi API válaszait menti,
+   mode="replay" a mentett válaszokat adja (hiány esetén szintetikus adat)
+⏱️ HIBAINJEKTÁLÁS: Késleltetés + jitter, 5xx és 429 arány (Retry-After),
+   párhuzamossági korlát (túllépésnél 429), provider kiesés, hiányzó értékek
+
+A döntések (hiba, 429, jitter) a kérés kulcsából és ismétlésszámából hash-elt
+értékek - a szálak ütemezésétől függetlenül ugyanazt adják.
+
+Használat (folyamaton belül):
+    with StandInServer(StandInConfig(latency_ms=80, error_rate=0.02)) as server:
+        server.install()                 # APIConfig URL-ek a helyi szerverre
+        client = WeatherClient()         # az új providerek már a stand-in-t hívják
+
+Használat (külön folyamat):
+    python -m src.devtools.standin_server --port 8765 --latency-ms 80
+    WEATHER_ANALYZER_API_STANDIN=http://127.0.0.1:8765 python main.py
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, asdict, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+
+from ..config import APIConfig
+
+logger = logging.getLogger(__name__)
+
+# Gyors JSON szerializáló (opcionális)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# Valódi végpontok a felvételhez (az APIConfig már a stand-in-re mutathat)
+UPSTREAM_OPEN_METEO_ARCHIVE = "https://archive-api.open-meteo.com/v1/archive"
+UPSTREAM_METEOSTAT_BASE = "https://meteostat.p.rapidapi.com"
+
+# Open-Meteo archív rács (ERA5-Land) - a szintetikus adat cellánként azonos
+OPEN_METEO_GRID = 0.1
+
+ENDPOINT_PROVIDERS = {
+    "/v1/archive": "open-meteo",
+    "/meteostat/point/daily": "meteostat",
+    "/meteostat/stations/daily": "meteostat",
+}
+
+
+@dataclass
+class StandInConfig:
+    """Stand-in szerver viselkedése (futás közben a configure()-ral módosítható)."""
+    latency_ms: float = 0.0             # alap válaszidő
+    latency_jitter_ms: float = 0.0      # + egyenletes [0, jitter) késleltetés
+    error_rate: float = 0.0             # 5xx válaszok aránya
+    rate_limit_rate: float = 0.0        # véletlen 429 válaszok aránya
+    retry_after: Optional[float] = 1.0  # 429 Retry-After fejléc (None = nincs fejléc)
+    max_concurrent: Optional[int] = None  # egyszerre kiszolgált kérések - túllépésnél 429
+    failing_providers: Tuple[str, ...] = ()  # mindig 503 (fallback mérés)
+    missing_rate: float = 0.0           # napi értékek ennyi része null
+    seed: int = 42
+    mode: str = "synthetic"             # "synthetic" | "replay" | "record"
+    recordings_dir: Optional[Path] = None
+
+
+# === SZINTETIKUS ADAT ===
+
+_MASK64 = (1 << 64) - 1
+
+
+def _location_key(*parts: Any) -> int:
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _hash_uniform(key: int, day_numbers: np.ndarray, channel: int) -> np.ndarray:
+    """Nap és csatorna szerinti determinisztikus [0, 1) értékek (splitmix64, vektorizált)."""
+    offset = np.uint64((key + channel * 0x9E3779B97F4A7C15) & _MASK64)
+    with np.errstate(over="ignore"):
+        x = day_numbers.astype(np.uint64) * np.uint64(0xBF58476D1CE4E5B9) + offset
+        x ^= x >> np.uint64(30)
+        x *= np.uint64(0xBF58476D1CE4E5B9)
+        x ^= x >> np.uint64(27)
+        x *= np.uint64(0x94D049BB133111EB)
+        x ^= x >> np.uint64(31)
+    return (x >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def _hash_normal(key: int, day_numbers: np.ndarray, channel: int) -> np.ndarray:
+    """Standard normális zaj Box-Muller transzformációval két hash csatornából."""
+    u1 = np.maximum(_hash_uniform(key, day_numbers, channel), 1e-12)
+    u2 = _hash_uniform(key, day_numbers, channel + 1000)
+    return np.sqrt(-2.0 * np.log(u1)) * np.cos(2.0 * np.pi * u2)
+
+
+def synthetic_daily(latitude: float, longitude: float, dates: np.ndarray, key: int,
+                    missing_rate: float = 0.0) -> Dict[str, np.ndarray]:
+    """
+    Szintetikus napi idősor (Open-Meteo változónevekkel).
+
+    Szélességfüggő évi közép és amplitúdó, évszakos koszinusz, napi hash zaj;
+    a déli félteke évszakai fordítottak.
+    """
+    day_numbers = dates.astype("datetime64[D]").astype(np.int64)
+    day_of_year = (dates - dates.astype("datetime64[Y]")).astype(np.int64)
+
+    abs_lat = abs(latitude)
+    annual_mean = 27.0 - 0.42 * abs_lat
+    amplitude = min(4.0 + 0.28 * abs_lat, 22.0) * (1.0 if latitude >= 0 else -1.0)
+    seasonal = -np.cos(2.0 * np.pi * (day_of_year - 15) / 365.25) * amplitude
+
+    t_mean = annual_mean + seasonal + 2.8 * _hash_normal(key, day_numbers, 1)
+    spread = 3.5 + 2.5 * _hash_uniform(key, day_numbers, 2)
+    wet = _hash_uniform(key, day_numbers, 3) < 0.33
+    precipitation = np.where(wet, -np.log(np.maximum(_hash_uniform(key, day_numbers, 4), 1e-9)) * 4.0, 0.0)
+    wind = 8.0 + 22.0 * _hash_uniform(key, day_numbers, 5) ** 1.5
+    gusts = wind * (1.5 + 0.5 * _hash_uniform(key, day_numbers, 6))
+
+    daily = {
+        "temperature_2m_max": t_mean + spread,
+        "temperature_2m_min": t_mean - spread,
+        "temperature_2m_mean": t_mean,
+        "precipitation_sum": precipitation,
+        "windspeed_10m_max": wind,
+        "windgusts_10m_max": gusts,
+        "winddirection_10m_dominant": np.floor(_hash_uniform(key, day_numbers, 7) * 360.0),
+    }
+    daily = {name: np.round(values, 1) for name, values in daily.items()}
+
+    if missing_rate > 0.0:
+        for channel, name in enumerate(daily, start=20):
+            mask = _hash_uniform(key, day_numbers, channel) < missing_rate
+            daily[name] = np.where(mask, np.nan, daily[name])
+
+    return daily
+
+
+def synthetic_hourly(daily: Dict[str, np.ndarray], dates: np.ndarray,
+                     variables: List[str]) -> Dict[str, List[Any]]:
+    """Óránkénti sor a napi értékekből (délutáni csúcsú napi menet)."""
+    hours = np.arange(24)
+    shape = 0.55 + 0.45 * np.sin(np.pi * np.clip(hours - 6, 0, 16) / 16.0)
+    times = (dates.astype("datetime64[h]")[:, None] + hours.astype("timedelta64[h]")[None, :]).reshape(-1)
+
+    hourly: Dict[str, List[Any]] = {
+        "time": [value[:16] for value in np.datetime_as_string(times, unit="m").tolist()]
+    }
+    sources = {"wind_gusts_10m": "windgusts_10m_max", "windspeed_10m": "windspeed_10m_max",
+               "temperature_2m": "temperature_2m_max"}
+    for variable in variables:
+        source = sources.get(variable)
+        if source is None:
+            continue
+        values = np.round((daily[source][:, None] * shape[None, :]).reshape(-1), 1)
+        hourly[variable] = _nan_to_none(values)
+    return hourly
+
+
+def _nan_to_none(values: np.ndarray) -> List[Optional[float]]:
+    if not np.isnan(values).any():
+        return values.tolist()
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+def _date_range(start_date: str, end_date: str) -> np.ndarray:
+    start = np.datetime64(start_date[:10], "D")
+    end = np.datetime64(end_date[:10], "D")
+    if end < start:
+        raise ValueError("end_date < start_date")
+    return np.arange(start, end + np.timedelta64(1, "D"), dtype="datetime64[D]")
+
+
+class _RequestError(Exception):
+    def __init__(self, status: int, reason: str):
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+
+
+# === SZERVER ===
+
+class StandInServer:
+    """
+    Helyi stand-in HTTP szerver (ThreadingHTTPServer, háttérszálon).
+
+    Minden kérés külön szálon fut, így a párhuzamossági korlát, a késleltetés és
+    a 429/5xx injektálás a valódi providerekhez hasonlóan terheli a klienst.
+    """
+
+    def __init__(self, config: Optional[StandInConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StandInConfig()
+        self.host = host
+        self.port = port
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._attempts: Dict[str, int] = {}
+        self._installed: Optional[Dict[str, str]] = None
+        self._stats: Dict[str, Any] = {}
+        self.reset_stats()
+
+    # === ÉLETCIKLUS ===
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> str:
+        """Szerver indítása háttérszálon; a tényleges URL-t adja vissza."""
+        if self._httpd is not None:
+            return self.url
+
+        handler = type("StandInRequestHandler", (_StandInRequestHandler,), {"standin": self})
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="StandInServer", daemon=True)
+        self._thread.start()
+        logger.info(f"🧪 Stand-in API szerver: {self.url} (mód: {self.config.mode})")
+        return self.url
+
+    def stop(self) -> None:
+        self.uninstall()
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> "StandInServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def install(self) -> None:
+        """
+        APIConfig / APIConstants végpontok átirányítása erre a szerverre (folyamaton belül).
+
+        Csak az ezután létrehozott providerekre hat (a base_url példányonként rögzül).
+        """
+        from ..gui.utils import APIConstants
+
+        if self._installed is None:
+            self._installed = {
+                "archive": APIConfig.OPEN_METEO_ARCHIVE,
+                "meteostat": APIConfig.METEOSTAT_BASE,
+            }
+        for target in (APIConfig, APIConstants):
+            target.OPEN_METEO_ARCHIVE = f"{self.url}/v1/archive"
+            target.METEOSTAT_BASE = f"{self.url}/meteostat"
+
+    def uninstall(self) -> None:
+        """Az install() előtti végpontok visszaállítása."""
+        if self._installed is None:
+            return
+        from ..gui.utils import APIConstants
+
+        for target in (APIConfig, APIConstants):
+            target.OPEN_METEO_ARCHIVE = self._installed["archive"]
+            target.METEOSTAT_BASE = self._installed["meteostat"]
+        self._installed = None
+
+    # === KONFIGURÁCIÓ / STATISZTIKA ===
+
+    def configure(self, **changes: Any) -> None:
+        """Viselkedés módosítása futás közben (pl. configure(error_rate=0.2))."""
+        valid = {f.name for f in fields(StandInConfig)}
+        unknown = set(changes) - valid
+        if unknown:
+            raise ValueError(f"Ismeretlen stand-in beállítás: {', '.join(sorted(unknown))}")
+        with self._lock:
+            for name, value in changes.items():
+                if name == "failing_providers":
+                    value = tuple(value)
+                elif name == "recordings_dir" and value is not None:
+                    value = Path(value)
+                setattr(self.config, name, value)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._attempts.clear()
+            self._stats = {
+                "requests": 0,
+                "by_endpoint": {},
+                "by_status": {},
+                "injected_errors": 0,
+                "injected_rate_limits": 0,
+                "concurrency_rejections": 0,
+                "synthetic": 0,
+                "replayed": 0,
+                "recorded": 0,
+                "max_in_flight": 0,
+            }
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = json.loads(json.dumps(self._stats))
+            stats["in_flight"] = self._in_flight
+            return stats
+
+    # === KÉRÉS FELDOLGOZÁS ===
+
+    def _enter(self, path: str) -> Tuple[bool, int]:
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["by_endpoint"][path] = self._stats["by_endpoint"].get(path, 0) + 1
+            limit = self.config.max_concurrent
+            if limit is not None and self._in_flight >= limit:
+                self._stats["concurrency_rejections"] += 1
+                return False, self._in_flight
+            self._in_flight += 1
+            self._stats["max_in_flight"] = max(self._stats["max_in_flight"], self._in_flight)
+            return True, self._in_flight
+
+    def _leave(self, status: int) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._count_status(status)
+
+    def _count_status(self, status: int) -> None:
+        key = str(status)
+        self._stats["by_status"][key] = self._stats["by_status"].get(key, 0) + 1
+
+    def _roll(self, request_key: str, attempt: int, channel: str) -> float:
+        """Kérés kulcs + ismétlésszám alapú determinisztikus [0, 1) érték."""
+        digest = hashlib.blake2b(f"{self.config.seed}:{request_key}:{attempt}:{channel}".encode("utf-8"),
+                                 digest_size=8).digest()
+        return int.from_bytes(digest, "little") / float(1 << 64)
+
+    def handle(self, path: str, query: Dict[str, List[str]],
+               headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """Egy GET kérés kiszolgálása → (státusz, fejlécek, törzs)."""
+        if path == "/__standin__/stats":
+            return 200, {}, _dumps(self.get_stats())
+
+        provider = ENDPOINT_PROVIDERS.get(path)
+        if provider is None:
+            return self._finish_unmanaged(404, {"error": True, "reason": f"Ismeretlen végpont: {path}"})
+
+        request_key = _request_key(path, query)
+        with self._lock:
+            attempt = self._attempts.get(request_key, 0)
+            self._attempts[request_key] = attempt + 1
+            config = StandInConfig(**asdict(self.config))
+
+        admitted, _ = self._enter(path)
+        if not admitted:
+            with self._lock:
+                self._count_status(429)
+            return 429, self._retry_after_headers(config), _dumps({"error": True, "reason": "Too many concurrent requests"})
+
+        status = 500
+        try:
+            delay = config.latency_ms + config.latency_jitter_ms * self._roll(request_key, attempt, "jitter")
+            if delay > 0:
+                time.sleep(delay / 1000.0)
+
+            if provider in config.failing_providers:
+                status = 503
+                return status, {}, _dumps({"error": True, "reason": f"{provider} kiesés (stand-in)"})
+
+            if self._roll(request_key, attempt, "ratelimit") < config.rate_limit_rate:
+                with self._lock:
+                    self._stats["injected_rate_limits"] += 1
+                status = 429
+                return status, self._retry_after_headers(config), _dumps({"error": True, "reason": "Rate limit"})
+
+            if self._roll(request_key, attempt, "error") < config.error_rate:
+                with self._lock:
+                    self._stats["injected_errors"] += 1
+                status = 500 if self._roll(request_key, attempt, "error-kind") < 0.5 else 503
+                return status, {}, _dumps({"error": True, "reason": "Injected server error"})
+
+            if provider == "meteostat" and not headers.get("x-rapidapi-key"):
+                status = 401
+                return status, {}, _dumps({"message": "Missing API key"})
+
+            status, body = self._respond(path, query, headers, request_key, config)
+            return status, {}, body
+
+        except _RequestError as e:
+            status = e.status
+            return status, {}, _dumps({"error": True, "reason": e.reason})
+        finally:
+            self._leave(status)
+
+    def _finish_unmanaged(self, status: int, payload: Dict[str, Any]) -> Tuple[int, Dict[str, str], bytes]:
+        with self._lock:
+            self._stats["requests"] += 1
+            self._count_status(status)
+        return status, {}, _dumps(payload)
+
+    @staticmethod
+    def _retry_after_headers(config: StandInConfig) -> Dict[str, str]:
+        if config.retry_after is None:
+            return {}
+        return {"Retry-After": f"{config.retry_after:g}"}
+
+    def _respond(self, path: str, query: Dict[str, List[str]], headers: Dict[str, str],
+                 request_key: str, config: StandInConfig) -> Tuple[int, bytes]:
+        if config.mode in ("replay", "record") and config.recordings_dir is not None:
+            recording = _recording_path(config.recordings_dir, path, request_key)
+            if recording.exists():
+                with self._lock:
+                    self._stats["replayed"] += 1
+                return 200, recording.read_bytes()
+            if config.mode == "record":
+                status, body = _fetch_upstream(path, query, headers)
+                if status == 200:
+                    recording.parent.mkdir(parents=True, exist_ok=True)
+                    recording.write_bytes(body)
+                    with self._lock:
+                        self._stats["recorded"] += 1
+                return status, body
+
+        with self._lock:
+            self._stats["synthetic"] += 1
+        if path == "/v1/archive":
+            return 200, _dumps(_synthetic_open_meteo(query, config))
+        return 200, _dumps(_synthetic_meteostat(path, query, config))
+
+
+class _StandInRequestHandler(BaseHTTPRequestHandler):
+    """HTTP kérés → StandInServer.handle() (a standin attribútumot a szerver adja)."""
+
+    standin: StandInServer = None
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        headers = {name.lower(): value for name, value in self.headers.items()}
+        status, extra_headers, body = self.standin.handle(parsed.path, parse_qs(parsed.query), headers)
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in extra_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Csendes mód - nincs console spam
+        pass
+
+
+# === VÁLASZ ÉPÍTÉS ===
+
+def _dumps(payload: Any) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _request_key(path: str, query: Dict[str, List[str]]) -> str:
+    """Kanonikus kérés kulcs (rendezett paraméterek, a többértékű paraméterek is rendezve)."""
+    parts = []
+    for name in sorted(query):
+        values = sorted(value for raw in query[name] for value in raw.split(","))
+        parts.append(f"{name}={','.join(values)}")
+    return f"{path}?{'&'.join(parts)}"
+
+
+def _recording_path(recordings_dir: Path, path: str, request_key: str) -> Path:
+    slug = path.strip("/").replace("/", "_")
+    digest = hashlib.sha1(request_key.encode("utf-8")).hexdigest()[:16]
+    return Path(recordings_dir) / f"{slug}__{digest}.json"
+
+
+def _param(query: Dict[str, List[str]], *names: str) -> str:
+    for name in names:
+        if query.get(name):
+            return query[name][0]
+    raise _RequestError(400, f"Hiányzó paraméter: {names[0]}")
+
+
+def _float_param(query: Dict[str, List[str]], name: str) -> float:
+    try:
+        return float(_param(query, name))
+    except ValueError:
+        raise _RequestError(400, f"Érvénytelen szám: {name}")
+
+
+def _list_param(query: Dict[str, List[str]], name: str) -> List[str]:
+    return [value for raw in query.get(name, []) for value in raw.split(",") if value]
+
+
+def _dates(query: Dict[str, List[str]], start_name: str, end_name: str) -> np.ndarray:
+    try:
+        return _date_range(_param(query, start_name), _param(query, end_name))
+    except ValueError as e:
+        raise _RequestError(400, f"Érvénytelen időszak: {e}")
+
+
+def _synthetic_open_meteo(query: Dict[str, List[str]], config: StandInConfig) -> Dict[str, Any]:
+    latitude = _float_param(query, "latitude")
+    longitude = _float_param(query, "longitude")
+    dates = _dates(query, "start_date", "end_date")
+
+    # ERA5-Land rács: egy cellán belül minden koordináta ugyanazt az adatot kapja
+    grid_lat = round(round(latitude / OPEN_METEO_GRID) * OPEN_METEO_GRID, 4)
+    grid_lon = round(round(longitude / OPEN_METEO_GRID) * OPEN_METEO_GRID, 4)
+    key = _location_key("open-meteo", grid_lat, grid_lon, config.seed)
+    series = synthetic_daily(grid_lat, grid_lon, dates, key, config.missing_rate)
+
+    response: Dict[str, Any] = {
+        "latitude": grid_lat,
+        "longitude": grid_lon,
+        "generationtime_ms": 0.1,
+        "utc_offset_seconds": 0,
+        "timezone": "GMT",
+        "timezone_abbreviation": "GMT",
+    }
+
+    daily_variables = _list_param(query, "daily")
+    if daily_variables:
+        unknown = [name for name in daily_variables if name not in series]
+        if unknown:
+            raise _RequestError(400, f"Cannot initialize WeatherVariable from invalid String value {unknown[0]}")
+        response["daily_units"] = {"time": "iso8601", **{name: "" for name in daily_variables}}
+        response["daily"] = {"time": np.datetime_as_string(dates, unit="D").tolist()}
+        for name in daily_variables:
+            response["daily"][name] = _nan_to_none(series[name])
+
+    hourly_variables = _list_param(query, "hourly")
+    if hourly_variables:
+        response["hourly"] = synthetic_hourly(series, dates, hourly_variables)
+
+    return response
+
+
+# Open-Meteo napi változó → Meteostat mező
+_METEOSTAT_FIELDS = {
+    "tavg": "temperature_2m_mean",
+    "tmin": "temperature_2m_min",
+    "tmax": "temperature_2m_max",
+    "prcp": "precipitation_sum",
+    "wspd": "windspeed_10m_max",
+    "wpgt": "windgusts_10m_max",
+    "wdir": "winddirection_10m_dominant",
+}
+
+
+def _synthetic_meteostat(path: str, query: Dict[str, List[str]], config: StandInConfig) -> Dict[str, Any]:
+    dates = _dates(query, "start", "end")
+
+    if path.endswith("/stations/daily"):
+        station_id = _param(query, "station")
+        key = _location_key("meteostat-station", station_id, config.seed)
+        # Állomás "koordináta" az azonosítóból (Közép-Európa környéke)
+        latitude = 45.5 + (key % 600) / 100.0
+        longitude = 16.0 + ((key >> 16) % 700) / 100.0
+        meta = {"stations": [station_id]}
+    else:
+        latitude = _float_param(query, "lat")
+        longitude = _float_param(query, "lon")
+        key = _location_key("meteostat-point", round(latitude, 4), round(longitude, 4), config.seed)
+        meta = {"stations": [f"SI{key % 100000:05d}"]}
+
+    series = synthetic_daily(latitude, longitude, dates, key, config.missing_rate)
+    columns = {field_name: _nan_to_none(series[source]) for field_name, source in _METEOSTAT_FIELDS.items()}
+    tsun = _nan_to_none(np.round(_hash_uniform(key, dates.astype(np.int64), 40) * 600.0))
+
+    data = []
+    for index, date_value in enumerate(np.datetime_as_string(dates, unit="D").tolist()):
+        record = {"date": date_value}
+        for field_name, values in columns.items():
+            record[field_name] = values[index]
+        record["snow"] = None
+        record["pres"] = None
+        record["tsun"] = tsun[index]
+        data.append(record)
+
+    return {"meta": {"generated": time.strftime("%Y-%m-%d %H:%M:%S"), **meta}, "data": data}
+
+
+def _fetch_upstream(path: str, query: Dict[str, List[str]], headers: Dict[str, str]) -> Tuple[int, bytes]:
+    """Felvétel: a kérés továbbítása a valódi API-hoz."""
+    import requests
+
+    if path == "/v1/archive":
+        url = UPSTREAM_OPEN_METEO_ARCHIVE
+        upstream_headers = {"User-Agent": APIConfig.USER_AGENT}
+    else:
+        url = UPSTREAM_METEOSTAT_BASE + path[len("/meteostat"):]
+        upstream_headers = {
+            "User-Agent": APIConfig.USER_AGENT,
+            "X-RapidAPI-Key": headers.get("x-rapidapi-key", ""),
+            "X-RapidAPI-Host": "meteostat.p.rapidapi.com",
+        }
+
+    try:
+        response = requests.get(url, params=query, headers=upstream_headers, timeout=APIConfig.REQUEST_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        raise _RequestError(502, f"Upstream hiba: {e}")
+    return response.status_code, response.content
+
+
+# === PARANCSSOR ===
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Helyi Open-Meteo / Meteostat stand-in API szerver")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--max-concurrent", type=int, default=None)
+    parser.add_argument("--fail", action="append", default=[], metavar="PROVIDER",
+                        help="Provider mindig 503-at ad (open-meteo / meteostat)")
+    parser.add_argument("--missing-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mode", choices=("synthetic", "replay", "record"), default="synthetic")
+    parser.add_argument("--recordings", type=Path, default=None, help="Felvételek könyvtára (replay/record)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    config = StandInConfig(
+        latency_ms=args.latency_ms, latency_jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after, max_concurrent=args.max_concurrent,
+        failing_providers=tuple(args.fail), missing_rate=args.missing_rate,
+        seed=args.seed, mode=args.mode, recordings_dir=args.recordings,
+    )
+
+    server = StandInServer(config, host=args.host, port=args.port)
+    url = server.start()
+    print(f"🧪 Stand-in API szerver fut: {url}")
+    print(f"   WEATHER_ANALYZER_API_STANDIN={url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\n🛑 Stand-in API szerver leállítva")
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Tracing - Könnyűsúlyú hot-path span mérés, elemzésenkénti összesítés, Chrome trace export
+Global Weather Analyzer projekt
+
+⏱️ SPANEK: with span("provider_request", "open-meteo"): ... - perf_counter_ns alapú,
+   szálanként rögzített időszakaszok (a pipeline szakaszai = stage-ek)
+🪶 KIKAPCSOLVA ~0 KÖLTSÉG: egyetlen modul szintű bool ellenőrzés, közös no-op
+   context manager - nincs allokáció, nincs lock
+📊 ELEMZÉSEK: with analysis("multi-city hottest_today"): ... - az utolsó N elemzés
+   stage-enkénti összideje a fejlesztői teljesítmény panelhez; a beágyazás és a nyitott
+   elemzés szálanként követett (párhuzamos elemzések nem írják felül egymást), a saját
+   elemzés nélküli szálak spanjai (chart rajzolás, térkép, pool fetch-ek) a legutóbb
+   indított elemzéshez kerülnek
+🧭 EXPORT: Chrome trace / Perfetto JSON (chrome://tracing, ui.perfetto.dev)
+
+Stage-ek: provider_request, json_decode, transform, statistics,
+overlay_conversion, folium_generation, chart_draw
+
+Bekapcsolás: WEATHER_ANALYZER_TRACING=1 vagy get_tracer().enable() (teljesítmény panel)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Callable, Deque, Iterator, Tuple, Union
+
+from ..config import TracingConfig
+
+logger = logging.getLogger(__name__)
+
+# Pipeline szakaszok (a panel oszlopsorrendje)
+STAGES = (
+    "provider_request",
+    "json_decode",
+    "transform",
+    "statistics",
+    "overlay_conversion",
+    "folium_generation",
+    "chart_draw",
+)
+
+# Modul szintű kapcsoló - a span() gyors útja csak ezt olvassa
+_enabled = TracingConfig.ENABLED
+
+
+class _NullSpan:
+    """Kikapcsolt tracing: közös, állapot nélküli no-op span."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+    def set(self, **args: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Egy futó span - kilépéskor a tracerbe kerül."""
+
+    __slots__ = ("tracer", "stage", "name", "args", "start_ns")
+
+    def __init__(self, tracer: "Tracer", stage: str, name: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.stage = stage
+        self.name = name
+        self.args = args
+        self.start_ns = 0
+
+    def __enter__(self) -> "_Span":
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        duration_ns = time.perf_counter_ns() - self.start_ns
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._record(self.stage, self.name, self.start_ns, duration_ns, self.args)
+        return False
+
+    def set(self, **args: Any) -> None:
+        """Utólag ismert attribútumok (pl. státusz, sorok száma)."""
+        self.args.update(args)
+
+
+class _AnalysisRecord:
+    """Egy elemzés stage-enkénti összesítése."""
+
+    __slots__ = ("label", "started_at", "start_ns", "end_ns", "stages", "span_count")
+
+    def __init__(self, label: str):
+        self.label = label
+        self.started_at = time.time()
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.stages: Dict[str, List[float]] = {}  # stage → [darab, össz ms, max ms]
+        self.span_count = 0
+
+    def add(self, stage: str, duration_ms: float) -> None:
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [1, duration_ms, duration_ms]
+        else:
+            entry[0] += 1
+            entry[1] += duration_ms
+            entry[2] = max(entry[2], duration_ms)
+        self.span_count += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        end_ns = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return {
+            "label": self.label,
+            "started_at": self.started_at,
+            "wall_ms": (end_ns - self.start_ns) / 1e6,
+            "running": self.end_ns is None,
+            "spans": self.span_count,
+            "stages": {stage: {"count": int(count), "total_ms": total, "max_ms": maximum}
+                       for stage, (count, total, maximum) in self.stages.items()},
+        }
+
+
+class Tracer:
+    """
+    Folyamat szintű span gyűjtő.
+
+    A spanek egy korlátos gyűrűpufferbe kerülnek (Chrome trace export), és az
+    aktuális elemzés stage összesítésébe (teljesítmény panel). A nyitott elemzés és
+    a beágyazási mélység szálanként tárolt (threading.local).
+    """
+
+    def __init__(self, max_events: int = TracingConfig.MAX_EVENTS,
+                 recent_analyses: int = TracingConfig.RECENT_ANALYSES):
+        self._lock = threading.Lock()
+        self._events: Deque[Tuple[str, str, int, int, int, str, Dict[str, Any]]] = deque(maxlen=max_events)
+        self._analyses: Deque[_AnalysisRecord] = deque(maxlen=recent_analyses)
+        self._latest: Optional[_AnalysisRecord] = None  # saját elemzés nélküli szálak célja
+        self._local = threading.local()  # szálanként: depth, record
+        self._epoch_ns = time.perf_counter_ns()
+
+    # === KAPCSOLÓ ===
+
+    @property
+    def enabled(self) -> bool:
+        return _enabled
+
+    def enable(self) -> None:
+        global _enabled
+        _enabled = True
+        logger.info("⏱️ Span tracing bekapcsolva")
+
+    def disable(self) -> None:
+        global _enabled
+        _enabled = False
+        logger.info("⏱️ Span tracing kikapcsolva")
+
+    # === RÖGZÍTÉS ===
+
+    def _record(self, stage: str, name: str, start_ns: int, duration_ns: int, args: Dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        self._events.append((stage, name, start_ns, duration_ns, thread.ident or 0, thread.name, args))
+        record = getattr(self._local, "record", None)
+        with self._lock:
+            if record is None:
+                record = self._latest
+            if record is not None:
+                record.add(stage, duration_ns / 1e6)
+
+    @contextmanager
+    def analysis(self, label: str) -> Iterator[Optional[_AnalysisRecord]]:
+        """
+        Elemzés határ: új stage összesítés indul.
+
+        Beágyazott hívás (pl. AnalysisWorker → MultiCityEngine) ugyanazon a szálon
+        a külső elemzéshez tartozik; más szálon futó elemzés külön rekordot kap.
+        """
+        if not _enabled:
+            yield None
+            return
+
+        local = self._local
+        nested = getattr(local, "depth", 0) > 0
+        if nested:
+            record = local.record
+        else:
+            record = _AnalysisRecord(label)
+            local.record = record
+            with self._lock:
+                self._analyses.append(record)
+                self._latest = record
+        local.depth = getattr(local, "depth", 0) + 1
+
+        start_ns = time.perf_counter_ns()
+        try:
+            yield record
+        finally:
+            end_ns = time.perf_counter_ns()
+            local.depth -= 1
+            if not nested:
+                local.record = None
+                with self._lock:
+                    record.end_ns = end_ns
+            thread = threading.current_thread()
+            self._events.append(("analysis", label, start_ns, end_ns - start_ns,
+                                 thread.ident or 0, thread.name, {"nested": nested}))
+
+    # === LEKÉRDEZÉS ===
+
+    def recent_analyses(self) -> List[Dict[str, Any]]:
+        """Az utolsó N elemzés stage összesítése (legújabb elöl)."""
+        with self._lock:
+            return [record.to_dict() for record in reversed(self._analyses)]
+
+    def event_count(self) -> int:
+        return len(self._events)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+            self._analyses.clear()
+            self._latest = None
+
+    def export_chrome_trace(self, path: Union[str, Path]) -> Path:
+        """
+        Chrome trace / Perfetto JSON export ("X" complete eventek + szálnév metaadat).
+
+        Returns:
+            A kiírt fájl útvonala
+        """
+        path = Path(path)
+        pid = os.getpid()
+        events = list(self._events)
+
+        trace_events: List[Dict[str, Any]] = [{
+            "name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+            "args": {"name": "Global Weather Analyzer"},
+        }]
+        thread_names: Dict[int, str] = {}
+        for stage, name, start_ns, duration_ns, tid, thread_name, args in events:
+            thread_names.setdefault(tid, thread_name)
+            trace_events.append({
+                "name": name,
+                "cat": stage,
+                "ph": "X",
+                "ts": (start_ns - self._epoch_ns) / 1000.0,
+                "dur": duration_ns / 1000.0,
+                "pid": pid,
+                "tid": tid,
+                "args": {key: _json_safe(value) for key, value in args.items()},
+            })
+        for tid, thread_name in thread_names.items():
+            trace_events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                                 "args": {"name": thread_name}})
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"traceEvents": trace_events, "displayTimeUnit": "ms"}), encoding="utf-8")
+        logger.info(f"🧭 Chrome trace exportálva: {path} ({len(events)} span)")
+        return path
+
+
+def _json_safe(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+# === KÖZÖS PÉLDÁNY ===
+
+_tracer_instance: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """A folyamat közös Tracer példánya."""
+    global _tracer_instance
+    with _tracer_lock:
+        if _tracer_instance is None:
+            _tracer_instance = Tracer()
+        return _tracer_instance
+
+
+# === GYORS API ===
+
+def span(stage: str, name: Optional[str] = None, **args: Any) -> Union[_Span, _NullSpan]:
+    """
+    Span egy pipeline szakaszra.
+
+    Kikapcsolt tracingnél a közös no-op spant adja (nincs allokáció).
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(get_tracer(), stage, name or stage, args)
+
+
+def analysis(label: str):
+    """Elemzés határ (lásd Tracer.analysis)."""
+    return get_tracer().analysis(label)
+
+
+def traced(stage: str, name: Optional[str] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Függvény dekorátor: a teljes hívás egy span (kikapcsolva egyetlen bool ellenőrzés)."""
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(get_tracer(), stage, span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
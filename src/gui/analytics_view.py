@@ -28,6 +28,7 @@ Ez a modul a multi-city régió elemzések dashboardját valósítja meg.
 🔥 SIGNAL EMISSION JAVÍTÁS - multi_city_analysis_completed signal kibocsátás
 🚨 STATISZTIKÁK JAVÍTÁS - _process_and_display_statistics() MEGHÍVÁS
 🌪️ VÉGSŐ JAVÍTÁS: WindChart/WindRoseChart DEDICATED KOMPONENSEK HOZZÁADÁSA
+🚩 LUSTA FRISSÍTÉS: Dirty-flag alapú tab és statisztika frissítés (LazyTabRefresher)
 
 Fájl helye: src/gui/analytics_view.py
 """
@@ -51,6 +52,9 @@ from PySide6.QtGui import QFont
 # Téma rendszer
 from .theme_manager import get_theme_manager, register_widget_for_theming, get_current_colors
 
+# Lusta, dirty-flag alapú tab frissítés
+from .lazy_tab_refresher import LazyTabRefresher
+
 # Chart imports - JAVÍTOTT: VISSZA A HEATMAP-EKHEZ + DEDICATED WIND CHARTOK
 from .charts.heatmap_chart import HeatmapCalendarChart
 from .charts.wind_chart import WindChart
@@ -69,6 +73,10 @@ except ImportError as e:
     logger = logging.getLogger(__name__)
     logger.warning(f"❌ Multi-City Engine import hiba: {e}")
 
+# 🔍 Esemény detektálás (run-length)
+from ..analytics.event_detection import detect_events, EventDefinition, EventCatalog
+from ..config import EventDetectionConfig
+
 # Logging
 logger = logging.getLogger(__name__)
 
@@ -566,12 +574,10 @@ class ClimateTabWidget(QTabWidget):
         
         self._setup_tabs()
         
-        # Lazy loading tracking
+        # Lazy loading - dirty flag + látható/idle számítás
         self.data_cache = None
-        self.tabs_initialized = {'temp': False, 'precip': False, 'wind': False, 'windgust': False, 'wind_chart': False, 'windrose_chart': False}
-        
-        # Tab változás figyelése
-        self.currentChanged.connect(self._on_tab_changed)
+        self.tab_refresher = LazyTabRefresher(self)
+        self._register_tab_consumers()
         
         logger.info("ClimateTabWidget inicializálva - 4 KONSTANS HEATMAP TAB + 2 DEDICATED WIND CHART (365 téglalap, BEAUFORT szél + max széllökés)")
     
@@ -613,75 +619,37 @@ class ClimateTabWidget(QTabWidget):
             }
         """)
     
+    def _register_tab_consumers(self):
+        """Tabok regisztrálása lusta fogyasztóként - csak a látható tab számol azonnal"""
+        self.tab_refresher.register("temp", self.temp_tab, self.temp_tab.update_data)
+        self.tab_refresher.register("precip", self.precip_tab, self.precip_tab.update_data)
+        self.tab_refresher.register("wind", self.wind_tab, self.wind_tab.update_data)
+        self.tab_refresher.register("windgust", self.windgust_tab, self.windgust_tab.update_data)
+        self.tab_refresher.register("wind_chart", self.dedicated_wind_chart, self.dedicated_wind_chart.update_data)
+        self.tab_refresher.register("windrose_chart", self.dedicated_windrose_chart, self.dedicated_windrose_chart.update_data)
+    
     def update_data(self, data: Dict[str, Any]):
-        """🎯 KONSTANS HEATMAP + DEDICATED WIND CHARTOK Tab widget adatok frissítése - BEAUFORT + MAX SZÉLLÖKÉS VERZIÓ"""
+        """🎯 KONSTANS HEATMAP + DEDICATED WIND CHARTOK Tab widget adatok frissítése - LUSTA (dirty flag) VERZIÓ"""
         try:
             # Adatok cache-elése
             self.data_cache = data
             
-            # Aktív tab frissítése
-            current_index = self.currentIndex()
-            self._update_current_tab(current_index)
-            
-            # 🌪️ KRITIKUS JAVÍTÁS: DEDICATED WIND CHARTOK MINDIG FRISSÍTÉSE
-            print("🌪️ DEBUG [ClimateTabWidget]: DEDICATED WIND CHARTOK frissítése...")
-            
-            try:
-                self.dedicated_wind_chart.update_data(data)
-                print("✅ DEBUG [ClimateTabWidget]: dedicated_wind_chart frissítve!")
-            except Exception as e:
-                print(f"❌ ERROR [ClimateTabWidget]: dedicated_wind_chart hiba: {e}")
-            
-            try:
-                self.dedicated_windrose_chart.update_data(data)
-                print("✅ DEBUG [ClimateTabWidget]: dedicated_windrose_chart frissítve!")
-            except Exception as e:
-                print(f"❌ ERROR [ClimateTabWidget]: dedicated_windrose_chart hiba: {e}")
+            # Minden tab piszkos: az aktív tab azonnal, a többi megjelenéskor vagy üresjárati időben frissül
+            self.tab_refresher.set_data(data)
             
             # Teljes napok számának logolása
             daily_data = data.get('daily', {})
             dates = daily_data.get('time', [])
             total_days = len(dates)
             
-            logger.info(f"🎯 ClimateTabWidget frissítve - {total_days} nap → 365 téglalap/tab (BEAUFORT szél + max széllökés)")
+            logger.info(f"🎯 ClimateTabWidget frissítve - {total_days} nap → 365 téglalap/tab (lusta, gen {self.tab_refresher.generation})")
             
         except Exception as e:
             logger.error(f"ClimateTabWidget frissítési hiba: {e}")
     
-    def _on_tab_changed(self, index: int):
-        """Tab váltás kezelője - lazy loading"""
-        logger.info(f"Tab váltás: {index}")
-        self._update_current_tab(index)
-    
-    def _update_current_tab(self, index: int):
-        """Aktív tab frissítése - KONSTANS HEATMAP VERZIÓK + MAX SZÉLLÖKÉS + DEDICATED WIND CHARTOK"""
-        if not self.data_cache:
-            return
-        
-        try:
-            if index == 0:  # Hőmérséklet tab (konstans heatmap)
-                self.temp_tab.update_data(self.data_cache)
-                self.tabs_initialized['temp'] = True
-            elif index == 1:  # Csapadék tab (konstans heatmap, 0mm=fehér)
-                self.precip_tab.update_data(self.data_cache)
-                self.tabs_initialized['precip'] = True
-            elif index == 2:  # Szél tab (konstans heatmap, BEAUFORT, átlagos max)
-                self.wind_tab.update_data(self.data_cache)
-                self.tabs_initialized['wind'] = True
-            elif index == 3:  # Max Széllökés tab (konstans heatmap, BEAUFORT, max gusts)
-                self.windgust_tab.update_data(self.data_cache)
-                self.tabs_initialized['windgust'] = True
-            elif index == 4:  # 🌪️ DEDICATED WindChart tab
-                self.dedicated_wind_chart.update_data(self.data_cache)
-                self.tabs_initialized['wind_chart'] = True
-                print("✅ DEBUG [_update_current_tab]: DEDICATED WindChart tab aktívált és frissítve!")
-            elif index == 5:  # 🌹 DEDICATED WindRoseChart tab
-                self.dedicated_windrose_chart.update_data(self.data_cache)
-                self.tabs_initialized['windrose_chart'] = True
-                print("✅ DEBUG [_update_current_tab]: DEDICATED WindRoseChart tab aktívált és frissítve!")
-                
-        except Exception as e:
-            logger.error(f"Tab {index} frissítési hiba: {e}")
+    def is_tab_fresh(self, key: str) -> bool:
+        """Tab naprakész-e az utolsó adattal (pl. 'temp', 'wind_chart')"""
+        return self.data_cache is not None and not self.tab_refresher.is_dirty(key)
 
 
 class AnalyticsView(QWidget):
@@ -737,6 +705,10 @@ class AnalyticsView(QWidget):
         self.climate_tabs = None
         self.status_label = None
         
+        # Lusta statisztika/rekord frissítés (csak látható nézetben vagy üresjárati időben)
+        self.panel_refresher = LazyTabRefresher(self)
+        self._total_days = 0
+        
         # 🚀 MULTI-CITY KOMPONENSEK (refaktorált)
         self.region_combo = None
         self.analysis_buttons = []
@@ -744,6 +716,7 @@ class AnalyticsView(QWidget):
         # UI építése
         self._setup_ui()
         self._setup_theme()
+        self._register_panel_consumers()
         
         logger.info("🗂️ AnalyticsView REFAKTORÁLT KONSTANS HEATMAP BEAUFORT + MAX SZÉLLÖKÉS + MULTI-CITY RÉGIÓ + DEDICATED WIND CHARTOK VERZIÓ betöltve - 6 tab + régió elemzés + STATISZTIKÁK JAVÍTÁS")
     
@@ -1083,6 +1056,21 @@ class AnalyticsView(QWidget):
         self._apply_current_theme()
         logger.debug(f"Konstans heatmap dashboard téma frissítve: {theme_name}")
     
+    def _register_panel_consumers(self) -> None:
+        """Bal oldali statisztika és rekord panelek regisztrálása lusta fogyasztóként"""
+        self.panel_refresher.register("statistics", self.statistics_area, self._refresh_statistics_panel)
+        if self.record_summary:
+            self.panel_refresher.register("records", self.record_summary, self._refresh_records_panel)
+    
+    def _refresh_statistics_panel(self, data: Dict[str, Any]) -> None:
+        """Statisztikák számítása és megjelenítése (lusta fogyasztó)"""
+        self._process_and_display_statistics(data, self._total_days)
+    
+    def _refresh_records_panel(self, data: Dict[str, Any]) -> None:
+        """Rekordok számítása és megjelenítése (lusta fogyasztó, mindig napi szinten)"""
+        records = self._calculate_records(data)
+        self.record_summary.update_records(records)
+    
     # === ✅ ÚJ PUBLIKUS SLOT: Eredmények fogadása a MainWindow-tól ===
     
     def update_with_multi_city_result(self, result: 'AnalyticsResult'):
@@ -1192,7 +1180,8 @@ class AnalyticsView(QWidget):
             if self.climate_tabs:
                 self.climate_tabs.update_data(fake_data)
             
-            # Fake rekordok (Multi-City eredményekből)
+            # Fake rekordok (Multi-City eredményekből) - a függő lusta rekord számítás eldobása
+            self.panel_refresher.cancel_pending()
             fake_records = self._create_fake_records_from_multi_city(analytics_result)
             if self.record_summary:
                 self.record_summary.update_records(fake_records)
@@ -1273,42 +1262,13 @@ class AnalyticsView(QWidget):
             logger.info(f"  💨 Szél: BEAUFORT 13 fokozat (átlagos max)")
             logger.info(f"  🌪️ Max Széllökés: BEAUFORT 13 fokozat (max gusts)")
             
-            # 🚨 KRITIKUS JAVÍTÁS: Bal oldali statisztikák frissítése - KOMPAKT KÁRTYÁS RENDSZER
-            logger.info("🚨 STATISZTIKÁK JAVÍTÁS: _process_and_display_statistics() meghívása")
-            self._process_and_display_statistics(data, total_days)
-            
-            # Rekordok frissítése (mindig napi szinten)
-            records = self._calculate_records(data)
-            self.record_summary.update_records(records)
+            # 🚩 LUSTA FRISSÍTÉS: statisztikák + rekordok piszkosnak jelölve (látható nézetben azonnal számolnak)
+            self._total_days = total_days
+            self.panel_refresher.set_data(data)
             
-            # Tab widget frissítése (konstans heatmap verziók + DEDICATED WIND CHARTOK)
+            # Tab widget frissítése (konstans heatmap verziók + DEDICATED WIND CHARTOK - csak az aktív tab számol)
             if self.climate_tabs:
                 self.climate_tabs.update_data(data)
-                
-                # 🌪️ VÉGSŐ KRITIKUS JAVÍTÁS: EXPLICIT DEDICATED WIND CHARTOK FRISSÍTÉSE
-                print("🌪️ FINAL DEBUG [AnalyticsView]: EXPLICIT DEDICATED WIND CHARTOK frissítése...")
-                
-                # DEDICATED WindChart explicit frissítés
-                if hasattr(self.climate_tabs, 'dedicated_wind_chart') and self.climate_tabs.dedicated_wind_chart:
-                    try:
-                        print("🌪️ DEBUG [AnalyticsView]: dedicated_wind_chart.update_data() EXPLICIT hívás...")
-                        self.climate_tabs.dedicated_wind_chart.update_data(data)
-                        print("✅ DEBUG [AnalyticsView]: dedicated_wind_chart SIKERESEN frissítve!")
-                    except Exception as e:
-                        print(f"❌ ERROR [AnalyticsView]: dedicated_wind_chart hiba: {e}")
-                        import traceback
-                        print(f"❌ DEBUG [AnalyticsView]: dedicated_wind_chart traceback: {traceback.format_exc()}")
-                
-                # DEDICATED WindRoseChart explicit frissítés
-                if hasattr(self.climate_tabs, 'dedicated_windrose_chart') and self.climate_tabs.dedicated_windrose_chart:
-                    try:
-                        print("🌹 DEBUG [AnalyticsView]: dedicated_windrose_chart.update_data() EXPLICIT hívás...")
-                        self.climate_tabs.dedicated_windrose_chart.update_data(data)
-                        print("✅ DEBUG [AnalyticsView]: dedicated_windrose_chart SIKERESEN frissítve!")
-                    except Exception as e:
-                        print(f"❌ ERROR [AnalyticsView]: dedicated_windrose_chart hiba: {e}")
-                        import traceback
-                        print(f"❌ DEBUG [AnalyticsView]: dedicated_windrose_chart traceback: {traceback.format_exc()}")
             
             # Állapot frissítése
             self._update_status(f"✅ {total_days} nap → 365 téglalap - Beaufort + Max Széllökés Dashboard + DEDICATED WIND CHARTOK + STATISZTIKÁK")
@@ -1328,6 +1288,9 @@ class AnalyticsView(QWidget):
         self.current_data = None
         self.current_location = None
         
+        # Függő lusta statisztika/rekord számítás eldobása
+        self.panel_refresher.clear()
+        
         # UI visszaállítása
         self.location_info_label.setText("Nincs kiválasztott lokáció")
         
@@ -1432,7 +1395,13 @@ class AnalyticsView(QWidget):
                 
                 # Speciális napok
                 stats['freezing_days'] = safe_count(temp_min_list, lambda x: x < 0) if temp_min_list else 0
-                stats['hot_days'] = safe_count(temp_max_list, lambda x: x > 30) if temp_max_list else 0
+                stats['hot_days'] = safe_count(temp_max_list, lambda x: x > EventDetectionConfig.HOT_DAY_TEMPERATURE) if temp_max_list else 0
+                
+                # Hőhullámok (több egymást követő forró nap)
+                heat_waves = self._find_heat_waves(temp_max_list, dates)
+                stats['heat_wave_count'] = len(heat_waves) if heat_waves is not None else 0
+                longest_heat_wave = heat_waves.longest() if heat_waves is not None else None
+                stats['longest_heat_wave'] = longest_heat_wave['duration'] if longest_heat_wave else 0
                 
                 # Hőmérséklet ingadozás
                 if temp_max_list and temp_min_list:
@@ -1512,7 +1481,8 @@ class AnalyticsView(QWidget):
                     f"• Átlag hőmérséklet: {stats.get('temp_avg', 0):.1f}°C" if stats.get('temp_avg') else "• Átlag hőmérséklet: N/A",
                     f"• Min/Max: {stats.get('temp_min', 0):.1f}°C / {stats.get('temp_max', 0):.1f}°C" if stats.get('temp_min') and stats.get('temp_max') else "• Min/Max: N/A",
                     f"• Fagyos napok: {stats.get('freezing_days', 0)} nap",
-                    f"• Hőséghullám (>30°C): {stats.get('hot_days', 0)} nap",
+                    f"• Hőséghullám (>{EventDetectionConfig.HOT_DAY_TEMPERATURE:g}°C): {stats.get('hot_days', 0)} nap",
+                    f"• Hőhullámok ({EventDetectionConfig.HEAT_WAVE_MIN_DAYS}+ nap): {stats.get('heat_wave_count', 0)} db, leghosszabb {stats.get('longest_heat_wave', 0)} nap",
                     f"• Hőmérséklet ingadozás: {stats.get('temp_range_avg', 0):.1f}°C" if stats.get('temp_range_avg') else "• Hőmérséklet ingadozás: N/A"
                 ]
             )
@@ -1698,48 +1668,44 @@ class AnalyticsView(QWidget):
             return {}
     
     def _find_longest_dry_streak(self, precip_list: List[float], dates: List[str]) -> Optional[Dict[str, Any]]:
-        """Leghosszabb száraz időszak keresése"""
+        """Leghosszabb száraz időszak keresése (run-length esemény detektálás)"""
         try:
             if not precip_list or not dates:
                 return None
             
-            max_streak = 0
-            current_streak = 0
-            max_start_idx = 0
-            max_end_idx = 0
-            current_start_idx = 0
-            
-            for i, precip in enumerate(precip_list):
-                if precip is not None and precip <= 0.1:
-                    if current_streak == 0:
-                        current_start_idx = i
-                    current_streak += 1
-                else:
-                    if current_streak > max_streak:
-                        max_streak = current_streak
-                        max_start_idx = current_start_idx
-                        max_end_idx = i - 1
-                    current_streak = 0
-            
-            # Utolsó streak ellenőrzése
-            if current_streak > max_streak:
-                max_streak = current_streak
-                max_start_idx = current_start_idx
-                max_end_idx = len(precip_list) - 1
-            
-            if max_streak >= 3:
-                return {
-                    'days': max_streak,
-                    'start': dates[max_start_idx],
-                    'end': dates[max_end_idx]
-                }
+            catalog = detect_events(self._to_float_array(precip_list), [date[:10] for date in dates],
+                                    EventDefinition.named("dry_spell"))
+            longest = catalog.longest()
+            if longest is None:
+                return None
             
-            return None
+            start_idx = longest['start_index']
+            return {
+                'days': longest['duration'],
+                'start': dates[start_idx],
+                'end': dates[start_idx + longest['duration'] - 1]
+            }
             
         except Exception as e:
             logger.error(f"Száraz időszak keresési hiba: {e}")
             return None
     
+    def _find_heat_waves(self, temp_max_list: List[float], dates: List[str]) -> Optional[EventCatalog]:
+        """Hőhullámok (egymást követő forró napok) eseménykatalógusa"""
+        try:
+            if not temp_max_list or len(temp_max_list) != len(dates):
+                return None
+            return detect_events(self._to_float_array(temp_max_list), [date[:10] for date in dates],
+                                 EventDefinition.named("heat_wave"))
+        except Exception as e:
+            logger.error(f"Hőhullám keresési hiba: {e}")
+            return None
+    
+    @staticmethod
+    def _to_float_array(values: List[Optional[float]]) -> np.ndarray:
+        """None-safe lista → float tömb (None → NaN, ami megszakítja az eseményeket)"""
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    
     def _update_status(self, message: str) -> None:
         """Állapot üzenet frissítése"""
         if self.status_label:
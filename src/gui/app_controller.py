@@ -27,8 +27,9 @@ import logging
 from PySide6.QtCore import QObject, Signal, Slot, QTimer
 
 from ..config import DATA_DIR, APIConfig, ProviderConfig, UserPreferences, UsageTracker
-from .workers.data_fetch_worker import WorkerManager, GeocodingWorker, WeatherDataWorker
+from .workers.data_fetch_worker import WorkerManager, GeocodingWorker, WeatherDataWorker, HourlyWindowWorker
 from .workers.analysis_worker import AnalysisWorker
+from .workers.task_scheduler import get_task_scheduler
 
 
 class AppController(QObject):
@@ -75,6 +76,7 @@ class AppController(QObject):
     # Eredeti signalok megőrzése (backwards compatibility)
     geocoding_results_ready = Signal(list)      # List[Dict] - település találatok
     weather_data_ready = Signal(dict)           # Dict - API válasz adatok
+    hourly_data_ready = Signal(dict)            # Dict - lefúrási óránkénti ablak (hourly + ablak)
     error_occurred = Signal(str)                # str - hibaüzenet
     status_updated = Signal(str)                # str - státusz üzenet
     progress_updated = Signal(str, int)         # worker_type, progress
@@ -519,7 +521,7 @@ class AppController(QObject):
         try:
             # Worker cleanup
             if self.active_analysis_worker:
-                if self.active_analysis_worker.isRunning():
+                if self.active_analysis_worker.is_running_analysis():
                     self.active_analysis_worker.stop_analysis()
                 
                 # Disconnect signalok
@@ -700,6 +702,9 @@ class AppController(QObject):
         self.worker_manager.weather_data_completed.connect(self._on_weather_data_completed)
         self._logger.info("🔗 weather_data_completed signal connected")
         
+        # Óránkénti lefúrási ablak signalok
+        self.worker_manager.hourly_data_completed.connect(self._on_hourly_data_completed)
+        
         # Általános worker signalok
         self.worker_manager.error_occurred.connect(self._on_worker_error)
         self.worker_manager.progress_updated.connect(self.progress_updated.emit)
@@ -783,18 +788,19 @@ class AppController(QObject):
         """
         Provider használat tracking.
         
+        A kéréseket a hálózati réteg számolja (kérésenként, memóriában) - itt
+        csak a friss összesítő és a kvóta figyelmeztetések mennek ki.
+        
         Args:
             provider_name: Provider neve
         """
         try:
-            # Usage tracking
-            updated_usage = self.usage_tracker.track_request(provider_name)
+            usage_summary = self.usage_tracker.get_usage_summary()
             
-            if updated_usage:
-                self._logger.info(f"🌐 Tracked usage for {provider_name}")
+            if usage_summary:
+                self._logger.info(f"🌐 Usage summary refreshed for {provider_name}")
                 
-                # Usage statistics frissítése - a track_request visszaadott adatok alapján
-                usage_summary = self.usage_tracker.get_usage_summary()
+                # Usage statistics frissítése
                 self.provider_usage_updated.emit({
                     'meteostat': {
                         'requests': usage_summary.get('meteostat_requests', 0),
@@ -1130,6 +1136,42 @@ class AppController(QObject):
         
         self.handle_analysis_request(analysis_request)
     
+    @Slot(str, str)
+    def handle_hourly_window_request(self, start_date: str, end_date: str) -> None:
+        """
+        🌪️ Óránkénti adatok igény szerinti lekérése a kiválasztott település
+        egy rövid ablakára (pl. viharnap lefúrás). Az eredmény a hourly_data_ready
+        signalon érkezik; ismételt kérés a külön óránkénti cache-ből szolgálódik ki.
+        
+        Args:
+            start_date: Ablak kezdete (YYYY-MM-DD)
+            end_date: Ablak vége (YYYY-MM-DD)
+        """
+        if not self.current_city_data:
+            self.error_occurred.emit("Nincs kiválasztott település az óránkénti lefúráshoz")
+            return
+        
+        try:
+            worker = HourlyWindowWorker(
+                latitude=self.current_city_data['latitude'],
+                longitude=self.current_city_data['longitude'],
+                start_date=start_date,
+                end_date=end_date,
+                preferred_provider=self.user_preferences.get_selected_provider()
+            )
+            worker_id = self.worker_manager.start_hourly_window_fetch(worker)
+            self._logger.info(f"🌪️ Óránkénti ablak lekérés indítva: {start_date} → {end_date} ({worker_id})")
+        except Exception as e:
+            self._logger.error(f"Óránkénti ablak worker indítási hiba: {e}")
+            self.error_occurred.emit(f"Óránkénti ablak lekérési hiba: {e}")
+    
+    @Slot(dict)
+    def _on_hourly_data_completed(self, data: Dict[str, Any]) -> None:
+        """🌪️ Lefúrási óránkénti ablak továbbítása a GUI komponenseknek."""
+        hours = len(data.get('hourly', {}).get('time', []))
+        self._logger.info(f"🌪️ Óránkénti ablak kész: {data.get('start_date')} → {data.get('end_date')} ({hours} óra)")
+        self.hourly_data_ready.emit(data)
+    
     @Slot(dict)
     def _on_weather_data_completed(self, data: Dict[str, Any]) -> None:
         """
@@ -1239,17 +1281,21 @@ class AppController(QObject):
             else:
                 self._logger.warning(f"🌹 No winddirection_10m_dominant field found in daily_data!")
             
-            # 🌪️ KRITIKUS JAVÍTÁS: Óránkénti széllökések → napi maximum számítás
-            daily_wind_gusts_max = self._calculate_daily_max_wind_gusts(
-                hourly_data.get('wind_gusts_10m', []),
-                hourly_data.get('time', []),
-                daily_data.get('time', [])
-            )
+            # 🌪️ Napi széllökés maximum: az API napi aggregátuma (windgusts_10m_max);
+            # óránkénti számítás csak régi, óránkénti adatot tartalmazó válaszokhoz
+            if daily_data.get('windgusts_10m_max'):
+                daily_wind_gusts_max = daily_data['windgusts_10m_max']
+            else:
+                daily_wind_gusts_max = self._calculate_daily_max_wind_gusts(
+                    hourly_data.get('wind_gusts_10m', []),
+                    hourly_data.get('time', []),
+                    daily_data.get('time', [])
+                )
             
             # 🌪️ KRITIKUS JAVÍTÁS: Feldolgozott adatok strukturált összeállítása
             processed = {
                 'daily': {},  # 🚀 KEZDETBEN ÜRES - Explicit feltöltés következik!
-                'hourly': hourly_data,  # Óránkénti adatok megtartása
+                'hourly': hourly_data,  # Óránkénti adatok (lefúrási ablak: handle_hourly_window_request)
                 'latitude': raw_data.get('latitude'),
                 'longitude': raw_data.get('longitude'),
                 'timezone': raw_data.get('timezone', 'UTC'),
@@ -1280,7 +1326,7 @@ class AppController(QObject):
             
             # További opcionális mezők másolása
             optional_daily_fields = [
-                'windspeed_10m_mean', 'winddirection_10m_dominant', 
+                'windspeed_10m_mean', 'winddirection_10m_dominant', 'windgusts_10m_max',
                 'apparent_temperature_max', 'apparent_temperature_min',
                 'shortwave_radiation_sum', 'et0_fao_evapotranspiration'
             ]
@@ -1311,7 +1357,7 @@ class AppController(QObject):
                     else:
                         self._logger.info(f"✅ Mérsékelt széllökés: {max_gust:.1f} km/h")
             else:
-                self._logger.warning(f"⚠️ Nincs széllökés adat az óránkénti adatokban")
+                self._logger.warning(f"⚠️ Nincs széllökés adat (sem napi aggregátum, sem óránkénti)")
             
             # 🌪️ KRITIKUS ELLENŐRZÉS: Szélsebesség adat jelenlét validálása
             if 'windspeed_10m_max' in processed['daily']:
@@ -1612,6 +1658,9 @@ class AppController(QObject):
             # WorkerManager központi leállítás
             self.worker_manager.shutdown()
             
+            # Közös háttér ütemező leállítása (elemzés, trend, geocoding feladatok)
+            get_task_scheduler().shutdown()
+            
             # User preferences mentése
             self.user_preferences.save()
             self.usage_tracker.save()
@@ -11,6 +11,7 @@ Charts konténer widget refaktorált verzió - CSAK ChartsContainer osztály.
 ✅ Piros (#C43939) téma támogatás
 ✅ Duplikáció bugfix minden chart-ban
 🌪️ WIND GUSTS KRITIKUS JAVÍTÁS: WindChart és WindRoseChart explicit debug és frissítés
+🖼️ OFFSCREEN RENDER: Chartok Agg renderelése worker szálakon, csak a látható fülön
 ✅ Professional styling
 
 Ez a widget fogja össze a különböző diagramokat egy füles (tabbed) felületen.
@@ -34,14 +35,14 @@ ELTÁVOLÍTOTT OSZTÁLYOK (most charts/ package-ben):
 - MultiYearComparisonChart → charts/comparison_chart.py
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Set
 from datetime import datetime
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTabWidget,
     QPushButton, QCheckBox, QLabel
 )
-from PySide6.QtCore import Signal
+from PySide6.QtCore import Signal, QTimer
 from PySide6.QtGui import QFont
 
 # === FRISSÍTETT IMPORT STRUKTÚRA - CHARTS PACKAGE ===
@@ -54,6 +55,7 @@ from .charts import (
     HeatmapCalendarChart,
     MultiYearComparisonChart
 )
+from .charts.offscreen_renderer import OffscreenChartRenderer, OffscreenRender
 
 from .theme_manager import get_theme_manager, register_widget_for_theming, get_current_colors
 
@@ -69,6 +71,8 @@ class ChartsContainer(QWidget):
     🚨 MOCK/DEMO ADATOK TELJES ELTÁVOLÍTÁSA - csak valódi API adatok használhatók
     🎨 SIMPLIFIED THEMEMANAGER INTEGRÁCIÓ: Automatikus téma kezelés minden charthoz
     🌪️ WIND GUSTS KRITIKUS JAVÍTÁS: WindChart és WindRoseChart explicit debug és adatátadás
+    🖼️ OFFSCREEN RENDER: Új adatnál a chartok csak "dirty" jelölést kapnak; a látható
+       chart worker szálon renderelődik, a rejtett fülek az első megjelenítéskor
     """
     
     # Signalok
@@ -84,6 +88,12 @@ class ChartsContainer(QWidget):
         
         self.current_data: Optional[Dict[str, Any]] = None
         
+        # 🖼️ OFFSCREEN RENDER ÁLLAPOT
+        self.renderer = OffscreenChartRenderer(parent=self)
+        self._chart_generations: Dict[str, int] = {}
+        self._pending_charts: Set[str] = set()
+        self._in_flight: Dict[str, int] = {}
+        
         self._init_ui()
         self._connect_signals()
         
@@ -133,6 +143,17 @@ class ChartsContainer(QWidget):
         self.comparison_chart = MultiYearComparisonChart()
         self.tabs.addTab(self.comparison_chart, "📊 Évek")
         
+        # Chart kulcs → widget (offscreen render ütemezéshez)
+        self._charts = {
+            "temperature": self.temp_chart,
+            "precipitation": self.precip_chart,
+            "wind": self.wind_chart,
+            "heatmap": self.heatmap_chart,
+            "wind_rose": self.windrose_chart,
+            "comparison": self.comparison_chart
+        }
+        self._chart_generations = {key: 0 for key in self._charts}
+        
         layout.addWidget(self.tabs)
     
     def _create_controls(self) -> QWidget:
@@ -187,6 +208,10 @@ class ChartsContainer(QWidget):
         for chart in charts:
             chart.chart_clicked.connect(self._on_chart_clicked)
         
+        # 🖼️ Offscreen render: tab váltáskor a függő chart renderelése, kész render átvétele
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+        self.renderer.render_finished.connect(self._on_render_finished)
+        
         # 🔧 TÉMA VÁLTOZÁS FIGYELÉSE - AUTOMATIKUS
         self.theme_manager.theme_changed.connect(self._on_theme_changed)
         
@@ -302,6 +327,12 @@ class ChartsContainer(QWidget):
     def _export_current_chart(self) -> None:
         """Aktuális chart exportálása."""
         current_widget = self.tabs.currentWidget()
+        
+        # Export előtt a függő/folyamatban lévő render szinkron befejezése
+        chart_key = self._chart_key_for(current_widget)
+        if chart_key and (chart_key in self._pending_charts or chart_key in self._in_flight):
+            self._render_chart_sync(chart_key)
+        
         if hasattr(current_widget, 'export_chart'):  # WeatherChart methods
             # TODO: file dialog implementálása
             chart_name = self.tabs.tabText(self.tabs.currentIndex()).replace(' ', '_')
@@ -313,6 +344,93 @@ class ChartsContainer(QWidget):
         """Chart kattintás kezelése."""
         print(f"Chart clicked at: {x}, {y}")  # Debug
     
+    # === OFFSCREEN RENDER ÜTEMEZÉS ===
+    
+    def _chart_key_for(self, widget: Optional[QWidget]) -> Optional[str]:
+        """Chart kulcs keresése widget alapján."""
+        for key, chart in self._charts.items():
+            if chart is widget:
+                return key
+        return None
+    
+    def _on_tab_changed(self, index: int) -> None:
+        """Tab váltás - a most láthatóvá vált chart renderelése, ha dirty."""
+        self._render_visible_chart()
+    
+    def showEvent(self, event) -> None:
+        """Konténer megjelenítése - a függő render az elrendezés után indul."""
+        super().showEvent(event)
+        QTimer.singleShot(0, self._render_visible_chart)
+    
+    def _render_visible_chart(self) -> None:
+        """
+        🖼️ A látható chart offscreen renderelése worker szálon.
+        
+        Rejtett fülek és rejtett konténer esetén nem renderelünk - a chart
+        dirty marad, és a megjelenítéskor kerül sorra.
+        """
+        if self.current_data is None or not self.isVisible():
+            return
+        
+        chart_key = self._chart_key_for(self.tabs.currentWidget())
+        if not chart_key or chart_key not in self._pending_charts:
+            return
+        
+        generation = self._chart_generations[chart_key]
+        if self._in_flight.get(chart_key) == generation:
+            return
+        
+        chart = self._charts[chart_key]
+        if self.renderer.submit(chart_key, chart, self.current_data, generation):
+            self._in_flight[chart_key] = generation
+            print(f"🖼️ DEBUG: Offscreen render beküldve: {chart_key} (gen {generation})")
+        else:
+            # Nincs még érvényes widget méret - szinkron fallback
+            self._render_chart_sync(chart_key)
+    
+    def _on_render_finished(self, render: OffscreenRender) -> None:
+        """
+        🖼️ Kész offscreen render kompozitálása a GUI szálon.
+        
+        Elavult generációjú (közben új adat érkezett) eredményeket eldobjuk.
+        """
+        chart_key = render.chart_key
+        
+        if self._in_flight.get(chart_key) == render.generation:
+            del self._in_flight[chart_key]
+        
+        if render.generation != self._chart_generations.get(chart_key):
+            print(f"🖼️ DEBUG: Elavult render eldobva: {chart_key} (gen {render.generation})")
+            self._render_visible_chart()
+            return
+        
+        if chart_key not in self._pending_charts:
+            return
+        
+        if render.error or render.figure is None:
+            print(f"⚠️ DEBUG: Offscreen render hiba ({chart_key}): {render.error} - szinkron fallback")
+            self._render_chart_sync(chart_key)
+            return
+        
+        self._charts[chart_key].adopt_offscreen_render(render)
+        self._pending_charts.discard(chart_key)
+        print(f"✅ DEBUG: Offscreen render átvéve: {chart_key} ({render.render_time:.3f}s)")
+    
+    def _render_chart_sync(self, chart_key: str) -> None:
+        """Chart szinkron frissítése a GUI szálon (fallback / export előtt)."""
+        if self.current_data is None:
+            return
+        
+        # A folyamatban lévő offscreen render eredménye így elavulttá válik
+        self._chart_generations[chart_key] += 1
+        self._in_flight.pop(chart_key, None)
+        self._pending_charts.discard(chart_key)
+        
+        try:
+            self._charts[chart_key].update_data(self.current_data)
+        except Exception as e:
+            print(f"❌ DEBUG: {chart_key} szinkron frissítési hiba: {e}")
+    
     # === PUBLIKUS METÓDUSOK ===
     
     def update_charts(self, data: Dict[str, Any]) -> None:
@@ -321,6 +439,10 @@ class ChartsContainer(QWidget):
         
         PROBLÉMA MEGOLDVA: WindChart és WindRoseChart nem kapták meg az adatokat.
         MEGOLDÁS: Explicit debug és adatátadás széladatokkal.
+        
+        🖼️ OFFSCREEN RENDER: A chartok nem a GUI szálon, egymás után frissülnek -
+        minden chart dirty jelölést kap, a látható chart worker szálon renderelődik,
+        a többi az első megjelenítéskor.
         """
         print("📈 DEBUG: ChartsContainer.update_charts() - WIND GUSTS KRITIKUS JAVÍTÁS VERZIÓ")
         
@@ -341,48 +463,13 @@ class ChartsContainer(QWidget):
             if windspeed_10m_max:
                 print(f"🌪️ DEBUG: - windspeed_10m_max minta értékek: {windspeed_10m_max[:3]}")
             
-            print("📈 DEBUG: Updating all professional charts with SimplifiedThemeManager + WIND GUSTS DEBUG...")
+            # 🖼️ OFFSCREEN RENDER: minden chart dirty, csak a látható renderelődik (worker szálon)
+            for chart_key in self._charts:
+                self._chart_generations[chart_key] += 1
+                self._pending_charts.add(chart_key)
             
-            # Szekvenciális frissítés - egy chart egyszerre duplikáció ellen
-            print("🌡️ UPDATING temp_chart...")
-            self.temp_chart.update_data(data)
-            
-            print("🌧️ UPDATING precip_chart...")
-            self.precip_chart.update_data(data)
-            
-            # 🌪️ KRITIKUS JAVÍTÁS: WindChart explicit debug és frissítés
-            print("🌪️ UPDATING wind_chart... (EXPLICIT WIND GUSTS DEBUG)")
-            try:
-                self.wind_chart.update_data(data)
-                print("✅ DEBUG: wind_chart.update_data() végrehajtva")
-            except Exception as wind_error:
-                print(f"❌ DEBUG: wind_chart.update_data() HIBA: {wind_error}")
-            
-            # Új professzionális chartok
-            print("📅 UPDATING heatmap_chart...")
-            self.heatmap_chart.update_data(data)
-            
-            # 🌪️ KRITIKUS JAVÍTÁS: WindRoseChart explicit debug és frissítés
-            print("🌹 UPDATING windrose_chart... (EXPLICIT WIND GUSTS DEBUG)")
-            try:
-                self.windrose_chart.update_data(data)
-                print("✅ DEBUG: windrose_chart.update_data() végrehajtva")
-            except Exception as windrose_error:
-                print(f"❌ DEBUG: windrose_chart.update_data() HIBA: {windrose_error}")
-            
-            print("📊 UPDATING comparison_chart...")
-            self.comparison_chart.update_data(data)
-            
-            print("✅ DEBUG: All professional charts updated - DUPLIKÁCIÓ MENTES + SIMPLIFIED THEMEMANAGER + WIND GUSTS EXPLICIT DEBUG")
-            
-            # 🌪️ TOVÁBBI DEBUG: WindChart státusz ellenőrzése
-            if hasattr(self.wind_chart, 'current_data'):
-                wind_data_status = "VAN" if self.wind_chart.current_data else "NINCS"
-                print(f"🌪️ FINAL DEBUG: wind_chart.current_data státusz: {wind_data_status}")
-            
-            if hasattr(self.windrose_chart, 'current_data'):
-                windrose_data_status = "VAN" if self.windrose_chart.current_data else "NINCS"
-                print(f"🌹 FINAL DEBUG: windrose_chart.current_data státusz: {windrose_data_status}")
+            print(f"📈 DEBUG: {len(self._pending_charts)} chart dirty - látható chart offscreen renderelése...")
+            self._render_visible_chart()
             
         except Exception as e:
             print(f"❌ DEBUG: ChartsContainer frissítési hiba: {e}")
@@ -393,6 +480,12 @@ class ChartsContainer(QWidget):
         """Összes chart törlése - BŐVÍTETT LISTA + WIND GUSTS."""
         self.current_data = None
         
+        # Függő és folyamatban lévő offscreen renderek érvénytelenítése
+        for chart_key in self._charts:
+            self._chart_generations[chart_key] += 1
+        self._pending_charts.clear()
+        self._in_flight.clear()
+        
         charts = [
             self.temp_chart, self.precip_chart, self.wind_chart,
             self.heatmap_chart, self.windrose_chart, self.comparison_chart
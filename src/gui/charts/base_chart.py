@@ -14,8 +14,11 @@ Alaposztály minden weather chart widget-hez ColorPalette integrációval.
 ✅ Optimális legend pozíció
 ✅ Teljes téma szinkronizáció
 🚨 KRITIKUS JAVÍTÁS: PySide6 backend használata Qt5 helyett
+🖼️ OFFSCREEN RENDER: A chart saját update_data()-ja worker szálon, offscreen Agg figure-re
+   (render_to_figure), a kész kép átvétele a GUI szálon (adopt_offscreen_render)
 """
 
+import threading
 from typing import Optional, Dict, Any
 import matplotlib
 matplotlib.use('QtAgg')  # 🚨 JAVÍTOTT: PySide6 backend
@@ -26,9 +29,49 @@ from matplotlib.figure import Figure
 
 from PySide6.QtWidgets import QWidget
 from PySide6.QtCore import Qt, Signal
+from PySide6.QtGui import QPainter
 
 from ..theme_manager import get_theme_manager, register_widget_for_theming, get_current_colors
 from ..color_palette import ColorPalette
+from ...devtools.tracing import span
+
+
+# Figure-höz kötött chart állapot - offscreen render alatt a render szálán külön példány
+_FIGURE_STATE = ("figure", "ax", "_colorbar", "current_data", "_last_update_data",
+                 "_is_updating", "chart_title", "y_label")
+
+# Szálanként: (chart, állapot) amíg a szál egy offscreen rendert futtat
+_render_local = threading.local()
+
+
+class _FigureBound:
+    """
+    Figure-höz kötött attribútum: a render_to_figure() szálán a render saját
+    állapotát adja, minden más szálon (GUI) a widget állapotát.
+    """
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+        # Külön kulcs: a PySide attribútum keresés az instance __dict__-et a descriptor elé veszi
+        self.slot = f"_gui_{name}"
+
+    def __get__(self, chart, owner=None):
+        if chart is None:
+            return self
+        target = getattr(_render_local, "target", None)
+        if target is not None and target[0] is chart:
+            return target[1][self.name]
+        try:
+            return chart.__dict__[self.slot]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, chart, value) -> None:
+        target = getattr(_render_local, "target", None)
+        if target is not None and target[0] is chart:
+            target[1][self.name] = value
+        else:
+            chart.__dict__[self.slot] = value
 
 
 class WeatherChart(FigureCanvas):
@@ -44,6 +87,16 @@ class WeatherChart(FigureCanvas):
     chart_clicked = Signal(float, float)  # x, y koordináták
     export_requested = Signal(str)  # format (png, pdf, svg)
     
+    # 🖼️ Figure-höz kötött állapot (lásd _FigureBound)
+    figure = _FigureBound()
+    ax = _FigureBound()
+    _colorbar = _FigureBound()
+    current_data = _FigureBound()
+    _last_update_data = _FigureBound()
+    _is_updating = _FigureBound()
+    chart_title = _FigureBound()
+    y_label = _FigureBound()
+    
     def __init__(self, figsize=(12, 8), parent: Optional[QWidget] = None):
         """
         Chart widget inicializálása - TÉMA SZINKRONIZÁCIÓ JAVÍTVA.
@@ -82,6 +135,11 @@ class WeatherChart(FigureCanvas):
         # Font cache tracking
         self._font_cache_rebuilt = False
         
+        # 🖼️ Offscreen render eredmény (worker szálon raszterizált kép)
+        self._offscreen_image = None
+        
+        self._colorbar = None
+        
         # Matplotlib stílus beállítások - CSAK FONT/MÉRET, SZÍNEK KÜLÖN
         self._setup_matplotlib_style()
         
@@ -250,6 +308,87 @@ class WeatherChart(FigureCanvas):
         except Exception as e:
             print(f"❌ DEBUG: Theme redraw error: {e}")
     
+    def draw(self) -> None:
+        """Szinkron renderelés - az esetleges offscreen kép ezzel elavul."""
+        if self._rendering_offscreen():
+            return  # a raszterizálás az offscreen canvas-on, az update_data() után fut
+        self._offscreen_image = None
+        with span("chart_draw", type(self).__name__):
+            super().draw()
+    
+    def paintEvent(self, event) -> None:
+        """
+        🖼️ Offscreen render kompozitálása: ha van a widget méretének megfelelő
+        előre renderelt kép, azt rajzoljuk ki Agg renderelés nélkül.
+        """
+        image = getattr(self, '_offscreen_image', None)
+        
+        if image is not None:
+            ratio = image.devicePixelRatio()
+            if (image.width() == round(self.width() * ratio) and
+                    image.height() == round(self.height() * ratio) and
+                    ratio == self.device_pixel_ratio):
+                painter = QPainter(self)
+                painter.drawImage(0, 0, image)
+                painter.end()
+                return
+            
+            # Méret/pixel ratio eltérés - teljes újrarajzolás a GUI szálon
+            self.draw()
+        
+        super().paintEvent(event)
+    
+    def _rendering_offscreen(self) -> bool:
+        target = getattr(_render_local, "target", None)
+        return target is not None and target[0] is self
+    
+    def render_to_figure(self, figure: Figure, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        🖼️ A chart saját update_data() logikája egy offscreen (Agg) figure-re.
+        
+        Worker szálon hívható: a figure-höz kötött állapotot (_FIGURE_STATE) a hívó
+        szál külön kapja, a widget állapota és a Qt objektum érintetlen marad.
+        
+        Args:
+            figure: Cél figure (saját FigureCanvasAgg-gel)
+            data: Chart adatok
+            
+        Returns:
+            A renderelt figure-höz kötött állapot (adopt_offscreen_render veszi át)
+        """
+        state = {name: getattr(self, name, None) for name in _FIGURE_STATE}
+        state.update(figure=figure, ax=figure.add_subplot(111), _colorbar=None,
+                     current_data=None, _last_update_data=None, _is_updating=False)
+        
+        _render_local.target = (self, state)
+        try:
+            self._apply_theme_to_chart()
+            self.update_data(data)
+        finally:
+            _render_local.target = None
+        return state
+    
+    def adopt_offscreen_render(self, render) -> None:
+        """
+        🖼️ Worker szálon elkészült render átvétele (GUI szálon hívandó).
+        
+        A render figure-je lesz a chart figure-je (export, grid/legend toggle,
+        téma frissítés így a friss tartalmon dolgozik), a kirajzolás pedig
+        az előre raszterizált képből történik.
+        
+        Args:
+            render: OffscreenRender eredmény
+        """
+        for name, value in render.state.items():
+            setattr(self, name, value)
+        self.figure.set_canvas(self)
+        
+        # A canvas callback-ek a figure-höz tartoznak - új figure-nél újra kell kötni
+        self.mpl_connect('button_press_event', self._on_click)
+        
+        self._offscreen_image = render.image
+        self.update()
+    
     def _on_click(self, event) -> None:
         """Grafikon kattintás kezelése."""
         if event.inaxes and event.xdata and event.ydata:
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Global Weather Analyzer - Offscreen Chart Renderer
+Chartok Agg renderelése worker szálakon, képpufferbe.
+
+🧵 GUI-N KÍVÜL: ThreadPoolExecutor, chartonként saját Figure + FigureCanvasAgg - a
+   renderelés nem blokkolja a GUI szálat (GIL-kötött szálak: nem skálázódik magokkal)
+🎯 SAJÁT PLOT LOGIKA: A chart saját update_data()-ja fut az offscreen figure-re
+   (WeatherChart.render_to_figure), a figure-höz kötött állapot szálanként külön
+🖼️ KOMPOZITÁLÁS: A kész RGBA képet a GUI szál csak kirajzolja (WeatherChart.adopt_offscreen_render)
+⏱️ GENERÁCIÓ SZÁMLÁLÓ: Az elavult renderek eldobhatók, ha közben új adat érkezett
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, Tuple
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QImage
+
+from .base_chart import WeatherChart
+from ...config import HardwareConfig
+from ...devtools.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChartRenderSnapshot:
+    """A GUI szálon rögzített cél chart és célméret egy renderhez."""
+    chart: WeatherChart
+    figsize: Tuple[float, float]
+    dpi: float
+    device_pixel_ratio: float
+
+
+@dataclass
+class OffscreenRender:
+    """Egy kész offscreen render eredménye (figure + kirajzolható kép)."""
+    chart_key: str
+    generation: int
+    figure: Optional[Figure] = None
+    state: Dict[str, Any] = field(default_factory=dict)
+    image: Optional[QImage] = None
+    render_time: float = 0.0
+    error: Optional[str] = None
+
+
+def capture_render_snapshot(chart: WeatherChart) -> Optional[ChartRenderSnapshot]:
+    """
+    Célméret rögzítése a GUI szálon.
+
+    Returns:
+        Snapshot, vagy None ha a widgetnek még nincs érvényes mérete
+    """
+    width, height = chart.width(), chart.height()
+    if width <= 1 or height <= 1:
+        return None
+
+    ratio = float(chart.device_pixel_ratio or 1.0)
+    base_dpi = chart.figure.dpi / ratio
+
+    return ChartRenderSnapshot(
+        chart=chart,
+        figsize=(width / base_dpi, height / base_dpi),
+        dpi=base_dpi,
+        device_pixel_ratio=ratio
+    )
+
+
+def render_chart_offscreen(chart_key: str, generation: int,
+                           snapshot: ChartRenderSnapshot, data: Dict[str, Any]) -> OffscreenRender:
+    """
+    Egy chart teljes renderelése worker szálon.
+
+    A chart saját update_data() logikája egy Agg figure-re fut
+    (render_to_figure), majd a figure RGBA képpé raszterizálódik.
+    """
+    start_time = time.perf_counter()
+
+    try:
+        figure = Figure(figsize=snapshot.figsize, dpi=snapshot.dpi)
+        canvas = FigureCanvasAgg(figure)
+        # Fizikai pixelekre renderelünk, a Qt canvas-szal azonos módon (dpi × pixel ratio)
+        figure.dpi = snapshot.dpi * snapshot.device_pixel_ratio
+
+        state = snapshot.chart.render_to_figure(figure, data)
+
+        with span("chart_draw", f"{type(snapshot.chart).__name__} (offscreen)"):
+            canvas.draw()
+        buffer = canvas.buffer_rgba()
+        height, width = buffer.shape[:2]
+        image = QImage(bytes(buffer), width, height, width * 4, QImage.Format.Format_RGBA8888).copy()
+        image.setDevicePixelRatio(snapshot.device_pixel_ratio)
+
+        return OffscreenRender(
+            chart_key=chart_key,
+            generation=generation,
+            figure=state["figure"],
+            state=state,
+            image=image,
+            render_time=time.perf_counter() - start_time
+        )
+
+    except Exception as e:
+        logger.error(f"❌ Offscreen render hiba ({chart_key}): {e}", exc_info=True)
+        return OffscreenRender(
+            chart_key=chart_key,
+            generation=generation,
+            render_time=time.perf_counter() - start_time,
+            error=str(e)
+        )
+
+
+class OffscreenChartRenderer(QObject):
+    """
+    Chart render pool - Agg renderelés worker szálakon (a GUI szál tehermentesítése).
+
+    A kész eredményt a render_finished signal szállítja a GUI szálra
+    (queued connection, mivel a renderer a GUI szálon él).
+    """
+
+    # Signalok
+    render_finished = Signal(object)  # OffscreenRender
+
+    def __init__(self, max_workers: Optional[int] = None, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+
+        self.max_workers = max_workers or HardwareConfig.CHART_RENDER_WORKERS
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="chart-render"
+        )
+
+        logger.info(f"🖼️ OffscreenChartRenderer inicializálva ({self.max_workers} worker)")
+
+    def submit(self, chart_key: str, chart: WeatherChart, data: Dict[str, Any], generation: int) -> bool:
+        """
+        Chart render feladat beküldése.
+
+        Args:
+            chart_key: Chart azonosító (a konténerben)
+            chart: A cél chart widget (csak a GUI szálon olvasva)
+            data: Chart adatok
+            generation: Adatgeneráció - az elavult eredmények kiszűréséhez
+
+        Returns:
+            True ha a feladat beküldésre került
+        """
+        snapshot = capture_render_snapshot(chart)
+        if snapshot is None:
+            return False
+
+        self._executor.submit(self._run, chart_key, generation, snapshot, data)
+        return True
+
+    def _run(self, chart_key: str, generation: int,
+             snapshot: ChartRenderSnapshot, data: Dict[str, Any]) -> None:
+        """Worker szál belépési pont."""
+        render = render_chart_offscreen(chart_key, generation, snapshot, data)
+        logger.debug(f"🖼️ Offscreen render kész: {chart_key} (gen {generation}, {render.render_time:.3f}s)")
+        self.render_finished.emit(render)
+
+    def shutdown(self) -> None:
+        """Pool leállítása - a még el nem indult feladatok törlésével."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -29,13 +29,15 @@ import datetime
 
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGroupBox, QButtonGroup,
-    QRadioButton, QTableWidget, QTableWidgetItem, QPushButton, QWidget
+    QRadioButton, QTableWidget, QTableWidgetItem, QPushButton, QWidget,
+    QCheckBox, QLabel, QFileDialog
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QColor
 
 from .utils import GUIConstants
 from .theme_manager import get_theme_manager, register_widget_for_theming
+from ..devtools.tracing import STAGES, get_tracer
 
 
 class ExtremeWeatherDialog(QDialog):
@@ -474,3 +476,146 @@ class ExtremeWeatherDialog(QDialog):
             self._calculate_extremes()
         
         print(f"✅ DEBUG: ExtremeWeatherDialog theme applied via ThemeManager: {'dark' if dark_theme else 'light'}")
+
+
+class PerformancePanelDialog(QDialog):
+    """
+    ⏱️ Fejlesztői teljesítmény panel - az utolsó N elemzés szakaszonkénti ideje.
+    
+    Soronként egy elemzés (multi-city, trend, lekérés), oszloponként a pipeline
+    szakaszok összideje (lekérés, JSON dekódolás, transzformáció, statisztika,
+    overlay konverzió, Folium generálás, chart rajzolás). A nyers spanek Chrome
+    trace / Perfetto JSON-ba exportálhatók.
+    """
+    
+    STAGE_LABELS = {
+        "provider_request": "Lekérés",
+        "json_decode": "JSON",
+        "transform": "Transzform",
+        "statistics": "Statisztika",
+        "overlay_conversion": "Overlay",
+        "folium_generation": "Folium",
+        "chart_draw": "Chart",
+    }
+    
+    REFRESH_INTERVAL_MS = 1000
+    
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self._tracer = get_tracer()
+        
+        self.setWindowTitle("⏱️ Teljesítmény panel")
+        self.setMinimumSize(GUIConstants.DIALOG_MIN_WIDTH + 300, GUIConstants.DIALOG_MIN_HEIGHT)
+        
+        self._init_ui()
+        self._register_widgets_for_theming()
+        
+        # Nyitott panel mellett élő frissítés (futó elemzések)
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(self.REFRESH_INTERVAL_MS)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self._refresh_timer.start()
+        
+        self.refresh()
+    
+    def _init_ui(self) -> None:
+        layout = QVBoxLayout(self)
+        layout.setSpacing(GUIConstants.LAYOUT_SPACING)
+        
+        controls = QHBoxLayout()
+        self.enabled_checkbox = QCheckBox("Tracing bekapcsolva")
+        self.enabled_checkbox.setChecked(self._tracer.enabled)
+        self.enabled_checkbox.toggled.connect(self._on_enabled_toggled)
+        controls.addWidget(self.enabled_checkbox)
+        
+        self.summary_label = QLabel()
+        controls.addWidget(self.summary_label)
+        controls.addStretch()
+        layout.addLayout(controls)
+        
+        self.analysis_table = QTableWidget()
+        headers = ["Elemzés", "Idő", "Fal (ms)"] + [self.STAGE_LABELS[stage] + " (ms)" for stage in STAGES]
+        self.analysis_table.setColumnCount(len(headers))
+        self.analysis_table.setHorizontalHeaderLabels(headers)
+        self.analysis_table.setAlternatingRowColors(True)
+        self.analysis_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.analysis_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.analysis_table.verticalHeader().setVisible(False)
+        layout.addWidget(self.analysis_table)
+        
+        buttons = QHBoxLayout()
+        self.refresh_button = QPushButton("🔄 Frissítés")
+        self.refresh_button.clicked.connect(self.refresh)
+        self.clear_button = QPushButton("🗑️ Törlés")
+        self.clear_button.clicked.connect(self._on_clear)
+        self.export_button = QPushButton("🧭 Chrome trace export...")
+        self.export_button.clicked.connect(self._on_export)
+        self.close_button = QPushButton("Bezárás")
+        self.close_button.clicked.connect(self.accept)
+        
+        for button in (self.refresh_button, self.clear_button, self.export_button):
+            button.setMinimumHeight(GUIConstants.BUTTON_HEIGHT)
+            buttons.addWidget(button)
+        buttons.addStretch()
+        self.close_button.setMinimumHeight(GUIConstants.BUTTON_HEIGHT)
+        buttons.addWidget(self.close_button)
+        layout.addLayout(buttons)
+    
+    def _register_widgets_for_theming(self) -> None:
+        register_widget_for_theming(self, "dialog")
+        register_widget_for_theming(self.analysis_table, "table")
+        for button in (self.refresh_button, self.clear_button, self.export_button, self.close_button):
+            register_widget_for_theming(button, "button")
+    
+    def refresh(self) -> None:
+        """Táblázat újratöltése a tracer elemzés összesítéseiből (legújabb felül)."""
+        analyses = self._tracer.recent_analyses()
+        
+        self.analysis_table.setRowCount(len(analyses))
+        for row, record in enumerate(analyses):
+            started = datetime.datetime.fromtimestamp(record["started_at"]).strftime("%H:%M:%S")
+            wall = f"{record['wall_ms']:.1f}" + (" …" if record["running"] else "")
+            values = [record["label"], started, wall]
+            
+            for stage in STAGES:
+                stage_stats = record["stages"].get(stage)
+                if stage_stats is None:
+                    values.append("-")
+                else:
+                    values.append(f"{stage_stats['total_ms']:.1f} ({stage_stats['count']}×)")
+            
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column >= 2:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.analysis_table.setItem(row, column, item)
+        
+        self.analysis_table.resizeColumnsToContents()
+        state = "aktív" if self._tracer.enabled else "kikapcsolva"
+        self.summary_label.setText(f"{len(analyses)} elemzés, {self._tracer.event_count()} span ({state})")
+    
+    def _on_enabled_toggled(self, checked: bool) -> None:
+        if checked:
+            self._tracer.enable()
+        else:
+            self._tracer.disable()
+        self.refresh()
+    
+    def _on_clear(self) -> None:
+        self._tracer.clear()
+        self.refresh()
+    
+    def _on_export(self) -> None:
+        default_name = f"weather_trace_{datetime.datetime.now():%Y%m%d_%H%M%S}.json"
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Chrome trace exportálása", default_name, "Trace JSON (*.json)"
+        )
+        if not file_path:
+            return
+        
+        path = self._tracer.export_chrome_trace(file_path)
+        self.summary_label.setText(f"🧭 Exportálva: {path.name} (chrome://tracing, ui.perfetto.dev)")
+    
+    def done(self, result: int) -> None:
+        self._refresh_timer.stop()
+        super().done(result)
@@ -28,11 +28,11 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal, QThread, QTimer
 from PySide6.QtGui import QFont, QPixmap, QIcon
 
-try:
-    import geopandas as gpd
-    GEOPANDAS_AVAILABLE = True
-except ImportError:
-    GEOPANDAS_AVAILABLE = False
+# 🚀 GeoPandas lusta betöltése - csak a megye/irányítószám fájlok olvasásakor importálódik
+from ..lazy_imports import lazy_module
+
+gpd = lazy_module("geopandas")
+GEOPANDAS_AVAILABLE = gpd.available
 
 # Saját modulok
 from ..data.models import Location
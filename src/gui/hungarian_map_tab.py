@@ -35,18 +35,21 @@ Fájl helye: src/gui/hungarian_map_tab.py (ANALYTICS SYNC 100% KÉSZ + PARAMÉTE
 
 from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+
+import numpy as np
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QLabel,
-    QGroupBox, QPushButton, QProgressBar, QMessageBox, QCheckBox
+    QGroupBox, QPushButton, QProgressBar, QMessageBox, QCheckBox, QSlider, QComboBox
 )
 from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtGui import QFont
 
 # Saját modulok
 from .hungarian_location_selector import HungarianLocationSelector
-from .map_visualizer import HungarianMapVisualizer
+from .map_visualizer import HungarianMapVisualizer, COLOR_SCALE_GRADIENTS
+from .map_animation import AnimationFrameWorker, PARAMETER_QUERY_TYPES
 from .theme_manager import register_widget_for_theming
 from .color_palette import ColorPalette
 
@@ -55,6 +58,7 @@ from .weather_data_bridge import WeatherDataBridge, WeatherOverlayData
 
 # 🚀 ÚJ: Analytics Engine integráció
 from ..analytics.multi_city_engine import MultiCityEngine
+from ..analytics.climate_indices import INDEX_DEFINITIONS, get_climate_index_engine
 from ..data.models import AnalyticsResult, AnalyticsQuestion
 from ..data.enums import RegionScope, AnalyticsMetric, QuestionType
 
@@ -114,6 +118,10 @@ class HungarianMapTab(QWidget):
     weather_data_updated = Signal(object)    # 🌤️ Weather overlay frissítve
     analytics_sync_completed = Signal(str)   # 🚀 ÚJ: Analytics sync befejezve
     
+    # 🎞️ Animáció: alapértelmezett időszak és lejátszási tempó
+    ANIMATION_DEFAULT_DAYS = 90
+    ANIMATION_FRAME_INTERVAL_MS = 100
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
@@ -149,6 +157,12 @@ class HungarianMapTab(QWidget):
         self.sync_in_progress = False
         self.auto_weather_refresh_enabled = True
         
+        # 🎞️ Animált idősor állapot
+        self.animation_worker: Optional[AnimationFrameWorker] = None
+        self.animation_matrix = None  # CityDayMatrix
+        self.animation_timer = QTimer(self)
+        self.animation_timer.setInterval(self.ANIMATION_FRAME_INTERVAL_MS)
+        
         # Folium specifikus állapot
         self.current_theme = "light"
         self.auto_sync_enabled = True
@@ -298,6 +312,72 @@ class HungarianMapTab(QWidget):
         register_widget_for_theming(self.loading_status, "text")
         layout.addWidget(self.loading_status)
         
+        # === 🎞️ ANIMÁLT IDŐSOR (város × nap képkockák) ===
+        
+        animation_group = QGroupBox("🎞️ Animált idősor")
+        register_widget_for_theming(animation_group, "container")
+        animation_layout = QHBoxLayout(animation_group)
+        
+        self.animation_build_btn = QPushButton("🎞️ Képkockák számítása")
+        self.animation_build_btn.setToolTip("Város × nap mátrix és napi raszter képkockák előszámítása háttérben "
+                                            "(aktuális paraméter, régió és dátum tartomány)")
+        register_widget_for_theming(self.animation_build_btn, "button")
+        animation_layout.addWidget(self.animation_build_btn)
+        
+        self.animation_play_btn = QPushButton("▶️")
+        self.animation_play_btn.setCheckable(True)
+        self.animation_play_btn.setEnabled(False)
+        self.animation_play_btn.setToolTip("Lejátszás / megállítás")
+        register_widget_for_theming(self.animation_play_btn, "button")
+        animation_layout.addWidget(self.animation_play_btn)
+        
+        self.animation_slider = QSlider(Qt.Horizontal)
+        self.animation_slider.setRange(0, 0)
+        self.animation_slider.setEnabled(False)
+        register_widget_for_theming(self.animation_slider, "input")
+        animation_layout.addWidget(self.animation_slider, 1)
+        
+        self.animation_label = QLabel("🎞️ Nincs animáció")
+        register_widget_for_theming(self.animation_label, "text")
+        animation_layout.addWidget(self.animation_label)
+        
+        layout.addWidget(animation_group)
+        
+        # === 📏 KLÍMAINDEX TREND (mentett ETCCDI készletek) ===
+        
+        climate_index_group = QGroupBox("📏 Klímaindex trend")
+        register_widget_for_theming(climate_index_group, "container")
+        climate_index_layout = QHBoxLayout(climate_index_group)
+        
+        self.climate_index_set_combo = QComboBox()
+        self.climate_index_set_combo.setToolTip("Mentett klímaindex készlet (<régió>_<kezdő év>_<záró év>)")
+        self.climate_index_set_combo.setMinimumWidth(200)
+        register_widget_for_theming(self.climate_index_set_combo, "input")
+        climate_index_layout.addWidget(self.climate_index_set_combo)
+        
+        self.climate_index_combo = QComboBox()
+        for index, (description, unit, _) in INDEX_DEFINITIONS.items():
+            self.climate_index_combo.addItem(f"{index} - {description}", index)
+        register_widget_for_theming(self.climate_index_combo, "input")
+        climate_index_layout.addWidget(self.climate_index_combo, 1)
+        
+        self.climate_index_reload_btn = QPushButton("🔄")
+        self.climate_index_reload_btn.setToolTip("Mentett készletek listájának frissítése")
+        register_widget_for_theming(self.climate_index_reload_btn, "button")
+        climate_index_layout.addWidget(self.climate_index_reload_btn)
+        
+        self.climate_index_show_btn = QPushButton("📏 Trend a térképen")
+        self.climate_index_show_btn.setToolTip("A kiválasztott index évtizedenkénti trendje megyénként (megye réteg)")
+        register_widget_for_theming(self.climate_index_show_btn, "button")
+        climate_index_layout.addWidget(self.climate_index_show_btn)
+        
+        self.climate_index_label = QLabel("📏 Nincs klímaindex réteg")
+        register_widget_for_theming(self.climate_index_label, "text")
+        climate_index_layout.addWidget(self.climate_index_label)
+        
+        layout.addWidget(climate_index_group)
+        self._reload_climate_index_sets()
+        
         # === FŐ SPLITTER LAYOUT ===
         
         main_splitter = QSplitter(Qt.Horizontal)
@@ -347,6 +427,8 @@ class HungarianMapTab(QWidget):
         
         # Layout súlyok
         layout.setStretchFactor(header_group, 0)
+        layout.setStretchFactor(animation_group, 0)
+        layout.setStretchFactor(climate_index_group, 0)
         layout.setStretchFactor(main_splitter, 1)
         
         print("✅ DEBUG: HungarianMapTab UI setup complete with Analytics → Map Sync + Paraméter Memória v3.0")
@@ -372,6 +454,16 @@ class HungarianMapTab(QWidget):
         # 🌤️ Weather frissítés gomb
         self.refresh_weather_btn.clicked.connect(self._refresh_weather_overlay)
         
+        # 🎞️ Animáció vezérlők
+        self.animation_build_btn.clicked.connect(self._start_animation_precompute)
+        self.animation_play_btn.toggled.connect(self._on_animation_play_toggled)
+        self.animation_slider.valueChanged.connect(self._on_animation_slider_changed)
+        self.animation_timer.timeout.connect(self._advance_animation_frame)
+        
+        # 📏 Klímaindex trend vezérlők
+        self.climate_index_reload_btn.clicked.connect(self._reload_climate_index_sets)
+        self.climate_index_show_btn.clicked.connect(self._on_climate_index_show_clicked)
+        
         # Auto-sync checkboxok
         self.auto_sync_check.toggled.connect(self._on_auto_sync_toggled)
         self.auto_weather_refresh_check.toggled.connect(self._on_auto_weather_refresh_toggled)
@@ -1516,6 +1608,10 @@ class HungarianMapTab(QWidget):
             if self.map_visualizer and self.is_folium_ready:
                 # 🚀 JAVÍTOTT: Direkt folium_format használata convert_overlay_to_folium_format helyett
                 if folium_format:
+                    # 🗺️ Megyénkénti statisztikák a megye réteghez (a set_weather_data generálja újra a térképet)
+                    self.map_visualizer.set_choropleth_data(
+                        self.weather_bridge.convert_analytics_to_choropleth(analytics_result, self.current_analytics_parameter)
+                    )
                     self.map_visualizer.set_weather_data(folium_format)
                     print("✅ DEBUG: Weather data passed to Folium map visualizer (direct format)")
                     
@@ -1603,6 +1699,172 @@ class HungarianMapTab(QWidget):
             print(f"❌ DEBUG: {error_msg}")
             self._on_error_occurred(error_msg)
     
+    # === 🎞️ ANIMÁLT IDŐSOR ===
+    
+    def _animation_request(self) -> Tuple[str, str, str, str]:
+        """
+        Animáció lekérdezés paraméterei a tab memóriájából.
+        
+        Returns:
+            (query_type, region, start_date, end_date) - alapértelmezés: hőmérséklet,
+            Magyarország, az utolsó ANIMATION_DEFAULT_DAYS nap
+        """
+        query_type = PARAMETER_QUERY_TYPES.get(self.current_analytics_parameter, "hottest_today")
+        
+        region = "HU"
+        if self.last_analysis_parameters:
+            region = (self.last_analysis_parameters.get("county")
+                      or self.last_analysis_parameters.get("region")
+                      or region)
+        
+        if self.last_date_parameters:
+            start_date = self.last_date_parameters["start_date"]
+            end_date = self.last_date_parameters["end_date"]
+        else:
+            end = datetime.now().date() - timedelta(days=1)
+            start_date = (end - timedelta(days=self.ANIMATION_DEFAULT_DAYS - 1)).isoformat()
+            end_date = end.isoformat()
+        
+        return query_type, region, start_date, end_date
+    
+    def _start_animation_precompute(self):
+        """
+        🎞️ Város × nap mátrix és képkockák előszámítása a közös TaskScheduler poolján.
+        """
+        if not self.multi_city_engine:
+            self._on_error_occurred("MultiCityEngine nem elérhető az animációhoz")
+            return
+        if self.animation_worker:
+            self.animation_worker.cancel()  # latest-wins: a korábbi előszámítás eredménye eldobva
+        
+        query_type, region, start_date, end_date = self._animation_request()
+        print(f"🎞️ DEBUG: Animation precompute: {query_type}, {region}, {start_date} → {end_date}")
+        
+        self.animation_play_btn.setChecked(False)
+        self.animation_build_btn.setEnabled(False)
+        self.loading_progress.setVisible(True)
+        self.loading_progress.setValue(0)
+        
+        self.animation_worker = AnimationFrameWorker(
+            self.multi_city_engine, query_type, region, start_date, end_date,
+            gradients=COLOR_SCALE_GRADIENTS, parent=self
+        )
+        self.animation_worker.progress_updated.connect(self.loading_progress.setValue)
+        self.animation_worker.status_updated.connect(self.loading_status.setText)
+        self.animation_worker.frames_ready.connect(self._on_animation_frames_ready)
+        self.animation_worker.error_occurred.connect(self._on_animation_error)
+        self.animation_worker.finished.connect(self._on_animation_worker_finished)
+        self.animation_worker.start()
+    
+    def _on_animation_worker_finished(self):
+        """Csak az aktuális (nem felülírt) előszámítás vége engedi újra a gombot."""
+        if self.sender() is self.animation_worker:
+            self.animation_build_btn.setEnabled(True)
+    
+    def _on_animation_frames_ready(self, matrix, frames):
+        """
+        🎞️ Kész képkockák betöltése a térkép kliensbe és a csúszka engedélyezése.
+        """
+        self.loading_progress.setVisible(False)
+        self.animation_matrix = matrix
+        
+        if not self.map_visualizer or not self.map_visualizer.load_animation_frames(frames):
+            self.loading_status.setText("⚠️ Animáció: a térkép nem kész a képkockákhoz")
+            return
+        
+        self.animation_slider.blockSignals(True)
+        self.animation_slider.setRange(0, frames.frame_count - 1)
+        self.animation_slider.setValue(0)
+        self.animation_slider.blockSignals(False)
+        self.animation_slider.setEnabled(True)
+        self.animation_play_btn.setEnabled(frames.frame_count > 1)
+        self._update_animation_label(0)
+        
+        cache_note = " (cache)" if frames.cached else ""
+        self.loading_status.setText(
+            f"🎞️ Animáció kész: {len(matrix.cities)} város × {frames.frame_count} nap, "
+            f"kitöltöttség {matrix.coverage():.0%}{cache_note}"
+        )
+    
+    def _on_animation_error(self, error_message: str):
+        self.loading_progress.setVisible(False)
+        self.loading_status.setText(f"❌ {error_message}")
+        self._on_error_occurred(error_message)
+    
+    def _on_animation_slider_changed(self, index: int):
+        """🎞️ Csúszka → képkocka (a kliens már tárolja az összes napot)."""
+        if self.map_visualizer:
+            self.map_visualizer.show_animation_frame(index)
+        self._update_animation_label(index)
+    
+    def _update_animation_label(self, index: int):
+        if self.animation_matrix is None:
+            return
+        day_values = self.animation_matrix.day_values(index)
+        finite = day_values[np.isfinite(day_values)]
+        summary = f"átlag {finite.mean():.1f}, max {finite.max():.1f}" if finite.size else "nincs adat"
+        self.animation_label.setText(f"📅 {self.animation_matrix.date_strings()[index]} · {summary}")
+    
+    def _on_animation_play_toggled(self, playing: bool):
+        self.animation_play_btn.setText("⏸️" if playing else "▶️")
+        if playing:
+            self.animation_timer.start()
+        else:
+            self.animation_timer.stop()
+    
+    def _advance_animation_frame(self):
+        maximum = self.animation_slider.maximum()
+        if maximum <= 0:
+            self.animation_play_btn.setChecked(False)
+            return
+        self.animation_slider.setValue((self.animation_slider.value() + 1) % (maximum + 1))
+    
+    # === 📏 KLÍMAINDEX TREND ===
+    
+    def _reload_climate_index_sets(self):
+        """Mentett klímaindex készletek listájának frissítése (a kiválasztás megmarad)."""
+        current = self.climate_index_set_combo.currentText()
+        self.climate_index_set_combo.clear()
+        self.climate_index_set_combo.addItems(get_climate_index_engine().saved_sets())
+        if current:
+            self.climate_index_set_combo.setCurrentText(current)
+        self.climate_index_show_btn.setEnabled(self.climate_index_set_combo.count() > 0)
+    
+    def _on_climate_index_show_clicked(self):
+        self.show_climate_index_trend(self.climate_index_set_combo.currentText(),
+                                      self.climate_index_combo.currentData())
+    
+    def show_climate_index_trend(self, set_name: str, index: str) -> bool:
+        """
+        📏 Mentett klímaindex készlet trendje a megye rétegen (változás / évtized megyénként).
+        
+        Args:
+            set_name: Klímaindex készlet neve (pl. "Dél-Alföld_1961_2024")
+            index: ETCCDI index kód (pl. "SU")
+            
+        Returns:
+            True, ha a réteg beállítva
+        """
+        if not self.multi_city_engine or not self.weather_bridge:
+            self._on_error_occurred("MultiCityEngine nem elérhető")
+            return False
+        
+        index_trend = self.multi_city_engine.climate_index_trend(set_name, index)
+        choropleth = self.weather_bridge.convert_climate_index_trend_to_choropleth(index_trend, index)
+        if not choropleth:
+            self.loading_status.setText(f"⚠️ Nincs {index} trend a(z) {set_name} készletben")
+            return False
+        
+        description, unit, _ = INDEX_DEFINITIONS[index]
+        self.climate_index_label.setText(f"📏 {index}: {len(choropleth['counties'])} megye ({unit}/évtized)")
+        self.loading_status.setText(f"📏 {description} trendje ({set_name}) a megye rétegen")
+        
+        if self.map_visualizer:
+            self.map_visualizer.set_choropleth_data(choropleth)
+            if self.is_folium_ready:
+                self.map_visualizer._refresh_map()
+        return True
+    
     # === PUBLIKUS API - ANALYTICS SYNC + WEATHER INTEGRATION 100% VERZIÓ + PARAMÉTER MEMÓRIA ===
     
     def get_location_selector(self) -> Optional[HungarianLocationSelector]:
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Global Weather Analyzer - Lazy Tab Refresher
+Dirty-flag alapú, lusta tab frissítés a többtabos nézetekhez.
+
+🎯 FOGYASZTÓK: A tabok (és egyéb panelek) fogyasztóként regisztrálnak egy frissítő callback-kel
+🚩 DIRTY FLAG: Új adat érkezésekor minden fogyasztó "piszkos" lesz, de nem számol azonnal
+👁️ LÁTHATÓSÁG: Csak a látható fogyasztó számol azonnal (tab váltás / Show esemény)
+💤 IDLE IDŐ: A rejtett fogyasztók egyesével, üresjárati időben frissülnek (QTimer)
+⏱️ GENERÁCIÓ SZÁMLÁLÓ: Újabb adat érkezésekor az elavult, még el nem indult munka eldobásra kerül
+
+Használat:
+    refresher = LazyTabRefresher(self)
+    refresher.register("table", self.table_tab, self.table_tab.update_data, self.table_tab.clear_data)
+    refresher.set_data(data)   # csak a látható tab számol azonnal
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Callable, List
+
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import QObject, QEvent, QTimer, Signal
+
+from ..config import GUIConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TabConsumer:
+    """Egy regisztrált fogyasztó (tab/panel) és a frissítési állapota."""
+    key: str
+    widget: QWidget
+    refresh: Callable[[Any], None]
+    clear: Optional[Callable[[], None]] = None
+    dirty: bool = False
+    generation: int = 0  # Az utoljára kiszámolt adatgeneráció
+    idle_allowed: bool = True
+
+
+class LazyTabRefresher(QObject):
+    """
+    Lusta, dirty-flag alapú frissítés koordinátor.
+
+    A fogyasztó widgetekre eseményszűrőt tesz: a Show esemény (tab váltás,
+    szülő megjelenése) indítja a piszkos fogyasztó frissítését. A rejtett
+    fogyasztókat az idle időzítő egyesével számolja ki.
+    """
+
+    # Signalok
+    consumer_refreshed = Signal(str, float)  # key, számítási idő (s)
+
+    def __init__(self, parent: Optional[QObject] = None,
+                 idle_delay_ms: Optional[int] = None):
+        """
+        Args:
+            parent: Szülő objektum
+            idle_delay_ms: Üresjárati frissítés késleltetése (None → GUIConfig, < 0 → kikapcsolva)
+        """
+        super().__init__(parent)
+
+        self._consumers: Dict[str, TabConsumer] = {}
+        self._order: List[str] = []
+        self._data: Any = None
+        self._generation = 0
+
+        self.idle_delay_ms = GUIConfig.LAZY_TAB_IDLE_DELAY_MS if idle_delay_ms is None else idle_delay_ms
+
+        # Üresjárati frissítés - egy tick = egy fogyasztó, így a GUI reszponzív marad
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.timeout.connect(self._on_idle_tick)
+
+    # === REGISZTRÁCIÓ ===
+
+    def register(self, key: str, widget: QWidget, refresh: Callable[[Any], None],
+                 clear: Optional[Callable[[], None]] = None, idle_allowed: bool = True) -> None:
+        """
+        Fogyasztó regisztrálása.
+
+        Args:
+            key: Fogyasztó azonosító
+            widget: A widget, amelynek láthatósága a számítást vezérli
+            refresh: Frissítő callback (az aktuális adatot kapja)
+            clear: Opcionális törlő callback
+            idle_allowed: Rejtett állapotban üresjárati időben előre számolható-e
+        """
+        if key not in self._consumers:
+            self._order.append(key)
+            widget.installEventFilter(self)
+
+        self._consumers[key] = TabConsumer(
+            key=key,
+            widget=widget,
+            refresh=refresh,
+            clear=clear,
+            dirty=self._data is not None,
+            idle_allowed=idle_allowed
+        )
+
+    # === ADAT KEZELÉS ===
+
+    def set_data(self, data: Any) -> None:
+        """
+        Új adat beállítása - minden fogyasztó piszkos lesz.
+
+        A látható fogyasztók azonnal frissülnek, a rejtettek üresjárati időben.
+        Az előző generáció még el nem indult munkája eldobásra kerül.
+        """
+        self._generation += 1
+        self._data = data
+        self._idle_timer.stop()
+
+        for consumer in self._consumers.values():
+            consumer.dirty = True
+
+        logger.debug(f"🚩 LazyTabRefresher: gen {self._generation} - {len(self._consumers)} fogyasztó piszkos")
+
+        self.refresh_visible()
+        self._schedule_idle()
+
+    def clear(self) -> None:
+        """Adat törlése - függő munka eldobása és a fogyasztók törlése."""
+        self._generation += 1
+        self._data = None
+        self._idle_timer.stop()
+
+        for consumer in self._consumers.values():
+            consumer.dirty = False
+            consumer.generation = self._generation
+            if consumer.clear:
+                try:
+                    consumer.clear()
+                except Exception as e:
+                    logger.error(f"❌ LazyTabRefresher törlési hiba ({consumer.key}): {e}")
+
+    def cancel_pending(self) -> None:
+        """Függő (piszkos) munka eldobása a fogyasztók törlése nélkül - pl. ha a tartalmat más forrás írja felül."""
+        self._generation += 1
+        self._idle_timer.stop()
+
+        for consumer in self._consumers.values():
+            consumer.dirty = False
+
+    def mark_dirty(self, key: Optional[str] = None) -> None:
+        """Fogyasztó (vagy mind) piszkosnak jelölése az aktuális adattal."""
+        if self._data is None:
+            return
+
+        targets = [self._consumers[key]] if key in self._consumers else (
+            list(self._consumers.values()) if key is None else []
+        )
+        for consumer in targets:
+            consumer.dirty = True
+
+        self.refresh_visible()
+        self._schedule_idle()
+
+    @property
+    def generation(self) -> int:
+        """Aktuális adatgeneráció."""
+        return self._generation
+
+    def is_dirty(self, key: str) -> bool:
+        """Fogyasztó piszkos-e."""
+        consumer = self._consumers.get(key)
+        return bool(consumer and consumer.dirty)
+
+    # === FRISSÍTÉS ===
+
+    def refresh_visible(self) -> None:
+        """Minden látható, piszkos fogyasztó frissítése."""
+        for key in self._order:
+            consumer = self._consumers[key]
+            if consumer.dirty and consumer.widget.isVisible():
+                self._refresh_consumer(consumer)
+
+    def ensure_fresh(self, key: str) -> None:
+        """Fogyasztó azonnali frissítése láthatóságtól függetlenül (pl. export előtt)."""
+        consumer = self._consumers.get(key)
+        if consumer and consumer.dirty:
+            self._refresh_consumer(consumer)
+
+    def flush(self) -> None:
+        """Minden piszkos fogyasztó azonnali frissítése."""
+        self._idle_timer.stop()
+        for key in self._order:
+            self.ensure_fresh(key)
+
+    def _refresh_consumer(self, consumer: TabConsumer) -> None:
+        """Egy fogyasztó kiszámolása az aktuális generációval."""
+        if self._data is None:
+            consumer.dirty = False
+            return
+
+        generation = self._generation
+        consumer.dirty = False
+        start_time = time.perf_counter()
+
+        try:
+            consumer.refresh(self._data)
+        except Exception as e:
+            logger.error(f"❌ LazyTabRefresher frissítési hiba ({consumer.key}): {e}", exc_info=True)
+
+        elapsed = time.perf_counter() - start_time
+
+        if generation != self._generation:
+            # Számítás közben újabb adat érkezett (pl. processEvents) - az eredmény elavult
+            logger.debug(f"🗑️ LazyTabRefresher: {consumer.key} gen {generation} elavult")
+            return
+
+        consumer.generation = generation
+        logger.debug(f"✅ LazyTabRefresher: {consumer.key} frissítve (gen {generation}, {elapsed:.3f}s)")
+        self.consumer_refreshed.emit(consumer.key, elapsed)
+
+    # === ÜRESJÁRATI FRISSÍTÉS ===
+
+    def _schedule_idle(self) -> None:
+        """Következő üresjárati tick ütemezése, ha van mit számolni."""
+        if self.idle_delay_ms < 0 or self._next_idle_consumer() is None:
+            return
+        self._idle_timer.start(self.idle_delay_ms)
+
+    def _next_idle_consumer(self) -> Optional[TabConsumer]:
+        """A következő piszkos, előre számolható fogyasztó."""
+        for key in self._order:
+            consumer = self._consumers[key]
+            if consumer.dirty and consumer.idle_allowed:
+                return consumer
+        return None
+
+    def _on_idle_tick(self) -> None:
+        """Egy fogyasztó kiszámolása üresjárati időben, majd újraütemezés."""
+        consumer = self._next_idle_consumer()
+        if consumer is None:
+            return
+
+        self._refresh_consumer(consumer)
+        self._schedule_idle()
+
+    # === LÁTHATÓSÁG ===
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        """Show esemény → a piszkos fogyasztó frissítése a megjelenés után."""
+        if event.type() == QEvent.Type.Show:
+            for consumer in self._consumers.values():
+                if consumer.widget is watched and consumer.dirty:
+                    # A Show esemény még a kirajzolás előtt jön - a számítás a következő ciklusban fut
+                    QTimer.singleShot(0, lambda key=consumer.key: self._refresh_if_visible(key))
+                    break
+        return False
+
+    def _refresh_if_visible(self, key: str) -> None:
+        """Halasztott frissítés - csak ha a fogyasztó még mindig látható és piszkos."""
+        consumer = self._consumers.get(key)
+        if consumer and consumer.dirty and consumer.widget.isVisible():
+            self._refresh_consumer(consumer)
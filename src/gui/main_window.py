@@ -9,6 +9,8 @@ Universal Weather Research Platform - Main Window Module
 🧹 4. HULLÁM: DEBUG TISZTÍTÁS ÉS FINALIZÁLÁS!
 🔧 HOTFIX: _on_analysis_failed metódus hozzáadva!
 🎯 VÉGSŐ FIX: DUPLA KONVERZIÓ JAVÍTVA - AnalysisWorker eredménye KÖZVETLENÜL használva!
+🚀 HIDEGINDÍTÁS: A nehéz nézetek (Analitika, Trend, Térkép) első navigáláskor épülnek fel,
+   a magyar megyék betöltése az ablak megjelenése után fut.
 
 ✅ BEFEJEZETT FUNKCIÓK:
 🎯 Analytics View signal chain helyreállítva - Moscow lekérdezés → AnalyticsView MŰKÖDIK
@@ -21,7 +23,7 @@ Universal Weather Research Platform - Main Window Module
 🛠 Lifecycle management és cleanup
 """
 
-from typing import Optional, Dict, Any, Tuple, List
+from typing import Optional, Dict, Any, Tuple, List, Callable, TYPE_CHECKING
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -31,7 +33,7 @@ from PySide6.QtWidgets import (
     QSplitter, QStatusBar, QMenuBar, QMessageBox, QToolBar, QLabel,
     QSizePolicy
 )
-from PySide6.QtCore import Qt, QSettings, Signal, QSize
+from PySide6.QtCore import Qt, QSettings, Signal, QSize, QTimer
 from PySide6.QtGui import QAction, QIcon, QActionGroup
 
 from ..config import AppInfo, GUIConfig
@@ -47,18 +49,19 @@ from .control_panel import ControlPanel
 from .results_panel import ResultsPanel
 from .data_widgets import WeatherDataTable
 from .workers.data_fetch_worker import WorkerManager
-from .dialogs import ExtremeWeatherDialog
-from .analytics_view import AnalyticsView
-from .map_view import MapView
-from .trend_analytics_tab import TrendAnalyticsTab
-from .hungarian_map_tab import HungarianMapTab
+from .dialogs import ExtremeWeatherDialog, PerformancePanelDialog
+from ..lazy_imports import lazy_module
 
-# 🗺️ MAGYAR MEGYÉK AUTOMATIKUS INTEGRÁCIÓJA
-try:
-    from ..analytics.hungarian_counties_integration import HungarianCountiesLoader, integrate_hungarian_counties_to_app
-    HUNGARIAN_COUNTIES_AVAILABLE = True
-except ImportError as e:
-    HUNGARIAN_COUNTIES_AVAILABLE = False
+# 🚀 A nehéz nézetek (geopandas, folium, sklearn, scipy, plotly, QtWebEngine) első navigáláskor töltődnek be
+if TYPE_CHECKING:
+    from .analytics_view import AnalyticsView
+    from .map_view import MapView
+    from .trend_analytics_tab import TrendAnalyticsTab
+    from .hungarian_map_tab import HungarianMapTab
+
+# 🗺️ MAGYAR MEGYÉK AUTOMATIKUS INTEGRÁCIÓJA (lusta - az ablak megjelenése után töltődik be)
+_counties_integration = lazy_module("src.analytics.hungarian_counties_integration")
+HUNGARIAN_COUNTIES_AVAILABLE = _counties_integration.available
 
 
 class MainWindow(QMainWindow):
@@ -151,6 +154,14 @@ class MainWindow(QMainWindow):
         # 📈 TREND ANALYTICS KOMPONENS
         self.trend_analytics_tab: Optional[TrendAnalyticsTab] = None
         
+        # 🚀 LUSTA NÉZETEK - első navigáláskor épülnek fel a helyőrző konténerekbe
+        self._lazy_view_hosts: Dict[str, QWidget] = {}
+        self._lazy_view_factories: Dict[str, Callable[[], QWidget]] = {}
+        
+        # Utolsó eredmények - a később felépülő nézetek ezeket kapják meg létrehozáskor
+        self._last_city_analysis: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None
+        self._last_multi_city_result: Optional[Tuple[Any, str]] = None
+        
         # 🌍 STATUS BAR PROVIDER WIDGETS
         self.provider_status_label: Optional[QLabel] = None
         self.usage_status_label: Optional[QLabel] = None
@@ -174,7 +185,8 @@ class MainWindow(QMainWindow):
         
         # === MAGYAR MEGYÉK AUTOMATIKUS BETÖLTÉSE ===
         
-        self._load_hungarian_counties()
+        # Az eseményciklus első körében fut - vagyis az ablak megjelenése után
+        QTimer.singleShot(0, self._load_hungarian_counties)
         
         # === BEÁLLÍTÁSOK BETÖLTÉSE ===
         
@@ -190,8 +202,8 @@ class MainWindow(QMainWindow):
                 self.hungarian_counties_loaded = False
                 return
             
-            # 2. HUNGARIAN COUNTIES LOADER LÉTREHOZÁSA
-            counties_loader = HungarianCountiesLoader()
+            # 2. HUNGARIAN COUNTIES LOADER LÉTREHOZÁSA (itt töltődik be a modul és a geopandas)
+            counties_loader = _counties_integration.HungarianCountiesLoader()
             
             # 3. MEGYÉK BETÖLTÉSE (KSH ADATBÁZIS VAGY DEMO)
             self.counties_geodataframe = counties_loader.load_counties_geodataframe()
@@ -355,21 +367,24 @@ class MainWindow(QMainWindow):
         
         # === VIEW-K LÉTREHOZÁSA - 5 NÉZET VERZIÓ ===
         
-        # 1. Single City View (KÖZPONTI FUNKCIONALITÁS)
+        # 1. Single City View (KÖZPONTI FUNKCIONALITÁS) - azonnal épül
         single_city_view = self._create_single_city_view()
         self.stacked_widget.addWidget(single_city_view)  # INDEX 0
         
-        # 2. Analytics View (REFAKTORÁLT VERZIÓ)
-        analytics_view = self._create_analytics_view()
-        self.stacked_widget.addWidget(analytics_view)  # INDEX 1
+        # 2. Analytics View (REFAKTORÁLT VERZIÓ) - lusta
+        self.stacked_widget.addWidget(
+            self._create_lazy_view_host("analytics", self._create_analytics_view)
+        )  # INDEX 1
         
-        # 3. Trend Analysis View
-        trend_view = self._create_trend_analysis_view()
-        self.stacked_widget.addWidget(trend_view)  # INDEX 2
+        # 3. Trend Analysis View - lusta (sklearn, scipy, plotly, QtWebEngine)
+        self.stacked_widget.addWidget(
+            self._create_lazy_view_host("trend_analysis", self._create_trend_analysis_view)
+        )  # INDEX 2
         
-        # 4. Map View
-        map_view = self._create_hungarian_map_view()
-        self.stacked_widget.addWidget(map_view)  # INDEX 3
+        # 4. Map View - lusta (folium, geopandas, QtWebEngine)
+        self.stacked_widget.addWidget(
+            self._create_lazy_view_host("map_view", self._create_hungarian_map_view)
+        )  # INDEX 3
         
         # 5. Settings View
         settings_view = self._create_settings_placeholder()
@@ -466,9 +481,57 @@ class MainWindow(QMainWindow):
         
         return view
     
+    # === 🚀 LUSTA NÉZETEK ===
+    
+    def _create_lazy_view_host(self, view_name: str, factory: Callable[[], QWidget]) -> QWidget:
+        """Üres helyőrző konténer egy lusta nézethez - a valódi nézet első navigáláskor épül bele."""
+        host = QWidget()
+        register_widget_for_theming(host, "container")
+        
+        layout = QVBoxLayout(host)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        
+        self._lazy_view_hosts[view_name] = host
+        self._lazy_view_factories[view_name] = factory
+        return host
+    
+    def _ensure_view_created(self, view_name: str) -> Optional[QWidget]:
+        """
+        Lusta nézet felépítése, ha még nem létezik.
+        
+        Returns:
+            A nézet widget (vagy None, ha a nézet nem lusta / a létrehozás sikertelen)
+        """
+        factory = self._lazy_view_factories.pop(view_name, None)
+        if factory is None:
+            return None
+        
+        start_time = datetime.now()
+        print(f"🚀 DEBUG: Lazy view build: {view_name}...")
+        
+        try:
+            view = factory()
+        except Exception as e:
+            print(f"❌ DEBUG: Lazy view build error ({view_name}): {e}")
+            import traceback
+            traceback.print_exc()
+            view = self._create_placeholder_content(
+                "Nézet nem elérhető",
+                f"Betöltési hiba: {e}",
+                ["• Ellenőrizze a hiányzó függőségeket (pip install -r requirements.txt)"]
+            )
+        
+        self._lazy_view_hosts[view_name].layout().addWidget(view)
+        
+        elapsed_ms = (datetime.now() - start_time).total_seconds() * 1000
+        print(f"✅ DEBUG: Lazy view built: {view_name} ({elapsed_ms:.0f} ms)")
+        return view
+    
     def _create_analytics_view(self) -> QWidget:
         """Analytics View létrehozása - REFAKTORÁLT IMPLEMENTÁCIÓ + THEMEMANAGER + SIGNAL INTEGRATION."""
         print("📊 DEBUG: Creating REFAKTORÁLT AnalyticsView with ThemeManager + Signal Integration...")
+        from .analytics_view import AnalyticsView
         
         # Refaktorált AnalyticsView létrehozása
         self.analytics_panel = AnalyticsView()  # 🔧 REFAKTORÁLT VERZIÓ
@@ -476,12 +539,20 @@ class MainWindow(QMainWindow):
         # 🎨 WIDGET REGISZTRÁCIÓ
         register_widget_for_theming(self.analytics_panel, "container")
         
+        # Signal bekötés + az eddigi utolsó eredmény átadása
+        self._connect_analytics_view_signals()
+        if self._last_city_analysis:
+            location_data, weather_data = self._last_city_analysis
+            self.analytics_panel.on_location_changed(location_data)
+            self.analytics_panel.update_data(weather_data)
+        
         print("✅ DEBUG: REFAKTORÁLT AnalyticsView created with ThemeManager + Signal Integration")
         return self.analytics_panel
     
     def _create_trend_analysis_view(self) -> QWidget:
         """📈 Trend Analysis view létrehozása - VALÓDI TRENDANALYTICSTAB KOMPONENS + THEMEMANAGER."""
         print("📈 DEBUG: Creating real TrendAnalyticsTab component with ThemeManager...")
+        from .trend_analytics_tab import TrendAnalyticsTab
         
         # Valódi TrendAnalyticsTab komponens létrehozása
         self.trend_analytics_tab = TrendAnalyticsTab()
@@ -495,6 +566,7 @@ class MainWindow(QMainWindow):
     def _create_hungarian_map_view(self) -> QWidget:
         """🌤️ Hungarian Map view létrehozása - VALÓDI HUNGARIAN MAP TAB KOMPONENS + THEMEMANAGER + WEATHER INTEGRATION + MAGYAR MEGYÉK AUTOMATIKUS INTEGRÁCIÓJA."""
         print("🌤️ DEBUG: Creating real HungarianMapTab component with ThemeManager + Weather Integration + Magyar Megyék...")
+        from .hungarian_map_tab import HungarianMapTab
         
         # Valódi HungarianMapTab komponens létrehozása
         self.hungarian_map_tab = HungarianMapTab()
@@ -509,6 +581,12 @@ class MainWindow(QMainWindow):
         else:
             print("⚠️ DEBUG: Counties még nincsenek betöltve a HungarianMapTab létrehozásakor")
         
+        # Az utolsó multi-city eredmény átadása (ha a térkép előtt érkezett)
+        if self._last_multi_city_result:
+            result, query_type = self._last_multi_city_result
+            self.hungarian_map_tab.set_analytics_parameter(self._map_query_type_to_parameter(query_type))
+            self.hungarian_map_tab.set_analytics_result(result)
+        
         print("✅ DEBUG: Real HungarianMapTab component created with ThemeManager + Weather Integration + Magyar Megyék")
         return self.hungarian_map_tab
     
@@ -586,6 +664,9 @@ class MainWindow(QMainWindow):
             print(f"⚠️ DEBUG: Unknown view name: {view_name}")
             return
         
+        # 🚀 Lusta nézet felépítése első navigáláskor
+        self._ensure_view_created(view_name)
+        
         # Nézet váltás
         self.current_view_name = view_name
         view_index = view_indices[view_name]
@@ -648,6 +729,12 @@ class MainWindow(QMainWindow):
         view_menu.addAction(extreme_action)
         self.extreme_action = extreme_action
         
+        # ⏱️ Fejlesztői teljesítmény panel (span tracing)
+        performance_action = QAction("⏱️ Teljesítmény panel...", self)
+        performance_action.setShortcut("Ctrl+Shift+P")
+        performance_action.triggered.connect(self._show_performance_panel)
+        view_menu.addAction(performance_action)
+        
         # === SÚGÓ MENÜ ===
         help_menu = menubar.addMenu("❓ Súgó")
         
@@ -756,37 +843,9 @@ class MainWindow(QMainWindow):
             print("✅ CLEAN: AppController.analysis_progress → MainWindow._update_progress_clean CONNECTED")
         
         # === 🚨 KRITIKUS: ANALYTICS VIEW SIGNAL HANDLING VISSZAÁLLÍTÁSA ===
+        # (lusta nézet - a bekötés az AnalyticsView létrehozásakor történik)
         
-        if self.analytics_panel:
-            print("🚨 DEBUG: ANALYTICS SIGNAL HANDLING VISSZAÁLLÍTÁSA...")
-            
-            # 🚨 KRITIKUS: Analytics View multi_city_query_requested signal
-            if hasattr(self.analytics_panel, 'multi_city_query_requested'):
-                def debug_analytics_multi_city_query_requested(query_type: str, region_name: str):
-                    print(f"🚨 DEBUG [ANALYTICS→MAIN_WINDOW]: multi_city_query_requested: {query_type}, {region_name}")
-                
-                self.analytics_panel.multi_city_query_requested.connect(debug_analytics_multi_city_query_requested)
-                self.analytics_panel.multi_city_query_requested.connect(
-                    self._handle_analytics_view_query
-                )
-                print("🚨 ✅ KRITIKUS: AnalyticsView.multi_city_query_requested → MainWindow._handle_analytics_view_query CONNECTED!")
-            else:
-                print("❌ DEBUG: AnalyticsView.multi_city_query_requested signal NOT FOUND!")
-            
-            # Analytics további signalok
-            if hasattr(self.analytics_panel, 'analysis_started'):
-                self.analytics_panel.analysis_started.connect(
-                    lambda: self.status_bar.showMessage("📊 Analytics elemzés folyamatban...")
-                )
-                print("✅ DEBUG: AnalyticsView.analysis_started signal connected")
-            
-            if hasattr(self.analytics_panel, 'error_occurred'):
-                self.analytics_panel.error_occurred.connect(
-                    lambda msg: self.status_bar.showMessage(f"❌ Analytics hiba: {msg}")
-                )
-                print("✅ DEBUG: AnalyticsView.error_occurred signal connected")
-        else:
-            print("❌ DEBUG: Analytics panel is None - signalok nem kapcsolódnak!")
+        self._connect_analytics_view_signals()
         
         # === 🌍 PROVIDER STATUS SIGNALOK ===
         
@@ -818,6 +877,11 @@ class MainWindow(QMainWindow):
             # Extrém időjárás kérések
             self.results_panel.extreme_weather_requested.connect(self._show_extreme_weather)
             print("✅ DEBUG: ResultsPanel.extreme_weather_requested → MainWindow._show_extreme_weather CONNECTED")
+            
+            # 🌪️ Óránkénti lefúrás: rekord nap → controller → óránkénti ablak vissza a tabnak
+            self.results_panel.hourly_window_requested.connect(self.controller.handle_hourly_window_request)
+            self.controller.hourly_data_ready.connect(self.results_panel.update_hourly_window)
+            print("✅ DEBUG: ResultsPanel.hourly_window_requested ↔ Controller.hourly_data_ready CONNECTED")
         
         # === 🎨 TÉMA SIGNALOK - THEMEMANAGER INTEGRÁCIÓ ===
         
@@ -826,6 +890,39 @@ class MainWindow(QMainWindow):
         
         print("🚨 ✅ DEBUG: ALL CLEAN signals connected successfully + ANALYTICS SIGNAL FIX + PROVIDER STATUS!")
     
+    def _connect_analytics_view_signals(self) -> None:
+        """🚨 AnalyticsView signalok bekötése - a lusta nézet létrehozásakor hívódik."""
+        if self.analytics_panel:
+            print("🚨 DEBUG: ANALYTICS SIGNAL HANDLING VISSZAÁLLÍTÁSA...")
+        
+            # 🚨 KRITIKUS: Analytics View multi_city_query_requested signal
+            if hasattr(self.analytics_panel, 'multi_city_query_requested'):
+                def debug_analytics_multi_city_query_requested(query_type: str, region_name: str):
+                    print(f"🚨 DEBUG [ANALYTICS→MAIN_WINDOW]: multi_city_query_requested: {query_type}, {region_name}")
+            
+                self.analytics_panel.multi_city_query_requested.connect(debug_analytics_multi_city_query_requested)
+                self.analytics_panel.multi_city_query_requested.connect(
+                    self._handle_analytics_view_query
+                )
+                print("🚨 ✅ KRITIKUS: AnalyticsView.multi_city_query_requested → MainWindow._handle_analytics_view_query CONNECTED!")
+            else:
+                print("❌ DEBUG: AnalyticsView.multi_city_query_requested signal NOT FOUND!")
+        
+            # Analytics további signalok
+            if hasattr(self.analytics_panel, 'analysis_started'):
+                self.analytics_panel.analysis_started.connect(
+                    lambda: self.status_bar.showMessage("📊 Analytics elemzés folyamatban...")
+                )
+                print("✅ DEBUG: AnalyticsView.analysis_started signal connected")
+        
+            if hasattr(self.analytics_panel, 'error_occurred'):
+                self.analytics_panel.error_occurred.connect(
+                    lambda msg: self.status_bar.showMessage(f"❌ Analytics hiba: {msg}")
+                )
+                print("✅ DEBUG: AnalyticsView.error_occurred signal connected")
+        else:
+            print("ℹ️ DEBUG: Analytics panel még nincs létrehozva - signalok a létrehozáskor kapcsolódnak")
+    
     # === 🚨 ANALYTICS VIEW QUERY HANDLER - VISSZAÁLLÍTOTT METÓDUS! ===
     
     def _handle_analytics_view_query(self, query_type: str, region_name: str):
@@ -986,6 +1083,9 @@ class MainWindow(QMainWindow):
         print(f"🔥 DEBUG: _on_multi_city_result_ready_for_views called - szétosztás a nézeteknek (query_type: {query_type})...")
         
         try:
+            # Utolsó eredmény megőrzése a még fel nem épült (lusta) nézetek számára
+            self._last_multi_city_result = (result, query_type)
+            
             # Eredmény küldése a Térképnek + QUERY TYPE INFO
             if self.hungarian_map_tab and hasattr(self.hungarian_map_tab, 'set_analytics_result'):
                 # 🔧 KRITIKUS: Query type alapú paraméter meghatározása
@@ -1117,6 +1217,9 @@ class MainWindow(QMainWindow):
                             import traceback
                             traceback.print_exc()
                     
+                    # Utolsó eredmény megőrzése - a lusta AnalyticsView létrehozáskor ezt kapja
+                    self._last_city_analysis = (location_data, weather_data)
+                    
                     # 🎯 KRITIKUS FIX: ANALYTICS PANEL AUTOMATIKUS FRISSÍTÉSE (KÖZVETLEN Dict[List] formátum)
                     if self.analytics_panel:
                         print("🎯 KRITIKUS: Updating AnalyticsView with DIRECT weather data - DUPLA KONVERZIÓ JAVÍTVA!")
@@ -1133,7 +1236,7 @@ class MainWindow(QMainWindow):
                             import traceback
                             traceback.print_exc()
                     else:
-                        print(f"❌ KRITIKUS: AnalyticsView update skipped - analytics_panel: {self.analytics_panel is not None}")
+                        print("ℹ️ DEBUG: AnalyticsView még nincs létrehozva - az adatot első megnyitáskor kapja")
                         
                 else:
                     print("❌ KRITIKUS: Invalid weather data format - expected Dict[List] from AnalysisWorker")
@@ -1405,6 +1508,14 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self._show_error(f"Extrém időjárás ablak hiba: {e}")
     
+    def _show_performance_panel(self) -> None:
+        """Fejlesztői teljesítmény panel (elemzésenkénti szakasz idők, trace export)."""
+        try:
+            dialog = PerformancePanelDialog(self)
+            dialog.exec()
+        except Exception as e:
+            self._show_error(f"Teljesítmény panel hiba: {e}")
+    
     # === 🎨 TÉMA KEZELÉS BŐVÍTÉSEK ===
     
     # Signal definition for theme changes
@@ -1608,7 +1719,7 @@ class MainWindow(QMainWindow):
         """Programmatic nézet váltás."""
         self._switch_view(view_name)
     
-    def get_analytics_panel(self) -> Optional[AnalyticsView]:
+    def get_analytics_panel(self) -> Optional['AnalyticsView']:
         """Analytics panel referencia lekérdezése."""
         return self.analytics_panel
     
@@ -1620,7 +1731,7 @@ class MainWindow(QMainWindow):
         """Elérhető nézetek listájának lekérdezése - 🗺️ 5 NÉZET VERZIÓ."""
         return ["single_city", "analytics", "trend_analysis", "map_view", "settings"]
     
-    def get_map_view(self) -> Optional[MapView]:
+    def get_map_view(self) -> Optional['MapView']:
         """🗺️ Map view referencia lekérdezése - ÚJ FUNKCIÓ."""
         return self.map_view
     
@@ -1628,7 +1739,7 @@ class MainWindow(QMainWindow):
         """🗺️ Map view fókuszba helyezése - ÚJ FUNKCIÓ."""
         self._switch_view("map_view")
     
-    def get_hungarian_map_tab(self) -> Optional[HungarianMapTab]:
+    def get_hungarian_map_tab(self) -> Optional['HungarianMapTab']:
         """🌤️ Hungarian Map Tab referencia lekérdezése - ÚJ FUNKCIÓ + MAGYAR MEGYÉK INTEGRÁCIÓJA."""
         return self.hungarian_map_tab
     
@@ -1636,7 +1747,7 @@ class MainWindow(QMainWindow):
         """🌤️ Hungarian Map Tab fókuszba helyezése - ÚJ FUNKCIÓ + MAGYAR MEGYÉK INTEGRÁCIÓJA."""
         self._switch_view("map_view")
     
-    def get_trend_analytics_tab(self) -> Optional[TrendAnalyticsTab]:
+    def get_trend_analytics_tab(self) -> Optional['TrendAnalyticsTab']:
         """📈 Trend Analytics tab referencia lekérdezése - ÚJ FUNKCIÓ."""
         return self.trend_analytics_tab
     
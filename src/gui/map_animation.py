@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🎞️ Animált idősoros térkép - előre számolt napi képkockák a Folium térképhez
+
+Egy hőhullám napról napra böngészése eddig napi egy teljes analyze_multi_city
+hívás + teljes térkép újragenerálás volt. Itt:
+
+- MultiCityEngine.build_city_day_matrix: város × nap mátrix városonként
+  EGY időszak lekéréssel (klíma archívumon keresztül)
+- RasterOverlayRenderer.render_frames: minden nap egy közös rácson,
+  uint8 színindex képkockákként egyetlen fájlba (a közös TaskScheduler poolján)
+- A térkép kliens a fájlt egyszer tölti le (fetch → Uint8Array), a napváltás
+  egy canvas putImageData a közös palettával - nincs Python ↔ böngésző
+  adatforgalom és térkép újragenerálás a csúszka húzásakor
+
+FÁJL: src/gui/map_animation.py
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from PySide6.QtCore import QObject, Signal
+
+from .raster_overlay import get_raster_overlay_renderer
+from .workers.task_scheduler import TaskHandle, TaskPriority, get_task_scheduler
+
+
+# Metrika → színskála (a COLOR_SCALE_GRADIENTS kulcsai)
+METRIC_COLOR_SCALES = {
+    'temperature_2m_max': 'RdYlBu_r',
+    'temperature_2m_min': 'RdYlBu_r',
+    'temperature_2m_mean': 'RdYlBu_r',
+    'temperature_range': 'Oranges',
+    'precipitation_sum': 'Blues',
+    'windspeed_10m_max': 'Greens',
+    'windgusts_10m_max': 'Oranges'
+}
+
+# Analytics paraméter (HungarianMapTab memória) → lekérdezés típus
+PARAMETER_QUERY_TYPES = {
+    "Hőmérséklet": "hottest_today",
+    "Csapadék": "wettest_today",
+    "Szél": "windiest_today"
+}
+
+# Színskála határok a teljes mátrix percentiliseiből (minden napra közös)
+VALUE_RANGE_PERCENTILES = (2.0, 98.0)
+
+
+def animation_value_range(values: np.ndarray) -> tuple:
+    """Közös színskála tartomány az összes képkockához (kiugró értékek nélkül)."""
+    finite = values[np.isfinite(values)]
+    if not finite.size:
+        return (0.0, 1.0)
+    low, high = np.percentile(finite, VALUE_RANGE_PERCENTILES)
+    if high - low < 1e-6:
+        high = low + 1.0
+    return (float(low), float(high))
+
+
+# 🌐 Térkép kliens: canvas alapú képréteg + képkocka lejátszó (Leaflet L.ImageOverlay kiterjesztés)
+ANIMATION_CLIENT_JS = """
+(function () {
+    if (window.weatherAnimation) { return; }
+
+    function findMap() {
+        for (var key in window) {
+            try {
+                if (window[key] instanceof L.Map) { return window[key]; }
+            } catch (e) {}
+        }
+        return null;
+    }
+
+    var CanvasFrameOverlay = L.ImageOverlay.extend({
+        _initImage: function () {
+            var canvas = this._image = L.DomUtil.create('canvas', 'leaflet-image-layer leaflet-zoom-animated');
+            canvas.width = this.options.frameWidth;
+            canvas.height = this.options.frameHeight;
+            if (this.options.zIndex != null) { this._updateZIndex(); }
+            this._context = canvas.getContext('2d');
+            this._imageData = this._context.createImageData(canvas.width, canvas.height);
+            this._pixels = new Uint32Array(this._imageData.data.buffer);
+        }
+    });
+
+    window.weatherAnimation = {
+        layer: null,
+        frames: null,
+        palette: null,
+        meta: null,
+        current: -1,
+
+        load: function (meta) {
+            var self = this;
+            return fetch(meta.url).then(function (response) {
+                return response.arrayBuffer();
+            }).then(function (buffer) {
+                // Paletta: RGBA → little-endian Uint32 (ABGR), 255 = átlátszó
+                var palette = new Uint32Array(256);
+                for (var i = 0; i < meta.palette.length; i++) {
+                    var color = meta.palette[i];
+                    palette[i] = ((255 << 24) | (color[2] << 16) | (color[1] << 8) | color[0]) >>> 0;
+                }
+                palette[255] = 0;
+
+                self.clear();
+                self.frames = new Uint8Array(buffer);
+                self.palette = palette;
+                self.meta = meta;
+                self.layer = new CanvasFrameOverlay('', meta.bounds, {
+                    opacity: meta.opacity,
+                    interactive: false,
+                    frameWidth: meta.width,
+                    frameHeight: meta.height
+                }).addTo(findMap());
+                self.show(0);
+                return meta.frame_count;
+            });
+        },
+
+        show: function (index) {
+            if (!this.frames || !this.layer || index === this.current) { return; }
+            var size = this.meta.width * this.meta.height;
+            var frame = this.frames.subarray(index * size, (index + 1) * size);
+            var pixels = this.layer._pixels;
+            var palette = this.palette;
+            for (var i = 0; i < size; i++) { pixels[i] = palette[frame[i]]; }
+            this.layer._context.putImageData(this.layer._imageData, 0, 0);
+            this.current = index;
+        },
+
+        clear: function () {
+            if (this.layer) { this.layer.remove(); }
+            this.layer = null;
+            this.frames = null;
+            this.current = -1;
+        }
+    };
+})();
+"""
+
+
+def animation_load_script(payload: Dict[str, Any]) -> str:
+    """Kliens telepítése (egyszer) + képkockák betöltése a megadott leíróból."""
+    return f"{ANIMATION_CLIENT_JS}\nwindow.weatherAnimation.load({json.dumps(payload)});"
+
+
+def animation_frame_script(index: int) -> str:
+    """Egy képkocka megjelenítése (a csúszka minden lépésére csak ez fut)."""
+    return f"window.weatherAnimation && window.weatherAnimation.show({int(index)});"
+
+
+ANIMATION_CLEAR_SCRIPT = "window.weatherAnimation && window.weatherAnimation.clear();"
+
+
+class AnimationFrameWorker(QObject):
+    """
+    🎞️ Város × nap mátrix és képkockák előszámítása háttérben.
+
+    A közös TaskScheduler poolján fut (latest-wins "map_animation" csoport): új
+    előszámítás megszakítja az előzőt, a megszakított feladat eredménye eldobásra kerül.
+
+    Signalok:
+        progress_updated(int): 0-70% adatlekérés, 70-100% raszterezés
+        frames_ready(matrix, frames): CityDayMatrix + RasterFrames
+        finished(): a feladat véget ért (sikeresen, hibával vagy megszakítva)
+    """
+
+    progress_updated = Signal(int)
+    status_updated = Signal(str)
+    frames_ready = Signal(object, object)
+    error_occurred = Signal(str)
+    finished = Signal()
+
+    TASK_GROUP = "map_animation"
+
+    def __init__(self, engine, query_type: str, region: str, start_date: str, end_date: str,
+                 gradients: Dict[str, Dict[float, str]], max_cities: Optional[int] = None, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.query_type = query_type
+        self.region = region
+        self.start_date = start_date
+        self.end_date = end_date
+        self.gradients = gradients
+        self.max_cities = max_cities
+        self.task_handle: Optional[TaskHandle] = None
+
+    def start(self) -> TaskHandle:
+        """Beküldés a közös ütemezőbe (a korábbi animáció előszámítás megszakad)."""
+        self.task_handle = get_task_scheduler().submit(
+            self.run,
+            name="map_animation",
+            priority=TaskPriority.ANALYSIS,
+            key=("map_animation", self.query_type, self.region, self.start_date, self.end_date),
+            group=self.TASK_GROUP,
+            on_done=self._on_task_done
+        )
+        return self.task_handle
+
+    def cancel(self) -> None:
+        if self.task_handle is not None:
+            self.task_handle.cancel()
+
+    def is_cancelled(self) -> bool:
+        return self.task_handle is not None and self.task_handle.is_cancelled()
+
+    def _on_task_done(self, handle: TaskHandle) -> None:
+        """El sem indult (megszakított) feladatnál is jelez befejezést."""
+        if not handle.started:
+            self.finished.emit()
+
+    def _progress(self, value: int) -> None:
+        if not self.is_cancelled():
+            self.progress_updated.emit(value)
+
+    def run(self):
+        try:
+            self.status_updated.emit(f"🎞️ Idősor lekérése: {self.start_date} → {self.end_date}...")
+            matrix = self.engine.build_city_day_matrix(
+                self.query_type, self.region, self.start_date, self.end_date,
+                max_cities=self.max_cities,
+                progress_callback=lambda done, total: self._progress(int(70 * done / max(total, 1)))
+            )
+            if self.is_cancelled():
+                return
+
+            self.status_updated.emit(f"🎞️ {matrix.day_count} képkocka raszterezése...")
+            color_scale = METRIC_COLOR_SCALES.get(matrix.metric, 'RdYlBu_r')
+            frames = get_raster_overlay_renderer().render_frames(
+                matrix.latitudes, matrix.longitudes, matrix.values, matrix.date_strings(),
+                animation_value_range(matrix.values), self.gradients[color_scale],
+                progress_callback=lambda done, total: self._progress(70 + int(30 * done / max(total, 1)))
+            )
+            if self.is_cancelled():
+                return
+            if frames is None:
+                self.error_occurred.emit("Nincs elég adat az animációhoz (kevesebb mint 3 város)")
+                return
+
+            self.progress_updated.emit(100)
+            self.frames_ready.emit(matrix, frames)
+
+        except Exception as e:
+            if not self.is_cancelled():
+                self.error_occurred.emit(f"Animáció előszámítási hiba: {e}")
+        finally:
+            self.finished.emit()
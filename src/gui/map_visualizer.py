@@ -22,6 +22,8 @@ Magyar Klímaanalitika MVP - Folium + Leaflet.js Alapú Térképes Megjelenítő
 FÁJL: src/gui/map_visualizer.py
 """
 
+from __future__ import annotations
+
 from typing import Dict, List, Optional, Tuple, Any, Union
 import os
 import json
@@ -35,6 +37,8 @@ from dataclasses import dataclass, field
 from datetime import datetime, date
 import uuid
 
+import numpy as np
+
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
     QComboBox, QSlider, QCheckBox, QGroupBox, QProgressBar,
@@ -42,31 +46,71 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, Signal, QUrl, QTimer, QThread
 from PySide6.QtGui import QFont, QPixmap
-from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtWebChannel import QWebChannel
 
-# Folium import with fallback
-try:
-    import folium
-    from folium import plugins
-    import branca.colormap as cm
-    FOLIUM_AVAILABLE = True
-    print("✅ Folium successfully imported")
-except ImportError as e:
-    FOLIUM_AVAILABLE = False
-    print(f"⚠️ Folium not available: {e}")
+# 🚀 Nehéz könyvtárak lusta betöltése - a térkép nézet első megnyitásáig nem importálódnak
+from ..lazy_imports import lazy_module, lazy_attribute
+
+# Web megjelenítés (QtWebEngine - Chromium)
+QWebEngineView = lazy_attribute("PySide6.QtWebEngineWidgets", "QWebEngineView")
+QWebChannel = lazy_attribute("PySide6.QtWebChannel", "QWebChannel")
 
-# GeoPandas import
-try:
-    import geopandas as gpd
-    import pandas as pd
-    GEOPANDAS_AVAILABLE = True
-except ImportError:
-    GEOPANDAS_AVAILABLE = False
+# Folium (elérhetőség ellenőrzés importálás nélkül)
+folium = lazy_module("folium")
+plugins = lazy_module("folium.plugins")
+cm = lazy_module("branca.colormap")
+FOLIUM_AVAILABLE = folium.available and cm.available
+if not FOLIUM_AVAILABLE:
+    print("⚠️ Folium not available (pip install folium branca)")
+
+# GeoPandas (elérhetőség ellenőrzés importálás nélkül)
+gpd = lazy_module("geopandas")
+GEOPANDAS_AVAILABLE = gpd.available
 
 # Saját modulok
 from .theme_manager import register_widget_for_theming
 from .color_palette import ColorPalette
+from ..devtools.tracing import traced
+from .raster_overlay import get_raster_overlay_renderer, embed_overlay_images, gradient_lut
+from .map_animation import animation_load_script, animation_frame_script, ANIMATION_CLEAR_SCRIPT
+from ..config import RegionalAggregationConfig
+from ..analytics.regional_aggregation import normalize_county_name
+
+
+# 🎨 DINAMIKUS SZÍNSKÁLA MAPPING (Folium gradiens, raszter overlay és animáció közös forrása)
+COLOR_SCALE_GRADIENTS = {
+    'RdYlBu_r': {  # Hőmérséklet - Kék (hideg) → Piros (meleg)
+        0.0: '#0000FF',  # Kék
+        0.2: '#00BFFF',  # Világoskék  
+        0.4: '#87CEEB',  # Égkék
+        0.6: '#FFFF00',  # Sárga
+        0.8: '#FFA500',  # Narancs
+        1.0: '#FF0000'   # Piros
+    },
+    'Blues': {  # Csapadék - Fehér → Sötétkék
+        0.0: '#F0F8FF',  # Alice Blue (szinte fehér)
+        0.2: '#E6F3FF',  # Nagyon világoskék
+        0.4: '#B3D9FF',  # Világoskék
+        0.6: '#4D94FF',  # Közepes kék
+        0.8: '#0066CC',  # Sötétkék
+        1.0: '#003366'   # Nagyon sötétkék
+    },
+    'Greens': {  # Szél - Világoszöld → Sötétzöld
+        0.0: '#F0FFF0',  # Honeydew (szinte fehér)
+        0.2: '#98FB98',  # Pale Green
+        0.4: '#90EE90',  # Light Green
+        0.6: '#32CD32',  # Lime Green
+        0.8: '#228B22',  # Forest Green
+        1.0: '#006400'   # Dark Green
+    },
+    'Oranges': {  # Széllökések - Világos narancs → Sötét narancs/piros
+        0.0: '#FFF8DC',  # Cornsilk (krémszín)
+        0.2: '#FFEFD5',  # Papaya Whip
+        0.4: '#FFE4B5',  # Moccasin  
+        0.6: '#FFA500',  # Orange
+        0.8: '#FF4500',  # Orange Red
+        1.0: '#DC143C'   # Crimson
+    }
+}
 
 
 @dataclass
@@ -92,6 +136,8 @@ class FoliumMapConfig:
     county_border_color: str = "#2E4057"
     county_border_weight: int = 2
     county_hover_color: str = "#E74C3C"
+    county_choropleth_opacity: float = 0.65
+    choropleth_statistic: str = RegionalAggregationConfig.DEFAULT_STATISTIC  # "mean" | "max" | "min" | "weighted_mean"
     
     # Weather overlay
     weather_overlay: bool = False
@@ -100,6 +146,10 @@ class FoliumMapConfig:
     # 🔧 Active overlay parameter
     active_overlay_parameter: Optional[str] = None  # "temperature", "wind_speed", "precipitation"
     
+    # 🖼️ Raszteres overlay: ennyi pont fölött egyetlen PNG kép a pontonkénti rétegek helyett
+    raster_overlay_min_points: int = 200
+    raster_overlay_base_url: Optional[str] = None  # helyi HTTP szerver (None → beágyazott kép)
+    
     # Interaktivitás
     disable_scroll_zoom: bool = False
     dragging: bool = True
@@ -240,11 +290,13 @@ class FoliumMapGenerator(QThread):
     error_occurred = Signal(str)          # error message
     status_updated = Signal(str)          # status message
     
-    def __init__(self, config: FoliumMapConfig, counties_gdf=None, weather_data=None, bridge_id=None, output_path=None):
+    def __init__(self, config: FoliumMapConfig, counties_gdf=None, weather_data=None, bridge_id=None, output_path=None,
+                 choropleth=None):
         super().__init__()
         self.config = config
         self.counties_gdf = counties_gdf
         self.weather_data = weather_data
+        self.choropleth = choropleth
         self.bridge_id = bridge_id or str(uuid.uuid4())
         
         # Output path generálás
@@ -254,6 +306,7 @@ class FoliumMapGenerator(QThread):
         else:
             self.output_path = output_path
     
+    @traced("folium_generation")
     def run(self):
         """
         🗺️ Folium interaktív térkép generálása - HTTP SZERVER VERZIÓ.
@@ -365,6 +418,7 @@ class FoliumMapGenerator(QThread):
         
         # GeoJSON konvertálás
         counties_geojson = json.loads(self.counties_gdf.to_json())
+        fill_colors = self._apply_choropleth(counties_geojson)
         
         # Style function
         def style_function(feature):
@@ -389,6 +443,15 @@ class FoliumMapGenerator(QThread):
                     'fillOpacity': 0.6
                 }
             
+            # Choropleth: megyénkénti időjárási érték színe
+            if county_name in fill_colors:
+                return {
+                    'fillColor': fill_colors[county_name],
+                    'color': self.config.county_border_color,
+                    'weight': self.config.county_border_weight,
+                    'fillOpacity': self.config.county_choropleth_opacity
+                }
+            
             # Normál stílus
             return {
                 'fillColor': self.config.county_fill_color,
@@ -406,18 +469,27 @@ class FoliumMapGenerator(QThread):
                 'fillOpacity': 0.8
             }
         
-        # GeoJson layer hozzáadása
-        counties_layer = folium.GeoJson(
-            counties_geojson,
-            style_function=style_function,
-            highlight_function=highlight_function,
-            tooltip=folium.Tooltip(
+        if fill_colors:
+            tooltip = folium.GeoJsonTooltip(
+                fields=['megye', 'choropleth_label'],
+                aliases=['Megye', self.CHOROPLETH_STATISTIC_LABELS.get(self.config.choropleth_statistic, 'Érték')],
+                sticky=True
+            )
+        else:
+            tooltip = folium.Tooltip(
                 folium.Html(
                     '<b>Hover a megyére a részletekért</b>',
                     script=True
                 ),
                 sticky=True
-            ),
+            )
+        
+        # GeoJson layer hozzáadása
+        counties_layer = folium.GeoJson(
+            counties_geojson,
+            style_function=style_function,
+            highlight_function=highlight_function,
+            tooltip=tooltip,
             popup=folium.Popup(
                 folium.Html(
                     '<b>Kattints a megyére</b>',
@@ -431,6 +503,57 @@ class FoliumMapGenerator(QThread):
         
         print("✅ Counties layer added with interactivity")
     
+    CHOROPLETH_STATISTIC_LABELS = {
+        'mean': 'Átlag',
+        'min': 'Minimum',
+        'max': 'Maximum',
+        'weighted_mean': 'Lakosság-súlyozott átlag'
+    }
+    
+    def _apply_choropleth(self, counties_geojson: Dict) -> Dict[str, str]:
+        """
+        🗺️ Megyénkénti statisztika → kitöltő szín (a megye tartomány min..max skáláján).
+        
+        A feature-ök 'choropleth_label' tulajdonságot kapnak a tooltiphez.
+        
+        Returns:
+            {megye (GeoJSON név): '#RRGGBB'} - üres, ha nincs choropleth adat
+        """
+        if not self.choropleth or not self.choropleth.get('counties'):
+            return {}
+        
+        try:
+            statistic = self.config.choropleth_statistic
+            county_values = {name: stats[statistic] for name, stats in self.choropleth['counties'].items()
+                             if stats.get(statistic) is not None and np.isfinite(stats[statistic])}
+            if not county_values:
+                return {}
+            
+            values = np.array(list(county_values.values()))
+            vmin, vmax = float(values.min()), float(values.max())
+            overlay_type = self.choropleth.get('overlay_type')
+            lut = gradient_lut(self._get_dynamic_gradient(None, overlay_type))
+            
+            fill_colors = {}
+            for feature in counties_geojson.get('features', []):
+                properties = feature.setdefault('properties', {})
+                name = properties.get('megye', '')
+                value = county_values.get(normalize_county_name(name))
+                if value is None:
+                    properties['choropleth_label'] = '-'
+                    continue
+                position = 0.0 if vmax - vmin < 1e-9 else (value - vmin) / (vmax - vmin)
+                red, green, blue = lut[int(round(position * (len(lut) - 1)))]
+                fill_colors[name] = f"#{red:02X}{green:02X}{blue:02X}"
+                properties['choropleth_label'] = f"{value:.1f}"
+            
+            print(f"🗺️ Choropleth: {overlay_type} {statistic}, {len(fill_colors)} megye ({vmin:.1f} - {vmax:.1f})")
+            return fill_colors
+            
+        except Exception as e:
+            print(f"⚠️ Choropleth error: {e}")
+            return {}
+    
     def _add_weather_overlay(self, map_obj: folium.Map):
         """
         🌤️ Időjárási adatok overlay hozzáadása HeatMap plugin-nal.
@@ -469,9 +592,13 @@ class FoliumMapGenerator(QThread):
         try:
             from folium.plugins import HeatMap
             
+            temperature_points = self.weather_data.get('temperature', {})
+            if self._add_raster_overlay(map_obj, 'temperature', temperature_points, 'value', 'RdYlBu_r', "🌡️ Hőmérséklet"):
+                return
+            
             # Hőmérséklet adatok előkészítése
             temp_data = []
-            for location, data in self.weather_data.get('temperature', {}).items():
+            for location, data in temperature_points.items():
                 if 'coordinates' in data and 'value' in data:
                     lat, lon = data['coordinates']
                     temp = data['value']
@@ -506,46 +633,59 @@ class FoliumMapGenerator(QThread):
         except Exception as e:
             print(f"⚠️ Temperature heatmap error: {e}")
     
+    # Raszter színskála tartományok - a jelmagyarázatokkal összhangban
+    RASTER_VALUE_RANGES = {
+        'temperature': (-20.0, 40.0),
+        'precipitation': (0.0, 50.0),
+        'wind_speed': (0.0, 60.0)
+    }
+    
+    def _add_raster_overlay(self, map_obj: folium.Map, overlay_type: str, points: Dict[str, Dict],
+                            value_key: str, color_scale: str, layer_name: str) -> bool:
+        """
+        🖼️ Sok pontos overlay egyetlen szerveroldali PNG képként (ImageOverlay).
+        
+        Returns:
+            True ha a raszter réteg elkészült, False → pontonkénti réteg marad
+        """
+        if len(points) < self.config.raster_overlay_min_points:
+            return False
+        
+        try:
+            overlay = get_raster_overlay_renderer().render(
+                points, value_key,
+                self.RASTER_VALUE_RANGES[overlay_type],
+                self._get_dynamic_gradient(color_scale, overlay_type)
+            )
+            if overlay is None:
+                return False
+            
+            folium.raster_layers.ImageOverlay(
+                image=overlay.url(self.config.raster_overlay_base_url),
+                bounds=[list(corner) for corner in overlay.bounds],
+                opacity=self.config.weather_opacity,
+                name=layer_name,
+                interactive=False,
+                cross_origin=False
+            ).add_to(map_obj)
+            
+            cache_note = " (cache)" if overlay.cached else ""
+            print(f"🖼️ {overlay_type} raster overlay: {overlay.point_count} points → {overlay.width}x{overlay.height} PNG{cache_note}")
+            return True
+            
+        except Exception as e:
+            print(f"⚠️ Raster overlay error ({overlay_type}): {e}")
+            return False
+    
+    def _measured_points(self, points: Dict[str, Dict]) -> Dict[str, Dict]:
+        """Csak a mért (nem interpolált) pontok - raszter mellé, ha kevesen vannak."""
+        measured = {name: data for name, data in points.items() if not data.get('interpolated')}
+        return measured if len(measured) < self.config.raster_overlay_min_points else {}
+    
     def _get_dynamic_gradient(self, color_scale: str, overlay_type: str) -> Dict[float, str]:
         """
         🔧 KRITIKUS ÚJ METÓDUS: Dinamikus gradient generálás color_scale alapján
         """
-        # 🎨 DINAMIKUS SZÍNSKÁLA MAPPING
-        COLOR_SCALE_GRADIENTS = {
-            'RdYlBu_r': {  # Hőmérséklet - Kék (hideg) → Piros (meleg)
-                0.0: '#0000FF',  # Kék
-                0.2: '#00BFFF',  # Világoskék  
-                0.4: '#87CEEB',  # Égkék
-                0.6: '#FFFF00',  # Sárga
-                0.8: '#FFA500',  # Narancs
-                1.0: '#FF0000'   # Piros
-            },
-            'Blues': {  # Csapadék - Fehér → Sötétkék
-                0.0: '#F0F8FF',  # Alice Blue (szinte fehér)
-                0.2: '#E6F3FF',  # Nagyon világoskék
-                0.4: '#B3D9FF',  # Világoskék
-                0.6: '#4D94FF',  # Közepes kék
-                0.8: '#0066CC',  # Sötétkék
-                1.0: '#003366'   # Nagyon sötétkék
-            },
-            'Greens': {  # Szél - Világoszöld → Sötétzöld
-                0.0: '#F0FFF0',  # Honeydew (szinte fehér)
-                0.2: '#98FB98',  # Pale Green
-                0.4: '#90EE90',  # Light Green
-                0.6: '#32CD32',  # Lime Green
-                0.8: '#228B22',  # Forest Green
-                1.0: '#006400'   # Dark Green
-            },
-            'Oranges': {  # Széllökések - Világos narancs → Sötét narancs/piros
-                0.0: '#FFF8DC',  # Cornsilk (krémszín)
-                0.2: '#FFEFD5',  # Papaya Whip
-                0.4: '#FFE4B5',  # Moccasin  
-                0.6: '#FFA500',  # Orange
-                0.8: '#FF4500',  # Orange Red
-                1.0: '#DC143C'   # Crimson
-            }
-        }
-        
         try:
             # Direkt color_scale mapping
             if color_scale in COLOR_SCALE_GRADIENTS:
@@ -582,6 +722,10 @@ class FoliumMapGenerator(QThread):
         try:
             precip_data = self.weather_data.get('precipitation', {})
             
+            # Sok pontnál raszter kép; markerek csak a mért (nem interpolált) pontokra
+            if self._add_raster_overlay(map_obj, 'precipitation', precip_data, 'value', 'Blues', "🌧️ Csapadék"):
+                precip_data = self._measured_points(precip_data)
+            
             # Csapadék színskála
             def get_precipitation_color(mm):
                 if mm == 0:
@@ -633,6 +777,10 @@ class FoliumMapGenerator(QThread):
         try:
             wind_data = self.weather_data.get('wind_speed', {})
             
+            # Sok pontnál raszter kép; irány nyilak csak a mért (nem interpolált) pontokra
+            if self._add_raster_overlay(map_obj, 'wind_speed', wind_data, 'speed', 'Greens', "💨 Szél"):
+                wind_data = self._measured_points(wind_data)
+            
             # Szél színskála Beaufort skála alapján
             def get_wind_color(kmh):
                 if kmh < 6:      return '#C0C0C0'  # Szélcsend - Szürke
@@ -644,12 +792,12 @@ class FoliumMapGenerator(QThread):
                 elif kmh < 62:   return '#FF0000'  # Viharos szél - Piros
                 else:            return '#800000'  # Orkán - Sötét piros
             
-            # Szél nyilak hozzáadása
+            # Szél nyilak hozzáadása (irány nélküli - interpolált - pontok kimaradnak)
             for location, data in wind_data.items():
-                if 'coordinates' in data and 'speed' in data:
+                if 'coordinates' in data and 'speed' in data and 'direction' in data:
                     lat, lon = data['coordinates']
                     speed_kmh = data['speed']
-                    direction = data.get('direction', 0)  # fok
+                    direction = data['direction']  # fok
                     
                     # Nyíl méret sebesség alapján
                     arrow_size = max(5, min(15, speed_kmh / 5))
@@ -1067,6 +1215,8 @@ class HungarianMapVisualizer(QWidget):
         # Adatok
         self.counties_gdf = None
         self.current_weather_data = None
+        self.current_choropleth = None  # 🗺️ Megyénkénti statisztikák (WeatherDataBridge.convert_analytics_to_choropleth)
+        self.animation_frames = None  # 🎞️ Betöltött animációs képkockák (RasterFrames)
         
         # 🔧 HTTP SZERVER VERZIÓ: Szerver objektumok
         self.local_server = None
@@ -1295,6 +1445,7 @@ class HungarianMapVisualizer(QWidget):
         """
         self.http_host = host
         self.http_port = port
+        self.map_config.raster_overlay_base_url = f"http://{host}:{port}"
         
         print(f"✅ Local HTTP server ready: http://{host}:{port}")
         
@@ -1371,7 +1522,8 @@ class HungarianMapVisualizer(QWidget):
             config=self.map_config,
             counties_gdf=self.counties_gdf,
             weather_data=self.current_weather_data,
-            bridge_id=self.js_bridge.bridge_id
+            bridge_id=self.js_bridge.bridge_id,
+            choropleth=self.current_choropleth
         )
         
         # Worker signalok
@@ -1470,6 +1622,9 @@ class HungarianMapVisualizer(QWidget):
         🗺️ WebEngine Folium térkép betöltés befejezve - HTTP SZERVER VERZIÓ + REAKTÍV MEGYEHATÁROK.
         """
         if success:
+            # 🎞️ Újragenerált térképen az animációs réteg újratöltése
+            if self.animation_frames is not None:
+                self._inject_animation_frames()
             self.map_ready.emit()
             counties_info = f" ({len(self.counties_gdf)} megye)" if self.counties_gdf is not None else ""
             self.status_label.setText(f"🌐 HTTP szerver interaktív térkép kész!{counties_info} Kattints a megyékre!")
@@ -1573,9 +1728,11 @@ class HungarianMapVisualizer(QWidget):
         
         if file_path:
             try:
-                # HTML fájl másolása
-                import shutil
-                shutil.copy2(self.current_map_file, file_path)
+                # HTML fájl másolása - a helyi szerverről betöltött raszter overlay-ek beágyazásával
+                with open(self.current_map_file, 'r', encoding='utf-8') as source:
+                    html = source.read()
+                with open(file_path, 'w', encoding='utf-8') as target:
+                    target.write(embed_overlay_images(html))
                 
                 self.export_completed.emit(file_path)
                 QMessageBox.information(self, "Export", f"HTTP szerver Folium térkép sikeresen exportálva:\n{file_path}")
@@ -1673,6 +1830,16 @@ class HungarianMapVisualizer(QWidget):
         else:
             print("⚠️ Empty or None counties data received - no map refresh triggered")
     
+    def set_choropleth_data(self, choropleth: Optional[Dict]):
+        """
+        🗺️ Megyénkénti statisztikák a megye réteg színezéséhez.
+        
+        Nem indít újragenerálást - a következő térképgenerálás (pl. set_weather_data) használja.
+        """
+        self.current_choropleth = choropleth
+        if choropleth:
+            print(f"🗺️ Choropleth data set: {choropleth.get('overlay_type')}, {len(choropleth.get('counties', {}))} counties")
+    
     def set_weather_data(self, weather_data: Dict):
         """
         🌤️ 🚀 REAKTÍV JAVÍTÁS: Időjárási adatok beállítása Folium overlay-hez DINAMIKUS SZÍNSKÁLÁVAL + AZONNALI FRISSÍTÉS - HTTP SZERVER VERZIÓ.
@@ -1805,6 +1972,42 @@ class HungarianMapVisualizer(QWidget):
         """
         self.weather_check.setChecked(show)
     
+    # === 🎞️ ANIMÁCIÓS KÉPKOCKÁK ===
+    
+    def load_animation_frames(self, frames) -> bool:
+        """
+        🎞️ Előre számolt képkockák betöltése a térkép kliensbe.
+        
+        A kliens a képkocka fájlt egyszer tölti le a helyi HTTP szerverről;
+        utána show_animation_frame() csak egy indexet küld.
+        
+        Args:
+            frames: RasterFrames (RasterOverlayRenderer.render_frames)
+        """
+        if not self.map_config.raster_overlay_base_url:
+            self.error_occurred.emit("Animáció: a helyi HTTP szerver még nem kész")
+            return False
+        
+        self.animation_frames = frames
+        self._inject_animation_frames()
+        print(f"🎞️ Animation frames loaded: {frames.frame_count} × {frames.width}x{frames.height}")
+        return True
+    
+    def _inject_animation_frames(self):
+        payload = self.animation_frames.client_payload(self.map_config.raster_overlay_base_url,
+                                                       self.map_config.weather_opacity)
+        self.web_view.page().runJavaScript(animation_load_script(payload))
+    
+    def show_animation_frame(self, index: int):
+        """🎞️ Egy nap képkockájának megjelenítése (csak index megy a kliensnek)."""
+        if self.animation_frames is not None:
+            self.web_view.page().runJavaScript(animation_frame_script(index))
+    
+    def clear_animation(self):
+        """🎞️ Animációs réteg eltávolítása."""
+        self.animation_frames = None
+        self.web_view.page().runJavaScript(ANIMATION_CLEAR_SCRIPT)
+    
     def set_selected_county(self, county_name: str):
         """
         🎯 Kiválasztott megye beállítása és térkép frissítése.
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🖼️ Raszteres időjárási overlay - szerveroldali PNG képréteg a Folium térképhez
+
+Több ezer pontos overlay (pl. az összes magyar település interpolált értéke)
+HeatMap/CircleMarker/DivIcon rétegként több ezer DOM/Canvas objektum lenne a
+böngészőben. Itt a pontfelhőt NumPy-jal egy rácsra raszterezzük, a
+térkép gradiens színskálájával kiszínezzük, és egyetlen PNG-be írjuk, amit a
+LocalHttpServerThread szolgál ki - a böngésző egyetlen ImageOverlay képet tölt.
+
+- Normalizált konvolúció: pontok cellákba gyűjtése (np.bincount), majd
+  szeparábilis Gauss simítás az érték- és súlyrácson - O(cellák × kernel),
+  nem függ a pontok számától (KD-fa / scipy nélkül is gyors)
+- Rács Web Mercator sorközökkel: a Leaflet ImageOverlay a képet vetített
+  térben nyújtja ki, így a sorok nem csúsznak el déli/északi irányban
+- Színezés 256 elemű LUT-tal a gradiens töréspontjaiból (np.interp csatornánként)
+- Pontoktól távoli cellák átlátszóak (adaptív maszk a pontsűrűségből)
+- Tartalom-hash alapú fájl cache a kiszolgált temp mappában
+- Animációs képkockák: város × nap mátrix → közös rácsú D × H × W uint8
+  színindex fájl, amit a térkép kliens egyszer tölt le (Uint8Array)
+
+FÁJL: src/gui/raster_overlay.py
+"""
+
+import base64
+import hashlib
+import logging
+import re
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..lazy_imports import lazy_module
+from ..analytics.spatial_interpolation import EARTH_RADIUS_KM, NeighborIndex, project_km
+from ..devtools.tracing import span
+
+# PNG kódolás (Pillow) - nélküle a hívó a pontonkénti rétegekre esik vissza
+PIL_Image = lazy_module("PIL.Image")
+
+logger = logging.getLogger(__name__)
+
+# Kiszolgált mappán belüli alkönyvtár (a LocalHttpServerThread a temp mappát szolgálja ki)
+OVERLAY_DIR_NAME = "weather_overlays"
+
+# Gauss simítás szélessége: a tipikus (medián legközelebbi-szomszéd) pontköz
+# ennyiszerese; a kernel ±KERNEL_SIGMAS szórásig ér, azon túl átlátszó a cella
+SMOOTHING_SPACING_FACTOR = 1.0
+KERNEL_SIGMAS = 3.0
+
+# Keret a pontfelhő befoglaló téglalapja körül (fok)
+BOUNDS_MARGIN_DEG = 0.05
+
+# Legfeljebb ennyi PNG / képkocka fájl marad a cache mappában
+MAX_CACHED_FILES = 64
+
+# Animációs képkockák: ennyi nap simítása egyszerre (memória korlát)
+FRAME_CHUNK_DAYS = 16
+
+# Kvantált képkocka: 0..254 színindex, 255 = átlátszó
+TRANSPARENT_INDEX = 255
+
+
+def _mercator_y(latitudes: np.ndarray) -> np.ndarray:
+    return np.log(np.tan(np.pi / 4.0 + np.radians(latitudes) / 2.0))
+
+
+def overlay_bounds(latitudes: np.ndarray, longitudes: np.ndarray) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+    """Pontfelhő befoglaló téglalapja kerettel: ((dél, nyugat), (észak, kelet))."""
+    return ((float(latitudes.min()) - BOUNDS_MARGIN_DEG, float(longitudes.min()) - BOUNDS_MARGIN_DEG),
+            (float(latitudes.max()) + BOUNDS_MARGIN_DEG, float(longitudes.max()) + BOUNDS_MARGIN_DEG))
+
+
+def _gaussian_blur(grid: np.ndarray, sigma: float) -> np.ndarray:
+    """Szeparábilis Gauss simítás az utolsó két tengelyen, eltolt összeadással (nulla peremmel)."""
+    radius = max(1, int(np.ceil(KERNEL_SIGMAS * sigma)))
+    offsets = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * (offsets / sigma) ** 2).astype(grid.dtype)
+
+    for axis in (-2, -1):
+        length = grid.shape[axis]
+        padding = [(0, 0)] * grid.ndim
+        padding[axis] = (radius, radius)
+        padded = np.pad(grid, padding)
+        blurred = np.zeros_like(grid)
+        for offset, weight in zip(offsets, kernel):
+            start = radius + offset
+            blurred += weight * (padded[..., start:start + length, :] if axis == -2 else padded[..., start:start + length])
+        grid = blurred
+    return grid
+
+
+def gradient_lut(gradient: Dict[float, str], size: int = 256) -> np.ndarray:
+    """
+    Folium gradiens ({0.0: '#RRGGBB', ...}) → (size, 3) uint8 színtábla.
+
+    A töréspontok között csatornánként lineáris interpoláció.
+    """
+    stops = sorted((float(position), color) for position, color in gradient.items())
+    positions = np.array([position for position, _ in stops])
+    rgb = np.array([[int(color.lstrip('#')[i:i + 2], 16) for i in (0, 2, 4)] for _, color in stops], dtype=np.float64)
+
+    samples = np.linspace(0.0, 1.0, size)
+    lut = np.column_stack([np.interp(samples, positions, rgb[:, channel]) for channel in range(3)])
+    return np.round(lut).astype(np.uint8)
+
+
+def colorize(grid: np.ndarray, value_range: Tuple[float, float], lut: np.ndarray) -> np.ndarray:
+    """(H, W) érték rács → (H, W, 4) RGBA kép; a NaN cellák átlátszóak."""
+    vmin, vmax = value_range
+    valid = np.isfinite(grid)
+    normalized = np.clip((np.where(valid, grid, vmin) - vmin) / max(vmax - vmin, 1e-12), 0.0, 1.0)
+    indices = np.round(normalized * (len(lut) - 1)).astype(np.intp)
+
+    rgba = np.zeros(grid.shape + (4,), dtype=np.uint8)
+    rgba[..., :3] = lut[indices]
+    rgba[..., 3] = np.where(valid, 255, 0)
+    return rgba
+
+
+@dataclass
+class _RasterGeometry:
+    """Közös rács geometria: a pontok cellái és a simítás szélessége."""
+    bounds: Tuple[Tuple[float, float], Tuple[float, float]]
+    width: int
+    height: int
+    cells: np.ndarray       # (N,) lapított cella index pontonként
+    sigma: float            # Gauss szórás pixelben
+
+
+@dataclass
+class RasterOverlay:
+    """Kész PNG overlay: fájl + Leaflet bounds ([[dél, nyugat], [észak, kelet]])."""
+    path: Path
+    filename: str
+    bounds: Tuple[Tuple[float, float], Tuple[float, float]]
+    width: int
+    height: int
+    point_count: int
+    cached: bool = False
+
+    def url(self, base_url: Optional[str]) -> str:
+        """HTTP URL a helyi szerveren, vagy a fájl útvonala (a Folium ekkor beágyazza)."""
+        if base_url:
+            return f"{base_url.rstrip('/')}/{OVERLAY_DIR_NAME}/{self.filename}"
+        return str(self.path)
+
+
+@dataclass
+class RasterFrames:
+    """
+    Animációs képkocka sorozat: D × H × W uint8 fájl (színindex, 255 = átlátszó).
+
+    A kliens egyszer tölti le (Uint8Array), a színeket a közös palettából
+    rakja össze - napváltáskor nincs hálózati forgalom és térkép újragenerálás.
+    """
+    path: Path
+    filename: str
+    bounds: Tuple[Tuple[float, float], Tuple[float, float]]
+    width: int
+    height: int
+    dates: List[str]
+    value_range: Tuple[float, float]
+    palette: np.ndarray     # (255, 3) uint8
+    cached: bool = False
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.dates)
+
+    def url(self, base_url: str) -> str:
+        return f"{base_url.rstrip('/')}/{OVERLAY_DIR_NAME}/{self.filename}"
+
+    def client_payload(self, base_url: str, opacity: float) -> Dict[str, Any]:
+        """JSON-képes leíró a térkép kliensnek (a képkockák az URL-ről jönnek)."""
+        return {
+            'url': self.url(base_url),
+            'bounds': [list(corner) for corner in self.bounds],
+            'width': self.width,
+            'height': self.height,
+            'frame_count': self.frame_count,
+            'dates': self.dates,
+            'value_range': list(self.value_range),
+            'palette': self.palette.tolist(),
+            'opacity': opacity,
+        }
+
+
+class RasterOverlayRenderer:
+    """
+    🖼️ Pontfelhő → színezett PNG raszter, tartalom szerinti cache-sel.
+
+    A rács pixelmérete a leghosszabb oldal mentén legfeljebb max_pixels,
+    így az overlay mérete nem függ a pontok számától.
+    """
+
+    def __init__(self, output_dir: Optional[Path] = None, max_pixels: int = 384):
+        self.output_dir = Path(output_dir) if output_dir else Path(tempfile.gettempdir()) / OVERLAY_DIR_NAME
+        self.max_pixels = max_pixels
+        self._lock = threading.Lock()
+        self.renders = 0
+        self.cache_hits = 0
+
+    @property
+    def available(self) -> bool:
+        return PIL_Image.available
+
+    # === RASZTEREZÉS ===
+
+    def _geometry(self, latitudes: np.ndarray, longitudes: np.ndarray, max_pixels: int) -> _RasterGeometry:
+        """Rács méret (Mercator-egyenletes sorok, észak → dél), pont cellák és simítási szélesség."""
+        (south, west), (north, east) = overlay_bounds(latitudes, longitudes)
+
+        y_north, y_south = _mercator_y(np.array([north, south]))
+        x_span = np.radians(east - west)
+        y_span = y_north - y_south
+        scale = max_pixels / max(x_span, y_span)
+        width = max(2, int(round(x_span * scale)))
+        height = max(2, int(round(y_span * scale)))
+
+        # Oszlopok hosszúságban, sorok Mercator y-ban egyenletesek
+        columns = np.clip(((longitudes - west) / (east - west) * width).astype(np.intp), 0, width - 1)
+        rows = np.clip(((y_north - _mercator_y(latitudes)) / y_span * height).astype(np.intp), 0, height - 1)
+
+        # Simítás szélessége pixelben: tipikus pontköz (km) / pixelméret (km)
+        reference_latitude = float(latitudes.mean())
+        pixel_km = np.radians((east - west) / width) * EARTH_RADIUS_KM * np.cos(np.radians(reference_latitude))
+        if len(latitudes) > 1:
+            sample_km = project_km(latitudes, longitudes, reference_latitude)
+            spacing, _ = NeighborIndex(sample_km).query(sample_km, 2)
+            spacing_km = float(np.median(spacing[:, 1]))
+        else:
+            spacing_km = pixel_km
+        sigma = max(1.0, SMOOTHING_SPACING_FACTOR * spacing_km / pixel_km)
+
+        return _RasterGeometry(((south, west), (north, east)), width, height, rows * width + columns, sigma)
+
+    @staticmethod
+    def _smooth_stack(geometry: _RasterGeometry, values: np.ndarray) -> np.ndarray:
+        """
+        (N, D) pontértékek → (D, H, W) float32 rácsok normalizált konvolúcióval.
+
+        A NaN értékű pont-nap kimarad (csak az adott nap súlyából).
+        """
+        cell_count = geometry.width * geometry.height
+        day_count = values.shape[1]
+        points, days = np.nonzero(np.isfinite(values))
+        flat = days * cell_count + geometry.cells[points]
+        shape = (day_count, geometry.height, geometry.width)
+
+        value_sum = np.bincount(flat, weights=values[points, days], minlength=day_count * cell_count)
+        weight_sum = np.bincount(flat, minlength=day_count * cell_count)
+        smoothed_values = _gaussian_blur(value_sum.reshape(shape).astype(np.float32), geometry.sigma)
+        smoothed_weights = _gaussian_blur(weight_sum.reshape(shape).astype(np.float32), geometry.sigma)
+
+        # A kernel hatósugarán belül nincs pont → átlátszó (a kernel súlya ott < exp(-KERNEL_SIGMAS²/2))
+        covered = smoothed_weights > np.exp(-0.5 * KERNEL_SIGMAS ** 2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(covered, smoothed_values / smoothed_weights, np.nan).astype(np.float32)
+
+    def rasterize(self, latitudes: np.ndarray, longitudes: np.ndarray, values: np.ndarray
+                  ) -> Tuple[np.ndarray, Tuple[Tuple[float, float], Tuple[float, float]]]:
+        """
+        Pontok → (H, W) float32 rács Mercator-egyenletes sorokkal (észak → dél).
+
+        Returns:
+            (rács, bounds) - a pontoktól távoli cellák NaN-ok
+        """
+        geometry = self._geometry(latitudes, longitudes, self.max_pixels)
+        return self._smooth_stack(geometry, values[:, np.newaxis])[0], geometry.bounds
+
+    # === PNG RENDERELÉS ===
+
+    @staticmethod
+    def _cache_key(latitudes: np.ndarray, longitudes: np.ndarray, values: np.ndarray,
+                   value_range: Tuple[float, float], gradient: Dict[float, str], max_pixels: int) -> str:
+        digest = hashlib.sha1()
+        for array in (latitudes, longitudes, values):
+            digest.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
+        digest.update(repr((tuple(value_range), sorted(gradient.items()), max_pixels)).encode())
+        return digest.hexdigest()[:20]
+
+    def render(self, points: Dict[str, Dict[str, Any]], value_key: str,
+               value_range: Tuple[float, float], gradient: Dict[float, str]) -> Optional[RasterOverlay]:
+        """
+        Folium weather_data pontjai ({név: {'coordinates': [lat, lon], value_key: ...}}) → PNG overlay.
+
+        Returns:
+            RasterOverlay, vagy None ha nincs elég pont / nincs PNG kódoló
+        """
+        if not self.available:
+            return None
+
+        rows = [
+            (data['coordinates'][0], data['coordinates'][1], data[value_key])
+            for data in points.values()
+            if 'coordinates' in data and data.get(value_key) is not None
+        ]
+        if len(rows) < 3:
+            return None
+
+        table = np.array(rows, dtype=np.float64)
+        table = table[np.isfinite(table).all(axis=1)]
+        if len(table) < 3:
+            return None
+        latitudes, longitudes, values = table[:, 0], table[:, 1], table[:, 2]
+
+        filename = f"{self._cache_key(latitudes, longitudes, values, value_range, gradient, self.max_pixels)}.png"
+        path = self.output_dir / filename
+
+        with self._lock:
+            if path.exists():
+                self.cache_hits += 1
+                with PIL_Image.open(path) as image:
+                    width, height = image.size
+                return RasterOverlay(path, filename, overlay_bounds(latitudes, longitudes),
+                                     width, height, len(values), cached=True)
+
+            with span("folium_generation", "raster_overlay"):
+                grid, bounds = self.rasterize(latitudes, longitudes, values)
+                rgba = colorize(grid, value_range, gradient_lut(gradient))
+
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                temp_path = path.with_suffix(".tmp")
+                PIL_Image.fromarray(rgba, mode="RGBA").save(temp_path, format="PNG", optimize=False)
+                temp_path.replace(path)
+
+            self.renders += 1
+            self._prune()
+
+        logger.debug(f"🖼️ Raster overlay: {len(values)} pont → {grid.shape[1]}x{grid.shape[0]} PNG ({filename})")
+        return RasterOverlay(path, filename, bounds, grid.shape[1], grid.shape[0], len(values))
+
+    # === ANIMÁCIÓS KÉPKOCKÁK ===
+
+    def render_frames(self, latitudes: np.ndarray, longitudes: np.ndarray, values: np.ndarray,
+                      dates: List[str], value_range: Tuple[float, float], gradient: Dict[float, str],
+                      max_pixels: int = 256,
+                      progress_callback: Optional[Callable[[int, int], None]] = None) -> Optional[RasterFrames]:
+        """
+        Város × nap mátrix → kvantált képkocka sorozat egy közös rácson.
+
+        Minden nap ugyanazt a geometriát használja (a városok cellái és a simítás
+        egyszer számolódnak), a napok FRAME_CHUNK_DAYS-es darabokban simulnak.
+
+        Args:
+            values: (C, D) értékek, NaN = hiányzó város-nap
+            progress_callback: (kész napok, összes nap)
+
+        Returns:
+            RasterFrames, vagy None ha kevesebb mint 3 használható város van
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float32)
+        usable = np.isfinite(latitudes) & np.isfinite(longitudes) & np.isfinite(values).any(axis=1)
+        if usable.sum() < 3:
+            return None
+        latitudes, longitudes, values = latitudes[usable], longitudes[usable], values[usable]
+
+        key = self._cache_key(latitudes, longitudes, values, value_range, gradient, max_pixels)
+        digest = hashlib.sha1(key.encode())
+        digest.update("|".join(dates).encode())
+        filename = f"{digest.hexdigest()[:20]}.frames"
+        path = self.output_dir / filename
+
+        geometry = self._geometry(latitudes, longitudes, max_pixels)
+        palette = gradient_lut(gradient, TRANSPARENT_INDEX)
+
+        with self._lock:
+            if path.exists() and path.stat().st_size == len(dates) * geometry.width * geometry.height:
+                self.cache_hits += 1
+                return RasterFrames(path, filename, geometry.bounds, geometry.width, geometry.height,
+                                    list(dates), tuple(value_range), palette, cached=True)
+
+            with span("folium_generation", "raster_frames", days=len(dates)):
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                frames = np.empty((len(dates), geometry.height, geometry.width), dtype=np.uint8)
+                vmin, vmax = value_range
+                for first in range(0, len(dates), FRAME_CHUNK_DAYS):
+                    chunk = self._smooth_stack(geometry, values[:, first:first + FRAME_CHUNK_DAYS])
+                    valid = np.isfinite(chunk)
+                    normalized = np.clip((np.where(valid, chunk, vmin) - vmin) / max(vmax - vmin, 1e-12), 0.0, 1.0)
+                    indices = np.round(normalized * (TRANSPARENT_INDEX - 1)).astype(np.uint8)
+                    frames[first:first + len(chunk)] = np.where(valid, indices, TRANSPARENT_INDEX)
+                    if progress_callback:
+                        progress_callback(min(first + FRAME_CHUNK_DAYS, len(dates)), len(dates))
+
+                temp_path = path.with_suffix(".tmp")
+                frames.tofile(temp_path)
+                temp_path.replace(path)
+
+            self.renders += 1
+            self._prune()
+
+        logger.debug(f"🎞️ Raster képkockák: {len(dates)} nap × {geometry.width}x{geometry.height} ({filename})")
+        return RasterFrames(path, filename, geometry.bounds, geometry.width, geometry.height,
+                            list(dates), tuple(value_range), palette)
+
+    def _prune(self) -> None:
+        """A legrégebbi PNG / képkocka fájlok törlése MAX_CACHED_FILES fölött."""
+        files = sorted((item for pattern in ("*.png", "*.frames") for item in self.output_dir.glob(pattern)),
+                       key=lambda item: item.stat().st_mtime)
+        for stale in files[:-MAX_CACHED_FILES]:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            'available': self.available,
+            'output_dir': str(self.output_dir),
+            'max_pixels': self.max_pixels,
+            'renders': self.renders,
+            'cache_hits': self.cache_hits,
+        }
+
+
+def embed_overlay_images(html: str, overlay_dir: Optional[Path] = None) -> str:
+    """
+    A helyi szerverre mutató overlay URL-ek cseréje base64 data URI-ra.
+
+    Exportnál kell: a kimásolt HTML a program bezárása után is önálló legyen.
+    """
+    overlay_dir = Path(overlay_dir) if overlay_dir else Path(tempfile.gettempdir()) / OVERLAY_DIR_NAME
+    pattern = re.compile(rf"https?://[^\s\"']+/{OVERLAY_DIR_NAME}/([0-9a-f]+\.png)")
+
+    def _data_uri(match: "re.Match[str]") -> str:
+        path = overlay_dir / match.group(1)
+        if not path.exists():
+            return match.group(0)
+        return "data:image/png;base64," + base64.b64encode(path.read_bytes()).decode("ascii")
+
+    return pattern.sub(_data_uri, html)
+
+
+# === SINGLETON ===
+
+_raster_overlay_renderer: Optional[RasterOverlayRenderer] = None
+_raster_overlay_renderer_lock = threading.Lock()
+
+
+def get_raster_overlay_renderer() -> RasterOverlayRenderer:
+    """Globális RasterOverlayRenderer példány."""
+    global _raster_overlay_renderer
+    with _raster_overlay_renderer_lock:
+        if _raster_overlay_renderer is None:
+            _raster_overlay_renderer = RasterOverlayRenderer()
+        return _raster_overlay_renderer
@@ -20,9 +20,10 @@ Anomáliák és rekordok kezelése élethű széllökés értékekkel.
 """
 
 import logging
+import re
 from typing import Optional, Dict, Any, List, Union, Tuple
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, QSplitter,
@@ -33,9 +34,11 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtGui import QFont
 
-from ...config import GUIConfig
+from ...config import GUIConfig, ExtremeValueConfig
+from ...analytics.extreme_value import analyze_return_levels
 from ..utils import GUIConstants, AnomalyConstants  # AnomalyConstants a fő utils.py-ból
 from ..theme_manager import get_theme_manager, register_widget_for_theming
+from ..workers.task_scheduler import TaskHandle, TaskPriority, get_task_scheduler
 from .utils import WindGustsConstants, DataFrameExtractor, WindGustsAnalyzer
 
 # Logging konfigurálása
@@ -61,6 +64,8 @@ class ExtremeEventsTab(QWidget):
     """
     
     extreme_weather_requested = Signal()
+    return_levels_ready = Signal(int, list)  # generáció, táblázat sorok (háttér számításból)
+    hourly_window_requested = Signal(str, str)  # 🌪️ lefúrás: ablak kezdete, vége (YYYY-MM-DD)
     
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
@@ -73,10 +78,16 @@ class ExtremeEventsTab(QWidget):
         self.wind_anomaly: Optional[QLabel] = None
         self.records_text: Optional[QTextEdit] = None
         self.extreme_table: Optional[QTableWidget] = None
+        self.return_level_table: Optional[QTableWidget] = None
+        self.return_level_note: Optional[QLabel] = None
+        self._return_level_generation = 0
+        self.hourly_table: Optional[QTableWidget] = None
+        self.hourly_summary: Optional[QLabel] = None
         self.period_type: str = "daily"  # Alapértelmezett: napi rekordok
         
         self._init_ui()
         self._register_widgets_for_theming()
+        self.return_levels_ready.connect(self._on_return_levels_ready)
         
         logger.info("ExtremeEventsTab Dict[List] adatformátum támogatással inicializálva")
     
@@ -100,6 +111,12 @@ class ExtremeEventsTab(QWidget):
         self.records_section = self._create_records_section()
         layout.addWidget(self.records_section)
         
+        self.return_level_section = self._create_return_level_section()
+        layout.addWidget(self.return_level_section)
+        
+        self.hourly_section = self._create_hourly_section()
+        layout.addWidget(self.hourly_section)
+        
         actions_section = self._create_actions_section()
         layout.addWidget(actions_section)
         
@@ -154,6 +171,52 @@ class ExtremeEventsTab(QWidget):
         
         return section
     
+    def _create_return_level_section(self) -> QGroupBox:
+        """Visszatérési szintek szekció - GEV illesztés éves maximumokra."""
+        section = QGroupBox("📈 Visszatérési Szintek (GEV, éves maximumok)")
+        layout = QVBoxLayout(section)
+        
+        periods = ExtremeValueConfig.RETURN_PERIODS
+        table = QTableWidget()
+        table.setColumnCount(len(periods) + 1)
+        table.setHorizontalHeaderLabels(["📊 Változó"] + [f"{period} év" for period in periods])
+        table.setAlternatingRowColors(True)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        table.setMinimumHeight(110)
+        self.return_level_table = table
+        layout.addWidget(table)
+        
+        self.return_level_note = QLabel(
+            f"ℹ️ Legalább {ExtremeValueConfig.MIN_YEARS} teljes év szükséges; "
+            f"zárójelben a {ExtremeValueConfig.CONFIDENCE:.0%}-os bootstrap intervallum."
+        )
+        self.return_level_note.setWordWrap(True)
+        layout.addWidget(self.return_level_note)
+        
+        return section
+    
+    def _create_hourly_section(self) -> QGroupBox:
+        """Óránkénti lefúrás szekció - dupla kattintás egy rekord napra tölti be."""
+        section = QGroupBox("🕐 Óránkénti Lefúrás")
+        layout = QVBoxLayout(section)
+        
+        self.hourly_summary = QLabel("ℹ️ Dupla kattintás egy rekord napra: óránkénti széllökés / szélsebesség.")
+        self.hourly_summary.setWordWrap(True)
+        layout.addWidget(self.hourly_summary)
+        
+        self.hourly_table = QTableWidget()
+        self.hourly_table.setColumnCount(3)
+        self.hourly_table.setHorizontalHeaderLabels(["🕐 Időpont", "🌪️ Széllökés (km/h)", "💨 Szélsebesség (km/h)"])
+        self.hourly_table.setAlternatingRowColors(True)
+        self.hourly_table.verticalHeader().setVisible(False)
+        self.hourly_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.hourly_table.setMinimumHeight(160)
+        self.hourly_table.setVisible(False)
+        layout.addWidget(self.hourly_table)
+        
+        return section
+    
     def _create_period_selection_group(self) -> QGroupBox:
         """Periódus kiválasztó widget létrehozása - INTELLIGENS IDŐSZAK VÁLASZTÁS."""
         period_group = QGroupBox("📅 Időszak típusa")
@@ -211,6 +274,8 @@ class ExtremeEventsTab(QWidget):
         header.setSectionResizeMode(3, QHeaderView.Stretch)           # Dátum
         
         table.setMinimumHeight(200)
+        table.setToolTip("Dupla kattintás: óránkénti lefúrás a rekord napjára")
+        table.cellDoubleClicked.connect(self._on_extreme_row_double_clicked)
         
         return table
     
@@ -278,6 +343,7 @@ class ExtremeEventsTab(QWidget):
         register_widget_for_theming(self, "container")
         register_widget_for_theming(self.anomaly_section, "container")
         register_widget_for_theming(self.records_section, "container")
+        register_widget_for_theming(self.return_level_section, "container")
         register_widget_for_theming(self.title_label, "text")
         register_widget_for_theming(self.records_text, "input")
         register_widget_for_theming(self.detailed_btn, "button")
@@ -286,6 +352,11 @@ class ExtremeEventsTab(QWidget):
         # ÚJ: Táblázat és radio button-ok regisztrálása
         if hasattr(self, 'extreme_table') and self.extreme_table:
             register_widget_for_theming(self.extreme_table, "table")
+        if self.return_level_table:
+            register_widget_for_theming(self.return_level_table, "table")
+        if self.hourly_table:
+            register_widget_for_theming(self.hourly_section, "container")
+            register_widget_for_theming(self.hourly_table, "table")
         if hasattr(self, 'daily_radio') and self.daily_radio:
             register_widget_for_theming(self.daily_radio, "chart")
         if hasattr(self, 'monthly_radio') and self.monthly_radio:
@@ -329,6 +400,7 @@ class ExtremeEventsTab(QWidget):
             self._detect_anomalies_from_dict(daily_data)
             self._find_records_from_dict(daily_data, dates)
             self._calculate_extremes()  # ÚJ: Táblázatos rekordok számítása
+            self._calculate_return_levels(daily_data, dates)
             
             logger.info("✅ ExtremeEventsTab update_data SIKERES! (Dict[List] formátum)")
             
@@ -617,6 +689,138 @@ class ExtremeEventsTab(QWidget):
             logger.error(f"Széllökés rekordok hiba: {e}")
             return f"🌪️ SZÉLLÖKÉS REKORDOK: Hiba a számítás során\n\n"
     
+    RETURN_LEVEL_VARIABLES = [
+        ("precipitation_sum", "🌧️ Napi csapadék", "mm"),
+        ("wind_gusts_max", "🌪️ Széllökés", "km/h"),
+        ("temperature_2m_max", "🌡️ Maximum hőmérséklet", "°C"),
+    ]
+    
+    def _calculate_return_levels(self, daily_data: Dict[str, List], dates: List[str]) -> None:
+        """
+        📈 Visszatérési szintek a napi csapadékra, széllökésre és maximum hőmérsékletre.
+        
+        Az éves maximumokra illesztett GEV (bootstrap intervallummal) a közös
+        TaskScheduler poolján fut - latest-wins: új adat megszakítja az előző számítást,
+        a táblázat a return_levels_ready signalon érkezik.
+        """
+        if not self.return_level_table:
+            return
+        
+        self._return_level_generation += 1
+        generation = self._return_level_generation
+        self.return_level_table.setRowCount(0)
+        if self.return_level_note:
+            self.return_level_note.setText("⏳ Visszatérési szintek számítása a háttérben...")
+        
+        # A napi listák másolata - a háttérszál nem olvassa a később cserélt current_data-t
+        inputs = [(daily_data.get(key, []), label, unit) for key, label, unit in self.RETURN_LEVEL_VARIABLES]
+        inputs = [(list(values), label, unit) for values, label, unit in inputs
+                  if values and len(values) == len(dates)]
+        dates = list(dates)
+        handle_holder: Dict[str, TaskHandle] = {}
+        
+        def compute() -> None:
+            rows = []
+            try:
+                day_axis = pd.to_datetime(dates).values.astype("datetime64[D]")
+                for values, label, unit in inputs:
+                    if handle_holder["handle"].is_cancelled():
+                        return
+                    series = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float)
+                    result = analyze_return_levels(series, day_axis, locations=[label])
+                    if not result.methods[0]:
+                        continue
+                    cells = []
+                    for column, level in enumerate(result.levels[0]):
+                        text = f"{level:.1f} {unit}"
+                        if result.lower is not None and pd.notna(result.lower[0, column]):
+                            text += f" ({result.lower[0, column]:.1f}–{result.upper[0, column]:.1f})"
+                        cells.append(text)
+                    rows.append((f"{label} [{int(result.sample_years[0])} év]", cells))
+            except Exception as e:
+                logger.error(f"Visszatérési szint számítási hiba: {e}")
+                rows = []
+            if not handle_holder["handle"].is_cancelled():
+                self.return_levels_ready.emit(generation, rows)
+        
+        handle_holder["handle"] = get_task_scheduler().submit(
+            compute,
+            name="return_levels",
+            priority=TaskPriority.ANALYSIS,
+            group="extreme_return_levels"
+        )
+    
+    def _on_return_levels_ready(self, generation: int, rows: list) -> None:
+        """Visszatérési szint táblázat kitöltése (GUI szál) - elavult eredmény eldobva."""
+        if generation != self._return_level_generation or not self.return_level_table:
+            return
+        
+        self.return_level_table.setRowCount(len(rows))
+        for row, (label, cells) in enumerate(rows):
+            self.return_level_table.setItem(row, 0, QTableWidgetItem(label))
+            for column, text in enumerate(cells, start=1):
+                self.return_level_table.setItem(row, column, QTableWidgetItem(text))
+        
+        if self.return_level_note and not rows:
+            self.return_level_note.setText(
+                f"ℹ️ Visszatérési szintekhez legalább {ExtremeValueConfig.MIN_YEARS} teljes év adata szükséges."
+            )
+        elif self.return_level_note:
+            self.return_level_note.setText(
+                f"ℹ️ GEV illesztés éves maximumokra; zárójelben a "
+                f"{ExtremeValueConfig.CONFIDENCE:.0%}-os bootstrap intervallum."
+            )
+    
+    def _on_extreme_row_double_clicked(self, row: int, column: int) -> None:
+        """🌪️ Rekord nap lefúrása: a nap ± 1 nap óránkénti ablakának kérése."""
+        item = self.extreme_table.item(row, 3) if self.extreme_table else None
+        match = re.search(r"\d{4}-\d{2}-\d{2}", item.text()) if item else None
+        if not match:
+            if self.hourly_summary:
+                self.hourly_summary.setText("ℹ️ Óránkénti lefúrás csak konkrét napra (napi rekordok) kérhető.")
+            return
+        
+        day = datetime.strptime(match.group(0), "%Y-%m-%d")
+        start_date = (day - timedelta(days=1)).strftime("%Y-%m-%d")
+        end_date = (day + timedelta(days=1)).strftime("%Y-%m-%d")
+        if self.hourly_summary:
+            self.hourly_summary.setText(f"⏳ Óránkénti adatok betöltése: {start_date} → {end_date}...")
+        logger.info(f"🌪️ Óránkénti lefúrás kérve: {match.group(0)}")
+        self.hourly_window_requested.emit(start_date, end_date)
+    
+    def show_hourly_window(self, data: Dict[str, Any]) -> None:
+        """
+        🌪️ Lefúrási óránkénti ablak megjelenítése (AppController.hourly_data_ready).
+        
+        Args:
+            data: {"hourly": {"time", "wind_gusts_10m", "windspeed_10m"}, "start_date", "end_date", ...}
+        """
+        if not self.hourly_table:
+            return
+        
+        hourly = data.get("hourly", {}) or {}
+        times = hourly.get("time", [])
+        gusts = hourly.get("wind_gusts_10m") or [None] * len(times)
+        speeds = hourly.get("windspeed_10m") or [None] * len(times)
+        
+        self.hourly_table.setRowCount(len(times))
+        for row, (time_text, gust, speed) in enumerate(zip(times, gusts, speeds)):
+            self.hourly_table.setItem(row, 0, QTableWidgetItem(str(time_text).replace("T", " ")))
+            self.hourly_table.setItem(row, 1, QTableWidgetItem("-" if gust is None else f"{gust:.1f}"))
+            self.hourly_table.setItem(row, 2, QTableWidgetItem("-" if speed is None else f"{speed:.1f}"))
+        self.hourly_table.setVisible(bool(times))
+        
+        valid = [(gust, time_text) for gust, time_text in zip(gusts, times) if gust is not None]
+        if self.hourly_summary:
+            if valid:
+                peak, peak_time = max(valid)
+                self.hourly_summary.setText(
+                    f"🌪️ {data.get('start_date')} → {data.get('end_date')}: legerősebb széllökés "
+                    f"{peak:.1f} km/h ({str(peak_time).replace('T', ' ')}) - forrás: {data.get('provider', '?')}"
+                )
+            else:
+                self.hourly_summary.setText("❌ Nincs óránkénti széllökés adat a kiválasztott ablakra.")
+    
     def _clear_extremes(self) -> None:
         """Extrém események törlése."""
         self._set_anomaly_status_with_theme(self.temp_anomaly, "🌡️ Hőmérséklet: -", "disabled")
@@ -628,6 +832,11 @@ class ExtremeEventsTab(QWidget):
         
         if self.extreme_table:
             self.extreme_table.setRowCount(0)
+        
+        if self.return_level_table:
+            self._return_level_generation += 1  # futó számítás eredménye eldobva
+            get_task_scheduler().cancel_group("extreme_return_levels")
+            self.return_level_table.setRowCount(0)
     
     def _on_period_type_changed(self) -> None:
         """Periódus típus változásának kezelése - FELHASZNÁLÓI VÁLASZTÁS KÖVETÉSE."""
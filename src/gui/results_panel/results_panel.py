@@ -7,6 +7,7 @@ MVC kompatibilis eredmények megjelenítő fő panel.
 🎨 KRITIKUS JAVÍTÁS: ColorPalette API integráció - scheme.border → scheme.get_color("info", "light")
 🌪️ WIND GUSTS TÁMOGATÁS: Minden tab frissítve élethű széllökés kezelésre.
 🔧 MODULÁRIS BONTÁS: chart_widgets.py → chart_container.py import frissítés
+🚩 LUSTA FRISSÍTÉS: Dirty-flag alapú tab frissítés - csak a látható tab számol azonnal
 
 🚀 PROFESSZIONÁLIS KÓDOLÁSI ELVEK:
 ✅ DRY: Közös utility osztályok használata
@@ -29,6 +30,7 @@ from PySide6.QtGui import QFont
 
 from ...config import GUIConfig
 from ..theme_manager import get_theme_manager, register_widget_for_theming
+from ..lazy_tab_refresher import LazyTabRefresher
 from .quick_overview_tab import QuickOverviewTab
 from .detailed_charts_tab import DetailedChartsTab
 from .data_table_tab import DataTableTab
@@ -56,6 +58,7 @@ class ResultsPanel(QWidget):
     
     # === KIMENŐ SIGNALOK ===
     extreme_weather_requested = Signal()
+    hourly_window_requested = Signal(str, str)  # 🌪️ óránkénti lefúrás ablaka (kezdet, vég)
     export_requested = Signal(str)
     chart_type_changed = Signal(str)
     
@@ -79,6 +82,9 @@ class ResultsPanel(QWidget):
         self.table_tab: Optional[DataTableTab] = None
         self.extreme_tab: Optional[ExtremeEventsTab] = None
         
+        # === LUSTA TAB FRISSÍTÉS (dirty flag + látható/idle számítás) ===
+        self.tab_refresher = LazyTabRefresher(self)
+        
         # === UI INICIALIZÁLÁSA ===
         self._init_ui()
         self._connect_internal_signals()
@@ -133,8 +139,34 @@ class ResultsPanel(QWidget):
         
         layout.addWidget(self.tab_widget)
         
+        self._register_tab_consumers()
+        
         logger.debug("ResultsPanel._init_ui() BEFEJEZVE")
     
+    def _register_tab_consumers(self) -> None:
+        """Tabok regisztrálása lusta fogyasztóként (tab index sorrendben)."""
+        self.tab_refresher.register(
+            "overview", self.overview_tab, self._refresh_overview_tab, self.overview_tab._clear_stats
+        )
+        self.tab_refresher.register(
+            "charts", self.charts_tab, self.charts_tab.update_data, self.charts_tab.clear_data
+        )
+        self.tab_refresher.register(
+            "table", self.table_tab, self.table_tab.update_data, self.table_tab.clear_data
+        )
+        self.tab_refresher.register(
+            "extreme", self.extreme_tab, self.extreme_tab.update_data, self.extreme_tab._clear_extremes
+        )
+    
+    def _refresh_overview_tab(self, data: Dict[str, Any]) -> None:
+        """QuickOverviewTab frissítése az aktuális városnévvel."""
+        self.overview_tab.update_data(data, self.current_city)
+    
+    def update_hourly_window(self, data: Dict[str, Any]) -> None:
+        """🌪️ Óránkénti lefúrási ablak továbbítása az extrém események tabnak."""
+        if self.extreme_tab:
+            self.extreme_tab.show_hourly_window(data)
+    
     def _register_widgets_for_theming(self) -> None:
         """Widget-ek regisztrálása ThemeManager-hez."""
         register_widget_for_theming(self, "container")
@@ -148,6 +180,7 @@ class ResultsPanel(QWidget):
         """Belső signal-slot kapcsolatok."""
         if self.extreme_tab:
             self.extreme_tab.extreme_weather_requested.connect(self.extreme_weather_requested.emit)
+            self.extreme_tab.hourly_window_requested.connect(self.hourly_window_requested.emit)
         
         if self.table_tab:
             if self.table_tab.csv_btn:
@@ -226,6 +259,8 @@ class ResultsPanel(QWidget):
         """
         Adatok frissítése új időjárási adatokkal.
         🌪️ WIND GUSTS TÁMOGATÁS: Minden tab frissítve élethű széllökés kezelésre.
+        🚩 LUSTA FRISSÍTÉS: A tabok csak piszkosnak jelölődnek - a látható tab azonnal,
+        a többi tab megjelenéskor vagy üresjárati időben számol.
         
         Args:
             data: OpenMeteo API válasz
@@ -237,25 +272,11 @@ class ResultsPanel(QWidget):
             self.current_data = data
             self.current_city = city_name
             
-            # === TAB FRISSÍTÉSEK ===
-            if self.overview_tab:
-                logger.debug("QuickOverviewTab frissítése (ColorPalette API + WIND GUSTS)...")
-                self.overview_tab.update_data(data, city_name)
-            
-            if self.charts_tab:
-                logger.debug("DetailedChartsTab frissítése...")
-                self.charts_tab.update_data(data)
-            
-            if self.table_tab:
-                logger.debug("DataTableTab frissítése...")
-                self.table_tab.update_data(data)
+            # === TAB FRISSÍTÉSEK (LUSTA) ===
+            # Minden tab piszkos lesz; az előző adat még el nem indult munkája eldobásra kerül
+            self.tab_refresher.set_data(data)
             
-            # 🌪️ KRITIKUS JAVÍTÁS: EXTRÉM ESEMÉNYEK TAB WIND GUSTS TÁMOGATÁSSAL
-            if self.extreme_tab:
-                logger.debug("ExtremeEventsTab frissítése (ColorPalette API + WIND GUSTS)...")
-                self.extreme_tab.update_data(data)
-            
-            logger.info("ResultsPanel.update_data() ÖSSZES TAB FRISSÍTÉSE SIKERES! (ColorPalette API + WIND GUSTS)")
+            logger.info(f"ResultsPanel.update_data() - tabok piszkosnak jelölve (gen {self.tab_refresher.generation}, aktív: {self.get_current_tab()})")
             
         except Exception as e:
             logger.error(f"ResultsPanel adatfrissítési hiba: {e}")
@@ -268,17 +289,8 @@ class ResultsPanel(QWidget):
         self.current_data = None
         self.current_city = None
         
-        if self.overview_tab:
-            self.overview_tab._clear_stats()
-        
-        if self.charts_tab:
-            self.charts_tab.clear_data()
-        
-        if self.table_tab:
-            self.table_tab.clear_data()
-        
-        if self.extreme_tab:
-            self.extreme_tab._clear_extremes()
+        # Függő lusta frissítések eldobása + minden tab törlése
+        self.tab_refresher.clear()
         
         logger.debug("ResultsPanel.clear_data() BEFEJEZVE")
     
@@ -330,12 +342,14 @@ class ResultsPanel(QWidget):
     def get_charts_container(self) -> Optional[object]:
         """Charts container referenciájának lekérdezése."""
         if self.charts_tab:
+            self.tab_refresher.ensure_fresh("charts")
             return self.charts_tab.charts_container
         return None
     
     def get_data_table(self) -> Optional[object]:
         """Data table referenciájának lekérdezése."""
         if self.table_tab:
+            self.tab_refresher.ensure_fresh("table")
             return self.table_tab.data_table
         return None
     
@@ -60,28 +60,44 @@ from PySide6.QtWidgets import (
     QPushButton, QProgressBar, QFrame, QSplitter, QScrollArea,
     QGridLayout, QSizePolicy
 )
-from PySide6.QtCore import Qt, Signal, QThread, QTimer, QObject, QSize
+from PySide6.QtCore import Qt, Signal, QTimer, QObject, QSize
 from PySide6.QtGui import QFont, QPalette, QColor
-from PySide6.QtWebEngineWidgets import QWebEngineView
+
+# 🚀 Nehéz könyvtárak lusta betöltése (első használatkor importálódnak)
+from ..lazy_imports import lazy_module, lazy_attribute
+
+# Web megjelenítés (QtWebEngine - Chromium)
+QWebEngineView = lazy_attribute("PySide6.QtWebEngineWidgets", "QWebEngineView")
 
 # Scientific computing
-from scipy import stats
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score
+stats = lazy_module("scipy.stats")
+LinearRegression = lazy_attribute("sklearn.linear_model", "LinearRegression")
+r2_score = lazy_attribute("sklearn.metrics", "r2_score")
 
 # Interactive plotting
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import plotly.io as pio
+go = lazy_module("plotly.graph_objects")
+px = lazy_module("plotly.express")
+make_subplots = lazy_attribute("plotly.subplots", "make_subplots")
+pio = lazy_module("plotly.io")
 
 # Project imports - FRISSÍTETT INTEGRÁCIÓ
 from ..data.weather_client import WeatherClient
+from ..data.weather_columns import WeatherColumns
+from ..data.climate_archive import get_climate_archive
+from ..analytics.climate_indices import INDEX_DEFINITIONS, get_climate_index_engine
+from ..config import ClimateIndexConfig
 from .theme_manager import ThemeManager
+from .workers.task_scheduler import TaskHandle, TaskPriority, get_task_scheduler
+from ..devtools.tracing import span, analysis
 
 # Logging beállítás
 logger = logging.getLogger(__name__)
 
+# 📏 ETCCDI klímaindexek trend paraméterként (mentett indexkészletekből, éves pontokkal)
+CLIMATE_INDEX_PARAMETERS = {
+    f"📏 {description} ({index})": index for index, (description, _, _) in INDEX_DEFINITIONS.items()
+}
+
 
 class TrendDataProcessor(QObject):
     """
@@ -113,6 +129,9 @@ class TrendDataProcessor(QObject):
         self.city_manager = CityManager()  # 🌍 GLOBÁLIS városkezelő (magyar + nemzetközi)
         self.weather_client = WeatherClient(preferred_provider="auto")
         
+        # 🗄️ Magyar települések klíma archívuma (memmap, inkrementálisan töltve)
+        self.climate_archive = get_climate_archive(self.city_manager.hungarian_db_path)
+        
         # 🔥 TREND PARAMETER MAPPING (API mezők)
         self.trend_parameters = {
             "🥶 Minimum hőmérséklet": "temperature_2m_min",
@@ -168,6 +187,14 @@ class TrendDataProcessor(QObject):
             return None
     
     def fetch_trend_data(self, settlement_name: str, parameter: str, time_range: str) -> None:
+        """Trend lekérdezés egy tracing elemzés határon belül (lásd _fetch_trend_data)."""
+        with analysis(f"trend {settlement_name} · {parameter} · {time_range}"):
+            if parameter in CLIMATE_INDEX_PARAMETERS:
+                self._fetch_index_trend(settlement_name, parameter, time_range)
+            else:
+                self._fetch_trend_data(settlement_name, parameter, time_range)
+    
+    def _fetch_trend_data(self, settlement_name: str, parameter: str, time_range: str) -> None:
         """
         🔥 TREND ADATOK LEKÉRDEZÉSE API-VAL (háttérszálban)
         
@@ -187,6 +214,7 @@ class TrendDataProcessor(QObject):
                 return
             
             lat, lon = coordinates
+            settlement_id = self.climate_archive.settlement_id_for_name(settlement_name) if self.climate_archive else None
             self.progress_updated.emit(20)
             
             # 2. Időtartam számítása
@@ -205,7 +233,7 @@ class TrendDataProcessor(QObject):
             
             try:
                 # Évenkénti batch-ek létrehozása (WeatherClient 1 éves limit miatt)
-                weather_data = []
+                weather_parts = []
                 current_start = start_date
                 batch_count = 0
                 total_batches = years
@@ -225,17 +253,19 @@ class TrendDataProcessor(QObject):
                     # 🔥 KRITIKUS JAVÍTÁS v4.2: EGYSÉGES API - weather_client hívás egyszerűsítve
                     try:
                         # ✅ EGYSZERŰSÍTETT KÓD v4.2: MINDIG List[Dict] visszatérés
-                        yearly_data = self.weather_client.get_weather_data(
-                            lat, lon, current_start_str, current_end_str
+                        yearly_data = self._fetch_weather_range(
+                            settlement_id, lat, lon, current_start_str, current_end_str
                         )
                         
                         # Source kinyerése az első rekordból (data_source minden rekordba beépítve)
                         source = "unknown"
-                        if yearly_data and isinstance(yearly_data, list) and len(yearly_data) > 0:
+                        if isinstance(yearly_data, WeatherColumns):
+                            source = yearly_data.data_source
+                        elif yearly_data and isinstance(yearly_data, list) and len(yearly_data) > 0:
                             source = yearly_data[0].get('data_source', 'weather_api')
                         
                         if yearly_data:
-                            weather_data.extend(yearly_data)
+                            weather_parts.append(yearly_data)
                             logger.info(f"✅ Batch {batch_count + 1} sikeres: {len(yearly_data)} nap ({source})")
                         else:
                             logger.warning(f"⚠️ Batch {batch_count + 1} üres adattal")
@@ -252,6 +282,12 @@ class TrendDataProcessor(QObject):
                     progress = 30 + int((batch_count / total_batches) * 30)  # 30-60%
                     self.progress_updated.emit(progress)
                 
+                # ⚡ Oszlopos batch-ek összefűzése rekord dict-ek nélkül
+                if weather_parts and all(isinstance(part, WeatherColumns) for part in weather_parts):
+                    weather_data = WeatherColumns.concat(weather_parts)
+                else:
+                    weather_data = [record for part in weather_parts for record in part]
+                
                 logger.info(f"✅ Multi-year API hívás befejezve: {len(weather_data)} nap összesen")
                 self.progress_updated.emit(60)
                 
@@ -274,9 +310,10 @@ class TrendDataProcessor(QObject):
             self.progress_updated.emit(70)
             
             # 5. Trend számítás végrehajtása
-            trend_results = self.calculate_trend_statistics(
-                weather_data, api_field, settlement_name, parameter, time_range, years
-            )
+            with span("statistics", "trend_statistics", years=years):
+                trend_results = self.calculate_trend_statistics(
+                    weather_data, api_field, settlement_name, parameter, time_range, years
+                )
             
             self.progress_updated.emit(90)
             
@@ -293,6 +330,146 @@ class TrendDataProcessor(QObject):
             logger.error(f"❌ KRITIKUS HIBA trend lekérdezésnél: {e}")
             self.error_occurred.emit(f"Kritikus hiba: {str(e)}")
     
+    def _fetch_weather_range(self, settlement_id: Optional[int], lat: float, lon: float,
+                             start_date: str, end_date: str) -> Any:
+        """
+        Egy időszak napi adatai - magyar településnél a klíma archívumon keresztül.
+        
+        🗄️ Az archivált napok memmap szeletből jönnek, csak a hiányzó darabok mennek a providerhez.
+        """
+        def fetch(start: str, end: str) -> Any:
+            return self.weather_client.get_weather_data(lat, lon, start, end)
+        
+        if settlement_id is not None and self.climate_archive is not None:
+            return self.climate_archive.read_through(settlement_id, start_date, end_date, fetch)
+        return fetch(start_date, end_date)
+    
+    def _fetch_index_trend(self, settlement_name: str, parameter: str, time_range: str) -> None:
+        """
+        📏 KLÍMAINDEX TREND mentett indexkészletből (nincs hálózati lekérés)
+        
+        A legutóbb mentett, a települést tartalmazó készlet éves sorát olvassa,
+        az időtartam utolsó éveire vágva.
+        """
+        try:
+            self.progress_updated.emit(10)
+            index = CLIMATE_INDEX_PARAMETERS[parameter]
+            
+            settlement_id = self.climate_archive.settlement_id_for_name(settlement_name) if self.climate_archive else None
+            if settlement_id is None:
+                self.error_occurred.emit(f"Klímaindex csak magyar településre érhető el: {settlement_name}")
+                return
+            
+            found = get_climate_index_engine().latest_containing(settlement_id, index)
+            if found is None:
+                self.error_occurred.emit(f"Nincs mentett {index} klímaindex készlet: {settlement_name} "
+                                         "(előbb számold ki a régióra)")
+                return
+            set_name, result = found
+            self.progress_updated.emit(50)
+            
+            years = self.time_ranges.get(time_range, 5)
+            values = result.settlement_values(index, settlement_id).astype(np.float64)
+            keep = (result.years > result.years.max() - years) & np.isfinite(values)
+            
+            with span("statistics", "index_trend_statistics", years=years):
+                trend_results = self.calculate_index_trend_statistics(
+                    result.years[keep], values[keep], index, settlement_name, parameter, time_range, years
+                )
+            self.progress_updated.emit(90)
+            
+            if trend_results:
+                trend_results['data_source'] = f"klímaindex: {set_name}"
+                self.data_received.emit(trend_results)
+                logger.info(f"🎉 INDEX TREND COMPLETE: {settlement_name} {index} ({set_name})")
+            else:
+                self.error_occurred.emit(f"Túl kevés érvényes év a {index} trendhez "
+                                         f"(min. {ClimateIndexConfig.MIN_TREND_YEARS})")
+            
+            self.progress_updated.emit(100)
+            
+        except Exception as e:
+            logger.error(f"❌ Klímaindex trend hiba: {e}")
+            self.error_occurred.emit(f"Klímaindex trend hiba: {str(e)}")
+    
+    def calculate_index_trend_statistics(self, years: np.ndarray, values: np.ndarray, index: str,
+                                         settlement_name: str, parameter: str, time_range: str,
+                                         span_years: int) -> Optional[Dict]:
+        """
+        📏 Éves klímaindex sor lineáris trendje (a havi trenddel azonos eredmény formátum).
+        
+        Returns:
+            Trend eredmények dictionary vagy None, ha kevés az érvényes év
+        """
+        if len(values) < ClimateIndexConfig.MIN_TREND_YEARS:
+            return None
+        
+        x = years.astype(np.float64)
+        slope, intercept = np.polyfit(x, values, 1)
+        y_pred = slope * x + intercept
+        residual = float(np.sum((values - y_pred) ** 2))
+        total = float(np.sum((values - values.mean()) ** 2))
+        r2 = 1.0 - residual / total if total > 0 else 0.0
+        
+        n = len(values)
+        y_err = np.sqrt(residual / (n - 2))
+        try:
+            p_value = float(stats.linregress(x, values).pvalue)
+            t_val = stats.t.ppf(0.975, n - 2)
+        except Exception as stats_error:
+            logger.error(f"❌ Index trend szignifikancia hiba: {stats_error}")
+            p_value, t_val = 0.5, 2.0
+        conf_interval = t_val * y_err * np.sqrt(1 + 1 / n + (x - x.mean()) ** 2 / np.sum((x - x.mean()) ** 2))
+        
+        if p_value < 0.001:
+            significance = "Nagyon szignifikáns"
+        elif p_value < 0.01:
+            significance = "Szignifikáns"
+        elif p_value < 0.05:
+            significance = "Mérsékelt szignifikáns"
+        else:
+            significance = "Nem szignifikáns"
+        
+        dates = [datetime(int(year), 1, 1) for year in years]
+        return {
+            'settlement_name': settlement_name,
+            'parameter': parameter,
+            'time_range': time_range,
+            'api_field': index,
+            'years': span_years,
+            'unit': INDEX_DEFINITIONS[index][1],
+            'series_label': 'Éves index',
+            'point_summary': f"{n} év",
+            'r_squared': float(r2),
+            'trend_per_decade': float(slope * 10),
+            'p_value': p_value,
+            'slope': float(slope),
+            'intercept': float(intercept),
+            'std_error': float(y_err),
+            'statistics': {
+                'mean': float(values.mean()),
+                'std': float(values.std()),
+                'min': float(values.min()),
+                'max': float(values.max()),
+                'median': float(np.median(values)),
+                'count': int(n)
+            },
+            'chart_data': {
+                'dates': dates,
+                'values': values.tolist(),
+                'trend_line': y_pred.tolist(),
+                'ci_upper': (y_pred + conf_interval).tolist(),
+                'ci_lower': (y_pred - conf_interval).tolist(),
+                'min_values': values.tolist(),
+                'max_values': values.tolist()
+            },
+            'start_date': dates[0].strftime('%Y-%m-%d'),
+            'end_date': f"{int(years[-1])}-12-31",
+            'total_days': int(n),
+            'monthly_points': int(n),
+            'significance': significance
+        }
+    
     def calculate_trend_statistics(self, weather_data: List[Dict], api_field: str, 
                                  settlement_name: str, parameter: str, time_range: str, years: int) -> Optional[Dict]:
         """
@@ -310,19 +487,30 @@ class TrendDataProcessor(QObject):
             logger.info(f"📊 TREND CALCULATION: {len(weather_data)} napból {api_field} feldolgozása")
             
             # DataFrame készítése API adatokból
-            df_data = []
-            for record in weather_data:
-                if record.get('date') and record.get(api_field) is not None:
-                    df_data.append({
-                        'date': pd.to_datetime(record['date']),
-                        'value': float(record[api_field])
-                    })
-            
-            if len(df_data) == 0:
+            if isinstance(weather_data, WeatherColumns):
+                # ⚡ Oszlopos út: datetime64 index + float64 oszlop közvetlenül
+                values = weather_data.column(api_field)
+                if values is None:
+                    values = np.full(len(weather_data), np.nan)
+                present = ~np.isnan(values)
+                df = pd.DataFrame({
+                    'date': weather_data.dates[present].astype('datetime64[ns]'),
+                    'value': values[present]
+                })
+            else:
+                df_data = []
+                for record in weather_data:
+                    if record.get('date') and record.get(api_field) is not None:
+                        df_data.append({
+                            'date': pd.to_datetime(record['date']),
+                            'value': float(record[api_field])
+                        })
+                df = pd.DataFrame(df_data)
+            
+            if len(df) == 0:
                 logger.error(f"❌ Nincs érvényes adat a {api_field} mezőhöz")
                 return None
             
-            df = pd.DataFrame(df_data)
             df = df.sort_values('date')
             
             # Hiányzó adatok kezelése
@@ -724,7 +912,7 @@ class InteractiveTrendChart(QWidget):
                 x=dates,
                 y=values,
                 mode='markers+lines',
-                name='Havi átlag',
+                name=trend_data.get('series_label', 'Havi átlag'),
                 line=dict(color='#ff6b35', width=3),
                 marker=dict(
                     size=6,
@@ -754,9 +942,12 @@ class InteractiveTrendChart(QWidget):
             time_range = trend_data['time_range']
             r2 = trend_data['r_squared']
             significance = trend_data['significance']
+            point_summary = trend_data.get('point_summary') or f"{trend_data['total_days']:,} nap"
             
-            # Y tengely címke paraméter alapján
-            if 'hőmérséklet' in parameter.lower():
+            # Y tengely címke paraméter alapján (klímaindexnél a saját mértékegység)
+            if trend_data.get('unit'):
+                y_title = f"{trend_data['api_field']} ({trend_data['unit']})"
+            elif 'hőmérséklet' in parameter.lower():
                 y_title = 'Hőmérséklet (°C)'
             elif 'csapadék' in parameter.lower():
                 y_title = 'Csapadék (mm)'
@@ -768,7 +959,7 @@ class InteractiveTrendChart(QWidget):
             fig.update_layout(
                 title=dict(
                     text=f'📈 {settlement} - {parameter} trend elemzés ({time_range})<br>' +
-                         f'<sub>R² = {r2:.3f} | {significance} | {trend_data["total_days"]:,} nap</sub>',
+                         f'<sub>R² = {r2:.3f} | {significance} | {point_summary}</sub>',
                     font=dict(size=16),
                     x=0.5
                 ),
@@ -922,7 +1113,9 @@ class EnhancedStatisticsPanel(QWidget):
             
             # 1. TREND VÁLTOZÁS KÁRTYA
             trend_value = trend_data['trend_per_decade']
-            if 'hőmérséklet' in trend_data['parameter'].lower():
+            if trend_data.get('unit'):
+                trend_unit = f"{trend_data['unit']}/évtized"
+            elif 'hőmérséklet' in trend_data['parameter'].lower():
                 trend_unit = "°C/évtized"
             elif 'csapadék' in trend_data['parameter'].lower():
                 trend_unit = "mm/évtized"
@@ -970,7 +1163,9 @@ class EnhancedStatisticsPanel(QWidget):
             
             # 4. ÉRTÉKTARTOMÁNY KÁRTYA
             stats = trend_data['statistics']
-            if 'hőmérséklet' in trend_data['parameter'].lower():
+            if trend_data.get('unit'):
+                unit = trend_data['unit']
+            elif 'hőmérséklet' in trend_data['parameter'].lower():
                 unit = "°C"
             elif 'csapadék' in trend_data['parameter'].lower():
                 unit = "mm"
@@ -1044,12 +1239,13 @@ class EnhancedStatisticsPanel(QWidget):
                 logger.debug(f"❌ Hiba kártya frissítve: {card_key}")
 
 
-class TrendAnalyticsWorker(QThread):
+class TrendAnalyticsWorker(QObject):
     """
-    🔥 BACKGROUND WORKER THREAD - API HÍVÁSOK HÁTTÉRBEN
+    🔥 BACKGROUND WORKER - API HÍVÁSOK HÁTTÉRBEN
     
     A trend elemzés hosszú ideig tart (multi-year API hívások),
-    ezért háttérszálban futtatjuk a UI blokkolás elkerülésére.
+    ezért a közös TaskScheduler poolján futtatjuk a UI blokkolás elkerülésére.
+    Latest-wins: új trend elemzés megszakítja az előzőt, az elavult eredmény eldobásra kerül.
     """
     
     # Signals
@@ -1064,11 +1260,48 @@ class TrendAnalyticsWorker(QThread):
         self.parameter = parameter  
         self.time_range = time_range
         self.processor = TrendDataProcessor()
+        self.task_handle: Optional[TaskHandle] = None
         
-        # Signal routing
-        self.processor.progress_updated.connect(self.progress_updated.emit)
-        self.processor.data_received.connect(self.data_received.emit)
-        self.processor.error_occurred.connect(self.error_occurred.emit)
+        # Signal routing - megszakítás után nincs továbbítás
+        self.processor.progress_updated.connect(self._forward_progress)
+        self.processor.data_received.connect(self._forward_data)
+        self.processor.error_occurred.connect(self._forward_error)
+    
+    def start(self) -> TaskHandle:
+        """Beküldés a közös ütemezőbe (trend csoport, latest-wins)."""
+        self.task_handle = get_task_scheduler().submit(
+            self.run,
+            name="trend_analytics",
+            priority=TaskPriority.NORMAL,
+            group="trend_analytics",
+            on_done=self._on_task_done
+        )
+        return self.task_handle
+    
+    def cancel(self) -> None:
+        """Megszakítás - a futó lekérdezés eredménye eldobásra kerül."""
+        if self.task_handle is not None:
+            self.task_handle.cancel()
+    
+    def _is_cancelled(self) -> bool:
+        return self.task_handle is not None and self.task_handle.is_cancelled()
+    
+    def _forward_progress(self, value: int) -> None:
+        if not self._is_cancelled():
+            self.progress_updated.emit(value)
+    
+    def _forward_data(self, data: dict) -> None:
+        if not self._is_cancelled():
+            self.data_received.emit(data)
+    
+    def _forward_error(self, message: str) -> None:
+        if not self._is_cancelled():
+            self.error_occurred.emit(message)
+    
+    def _on_task_done(self, handle: TaskHandle) -> None:
+        """Ütemező callback - el sem indult feladatnál is jelez befejezést."""
+        if not handle.started:
+            self.finished.emit()
     
     def run(self) -> None:
         """Háttérszál futtatása"""
@@ -1081,7 +1314,7 @@ class TrendAnalyticsWorker(QThread):
             
         except Exception as e:
             logger.error(f"❌ Worker thread hiba: {e}")
-            self.error_occurred.emit(f"Háttérszál hiba: {str(e)}")
+            self._forward_error(f"Háttérszál hiba: {str(e)}")
         finally:
             self.finished.emit()
 
@@ -1275,6 +1508,7 @@ class TrendAnalyticsTab(QWidget):
             "💨 Szélsebesség", 
             "💨 Széllökések"
         ])
+        self.parameter_combo.addItems(list(CLIMATE_INDEX_PARAMETERS))
         self.parameter_combo.setCurrentText("🔥 Maximum hőmérséklet")
         param_group.addWidget(self.parameter_combo)
         controls_layout.addLayout(param_group)
@@ -1508,7 +1742,13 @@ class TrendAnalyticsTab(QWidget):
         self.error_occurred.emit(error_message)
     
     def on_worker_finished(self) -> None:
-        """Worker thread befejezése (VÁLTOZATLAN)"""
+        """Worker befejezése"""
+        # Felülírt (latest-wins) worker befejezése nem érinti az aktuálisat
+        worker = self.sender()
+        if worker is not None and worker is not self.current_worker:
+            worker.deleteLater()
+            return
+        
         # UI reset
         self.analyze_button.setEnabled(True)
         self.analyze_button.setText("🚀 Dashboard Elemzés Indítása")
@@ -53,6 +53,8 @@ import logging
 from typing import Dict, List, Tuple, Any, Optional
 from enum import Enum
 
+from ..config import APIConfig
+
 # Logging konfigurálása
 logger = logging.getLogger(__name__)
 
@@ -64,11 +66,11 @@ class APIConstants:
     
     # Open-Meteo API endpoints (FREE - Primary)
     OPEN_METEO_BASE = "https://api.open-meteo.com/v1"
-    OPEN_METEO_ARCHIVE = "https://archive-api.open-meteo.com/v1/archive"
+    OPEN_METEO_ARCHIVE = APIConfig.OPEN_METEO_ARCHIVE  # stand-in szerver esetén helyi URL
     OPEN_METEO_GEOCODING = "https://geocoding-api.open-meteo.com/v1/search"
     
     # Meteostat API endpoints (PREMIUM - Multi-city & Historical)
-    METEOSTAT_BASE = "https://meteostat.p.rapidapi.com"
+    METEOSTAT_BASE = APIConfig.METEOSTAT_BASE
     METEOSTAT_STATIONS_NEARBY = f"{METEOSTAT_BASE}/stations/nearby"
     METEOSTAT_STATIONS_META = f"{METEOSTAT_BASE}/stations/meta"
     METEOSTAT_STATIONS_DAILY = f"{METEOSTAT_BASE}/stations/daily"
@@ -88,7 +90,8 @@ class APIConstants:
     # Source Display Names
     SOURCE_DISPLAY_NAMES = {
         "open-meteo": "🌍 Open-Meteo API",
-        "meteostat": "💎 Meteostat API"
+        "meteostat": "💎 Meteostat API",
+        "local-grid": "🗂️ Helyi rács (NetCDF/Zarr)"
     }
 
 
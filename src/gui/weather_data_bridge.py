@@ -28,12 +28,16 @@ Ez a bridge összköti az Analytics Engine-t a Folium térképpel!
 """
 
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Iterator, Tuple
 from datetime import datetime, date
 from dataclasses import dataclass
 
+import numpy as np
+
 from ..data.models import AnalyticsResult, CityWeatherResult, AnalyticsQuestion
 from ..data.enums import AnalyticsMetric
+from ..devtools.tracing import traced
+from ..config import RegionalAggregationConfig
 
 logger = logging.getLogger(__name__)
 
@@ -123,6 +127,7 @@ class WeatherDataBridge:
         logger.info("🌉 Weather Data Bridge v2.0 inicializálva - METRIC_MAP javítással")
         logger.info(f"🔧 Támogatott metrikák: {list(self.METRIC_MAP.keys())}")
     
+    @traced("overlay_conversion")
     def convert_analytics_result(self, analytics_result: AnalyticsResult, display_parameter: Optional[str] = None) -> Dict[str, Any]:
         """
         🔧 KRITIKUS ÚJ METÓDUS: Analytics eredmény konvertálása display_parameter alapján
@@ -181,6 +186,13 @@ class WeatherDataBridge:
                     
                     result_data[detected_parameter][city_result.city_name] = city_data
             
+            # 🗺️ Interpolált (nem lekért) települések
+            for name, latitude, longitude, value in self._interpolated_points(analytics_result, result_data[detected_parameter]):
+                city_data = {'coordinates': [latitude, longitude], 'value': value, 'interpolated': True}
+                if detected_parameter in ['wind_speed', 'wind_gusts']:
+                    city_data['speed'] = value  # irány nincs - a nyíl réteg kihagyja
+                result_data[detected_parameter][name] = city_data
+            
             if not result_data[detected_parameter]:
                 logger.error("❌ Nincs érvényes város adat a konverzióhoz")
                 return {}
@@ -208,6 +220,7 @@ class WeatherDataBridge:
         logger.debug(f"🔄 Display parameter normalizálás: {display_parameter} → {normalized}")
         return normalized
     
+    @traced("overlay_conversion")
     def convert_analytics_to_weather_overlay(self, analytics_result: AnalyticsResult) -> Optional[WeatherOverlayData]:
         """
         🔧 JAVÍTOTT: AnalyticsResult → WeatherOverlayData konverzió METRIC_MAP alapján
@@ -262,12 +275,30 @@ class WeatherDataBridge:
                     weather_data[city_result.city_name] = city_data
                     values.append(float(city_result.value))
             
+            # 🗺️ Interpolált (nem lekért) települések - a színskála a mért mintákból
+            interpolated_count = 0
+            for name, latitude, longitude, value in self._interpolated_points(analytics_result, weather_data):
+                weather_data[name] = {
+                    'coordinates': [latitude, longitude],
+                    'value': value,
+                    'city_name': name,
+                    'country': 'Magyarország',
+                    'country_code': 'HU',
+                    'interpolated': True
+                }
+                if overlay_type in ['wind_speed', 'wind_gusts']:
+                    weather_data[name]['speed'] = value  # irány nincs - a nyíl réteg kihagyja
+                interpolated_count += 1
+            
             if not weather_data:
                 logger.error("❌ Nincs érvényes város adat a konverzióhoz")
                 return None
             
             # Metadata létrehozása (min/max, színskála info)
             metadata = self._create_overlay_metadata(overlay_type, values, analytics_result)
+            if interpolated_count:
+                metadata['interpolated_count'] = interpolated_count
+                metadata['spatial_field'] = analytics_result.spatial_field
             
             overlay_data = WeatherOverlayData(
                 overlay_type=overlay_type,
@@ -283,6 +314,83 @@ class WeatherDataBridge:
             logger.error(f"❌ Hiba az analytics→overlay konverzióban: {e}", exc_info=True)
             return None
     
+    def _interpolated_points(self, analytics_result: AnalyticsResult,
+                             existing: Dict[str, Any]) -> Iterator[Tuple[str, float, float, float]]:
+        """
+        Az AnalyticsResult.spatial_field becsült (minta nélküli) települései.
+        
+        Yields:
+            (név, szélesség, hosszúság, érték) - azonos nevű településnél a név megye nélkül
+            ütközne, ezért a már foglalt neveket az azonosító egészíti ki
+        """
+        spatial_field = getattr(analytics_result, 'spatial_field', None)
+        if spatial_field is None:
+            return
+        
+        estimated = np.flatnonzero(~spatial_field.sampled & np.isfinite(spatial_field.values))
+        for index in estimated:
+            name = str(spatial_field.names[index])
+            if name in existing:
+                name = f"{name} #{int(spatial_field.settlement_ids[index])}"
+            yield (name, float(spatial_field.latitudes[index]), float(spatial_field.longitudes[index]),
+                   float(spatial_field.values[index]))
+    
+    def convert_analytics_to_choropleth(self, analytics_result: AnalyticsResult,
+                                        display_parameter: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        🗺️ Megyénkénti / régiónkénti statisztikák a megye réteg színezéséhez.
+        
+        Returns:
+            {'overlay_type', 'statistic', 'counties': {megye: {count, population, mean, min, max,
+            weighted_mean}}, 'regions': {...}} vagy None (nincs területi összesítés)
+        """
+        regional_statistics = getattr(analytics_result, 'regional_statistics', None)
+        if not regional_statistics:
+            return None
+        
+        if display_parameter:
+            overlay_type = self._normalize_display_parameter(display_parameter)
+        else:
+            overlay_type = self.METRIC_MAP.get(analytics_result.question.metric)
+        if not overlay_type:
+            return None
+        
+        counties = regional_statistics['county'].as_dict()
+        if not counties:
+            return None
+        
+        logger.info(f"🗺️ Choropleth: {overlay_type}, {len(counties)} megye")
+        return {
+            'overlay_type': overlay_type,
+            'statistic': RegionalAggregationConfig.DEFAULT_STATISTIC,
+            'counties': counties,
+            'regions': regional_statistics['region'].as_dict()
+        }
+    
+    def convert_climate_index_trend_to_choropleth(self, index_trend: Dict[str, Any],
+                                                  index: str) -> Optional[Dict[str, Any]]:
+        """
+        📏 Klímaindex trend (MultiCityEngine.climate_index_trend) → megye réteg színezés.
+        
+        Returns:
+            Choropleth dictionary (overlay_type 'climate_index', megyénkénti trend / évtized) vagy None
+        """
+        if not index_trend or index_trend.get('county') is None:
+            return None
+        
+        counties = index_trend['county'].as_dict()
+        if not counties:
+            return None
+        
+        logger.info(f"📏 Klímaindex choropleth: {index} trend, {len(counties)} megye")
+        return {
+            'overlay_type': 'climate_index',
+            'index': index,
+            'statistic': RegionalAggregationConfig.DEFAULT_STATISTIC,
+            'counties': counties,
+            'regions': index_trend['region'].as_dict() if index_trend.get('region') is not None else {}
+        }
+    
     def get_display_parameter_for_metric(self, metric: AnalyticsMetric) -> Optional[str]:
         """
         🔧 ÚJ METÓDUS: Metrika alapján display parameter lekérdezése
@@ -456,7 +564,8 @@ class WeatherDataBridge:
             # Szél esetén extra adatok
             if overlay_data.overlay_type in ['wind_speed', 'wind_gusts']:
                 marker_config['speed'] = city_data.get('speed', city_data['value'])
-                marker_config['direction'] = city_data.get('direction', 0)
+                if 'direction' in city_data:
+                    marker_config['direction'] = city_data['direction']
             
             marker_data.append(marker_config)
         
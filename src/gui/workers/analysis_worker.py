@@ -30,9 +30,14 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime
 from pathlib import Path
 
-from PySide6.QtCore import QThread, Signal, QMutex, QMutexLocker
+from PySide6.QtCore import QObject, Signal, QMutex, QMutexLocker
 from PySide6.QtWidgets import QApplication
 
+from .task_scheduler import TaskHandle, TaskPriority, get_task_scheduler
+from ...data.weather_columns import WeatherColumns
+from ...data.climate_archive import get_climate_archive
+from ...devtools.tracing import analysis
+
 # Analytics imports
 try:
     from ...analytics.multi_city_engine import MultiCityEngine
@@ -66,7 +71,7 @@ except ImportError as e:
         DataProvider = None
 
 
-class AnalysisWorker(QThread):
+class AnalysisWorker(QObject):
     """
     HÁTTÉRSZÁL WORKER - UI Thread Felszabadítása
     
@@ -77,8 +82,9 @@ class AnalysisWorker(QThread):
     - analysis_cancelled(): Megszakítás megerősítése
     
     INTERRUPT TÁMOGATÁS:
-    - QThread.requestInterruption() használata
-    - Periodikus isInterruptionRequested() ellenőrzés
+    - A közös TaskScheduler poolján fut (saját QThread helyett)
+    - Latest-wins "analysis" csoport: új elemzés megszakítja az előzőt
+    - Periodikus megszakítás ellenőrzés (TaskHandle.is_cancelled)
     - Graceful shutdown minden lépésnél
     """
     
@@ -94,6 +100,7 @@ class AnalysisWorker(QThread):
         # === WORKER STATE ===
         self._request_data: Optional[Dict[str, Any]] = None
         self._mutex = QMutex()  # Thread-safe hozzáférés
+        self._task_handle: Optional[TaskHandle] = None
         
         # === ANALYTICS COMPONENTS ===
         self._multi_city_engine: Optional[MultiCityEngine] = None
@@ -119,6 +126,11 @@ class AnalysisWorker(QThread):
             self._logger.info(f"Worker setup: {request_data.get('analysis_type', 'unknown')}")
     
     def run(self):
+        """Elemzés futtatása egy tracing elemzés határon belül (lásd _run)."""
+        with analysis(f"AnalysisWorker {(self._request_data or {}).get('analysis_type', 'unknown')}"):
+            self._run()
+    
+    def _run(self):
         """
         FŐSZÁL FUTÁS - Itt történik a tényleges munka
         
@@ -385,17 +397,27 @@ class AnalysisWorker(QThread):
             # ✅ JAVÍTOTT: latitude=..., longitude=...
             self._logger.info(f"🔧 WeatherClient.get_weather_data() hívás JAVÍTOTT paraméterekkel...")
             
-            weather_data = self._weather_client.get_weather_data(
-                latitude=latitude,           # ✅ HELYES PARAMÉTER NÉV!
-                longitude=longitude,         # ✅ HELYES PARAMÉTER NÉV!
-                start_date=date_range.get('start_date'),
-                end_date=date_range.get('end_date')
-            )
+            def fetch(start_date: str, end_date: str):
+                return self._weather_client.get_weather_data(
+                    latitude=latitude,           # ✅ HELYES PARAMÉTER NÉV!
+                    longitude=longitude,         # ✅ HELYES PARAMÉTER NÉV!
+                    start_date=start_date,
+                    end_date=end_date
+                )
+            
+            # 🗄️ Magyar település: klíma archívum szelet, csak a hiányzó időszakok lekérése
+            archive = get_climate_archive()
+            settlement_id = archive.settlement_id_at(latitude, longitude) if archive else None
+            if settlement_id is not None and date_range.get('start_date') and date_range.get('end_date'):
+                self._logger.info(f"🗄️ Klíma archívum olvasás: település {settlement_id}")
+                weather_data = archive.read_through(settlement_id, date_range['start_date'], date_range['end_date'], fetch)
+            else:
+                weather_data = fetch(date_range.get('start_date'), date_range.get('end_date'))
             
             self._logger.info(f"✅ WeatherClient.get_weather_data() sikeresen lefutott")
             self._logger.info(f"🎯 Nyers weather_data típus: {type(weather_data)}")
             
-            if isinstance(weather_data, list) and weather_data:
+            if isinstance(weather_data, (list, WeatherColumns)) and weather_data:
                 self._logger.info(f"🎯 Első elem típus: {type(weather_data[0])}")
                 self._logger.info(f"🎯 Első elem kulcsok: {list(weather_data[0].keys()) if isinstance(weather_data[0], dict) else 'Not dict'}")
             
@@ -461,20 +483,25 @@ class AnalysisWorker(QThread):
                 self._logger.warning("🎯 Üres weather_data")
                 return None
             
-            if not isinstance(weather_data, list):
+            if isinstance(weather_data, WeatherColumns):
+                # ⚡ Oszlopos adat - közvetlen Dict[List] (oszloponként egy tolist, rekord dict-ek nélkül)
+                result = {"daily": weather_data.to_daily_dict()}
+                result["daily"]["data_source"] = [weather_data.data_source] * len(weather_data)
+                sample_keys = []
+                self._logger.info(f"🎯 Oszlopos konverzió: {list(weather_data.columns)}")
+            elif not isinstance(weather_data, list):
                 self._logger.warning(f"🎯 Váratlan weather_data típus: {type(weather_data)}")
                 return None
-            
-            if not weather_data or not isinstance(weather_data[0], dict):
+            elif not weather_data or not isinstance(weather_data[0], dict):
                 self._logger.warning("🎯 Weather_data nem List[Dict] formátum")
                 return None
-            
-            # 🎯 KONVERZIÓ: List[Dict] → Dict[List]
-            result = {"daily": {}}
-            
-            # Első rekord kulcsainak felmérése
-            sample_keys = list(weather_data[0].keys())
-            self._logger.info(f"🎯 Konvertálandó kulcsok: {sample_keys}")
+            else:
+                # 🎯 KONVERZIÓ: List[Dict] → Dict[List]
+                result = {"daily": {}}
+                
+                # Első rekord kulcsainak felmérése
+                sample_keys = list(weather_data[0].keys())
+                self._logger.info(f"🎯 Konvertálandó kulcsok: {sample_keys}")
             
             for key in sample_keys:
                 if key == 'date':
@@ -505,7 +532,7 @@ class AnalysisWorker(QThread):
                 self._logger.info("🌹 ✅ Kompatibilitási kulcs hozzáadva: winddirection_10m_dominant → wind_direction_10m_dominant")
             
             # Extra metaadatok hozzáadása (ha vannak)
-            if weather_data:
+            if weather_data and not isinstance(weather_data, WeatherColumns):
                 first_record = weather_data[0]
                 # WeatherClient metadata keresése
                 for meta_key in ['latitude', 'longitude', 'timezone', 'elevation']:
@@ -582,7 +609,7 @@ class AnalysisWorker(QThread):
         Returns:
             bool: True ha meg kell szakítani
         """
-        if self.isInterruptionRequested():
+        if self._task_handle is not None and self._task_handle.is_cancelled():
             self._logger.info(f"Megszakítás kérve művelet közben: {operation}")
             self._emit_progress("Megszakítás...", 0)
             self.analysis_cancelled.emit()
@@ -610,32 +637,41 @@ class AnalysisWorker(QThread):
         Args:
             request_data (dict): Teljes elemzési kérés
         """
-        if self.isRunning():
+        if self.is_running_analysis():
             self._logger.warning("Worker már fut, nem lehet újat indítani")
             return False
             
         self.setup_analysis_request(request_data)
-        self.start()  # QThread.start()
+        self._task_handle = get_task_scheduler().submit(
+            self.run,
+            name="analysis",
+            priority=TaskPriority.ANALYSIS,
+            group="analysis",
+            on_done=self._on_task_done
+        )
         return True
     
+    def _on_task_done(self, handle: TaskHandle):
+        """Ütemező callback - a sorból kivett (el sem indult) elemzés megszakításának jelzése"""
+        if not handle.started:
+            self.analysis_cancelled.emit()
+    
     def stop_analysis(self):
         """
         ELEMZÉS MEGSZAKÍTÁSA
         Graceful shutdown - nem brutális kill
         """
-        if self.isRunning():
+        if self.is_running_analysis():
             self._logger.info("Worker megszakítás kérve...")
-            self.requestInterruption()
+            self._task_handle.cancel()
             
-            # Várunk a tiszta leállásra (max 5 másodperc)
-            if not self.wait(5000):
-                self._logger.warning("Worker nem állt le 5 másodperc alatt, terminálás...")
-                self.terminate()
-                self.wait(1000)
+            # Várunk a tiszta leállásra (max 5 másodperc) - pool szál nem terminálható
+            if not self._task_handle.wait(5000):
+                self._logger.warning("Worker nem állt le 5 másodperc alatt, a háttérben fejeződik be")
     
     def is_running_analysis(self) -> bool:
         """Worker futási állapot lekérdezése"""
-        return self.isRunning()
+        return self._task_handle is not None and not self._task_handle.is_done()
 
 
 # === USAGE EXAMPLE ===
@@ -13,20 +13,30 @@ Háttérszálak és aszinkron munkák modulja provider routing támogatással.
 ✅ Signal routing app_controller-hez
 
 🌪️ KRITIKUS JAVÍTÁS: WindDataWorker API paraméter módosítás
-✅ Hourly wind_gusts_10m paraméter hozzáadva
-✅ Napi maximum széllökés számítás támogatás
+✅ Napi windgusts_10m_max aggregátum (nem teljes időszakos óránkénti letöltés)
+✅ Óránkénti wind_gusts_10m csak lefúrási ablakra (HourlyWindowWorker, külön cache)
 ✅ Backward compatibility windspeed_10m_max-szal
 ✅ Élethű 130+ km/h széllökések támogatása
+
+🧵 KÖZÖS ÜTEMEZŐ: A worker-ek nem saját QThread-en, hanem a közös TaskScheduler
+   poolján futnak (prioritás, deduplikáció, latest-wins, korlátozott párhuzamosság)
 """
 
 import json
 import sqlite3
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Hashable, Sequence
 from datetime import datetime
 import httpx
 from pathlib import Path
 
-from PySide6.QtCore import QThread, Signal, QObject, QMutex, QWaitCondition
+from PySide6.QtCore import Signal, QObject, QMutex, QWaitCondition
+
+from .task_scheduler import TaskScheduler, TaskHandle, TaskPriority, get_task_scheduler
+from ...data.request_coalescer import get_request_coalescer
+from ...data.weather_columns import decode_json
+from ...data.hourly_window_cache import get_hourly_window_cache
+from ...config import APIConfig
+from ...devtools.tracing import span, analysis
 
 # 🌍 ÚJ: Provider routing imports
 from ..utils import (
@@ -36,10 +46,13 @@ from ..utils import (
 )
 
 
-class BaseWorkerThread(QThread):
+class BaseWorker(QObject):
     """
-    Base worker thread class közös hibakezeléssel és signalokkal.
-    Professzionális thread lifecycle management.
+    Base worker class közös hibakezeléssel és signalokkal.
+    
+    A worker a közös TaskScheduler poolján fut (nem saját QThread-en).
+    Az ütemezési paramétereket (prioritás, deduplikációs kulcs, latest-wins
+    csoport) a leszármazott osztályok adják meg.
     """
     
     # Közös signalok minden worker számára
@@ -47,15 +60,57 @@ class BaseWorkerThread(QThread):
     error_occurred = Signal(str)
     progress_updated = Signal(int)  # 0-100 százalék
     
+    # Ütemezési alapértékek
+    task_priority = TaskPriority.NORMAL
+    task_group: Optional[str] = None  # Latest-wins csoport
+    
     def __init__(self, parent: Optional[QObject] = None):
         super().__init__(parent)
         self.is_cancelled = False
         self._error_message = ""
+        self.task_handle: Optional[TaskHandle] = None
     
     def cancel(self) -> None:
         """Worker megszakítása."""
         self.is_cancelled = True
     
+    def task_key(self) -> Optional[Hashable]:
+        """Deduplikációs kulcs - azonos kulcsú aktív feladat nem indul újra (None → nincs)."""
+        return None
+    
+    def start(self, scheduler: Optional[TaskScheduler] = None,
+              priority: Optional[TaskPriority] = None) -> TaskHandle:
+        """
+        Worker beküldése a közös ütemezőbe.
+        
+        Args:
+            scheduler: Ütemező (None → közös példány)
+            priority: Prioritás felülírása (None → task_priority)
+            
+        Returns:
+            TaskHandle - deduplikáció esetén a már aktív feladaté
+        """
+        scheduler = scheduler or get_task_scheduler()
+        self.task_handle = scheduler.submit(
+            self.run,
+            name=type(self).__name__,
+            priority=self.task_priority if priority is None else priority,
+            key=self.task_key(),
+            group=self.task_group,
+            on_cancel=self.cancel,
+            on_done=self._on_task_done
+        )
+        return self.task_handle
+    
+    def isRunning(self) -> bool:
+        """Aktív-e (várakozik vagy fut) - QThread kompatibilis név."""
+        return self.task_handle is not None and not self.task_handle.is_done()
+    
+    def _on_task_done(self, handle: TaskHandle) -> None:
+        """Ütemező callback - el sem indult (megszakított) feladatnál is jelez befejezést."""
+        if not handle.started:
+            self.finished.emit()
+    
     def emit_error(self, message: str) -> None:
         """Hibajel kibocsátása."""
         self._error_message = message
@@ -76,7 +131,11 @@ class BaseWorkerThread(QThread):
         raise NotImplementedError("A execute() metódust override-olni kell!")
 
 
-class GeocodingWorker(BaseWorkerThread):
+# Visszafelé kompatibilitás - a worker-ek korábban QThread alosztályok voltak
+BaseWorkerThread = BaseWorker
+
+
+class GeocodingWorker(BaseWorker):
     """
     Geocoding API lekérdezést végző worker.
     Települések keresése koordináták lekérdezéséhez.
@@ -86,11 +145,19 @@ class GeocodingWorker(BaseWorkerThread):
     # Specifikus signalok
     geocoding_completed = Signal(list)  # List[Dict] - találatok
     
+    # Typeahead: interaktív prioritás, a legutolsó keresés nyer
+    task_priority = TaskPriority.INTERACTIVE
+    task_group = "geocoding"
+    
     def __init__(self, search_query: str, parent: Optional[QObject] = None):
         super().__init__(parent)
         self.search_query = search_query.strip()
         self.results: List[Dict[str, Any]] = []
     
+    def task_key(self) -> Optional[Hashable]:
+        """Azonos (kis-nagybetű független) keresés deduplikálása."""
+        return ("geocoding", self.search_query.casefold())
+    
     def execute(self) -> None:
         """Geocoding lekérdezés végrehajtása - professzionális implementáció."""
         if not self.search_query or len(self.search_query) < 2:
@@ -127,6 +194,10 @@ class GeocodingWorker(BaseWorkerThread):
                 data = response.json()
                 self.results = data.get("results", [])
                 
+                # Felülírt (latest-wins) keresés eredménye elavult
+                if self.is_cancelled:
+                    return
+                
                 self.progress_updated.emit(100)
                 
                 # Eredmények kibocsátása
@@ -142,7 +213,7 @@ class GeocodingWorker(BaseWorkerThread):
             self.emit_error(f"Váratlan hiba a geocoding során: {str(e)}")
 
 
-class WeatherDataWorker(BaseWorkerThread):
+class WeatherDataWorker(BaseWorker):
     """
     🌍 PROVIDER ROUTING + 🌪️ WIND GUSTS: Open-Meteo időjárási adatok lekérdezés 
     provider routing támogatással és wind gusts funkcionalitással.
@@ -154,8 +225,8 @@ class WeatherDataWorker(BaseWorkerThread):
     ✅ API endpoint dinamikus választás
     
     WIND GUSTS FUNKCIÓK:
-    ✅ Hourly wind_gusts_10m paraméter hozzáadva
-    ✅ Napi maximum széllökés számítás
+    ✅ Napi windgusts_10m_max aggregátum közvetlenül az API-tól
+    ✅ Óránkénti adat csak lefúrási ablakra (HourlyWindowWorker)
     ✅ 130+ km/h széllökések accurate reporting
     ✅ Backward compatibility windspeed_10m_max-szal
     """
@@ -181,6 +252,17 @@ class WeatherDataWorker(BaseWorkerThread):
         self.actual_provider: Optional[str] = None
         self.weather_data: Optional[Dict[str, Any]] = None
     
+    def task_key(self) -> Optional[Hashable]:
+        """Azonos helyszín + időszak + provider lekérdezés deduplikálása."""
+        return ("weather_data", round(self.latitude, 4), round(self.longitude, 4),
+                self.start_date, self.end_date, self.preferred_provider)
+    
+    def run(self) -> None:
+        """A lekérés egy tracing elemzés határon belül fut (teljesítmény panel)."""
+        with analysis(f"{type(self).__name__} {self.latitude:.2f},{self.longitude:.2f} "
+                      f"{self.start_date} → {self.end_date}"):
+            super().run()
+    
     def execute(self) -> None:
         """
         🌍 PROVIDER ROUTING + 🌪️ WIND GUSTS: Időjárási adatok lekérdezése 
@@ -209,7 +291,7 @@ class WeatherDataWorker(BaseWorkerThread):
             
             # 🌍 HTTP REQUEST WITH PROVIDER FALLBACK
             success = False
-            fallback_chain = get_fallback_source_chain(selected_provider)
+            fallback_chain = self._provider_chain(selected_provider)
             
             for provider in fallback_chain:
                 if self.is_cancelled:
@@ -243,17 +325,24 @@ class WeatherDataWorker(BaseWorkerThread):
             
             self.progress_updated.emit(90)
             
+            if self.is_cancelled:
+                return
+            
             # 🌪️ WIND GUSTS VALIDATION & RESPONSE PROCESSING
             if self.weather_data:
-                self._validate_wind_gusts_data()
-                self.progress_updated.emit(100)
-                self.weather_data_completed.emit(self.weather_data)
+                self._emit_result()
             else:
                 self.emit_error("Érvénytelen API válasz struktúra")
                 
         except Exception as e:
             self.emit_error(f"Váratlan hiba az időjárási adatok lekérdezése során: {str(e)}")
     
+    def _emit_result(self) -> None:
+        """Sikeres lekérdezés eredményének kibocsátása."""
+        self._validate_wind_gusts_data()
+        self.progress_updated.emit(100)
+        self.weather_data_completed.emit(self.weather_data)
+    
     def _select_optimal_provider(self) -> Optional[str]:
         """
         🌍 Optimális provider kiválasztása user preferencia és elérhetőség alapján.
@@ -287,6 +376,10 @@ class WeatherDataWorker(BaseWorkerThread):
                 # Auto fallback
                 return self._select_optimal_provider() if self.preferred_provider != "auto" else None
     
+    def _provider_chain(self, selected_provider: str) -> List[str]:
+        """Kipróbálandó providerek sorrendje (kiválasztott + fallback lánc)."""
+        return get_fallback_source_chain(selected_provider)
+    
     def _build_api_request(self, provider: str) -> tuple[str, Dict[str, Any]]:
         """
         🌍 Provider-specific API request építése.
@@ -315,10 +408,9 @@ class WeatherDataWorker(BaseWorkerThread):
             "end_date": self.end_date,
             
             # 🌪️ WIND GUSTS: Daily paraméterek - windspeed_10m_max MEGTARTVA backward compatibility-ért
-            "daily": "temperature_2m_max,temperature_2m_min,temperature_2m_mean,precipitation_sum,windspeed_10m_max,winddirection_10m_dominant",
-            
-            # 🌪️ WIND GUSTS: Hourly paraméterek - wind_gusts_10m a valódi széllökésekhez!
-            "hourly": "wind_gusts_10m,windspeed_10m",
+            # A napi széllökés maximum (windgusts_10m_max) aggregátumként érkezik - óránkénti
+            # adat csak lefúrási ablakra töltődik le (HourlyWindowWorker)
+            "daily": "temperature_2m_max,temperature_2m_min,temperature_2m_mean,precipitation_sum,windspeed_10m_max,windgusts_10m_max,winddirection_10m_dominant",
             
             "timezone": "auto"
         }
@@ -347,24 +439,38 @@ class WeatherDataWorker(BaseWorkerThread):
             headers = self._get_provider_headers(provider)
             timeout = APIConstants.DEFAULT_TIMEOUT
             
-            with httpx.Client(timeout=timeout, headers=headers) as client:
-                if self.is_cancelled:
-                    return False
-                
-                response = client.get(api_url, params=params)
-                
-                if response.status_code != 200:
-                    print(f"❌ DEBUG: {provider} API hiba: {response.status_code}")
-                    return False
-                
-                self.weather_data = response.json()
-                
-                # Provider change notification
-                if provider != self.preferred_provider and self.preferred_provider != "auto":
-                    self.provider_changed.emit(provider)
-                
-                return True
-                
+            if self.is_cancelled:
+                return False
+            
+            def fetch() -> Optional[Dict[str, Any]]:
+                with httpx.Client(timeout=timeout, headers=headers) as client:
+                    with span("provider_request", provider) as request_span:
+                        response = client.get(api_url, params=params)
+                        request_span.set(status=response.status_code)
+                    
+                    if response.status_code != 200:
+                        print(f"❌ DEBUG: {provider} API hiba: {response.status_code}")
+                        return None
+                    
+                    with span("json_decode", provider):
+                        return decode_json(response.content)
+            
+            # 🔁 Azonos, éppen repülő kérés eredményének megosztása (single-flight)
+            request_key = (provider, api_url, tuple(sorted((k, str(v)) for k, v in params.items())))
+            response_data = get_request_coalescer().single_flight(request_key, fetch)
+            
+            if response_data is None:
+                return False
+            
+            # Saját másolat - a megosztott válaszon több fogyasztó osztozhat
+            self.weather_data = dict(response_data)
+            
+            # Provider change notification
+            if provider != self.preferred_provider and self.preferred_provider != "auto":
+                self.provider_changed.emit(provider)
+            
+            return True
+            
         except httpx.TimeoutException:
             print(f"⏱️ DEBUG: {provider} API timeout")
             return False
@@ -408,19 +514,15 @@ class WeatherDataWorker(BaseWorkerThread):
             return
         
         daily_data = self.weather_data.get("daily", {})
-        hourly_data = self.weather_data.get("hourly", {})
         
         daily_record_count = len(daily_data.get('time', []))
-        hourly_record_count = len(hourly_data.get('time', []))
-        wind_gusts_count = len(hourly_data.get('wind_gusts_10m', []))
+        wind_gusts = daily_data.get('windgusts_10m_max', [])
         
         print(f"✅ DEBUG: {daily_record_count} napi rekord lekérdezve")
-        print(f"✅ DEBUG: {hourly_record_count} óránkénti rekord lekérdezve")
-        print(f"🌪️ DEBUG: {wind_gusts_count} széllökés rekord lekérdezve")
+        print(f"🌪️ DEBUG: {len(wind_gusts)} napi széllökés maximum lekérdezve")
         
         # Széllökés adatok minőség ellenőrzés
-        if wind_gusts_count > 0:
-            wind_gusts = hourly_data.get('wind_gusts_10m', [])
+        if wind_gusts:
             valid_gusts = [g for g in wind_gusts if g is not None and g > 0]
             if valid_gusts:
                 max_gust = max(valid_gusts)
@@ -437,7 +539,103 @@ class WeatherDataWorker(BaseWorkerThread):
             print(f"❌ DEBUG: Nincs széllökés adat az API válaszban!")
 
 
-class SQLQueryWorker(BaseWorkerThread):
+class HourlyWindowWorker(WeatherDataWorker):
+    """
+    🌪️ Óránkénti adatok igény szerinti lekérdezése egy rövid lefúrási ablakra
+    (pl. egy viharnap), a napi adatoktól külön cache-elve.
+    
+    Interaktív prioritással fut; egy újabb ablak kérése a korábbit megszakítja.
+    """
+    
+    # Specifikus signal - óránkénti ablak (hourly blokk + ablak metaadat)
+    hourly_data_completed = Signal(dict)
+    
+    task_priority = TaskPriority.INTERACTIVE
+    task_group = "hourly_window"
+    
+    def __init__(self, latitude: float, longitude: float,
+                 start_date: str, end_date: str,
+                 variables: Optional[Sequence[str]] = None,
+                 preferred_provider: str = "auto",
+                 parent: Optional[QObject] = None):
+        super().__init__(latitude, longitude, start_date, end_date, preferred_provider, parent)
+        self.variables = tuple(variables or APIConfig.HOURLY_WINDOW_VARIABLES)
+    
+    def task_key(self) -> Optional[Hashable]:
+        return ("hourly_window", round(self.latitude, 4), round(self.longitude, 4),
+                self.start_date, self.end_date, self.variables)
+    
+    def execute(self) -> None:
+        """Cache találat esetén azonnali válasz, egyébként letöltés a közös provider logikával."""
+        window_days = (datetime.strptime(self.end_date, "%Y-%m-%d")
+                       - datetime.strptime(self.start_date, "%Y-%m-%d")).days + 1
+        if window_days > APIConfig.HOURLY_WINDOW_MAX_DAYS:
+            self.emit_error(f"Túl hosszú óránkénti ablak: {window_days} nap "
+                            f"(max {APIConfig.HOURLY_WINDOW_MAX_DAYS})")
+            return
+        
+        cached = get_hourly_window_cache().get(
+            self.latitude, self.longitude, self.start_date, self.end_date, self.variables
+        )
+        if cached is not None:
+            print(f"💾 DEBUG: Óránkénti ablak cache találat: {self.start_date} → {self.end_date}")
+            self.weather_data = {"hourly": cached, "provider": "cache"}
+            self._emit_result()
+            return
+        
+        super().execute()
+    
+    def _select_optimal_provider(self) -> Optional[str]:
+        """
+        Óránkénti széllökés csak az Open-Meteo archívumból érhető el (a Meteostat
+        útvonal napi kérést építene) - Meteostat preferencia esetén is open-meteo.
+        """
+        if self.preferred_provider not in ("auto", "open-meteo"):
+            print(f"🔄 DEBUG: Óránkénti ablak: {self.preferred_provider} helyett open-meteo (csak ott van óránkénti adat)")
+        return "open-meteo"
+    
+    def _provider_chain(self, selected_provider: str) -> List[str]:
+        return ["open-meteo"]
+    
+    def _build_openmeteo_request(self) -> tuple[str, Dict[str, Any]]:
+        """🌪️ Csak óránkénti változók, csak az ablakra."""
+        url = APIConstants.OPEN_METEO_ARCHIVE
+        
+        params = {
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "hourly": ",".join(self.variables),
+            "timezone": "auto"
+        }
+        
+        return url, params
+    
+    def _emit_result(self) -> None:
+        hourly = self.weather_data.get("hourly") or {}
+        if not hourly.get("time"):
+            self.emit_error("Nincs óránkénti adat a kiválasztott ablakra")
+            return
+        
+        if self.weather_data.get("provider") != "cache":
+            get_hourly_window_cache().put(
+                self.latitude, self.longitude, self.start_date, self.end_date, self.variables, hourly
+            )
+        
+        print(f"🌪️ DEBUG: {len(hourly['time'])} óránkénti rekord ({self.start_date} → {self.end_date})")
+        self.progress_updated.emit(100)
+        self.hourly_data_completed.emit({
+            "hourly": hourly,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "provider": self.weather_data.get("provider", self.actual_provider or "unknown"),
+        })
+
+
+class SQLQueryWorker(BaseWorker):
     """
     SQL lekérdezéseket végző worker thread SQLite adatbázishoz.
     SQL injection védelem és professzionális adatbázis kezelés.
@@ -453,6 +651,10 @@ class SQLQueryWorker(BaseWorkerThread):
         self.db_path = Path(db_path)
         self.result: Optional[Any] = None
     
+    def task_key(self) -> Optional[Hashable]:
+        """Azonos adatbázis + lekérdezés deduplikálása."""
+        return ("sql_query", str(self.db_path), self.query)
+    
     def execute(self) -> None:
         """SQL lekérdezés végrehajtása - professzionális biztonsági intézkedésekkel."""
         if not self.query:
@@ -539,6 +741,7 @@ class WorkerManager(QObject):
     # Specifikus worker signalok
     geocoding_completed = Signal(list)
     weather_data_completed = Signal(dict)  # 🌪️ Wind gusts data támogatás
+    hourly_data_completed = Signal(dict)   # 🌪️ Lefúrási óránkénti ablak
     sql_query_completed = Signal(object)
     
     # 🌍 ÚJ: Provider routing signalok
@@ -550,9 +753,11 @@ class WorkerManager(QObject):
     def __init__(self, parent: Optional[QObject] = None):
         super().__init__(parent)
         
-        # Aktív worker threadek tárolása
-        self.active_workers: Dict[str, BaseWorkerThread] = {}
+        # Aktív worker-ek tárolása (a közös ütemező poolján futnak)
+        self.active_workers: Dict[str, BaseWorker] = {}
+        self.task_workers: Dict[str, str] = {}  # task_id → worker_id (deduplikációhoz)
         self.worker_counter = 0
+        self.scheduler = get_task_scheduler()
         
         # 🌍 ÚJ: Provider state tracking
         self.provider_states: Dict[str, Dict[str, Any]] = {}
@@ -569,78 +774,89 @@ class WorkerManager(QObject):
         self.worker_counter += 1
         return f"{worker_type}_{self.worker_counter}"
     
-    def start_geocoding(self, worker: GeocodingWorker) -> str:
-        """Geocoding worker indítása."""
-        worker_id = self._get_worker_id("geocoding")
+    def start_geocoding(self, worker: GeocodingWorker,
+                        priority: Optional[TaskPriority] = None) -> str:
+        """
+        Geocoding worker indítása.
         
-        # Signal kapcsolatok
+        Interaktív prioritással fut, azonos keresés deduplikálva, a korábbi
+        (typeahead) keresések a legutolsó javára megszakítva.
+        """
         worker.geocoding_completed.connect(self.geocoding_completed.emit)
-        worker.error_occurred.connect(self._on_worker_error)
-        worker.finished.connect(lambda worker_id=worker_id: self._on_worker_finished(worker_id))
-        worker.progress_updated.connect(lambda p: self.progress_updated.emit("geocoding", p))
-        
-        # Thread safe worker tárolása és indítása
-        self.mutex.lock()
-        try:
-            self.active_workers[worker_id] = worker
-        finally:
-            self.mutex.unlock()
-        
-        worker.start()
-        self.worker_started.emit("geocoding")
-        print(f"✅ DEBUG: Geocoding worker indítva - {worker_id}")
-        return worker_id
+        return self._start_worker("geocoding", worker, priority)
     
-    def start_weather_data_fetch(self, worker: WeatherDataWorker) -> str:
+    def start_weather_data_fetch(self, worker: WeatherDataWorker,
+                                 priority: Optional[TaskPriority] = None) -> str:
         """
         🌍 PROVIDER ROUTING + 🌪️ WIND GUSTS: Weather data worker indítása 
         provider routing és wind gusts támogatással.
-        """
-        worker_id = self._get_worker_id("weather_data")
         
-        # Signal kapcsolatok
+        Háttér előtöltéshez priority=TaskPriority.BACKGROUND adható meg.
+        """
         worker.weather_data_completed.connect(self.weather_data_completed.emit)
-        worker.error_occurred.connect(self._on_worker_error)
-        worker.finished.connect(lambda worker_id=worker_id: self._on_worker_finished(worker_id))
-        worker.progress_updated.connect(lambda p: self.progress_updated.emit("weather_data", p))
         
         # 🌍 ÚJ: Provider routing signal kapcsolatok
         worker.provider_changed.connect(self._on_provider_changed)
         worker.provider_fallback_occurred.connect(self._on_provider_fallback)
         worker.provider_validation_failed.connect(self._on_provider_validation_failed)
         
-        # Thread safe worker tárolása és indítása
-        self.mutex.lock()
-        try:
-            self.active_workers[worker_id] = worker
-        finally:
-            self.mutex.unlock()
-        
-        worker.start()
-        self.worker_started.emit("weather_data")
-        print(f"✅ DEBUG: Weather worker indítva PROVIDER ROUTING + WIND GUSTS támogatással - {worker_id}")
-        return worker_id
+        return self._start_worker("weather_data", worker, priority)
     
-    def start_sql_query(self, worker: SQLQueryWorker) -> str:
+    def start_hourly_window_fetch(self, worker: HourlyWindowWorker,
+                                  priority: Optional[TaskPriority] = None) -> str:
+        """🌪️ Óránkénti lefúrási ablak worker indítása (cache találatnál azonnal válaszol)."""
+        worker.hourly_data_completed.connect(self.hourly_data_completed.emit)
+        return self._start_worker("hourly_window", worker, priority)
+    
+    def start_sql_query(self, worker: SQLQueryWorker,
+                        priority: Optional[TaskPriority] = None) -> str:
         """SQL query worker indítása."""
-        worker_id = self._get_worker_id("sql_query")
-        
-        # Signal kapcsolatok
         worker.query_completed.connect(self.sql_query_completed.emit)
+        return self._start_worker("sql_query", worker, priority)
+    
+    def _start_worker(self, worker_type: str, worker: BaseWorker,
+                      priority: Optional[TaskPriority] = None) -> str:
+        """
+        Worker beküldése a közös ütemezőbe.
+        
+        Returns:
+            Worker ID - deduplikáció esetén a már aktív azonos worker ID-ja
+        """
+        worker_id = self._get_worker_id(worker_type)
+        
+        # Közös signal kapcsolatok
         worker.error_occurred.connect(self._on_worker_error)
         worker.finished.connect(lambda worker_id=worker_id: self._on_worker_finished(worker_id))
-        worker.progress_updated.connect(lambda p: self.progress_updated.emit("sql_query", p))
+        worker.progress_updated.connect(lambda p, worker_type=worker_type: self.progress_updated.emit(worker_type, p))
         
-        # Thread safe worker tárolása és indítása
+        # Tárolás beküldés előtt - a gyorsan végző feladat is megtalálja
         self.mutex.lock()
         try:
             self.active_workers[worker_id] = worker
         finally:
             self.mutex.unlock()
         
-        worker.start()
-        self.worker_started.emit("sql_query")
-        print(f"✅ DEBUG: SQL query worker indítva - {worker_id}")
+        # Beküldés a lockon kívül: a latest-wins megszakítás szinkron finished jelzést adhat
+        handle = worker.start(self.scheduler, priority)
+        
+        self.mutex.lock()
+        try:
+            existing_id = self.task_workers.get(handle.task_id)
+            if existing_id is not None:
+                # Azonos feladat már fut - az új worker el sem indul
+                self.active_workers.pop(worker_id, None)
+            elif not handle.is_done():
+                self.task_workers[handle.task_id] = worker_id
+        finally:
+            self.mutex.unlock()
+        
+        if existing_id is not None:
+            worker.deleteLater()
+            print(f"🔁 DEBUG: {worker_type} worker deduplikálva → {existing_id}")
+            return existing_id
+        
+        self.worker_started.emit(worker_type)
+        print(f"✅ DEBUG: {worker_type} worker beküldve - {worker_id} ({handle.task_id}, {handle.priority.name})")
         return worker_id
     
     def _on_worker_error(self, error_message: str) -> None:
@@ -657,16 +873,13 @@ class WorkerManager(QObject):
                 
                 # Worker eltávolítása
                 worker = self.active_workers.pop(worker_id)
+                if worker.task_handle is not None:
+                    self.task_workers.pop(worker.task_handle.task_id, None)
                 
                 # 🌍 Provider usage tracking finalizálása
                 if hasattr(worker, 'actual_provider') and worker.actual_provider:
                     self._track_provider_usage(worker.actual_provider, True)
                 
-                # Thread cleanup
-                if worker.isRunning():
-                    worker.quit()
-                    worker.wait(3000)  # 3 másodperc timeout
-                
                 self.worker_finished.emit(worker_type)
                 print(f"✅ DEBUG: Worker befejezve: {worker_id}")
         finally:
@@ -754,27 +967,38 @@ class WorkerManager(QObject):
         """Specifikus worker megszakítása."""
         self.mutex.lock()
         try:
-            if worker_id in self.active_workers:
-                worker = self.active_workers[worker_id]
-                worker.cancel()
-                print(f"🛑 DEBUG: Worker megszakítva: {worker_id}")
-                return True
-            return False
+            worker = self.active_workers.get(worker_id)
         finally:
             self.mutex.unlock()
+        
+        if worker is None:
+            return False
+        
+        # A lockon kívül: várakozó feladat megszakítása szinkron finished jelzést ad
+        self._cancel_worker_task(worker)
+        print(f"🛑 DEBUG: Worker megszakítva: {worker_id}")
+        return True
     
     def cancel_all(self) -> None:
         """Összes aktív worker megszakítása."""
         self.mutex.lock()
         try:
-            for worker_id, worker in self.active_workers.items():
-                worker.cancel()
-                print(f"🛑 DEBUG: Worker cancel: {worker_id}")
+            workers = list(self.active_workers.items())
         finally:
             self.mutex.unlock()
         
+        for worker_id, worker in workers:
+            self._cancel_worker_task(worker)
+            print(f"🛑 DEBUG: Worker cancel: {worker_id}")
+        
         print("🛑 DEBUG: Összes worker megszakítva")
     
+    def _cancel_worker_task(self, worker: BaseWorker) -> None:
+        """Worker feladatának megszakítása az ütemezőben (várakozó feladat ki is kerül a sorból)."""
+        if worker.task_handle is not None:
+            worker.task_handle.cancel()
+        worker.cancel()
+    
     def get_active_workers(self) -> List[str]:
         """Aktív worker ID-k listája."""
         self.mutex.lock()
@@ -798,21 +1022,22 @@ class WorkerManager(QObject):
         # Összes worker megszakítása
         self.cancel_all()
         
-        # Várakozás a worker-ek leállására
+        # Várakozás a worker-ek leállására (kooperatív - a pool szálak nem terminálhatók)
         self.mutex.lock()
         try:
-            for worker_id, worker in list(self.active_workers.items()):
-                print(f"  ⏳ Worker leállítása: {worker_id}")
-                
-                if worker.isRunning():
-                    worker.quit()
-                    if not worker.wait(5000):  # 5 másodperc timeout
-                        print(f"  ⚠️ Worker kényszerű leállítása: {worker_id}")
-                        worker.terminate()
-                        worker.wait(1000)
-                
-                # Worker eltávolítása
-                self.active_workers.pop(worker_id, None)
+            workers = list(self.active_workers.items())
+        finally:
+            self.mutex.unlock()
+        
+        for worker_id, worker in workers:
+            print(f"  ⏳ Worker leállítása: {worker_id}")
+            if worker.task_handle is not None and not worker.task_handle.wait(5000):  # 5 másodperc timeout
+                print(f"  ⚠️ Worker nem állt le időben: {worker_id}")
+        
+        self.mutex.lock()
+        try:
+            self.active_workers.clear()
+            self.task_workers.clear()
             
             # Provider states cleanup
             self.provider_states.clear()
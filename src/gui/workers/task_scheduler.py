@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Global Weather Analyzer - Shared Task Scheduler
+Közös, prioritásos háttér feladat ütemező QThreadPool/QRunnable alapon.
+
+🧵 KÖZÖS POOL: Kérésenkénti QThread helyett egy korlátozott méretű QThreadPool
+🎯 PRIORITÁS: Interaktív keresés > elemzés > normál > háttér előtöltés
+🔁 DEDUPLIKÁCIÓ: Azonos kulcsú, még futó/várakozó feladat nem indul el újra
+🏁 LATEST-WINS: Egy csoporton belül az új feladat megszakítja a régieket (typeahead)
+🚦 KORLÁTOZOTT PÁRHUZAMOSSÁG: HardwareConfig.TASK_SCHEDULER_MAX_WORKERS
+
+Használat:
+    scheduler = get_task_scheduler()
+    handle = scheduler.submit(
+        worker.run,
+        name="geocoding",
+        priority=TaskPriority.INTERACTIVE,
+        key="geocoding:budapest",
+        group="geocoding",
+        on_cancel=worker.cancel
+    )
+"""
+
+import logging
+import threading
+import time
+from enum import Enum, IntEnum
+from typing import Optional, Dict, Any, Callable, List, Hashable
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from ...config import HardwareConfig
+
+logger = logging.getLogger(__name__)
+
+
+class TaskPriority(IntEnum):
+    """Feladat prioritás - a nagyobb érték előbb kerül sorra a QThreadPool-ban."""
+    BACKGROUND = 0     # Előtöltés (prefetch), üresjárati munka
+    NORMAL = 10        # SQL lekérdezés, trend adatok
+    ANALYSIS = 20      # Felhasználó által indított elemzés
+    INTERACTIVE = 30   # Gépelés közbeni keresés (typeahead)
+
+
+class TaskState(Enum):
+    """Feladat életciklus állapot."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    FINISHED = "finished"
+    CANCELLED = "cancelled"
+
+
+class TaskHandle:
+    """
+    Beküldött feladat azonosítója és állapota.
+
+    A megszakítás kooperatív: várakozó feladat kikerül a sorból, futó
+    feladatnál csak a jelző áll be (a feladat a saját ellenőrzési pontjain áll le).
+    """
+
+    def __init__(self, scheduler: "TaskScheduler", task_id: str, name: str,
+                 priority: TaskPriority, key: Optional[Hashable], group: Optional[str]):
+        self._scheduler = scheduler
+        self.task_id = task_id
+        self.name = name
+        self.priority = priority
+        self.key = key
+        self.group = group
+        self.state = TaskState.QUEUED
+        self.started = False
+        self.submitted_at = time.perf_counter()
+        self.duplicate_count = 0
+
+        self._cancel_event = threading.Event()
+        self._done_event = threading.Event()
+
+    def cancel(self) -> bool:
+        """Feladat megszakítása (lásd TaskScheduler.cancel)."""
+        return self._scheduler.cancel(self.task_id)
+
+    def is_cancelled(self) -> bool:
+        """Megszakítás kérve lett-e."""
+        return self._cancel_event.is_set()
+
+    def is_done(self) -> bool:
+        """Befejeződött-e (sikeresen vagy megszakítva)."""
+        return self._done_event.is_set()
+
+    def wait(self, timeout_ms: Optional[int] = None) -> bool:
+        """
+        Várakozás a feladat befejezésére.
+
+        Returns:
+            True ha a feladat a timeout előtt befejeződött
+        """
+        timeout = None if timeout_ms is None else timeout_ms / 1000.0
+        return self._done_event.wait(timeout)
+
+    def __repr__(self) -> str:
+        return f"<TaskHandle {self.task_id} {self.name} ({self.state.value})>"
+
+
+class _TaskRunnable(QRunnable):
+    """QRunnable burok - a pool szálon a scheduler _run_task metódusát hívja."""
+
+    def __init__(self, scheduler: "TaskScheduler", handle: TaskHandle, fn: Callable[[], Any]):
+        super().__init__()
+        # A Python oldal tartja életben (tryTake után is biztonságos)
+        self.setAutoDelete(False)
+        self._scheduler = scheduler
+        self._handle = handle
+        self._fn = fn
+
+    def run(self) -> None:
+        self._scheduler._run_task(self._handle, self._fn)
+
+
+class TaskScheduler(QObject):
+    """
+    Közös háttér feladat ütemező.
+
+    Egy saját QThreadPool-t használ (nem a globális példányt), így a
+    párhuzamosság felső korlátja független a többi pool használótól.
+    """
+
+    # Signalok
+    task_started = Signal(str)        # task_id
+    task_finished = Signal(str, str)  # task_id, végállapot ("finished" / "cancelled")
+
+    def __init__(self, max_workers: Optional[int] = None, parent: Optional[QObject] = None):
+        super().__init__(parent)
+
+        self.max_workers = max_workers or HardwareConfig.TASK_SCHEDULER_MAX_WORKERS
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(self.max_workers)
+        self._pool.setExpiryTimeout(30000)  # Üresjárati szálak 30 s után megszűnnek
+
+        self._lock = threading.RLock()
+        self._counter = 0
+        self._tasks: Dict[str, TaskHandle] = {}
+        self._runnables: Dict[str, _TaskRunnable] = {}
+        self._by_key: Dict[Hashable, str] = {}
+        self._callbacks: Dict[str, Dict[str, Optional[Callable]]] = {}
+
+        self._stats = {
+            "submitted": 0,
+            "deduplicated": 0,
+            "superseded": 0,
+            "cancelled": 0,
+            "finished": 0,
+        }
+
+        logger.info(f"🧵 TaskScheduler inicializálva ({self.max_workers} worker)")
+
+    # === BEKÜLDÉS ===
+
+    def submit(self, fn: Callable[[], Any], name: str = "task",
+               priority: TaskPriority = TaskPriority.NORMAL,
+               key: Optional[Hashable] = None, group: Optional[str] = None,
+               on_cancel: Optional[Callable[[], None]] = None,
+               on_done: Optional[Callable[[TaskHandle], None]] = None) -> TaskHandle:
+        """
+        Feladat beküldése.
+
+        Args:
+            fn: Pool szálon futó callable (paraméter nélkül)
+            name: Feladat neve (naplózás, statisztika)
+            priority: Prioritás
+            key: Deduplikációs kulcs - azonos kulcsú aktív feladat esetén azt adja vissza
+            group: Latest-wins csoport - az új feladat megszakítja a csoport többi feladatát
+            on_cancel: Megszakításkor hívott callback (pl. worker.cancel)
+            on_done: Befejezéskor hívott callback (a befejező szálon fut)
+
+        Returns:
+            TaskHandle - deduplikáció esetén a már futó/várakozó feladaté
+        """
+        with self._lock:
+            if key is not None:
+                existing_id = self._by_key.get(key)
+                existing = self._tasks.get(existing_id) if existing_id else None
+                if existing is not None and not existing.is_cancelled():
+                    existing.duplicate_count += 1
+                    self._stats["deduplicated"] += 1
+                    logger.debug(f"🔁 TaskScheduler: {name} deduplikálva → {existing.task_id}")
+                    return existing
+
+            superseded = [
+                task_id for task_id, handle in self._tasks.items()
+                if group is not None and handle.group == group
+            ]
+
+            self._counter += 1
+            handle = TaskHandle(self, f"{name}_{self._counter}", name, priority, key, group)
+            runnable = _TaskRunnable(self, handle, fn)
+
+            self._tasks[handle.task_id] = handle
+            self._runnables[handle.task_id] = runnable
+            self._callbacks[handle.task_id] = {"on_cancel": on_cancel, "on_done": on_done}
+            if key is not None:
+                self._by_key[key] = handle.task_id
+            self._stats["submitted"] += 1
+
+        # Latest-wins: a csoport régebbi feladatai megszakítva (a lockon kívül - callbackek miatt)
+        for task_id in superseded:
+            if self.cancel(task_id):
+                with self._lock:
+                    self._stats["superseded"] += 1
+                logger.debug(f"🏁 TaskScheduler: {task_id} felülírva ({group})")
+
+        self._pool.start(runnable, int(priority))
+        logger.debug(f"🧵 TaskScheduler: {handle.task_id} beküldve (prioritás {priority.name})")
+        return handle
+
+    # === MEGSZAKÍTÁS ===
+
+    def cancel(self, task_id: str) -> bool:
+        """
+        Feladat megszakítása.
+
+        Várakozó feladat kikerül a sorból, futó feladatnál a megszakítás jelző
+        és az on_cancel callback jelzi a leállást.
+
+        Returns:
+            True ha a feladat aktív volt
+        """
+        with self._lock:
+            handle = self._tasks.get(task_id)
+            if handle is None or handle.is_cancelled():
+                return False
+
+            handle._cancel_event.set()
+            on_cancel = self._callbacks.get(task_id, {}).get("on_cancel")
+            runnable = self._runnables.get(task_id)
+            removed = (
+                handle.state == TaskState.QUEUED and runnable is not None
+                and self._pool.tryTake(runnable)
+            )
+
+        if on_cancel:
+            try:
+                on_cancel()
+            except Exception as e:
+                logger.error(f"❌ TaskScheduler on_cancel hiba ({task_id}): {e}")
+
+        if removed:
+            # Soha nem indult el - itt zárjuk le
+            self._finalize(handle, TaskState.CANCELLED)
+
+        return True
+
+    def cancel_group(self, group: str) -> int:
+        """Egy csoport összes aktív feladatának megszakítása."""
+        with self._lock:
+            task_ids = [tid for tid, handle in self._tasks.items() if handle.group == group]
+        return sum(1 for task_id in task_ids if self.cancel(task_id))
+
+    def cancel_all(self) -> int:
+        """Összes aktív feladat megszakítása."""
+        with self._lock:
+            task_ids = list(self._tasks)
+        return sum(1 for task_id in task_ids if self.cancel(task_id))
+
+    # === FUTTATÁS ===
+
+    def _run_task(self, handle: TaskHandle, fn: Callable[[], Any]) -> None:
+        """Pool szál belépési pont."""
+        with self._lock:
+            if handle.is_cancelled() or handle.is_done():
+                cancelled_before_start = True
+            else:
+                cancelled_before_start = False
+                handle.state = TaskState.RUNNING
+                handle.started = True
+
+        if cancelled_before_start:
+            self._finalize(handle, TaskState.CANCELLED)
+            return
+
+        self.task_started.emit(handle.task_id)
+        start_time = time.perf_counter()
+
+        try:
+            fn()
+        except Exception as e:
+            logger.error(f"❌ TaskScheduler feladat hiba ({handle.task_id}): {e}", exc_info=True)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            final_state = TaskState.CANCELLED if handle.is_cancelled() else TaskState.FINISHED
+            logger.debug(f"✅ TaskScheduler: {handle.task_id} {final_state.value} ({elapsed:.3f}s)")
+            self._finalize(handle, final_state)
+
+    def _finalize(self, handle: TaskHandle, state: TaskState) -> None:
+        """Feladat lezárása - nyilvántartásból törlés, callback és signal."""
+        with self._lock:
+            if handle.is_done():
+                return
+            handle.state = state
+            self._tasks.pop(handle.task_id, None)
+            self._runnables.pop(handle.task_id, None)
+            callbacks = self._callbacks.pop(handle.task_id, {})
+            if handle.key is not None and self._by_key.get(handle.key) == handle.task_id:
+                del self._by_key[handle.key]
+            self._stats["cancelled" if state == TaskState.CANCELLED else "finished"] += 1
+            handle._done_event.set()
+
+        on_done = callbacks.get("on_done")
+        if on_done:
+            try:
+                on_done(handle)
+            except Exception as e:
+                logger.error(f"❌ TaskScheduler on_done hiba ({handle.task_id}): {e}")
+
+        self.task_finished.emit(handle.task_id, state.value)
+
+    # === ÁLLAPOT ===
+
+    def get_task(self, task_id: str) -> Optional[TaskHandle]:
+        """Aktív feladat lekérdezése."""
+        with self._lock:
+            return self._tasks.get(task_id)
+
+    def active_tasks(self, group: Optional[str] = None) -> List[TaskHandle]:
+        """Aktív (várakozó vagy futó) feladatok, opcionálisan csoportra szűrve."""
+        with self._lock:
+            return [
+                handle for handle in self._tasks.values()
+                if group is None or handle.group == group
+            ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Ütemező statisztika."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["active"] = len(self._tasks)
+            stats["running"] = sum(1 for h in self._tasks.values() if h.state == TaskState.RUNNING)
+        stats["max_workers"] = self.max_workers
+        stats["pool_active_threads"] = self._pool.activeThreadCount()
+        return stats
+
+    def shutdown(self, timeout_ms: int = 5000) -> bool:
+        """
+        Ütemező leállítása - minden feladat megszakítása és várakozás a futókra.
+
+        Returns:
+            True ha minden feladat a timeout előtt leállt
+        """
+        cancelled = self.cancel_all()
+        done = self._pool.waitForDone(timeout_ms)
+        if not done:
+            logger.warning(f"⚠️ TaskScheduler: nem minden feladat állt le {timeout_ms} ms alatt")
+        logger.info(f"🛑 TaskScheduler leállítva ({cancelled} feladat megszakítva)")
+        return done
+
+
+# === KÖZÖS PÉLDÁNY ===
+
+_scheduler_instance: Optional[TaskScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_task_scheduler() -> TaskScheduler:
+    """Az alkalmazás közös TaskScheduler példánya (első híváskor jön létre)."""
+    global _scheduler_instance
+    with _scheduler_lock:
+        if _scheduler_instance is None:
+            _scheduler_instance = TaskScheduler()
+        return _scheduler_instance
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Global Weather Analyzer - Lazy Import Facades
+Nehéz könyvtárak (geopandas, folium, sklearn, scipy, plotly, QtWebEngine) lusta importálása.
+
+🚀 HIDEGINDÍTÁS: A modul szintű import csak egy kis proxy objektumot hoz létre,
+   a valódi import az első attribútum eléréskor (vagy híváskor) történik
+🔍 ELÉRHETŐSÉG: Az `available` ellenőrzés importlib.util.find_spec alapú - nem importál
+⏱️ MÉRÉS: Minden tényleges betöltés ideje rögzítésre kerül (get_lazy_import_report)
+
+Használat:
+    from ..lazy_imports import lazy_module, lazy_attribute
+
+    folium = lazy_module("folium")
+    LinearRegression = lazy_attribute("sklearn.linear_model", "LinearRegression")
+
+    if folium.available:
+        map_obj = folium.Map(...)   # itt töltődik be a folium
+"""
+
+import importlib
+import importlib.util
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.RLock()
+_modules: Dict[str, "LazyModule"] = {}
+_load_times: Dict[str, float] = {}
+
+
+class LazyModule:
+    """
+    Modul proxy - az első attribútum eléréskor importál.
+
+    Nem ModuleType alosztály, így az `isinstance(x, ModuleType)` ellenőrzések
+    nem indítanak importot véletlenül.
+    """
+
+    def __init__(self, name: str):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+        object.__setattr__(self, "_available", None)
+
+    @property
+    def available(self) -> bool:
+        """Telepítve van-e a modul (importálás nélkül)."""
+        if self._module is not None:
+            return True
+        if self._available is None:
+            try:
+                found = importlib.util.find_spec(self._name) is not None
+            except (ImportError, ValueError):
+                found = False
+            object.__setattr__(self, "_available", found)
+        return self._available
+
+    @property
+    def loaded(self) -> bool:
+        """Betöltődött-e már a modul."""
+        return self._module is not None
+
+    def load(self) -> Any:
+        """
+        Modul tényleges importálása (szálbiztos, egyszeri).
+
+        Raises:
+            ImportError: Ha a modul nem importálható
+        """
+        module = self._module
+        if module is not None:
+            return module
+
+        with _lock:
+            if self._module is None:
+                start_time = time.perf_counter()
+                module = importlib.import_module(self._name)
+                elapsed = time.perf_counter() - start_time
+
+                _load_times[self._name] = elapsed
+                object.__setattr__(self, "_module", module)
+                object.__setattr__(self, "_available", True)
+                logger.info(f"📦 Lusta import: {self._name} betöltve ({elapsed * 1000:.0f} ms)")
+
+        return self._module
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self.load(), item)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        setattr(self.load(), key, value)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "deferred"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+class LazyAttribute:
+    """
+    Egy modul attribútumának (osztály/függvény) proxyja.
+
+    Híváskor vagy attribútum eléréskor tölti be a modult, pl.:
+        LinearRegression = lazy_attribute("sklearn.linear_model", "LinearRegression")
+        model = LinearRegression()
+    """
+
+    def __init__(self, module_name: str, attribute: str):
+        self._module = lazy_module(module_name)
+        self._attribute = attribute
+
+    @property
+    def available(self) -> bool:
+        """Telepítve van-e a forrás modul (importálás nélkül)."""
+        return self._module.available
+
+    def resolve(self) -> Any:
+        """A valódi attribútum (a modul betöltésével)."""
+        return getattr(self._module.load(), self._attribute)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, item: str) -> Any:
+        if item.startswith("_"):
+            raise AttributeError(item)
+        return getattr(self.resolve(), item)
+
+    def __repr__(self) -> str:
+        return f"<LazyAttribute {self._module._name}.{self._attribute}>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """Megosztott lusta modul proxy lekérése (modulnévenként egy példány)."""
+    with _lock:
+        proxy = _modules.get(name)
+        if proxy is None:
+            proxy = LazyModule(name)
+            _modules[name] = proxy
+        return proxy
+
+
+def lazy_attribute(module_name: str, attribute: str) -> LazyAttribute:
+    """Lusta attribútum proxy (osztály/függvény) létrehozása."""
+    return LazyAttribute(module_name, attribute)
+
+
+def get_lazy_import_report() -> Dict[str, Optional[float]]:
+    """
+    Lusta importok állapota.
+
+    Returns:
+        Modulnév → betöltési idő másodpercben (None ha még nem töltődött be)
+    """
+    with _lock:
+        return {name: _load_times.get(name) for name in sorted(_modules)}